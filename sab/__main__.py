@@ -6,9 +6,17 @@ import logging
 import os
 import sys
 
+from .backtest import run_backtest
+from .data.kr_eod import DEFAULT_BACKFILL_SESSIONS
 from .env_loader import load_dotenv_if_available
+from .ingest import run_ingest
+from .optimize import run_optimize
 from .scan import run_scan
 from .sell import run_sell
+from .signals.backtest import DEFAULT_MAX_HOLD_BARS
+from .signals.indicator_cache import IndicatorCache
+from .signals.walkforward import DEFAULT_TEST_BARS, DEFAULT_TRAIN_BARS
+from .walkforward import run_walkforward_validation
 
 
 def _configure_logging() -> None:
@@ -47,13 +55,7 @@ def _configure_logging() -> None:
     logging.basicConfig(level=level, handlers=[handler], force=True)
 
 
-def _build_parser() -> argparse.ArgumentParser:
-    p = argparse.ArgumentParser(
-        prog="sab", description="Swing Alert Bot — on-demand report"
-    )
-    sub = p.add_subparsers(dest="cmd")
-
-    s = sub.add_parser("scan", help="Collect -> evaluate -> write markdown report")
+def _add_scan_arguments(s: argparse.ArgumentParser) -> None:
     s.add_argument("--limit", type=int, default=None, help="Max tickers to evaluate")
     s.add_argument("--watchlist", type=str, default=None, help="Path to watchlist file")
     s.add_argument(
@@ -70,10 +72,62 @@ def _build_parser() -> argparse.ArgumentParser:
         "--universe",
         type=str,
         default=None,
-        choices=["watchlist", "screener", "both"],
-        help="Universe selection: watchlist only, screener only, or both",
+        choices=["watchlist", "screener", "both", "market"],
+        help=(
+            "Universe selection: watchlist only, screener only, both, or every "
+            "KR stock from the last `sab ingest`"
+        ),
+    )
+
+
+def _add_sweep_arguments(o: argparse.ArgumentParser) -> None:
+    o.add_argument("--limit", type=int, default=None, help="Max tickers to replay")
+    o.add_argument(
+        "--watchlist",
+        type=str,
+        default=None,
+        help="Replay these tickers instead of every cached series",
+    )
+    o.add_argument(
+        "--param",
+        action="append",
+        default=None,
+        metavar="NAME=V1,V2,...",
+        help="Values to sweep (repeatable; buy./sell. prefix picks the side)",
+    )
+    o.add_argument(
+        "--samples",
+        type=int,
+        default=None,
+        help="Random search: evaluate N combinations instead of the full grid",
+    )
+    o.add_argument("--seed", type=int, default=0, help="Random search seed")
+    o.add_argument(
+        "--workers", type=int, default=None, help="Worker processes (default: CPUs)"
+    )
+    o.add_argument(
+        "--max-hold",
+        type=int,
+        default=DEFAULT_MAX_HOLD_BARS,
+        help="Exit after this many bars without a SELL (0 = no limit)",
+    )
+    o.add_argument(
+        "--min-trades",
+        type=int,
+        default=5,
+        help="Rank combinations with fewer closed trades last",
     )
 
+
+def _build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(
+        prog="sab", description="Swing Alert Bot — on-demand report"
+    )
+    sub = p.add_subparsers(dest="cmd")
+
+    s = sub.add_parser("scan", help="Collect -> evaluate -> write markdown report")
+    _add_scan_arguments(s)
+
     sell = sub.add_parser("sell", help="Evaluate holdings against sell/review rules")
     sell.add_argument(
         "--provider",
@@ -82,6 +136,87 @@ def _build_parser() -> argparse.ArgumentParser:
         choices=["kis", "pykrx"],
         help="Data provider override",
     )
+
+    run = sub.add_parser(
+        "run",
+        help="Run scan then sell in one process, sharing computed indicators",
+    )
+    _add_scan_arguments(run)
+
+    bt = sub.add_parser(
+        "backtest", help="Replay buy/sell rules over cached candles -> snapshot"
+    )
+    bt.add_argument("--limit", type=int, default=None, help="Max tickers to replay")
+    bt.add_argument(
+        "--watchlist",
+        type=str,
+        default=None,
+        help="Replay these tickers instead of every cached series",
+    )
+    bt.add_argument(
+        "--max-hold",
+        type=int,
+        default=DEFAULT_MAX_HOLD_BARS,
+        help="Exit after this many bars without a SELL (0 = no limit)",
+    )
+    bt.add_argument(
+        "--recent", type=int, default=20, help="Signals listed in the report"
+    )
+
+    ing = sub.add_parser(
+        "ingest",
+        help="Build the full-market KR EOD history, one KRX snapshot per session",
+    )
+    ing.add_argument(
+        "--since",
+        type=str,
+        default=None,
+        metavar="YYYYMMDD",
+        help="Backfill from this date (default: continue from the last ingest)",
+    )
+    ing.add_argument(
+        "--sessions",
+        type=int,
+        default=DEFAULT_BACKFILL_SESSIONS,
+        help="Sessions to backfill on the first run",
+    )
+    ing.add_argument(
+        "--market",
+        type=str,
+        default="ALL",
+        choices=["ALL", "KOSPI", "KOSDAQ", "KONEX"],
+        help="KRX market to snapshot",
+    )
+
+    opt = sub.add_parser(
+        "optimize", help="Sweep hybrid strategy settings over cached candles"
+    )
+    _add_sweep_arguments(opt)
+    opt.add_argument("--top", type=int, default=20, help="Rows in the ranked table")
+
+    wf = sub.add_parser(
+        "walkforward",
+        help="Walk-forward validation: re-select hybrid settings per train window",
+    )
+    _add_sweep_arguments(wf)
+    wf.add_argument(
+        "--train-bars",
+        type=int,
+        default=DEFAULT_TRAIN_BARS,
+        help="Sessions in each train window",
+    )
+    wf.add_argument(
+        "--test-bars",
+        type=int,
+        default=DEFAULT_TEST_BARS,
+        help="Sessions in each test window",
+    )
+    wf.add_argument(
+        "--step-bars",
+        type=int,
+        default=None,
+        help="Sessions between window starts (default: --test-bars)",
+    )
     return p
 
 
@@ -104,6 +239,62 @@ def main(argv: list[str] | None = None) -> int:
     if ns.cmd == "sell":
         return run_sell(provider=ns.provider)
 
+    if ns.cmd == "run":
+        cache = IndicatorCache()
+        scan_rc = run_scan(
+            limit=ns.limit,
+            watchlist_path=ns.watchlist,
+            provider=ns.provider,
+            screener_limit=ns.screener_limit,
+            universe=ns.universe,
+            indicator_cache=cache,
+        )
+        sell_rc = run_sell(provider=ns.provider, indicator_cache=cache)
+        stats = cache.stats()
+        logging.getLogger(__name__).info(
+            "Indicator cache: %d hits, %d misses", stats["hits"], stats["misses"]
+        )
+        return max(scan_rc, sell_rc)
+
+    if ns.cmd == "backtest":
+        return run_backtest(
+            limit=ns.limit,
+            watchlist_path=ns.watchlist,
+            max_hold_bars=ns.max_hold,
+            recent=ns.recent,
+        )
+
+    if ns.cmd == "ingest":
+        return run_ingest(since=ns.since, sessions=ns.sessions, market=ns.market)
+
+    if ns.cmd == "optimize":
+        return run_optimize(
+            limit=ns.limit,
+            watchlist_path=ns.watchlist,
+            params=ns.param,
+            samples=ns.samples,
+            seed=ns.seed,
+            workers=ns.workers,
+            max_hold_bars=ns.max_hold,
+            min_trades=ns.min_trades,
+            top=ns.top,
+        )
+
+    if ns.cmd == "walkforward":
+        return run_walkforward_validation(
+            limit=ns.limit,
+            watchlist_path=ns.watchlist,
+            params=ns.param,
+            samples=ns.samples,
+            seed=ns.seed,
+            workers=ns.workers,
+            train_bars=ns.train_bars,
+            test_bars=ns.test_bars,
+            step_bars=ns.step_bars,
+            max_hold_bars=ns.max_hold,
+            min_trades=ns.min_trades,
+        )
+
     parser.print_help()
     return 2
 
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any
+
+from .config import Config, load_config, load_watchlist
+from .config_loader import ConfigLoadError
+from .data.candle_store import CandleRepository, open_candle_store, split_cache_key
+from .data.kr_eod import EOD_KEY_PREFIX
+from .holdings_loader import HoldingsLoadError
+from .report.backtest_report import write_backtest_report
+from .scan import _build_eval_settings, _build_hybrid_settings, _kis_cache_key
+from .sell import _build_hybrid_sell_settings, _build_sell_settings
+from .signals.backtest import DEFAULT_MAX_HOLD_BARS, SignalOutcome, backtest_ticker
+
+
+def _backtest_universe(
+    cfg: Config, store: CandleRepository, watchlist_path: str | None
+) -> list[tuple[str, str]]:
+    """``(ticker, cache key)`` pairs: the watchlist, else every cached series."""
+    if watchlist_path:
+        return [(t, _kis_cache_key(t)[2]) for t in load_watchlist(watchlist_path)]
+    universe: list[tuple[str, str]] = []
+    keys = store.manifest.cached_keys()
+    cached = set(keys)
+    for key in keys:
+        if key.startswith(EOD_KEY_PREFIX):
+            # Unadjusted `sab ingest` history only stands in for missing KIS data.
+            ticker = key[len(EOD_KEY_PREFIX) :]
+            if _kis_cache_key(ticker)[2] not in cached:
+                universe.append((ticker, key))
+            continue
+        market, symbol = split_cache_key(key)
+        if market == "KR":
+            universe.append((symbol, key))
+        elif market:
+            universe.append((f"{symbol}.{market}", key))
+    return universe
+
+
+def _ticker_meta(cfg: Config, ticker: str, source: str) -> dict[str, Any]:
+    exchange = _kis_cache_key(ticker)[1]
+    return {
+        "currency": "USD" if exchange else "KRW",
+        "exchange": exchange,
+        "data_source": source,
+        "provider": source,
+        "data_dir": cfg.data_dir,
+    }
+
+
+def run_backtest(
+    *,
+    limit: int | None = None,
+    watchlist_path: str | None = None,
+    max_hold_bars: int = DEFAULT_MAX_HOLD_BARS,
+    recent: int = 20,
+) -> int:
+    logger = logging.getLogger(__name__)
+    try:
+        cfg: Config = load_config()
+    except (ConfigLoadError, HoldingsLoadError) as exc:
+        logger.error("Configuration loading failed: %s", exc)
+        return 1
+
+    hybrid = cfg.strategy_mode == "sma_ema_hybrid"
+    buy_settings = _build_hybrid_settings(cfg) if hybrid else _build_eval_settings(cfg)
+    sell_settings = (
+        _build_hybrid_sell_settings(cfg) if hybrid else _build_sell_settings(cfg)
+    )
+
+    store = open_candle_store(cfg.data_dir, cfg.candle_store)
+    universe = _backtest_universe(cfg, store, watchlist_path)
+    if limit:
+        universe = universe[:limit]
+    if not universe:
+        logger.error("No cached candles to backtest (run scan or ingest first)")
+        return 1
+
+    started = time.perf_counter()
+    outcomes: list[SignalOutcome] = []
+    failures: list[str] = []
+    for ticker, key in universe:
+        candles = store.load(key)
+        if not candles:
+            failures.append(f"{ticker}: no cached candles")
+            continue
+        entry = store.manifest.get(key) or {}
+        meta = _ticker_meta(cfg, ticker, str(entry.get("source") or "kis"))
+        outcomes.extend(
+            backtest_ticker(
+                ticker,
+                candles,
+                buy_settings,
+                sell_settings,
+                meta,
+                max_hold_bars=max_hold_bars,
+            )
+        )
+    logger.info(
+        "Backtested %d tickers in %.1fs: %d signals",
+        len(universe),
+        time.perf_counter() - started,
+        len(outcomes),
+    )
+
+    out_path = write_backtest_report(
+        report_dir=cfg.report_dir,
+        strategy_mode=cfg.strategy_mode,
+        universe_count=len(universe),
+        outcomes=outcomes,
+        max_hold_bars=max_hold_bars,
+        recent=recent,
+        failures=failures,
+    )
+    logger.info("Backtest report written to: %s", out_path)
+    return 0
+
+
+__all__ = ["run_backtest"]
@@ -6,6 +6,7 @@ from typing import Any, overload
 from urllib.parse import urlparse
 
 from .config_loader import ConfigLoadError, load_yaml_config
+from .data.candle_store import CANDLE_STORE_BACKENDS
 from .env_loader import load_dotenv_if_available
 from .holdings_loader import HoldingsData, load_holdings
 
@@ -74,11 +75,18 @@ class Config:
     screen_limit: int = 30
     report_dir: str = "reports"
     data_dir: str = "data"
+    candle_store: str = "columnar"  # 'columnar' | 'json' | 'sqlite'
+    skip_fresh_fetch: bool = True
+    indicator_state: bool = False
+    cache_write_behind: bool = True
+    cache_durability: str = "fsync"  # 'fsync' | 'none'
     watchlist_path: str | None = None
     screener_enabled: bool = False
     screener_limit: int = 20
     screener_only: bool = False
     strategy_mode: str = "ema_cross"
+    batch_evaluation: bool = True
+    eval_workers: int = 0
     use_sma200_filter: bool = False
     gap_atr_multiplier: float = 1.0
     min_dollar_volume: float = 0.0
@@ -86,6 +94,8 @@ class Config:
     exclude_etf_etn: bool = False
     require_slope_up: bool = False
     kis_min_interval_ms: float | None = None
+    kis_concurrency: int = 4
+    kis_shared_rate_limit: bool = True
     screener_cache_ttl_minutes: float = 5.0
     min_price: float = 0.0
     rs_lookback_days: int = 20
@@ -113,6 +123,7 @@ class Config:
     fx_mode: str = "manual"  # 'manual' | 'kis' | 'off'
     fx_cache_ttl_minutes: float = 10.0
     fx_kis_symbol: str | None = None
+    holiday_refresh_hours: float = 24.0
     # Per-market thresholds
     us_min_price: float | None = None
     us_min_dollar_volume: float | None = None
@@ -238,6 +249,8 @@ def load_config(
         "USE_SMA200_FILTER", "strategy.use_sma200_filter", False
     )
     require_slope_up = env_bool("REQUIRE_SLOPE_UP", "strategy.require_slope_up", False)
+    batch_evaluation = env_bool("BATCH_EVALUATION", "strategy.batch_evaluation", True)
+    eval_workers = max(0, env_int("EVAL_WORKERS", "strategy.eval_workers", 0))
     exclude_etf_etn = env_bool("EXCLUDE_ETF_ETN", "strategy.exclude_etf_etn", False)
 
     gap_atr_multiplier = env_float(
@@ -258,6 +271,30 @@ def load_config(
     else:
         kis_min_interval_ms = parse_float(from_yaml("kis.min_interval_ms"), None)  # type: ignore[arg-type]
 
+    kis_concurrency = max(1, env_int("KIS_CONCURRENCY", "kis.concurrency", 4))
+    kis_shared_rate_limit = env_bool(
+        "KIS_SHARED_RATE_LIMIT", "kis.shared_rate_limit", True
+    )
+
+    candle_store_raw = (
+        os.getenv("CANDLE_STORE") or from_yaml("data.candle_store", "columnar") or ""
+    )
+    candle_store = str(candle_store_raw).strip().lower()
+    if candle_store not in CANDLE_STORE_BACKENDS:
+        candle_store = "columnar"
+
+    skip_fresh_fetch = env_bool("SKIP_FRESH_FETCH", "data.skip_fresh_fetch", True)
+    indicator_state = env_bool("INDICATOR_STATE", "data.indicator_state", False)
+    cache_write_behind = env_bool("CACHE_WRITE_BEHIND", "data.cache_write_behind", True)
+    cache_durability_raw = (
+        os.getenv("CACHE_DURABILITY")
+        or from_yaml("data.cache_durability", "fsync")
+        or ""
+    )
+    cache_durability = str(cache_durability_raw).strip().lower()
+    if cache_durability not in {"fsync", "none"}:
+        cache_durability = "fsync"
+
     screener_cache_ttl_minutes = env_float(
         "SCREENER_CACHE_TTL", "screener.cache_ttl_minutes", 5.0
     )
@@ -467,6 +504,9 @@ def load_config(
     fx_cache_ttl_minutes = env_float("FX_CACHE_TTL", "fx.cache_ttl_minutes", 10.0)
     fx_kis_symbol_raw = env_str("FX_KIS_SYMBOL", "fx.kis_symbol", None)
     fx_kis_symbol = fx_kis_symbol_raw.strip().upper() if fx_kis_symbol_raw else None
+    holiday_refresh_hours = env_float(
+        "HOLIDAY_REFRESH_HOURS", "holidays.refresh_hours", 24.0
+    )
 
     # Per-market thresholds (USD units for US)
     us_min_price = None
@@ -507,11 +547,18 @@ def load_config(
         screen_limit=screen_limit,
         report_dir=os.getenv("REPORT_DIR") or from_yaml("data.report_dir", "reports"),
         data_dir=os.getenv("DATA_DIR") or from_yaml("data.data_dir", "data"),
+        candle_store=candle_store,
+        skip_fresh_fetch=skip_fresh_fetch,
+        indicator_state=indicator_state,
+        cache_write_behind=cache_write_behind,
+        cache_durability=cache_durability,
         watchlist_path=watchlist_path,
         screener_enabled=screener_enabled,
         screener_limit=screener_limit,
         screener_only=screener_only,
         strategy_mode=strategy_mode,
+        batch_evaluation=batch_evaluation,
+        eval_workers=eval_workers,
         use_sma200_filter=use_sma200_filter,
         gap_atr_multiplier=gap_atr_multiplier,
         min_dollar_volume=min_dollar_volume,
@@ -519,6 +566,8 @@ def load_config(
         exclude_etf_etn=exclude_etf_etn,
         require_slope_up=require_slope_up,
         kis_min_interval_ms=kis_min_interval_ms,
+        kis_concurrency=kis_concurrency,
+        kis_shared_rate_limit=kis_shared_rate_limit,
         screener_cache_ttl_minutes=screener_cache_ttl_minutes,
         min_price=min_price,
         rs_lookback_days=rs_lookback_days,
@@ -544,6 +593,7 @@ def load_config(
         fx_mode=fx_mode,
         fx_cache_ttl_minutes=fx_cache_ttl_minutes,
         fx_kis_symbol=fx_kis_symbol,
+        holiday_refresh_hours=holiday_refresh_hours,
         us_min_price=us_min_price,
         us_min_dollar_volume=us_min_dollar_volume,
         hybrid=hybrid_cfg,
@@ -1,10 +1,56 @@
 from __future__ import annotations
 
+import atexit
 import json
 import os
+import threading
 from typing import Any
 
-from ..utils.atomic_io import atomic_write_json
+from ..utils.atomic_io import atomic_write_bytes, atomic_write_json
+from ..utils.write_behind import WriteBehindWriter
+
+# Cache files are regenerable, so their durability is configured separately
+# from reports (which always fsync). See configure_cache_writes().
+_CONFIG_LOCK = threading.Lock()
+_WRITER: WriteBehindWriter | None = None
+_FSYNC = True
+
+
+def configure_cache_writes(*, write_behind: bool, fsync: bool) -> None:
+    """Select how cache files are written for the rest of the process.
+
+    With ``write_behind`` saves are queued and committed in batches by a
+    background thread (flushed by ``flush_cache_writes`` and at exit);
+    ``fsync`` controls whether each commit is forced to disk.
+    """
+    global _WRITER, _FSYNC
+    with _CONFIG_LOCK:
+        previous = _WRITER
+        _WRITER = None
+        _FSYNC = fsync
+    if previous is not None:
+        previous.close()
+    if write_behind:
+        writer = WriteBehindWriter(fsync=fsync)
+        with _CONFIG_LOCK:
+            _WRITER = writer
+
+
+def cache_fsync() -> bool:
+    return _FSYNC
+
+
+def flush_cache_writes() -> None:
+    writer = _WRITER
+    if writer is not None:
+        writer.flush()
+
+
+def _close_at_exit() -> None:
+    configure_cache_writes(write_behind=False, fsync=_FSYNC)
+
+
+atexit.register(_close_at_exit)
 
 
 def ensure_dir(path: str) -> None:
@@ -16,18 +62,46 @@ def json_path(base_dir: str, key: str) -> str:
     return os.path.join(base_dir, f"{safe}.json")
 
 
+def write_cache_bytes(path: str, payload: bytes | None) -> None:
+    """Write (or with ``None`` remove) a cache file per the configured policy."""
+    writer = _WRITER
+    if writer is not None:
+        writer.submit(path, payload)
+        return
+    if payload is None:
+        if os.path.exists(path):
+            os.remove(path)
+        return
+    atomic_write_bytes(path, payload, fsync=_FSYNC)
+
+
+def queued_cache_write(path: str) -> tuple[bool, bytes | None]:
+    writer = _WRITER
+    if writer is None:
+        return False, None
+    return writer.lookup(path)
+
+
 def save_json(base_dir: str, key: str, obj: Any) -> str:
     ensure_dir(base_dir)
     p = json_path(base_dir, key)
-    atomic_write_json(p, obj, ensure_ascii=False)
+    writer = _WRITER
+    if writer is not None:
+        # Serialize now so later mutations of ``obj`` cannot leak into the file.
+        writer.submit(p, json.dumps(obj, ensure_ascii=False).encode("utf-8"))
+    else:
+        atomic_write_json(p, obj, ensure_ascii=False, fsync=_FSYNC)
     return p
 
 
 def load_json(base_dir: str, key: str) -> Any | None:
     p = json_path(base_dir, key)
-    if not os.path.exists(p):
-        return None
+    queued, payload = queued_cache_write(p)
     try:
+        if queued:
+            return None if payload is None else json.loads(payload)
+        if not os.path.exists(p):
+            return None
         with open(p, "r", encoding="utf-8") as f:
             return json.load(f)
     except Exception:
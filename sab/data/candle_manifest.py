@@ -0,0 +1,120 @@
+"""Single-file index of cached candle series.
+
+Planning steps (what is stale, what to fetch) only need each series' last date
+and size, so the store records them here instead of making callers open every
+candle file. Entries are keyed by cache key::
+
+    {"version": 1, "entries": {"candles_005930": {
+        "last_date": "20250103", "bars": 200, "source": "kis",
+        "fetched_at": "2025-01-03T07:00:00+00:00", "checksum": "..."}}}
+
+Updates are buffered and written atomically on ``flush``; concurrent runs are
+merged under an advisory lock so neither loses the other's entries.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import hashlib
+import json
+import os
+import threading
+from typing import Any
+
+from ..utils.atomic_io import advisory_path_lock, atomic_write_json
+from .cache import cache_fsync
+from .candle_series import Candles, candle_rows
+
+MANIFEST_NAME = "candles_manifest.json"
+_VERSION = 1
+
+
+def candle_checksum(candles: Candles) -> str:
+    """Stable digest of a series, independent of the storage backend."""
+    digest = hashlib.sha256()
+    for row in candle_rows(candles):
+        digest.update(json.dumps(row, sort_keys=True, default=str).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+class CandleManifest:
+    def __init__(self, base_dir: str, *, name: str = MANIFEST_NAME) -> None:
+        self.path = os.path.join(base_dir, name)
+        self._lock = threading.Lock()
+        self._entries: dict[str, dict[str, Any]] | None = None
+        self._dirty: dict[str, dict[str, Any]] = {}
+
+    def _read_file(self) -> dict[str, dict[str, Any]]:
+        try:
+            with open(self.path, encoding="utf-8") as fp:
+                data = json.load(fp)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get("version") != _VERSION:
+            return {}
+        entries = data.get("entries")
+        if not isinstance(entries, dict):
+            return {}
+        return {k: v for k, v in entries.items() if isinstance(v, dict)}
+
+    def _loaded(self) -> dict[str, dict[str, Any]]:
+        if self._entries is None:
+            self._entries = self._read_file()
+        return self._entries
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        with self._lock:
+            entry = self._loaded().get(key)
+            return dict(entry) if entry is not None else None
+
+    def cached_keys(self) -> list[str]:
+        with self._lock:
+            return sorted(self._loaded())
+
+    def last_date(self, key: str) -> str | None:
+        entry = self.get(key)
+        if not entry:
+            return None
+        value = entry.get("last_date")
+        return str(value) if value else None
+
+    def record(
+        self,
+        key: str,
+        candles: Candles,
+        *,
+        source: str,
+        fetched_at: dt.datetime | None = None,
+    ) -> None:
+        if not candles:
+            return
+        when = fetched_at or dt.datetime.now(dt.UTC)
+        entry = {
+            "last_date": str(candles[-1].get("date") or ""),
+            "bars": len(candles),
+            "source": source,
+            "fetched_at": when.isoformat(timespec="seconds"),
+            "checksum": candle_checksum(candles),
+        }
+        with self._lock:
+            self._loaded()[key] = entry
+            self._dirty[key] = entry
+
+    def flush(self) -> None:
+        with self._lock:
+            dirty, self._dirty = self._dirty, {}
+        if not dirty:
+            return
+        with advisory_path_lock(f"{self.path}.lock"):
+            merged = self._read_file()
+            merged.update(dirty)
+            atomic_write_json(
+                self.path,
+                {"version": _VERSION, "entries": dict(sorted(merged.items()))},
+                fsync=cache_fsync(),
+            )
+        with self._lock:
+            self._entries = {**merged, **self._dirty}
+
+
+__all__ = ["MANIFEST_NAME", "CandleManifest", "candle_checksum"]
@@ -0,0 +1,254 @@
+"""Columnar daily candle series.
+
+Candles used to travel as ``list[dict]``: a dict, a date string and six float
+objects per bar, and every evaluator rebuilt ``closes``/``highs``/``lows``
+from them. :class:`CandleSeries` keeps the same data as one ``int32`` date
+array (``YYYYMMDD``) and one ``float64`` array per column in
+``FLOAT_COLUMNS`` (~52 bytes per bar instead of ~600).
+
+It is a drop-in ``Sequence`` of read-only bar mappings, so code written for
+``list[dict]`` keeps working: ``series[-1]["close"]``, ``bar.get("date")`` and
+``series == [{...}, ...]`` behave as before. Slices with step 1 are views
+sharing the parent's arrays, and :meth:`CandleSeries.values` /
+:func:`candle_column` return a column without touching individual bars.
+
+Only series whose bars carry exactly ``date`` plus ``FLOAT_COLUMNS`` with an
+8-digit date convert; anything else stays a list of dicts (see
+:func:`as_candle_series`).
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from typing import Any, overload
+
+FLOAT_COLUMNS: tuple[str, ...] = (
+    "open",
+    "high",
+    "low",
+    "close",
+    "volume",
+    "prev_close_diff",
+)
+BAR_KEYS: tuple[str, ...] = ("date", *FLOAT_COLUMNS)
+_BAR_KEY_SET = frozenset(BAR_KEYS)
+
+# What candle-consuming code accepts: a CandleSeries or a list of dicts.
+Candles = Sequence[Mapping[str, Any]]
+
+
+def encode_date(value: Any) -> int | None:
+    text = str(value or "")
+    if len(text) != 8 or not text.isdigit():
+        return None
+    return int(text)
+
+
+class CandleBar(Mapping[str, Any]):
+    """Read-only view of one bar of a :class:`CandleSeries`."""
+
+    __slots__ = ("_series", "_index")
+
+    def __init__(self, series: CandleSeries, index: int) -> None:
+        self._series = series
+        self._index = index
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "date":
+            return f"{self._series._dates[self._index]:08d}"
+        return self._series._columns[key][self._index]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(BAR_KEYS)
+
+    def __len__(self) -> int:
+        return len(BAR_KEYS)
+
+    def __contains__(self, key: object) -> bool:
+        return key in _BAR_KEY_SET
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
+class CandleSeries(Sequence[CandleBar]):
+    __slots__ = ("_dates", "_columns", "_start", "_stop")
+
+    def __init__(
+        self,
+        dates: array[int],
+        columns: Mapping[str, array[float]],
+        start: int = 0,
+        stop: int | None = None,
+    ) -> None:
+        if set(columns) != set(FLOAT_COLUMNS):
+            raise ValueError("CandleSeries needs exactly the FLOAT_COLUMNS")
+        size = len(dates)
+        if any(len(col) != size for col in columns.values()):
+            raise ValueError("CandleSeries columns differ in length")
+        self._dates = dates
+        self._columns = dict(columns)
+        self._start = start
+        self._stop = size if stop is None else stop
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Mapping[str, Any]]) -> CandleSeries | None:
+        """Build a series, or return None if the rows do not fit the layout."""
+        if isinstance(rows, CandleSeries):
+            return rows
+        dates: array[int] = array("i")
+        columns = {name: array("d") for name in FLOAT_COLUMNS}
+        for row in rows:
+            if not isinstance(row, Mapping) or row.keys() != _BAR_KEY_SET:
+                return None
+            date = encode_date(row.get("date"))
+            if date is None:
+                return None
+            dates.append(date)
+            for name, column in columns.items():
+                value = row[name]
+                try:
+                    column.append(float("nan") if value is None else float(value))
+                except (TypeError, ValueError):
+                    return None
+        return cls(dates, columns)
+
+    def _view(self, start: int, stop: int) -> CandleSeries:
+        # Shares the arrays, which were validated when the parent was built.
+        view = object.__new__(CandleSeries)
+        view._dates = self._dates
+        view._columns = self._columns
+        view._start = start
+        view._stop = stop
+        return view
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    @overload
+    def __getitem__(self, index: int) -> CandleBar: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> CandleSeries: ...
+
+    def __getitem__(self, index: int | slice) -> CandleBar | CandleSeries:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step == 1:
+                return self._view(self._start + start, self._start + max(start, stop))
+            picks = range(self._start + start, self._start + stop, step)
+            return CandleSeries(
+                array("i", (self._dates[i] for i in picks)),
+                {
+                    name: array("d", (col[i] for i in picks))
+                    for name, col in self._columns.items()
+                },
+            )
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("candle index out of range")
+        return CandleBar(self, self._start + index)
+
+    def __iter__(self) -> Iterator[CandleBar]:
+        for i in range(self._start, self._stop):
+            yield CandleBar(self, i)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, CandleSeries):
+            # Bitwise, so NaN gaps compare equal like the same float object.
+            return self.date_values() == other.date_values() and all(
+                self.column(name).tobytes() == other.column(name).tobytes()
+                for name in FLOAT_COLUMNS
+            )
+        if isinstance(other, Sequence) and not isinstance(other, str | bytes):
+            return len(self) == len(other) and all(
+                a == b for a, b in zip(self, other, strict=True)
+            )
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"CandleSeries({len(self)} bars)"
+
+    def column(self, name: str) -> memoryview:
+        """Zero-copy view of one float column."""
+        return memoryview(self._columns[name])[self._start : self._stop]
+
+    def values(self, name: str) -> list[float]:
+        return self._columns[name][self._start : self._stop].tolist()
+
+    def date_values(self) -> memoryview:
+        """Zero-copy view of the ``YYYYMMDD`` integers."""
+        return memoryview(self._dates)[self._start : self._stop]
+
+    def dates(self) -> list[str]:
+        return [f"{d:08d}" for d in self.date_values()]
+
+    def arrays(self) -> tuple[array[int], dict[str, array[float]]]:
+        """Copies of the visible rows as ``(dates, columns)`` arrays."""
+        window = slice(self._start, self._stop)
+        return self._dates[window], {
+            name: col[window] for name, col in self._columns.items()
+        }
+
+    def to_rows(self) -> list[dict[str, Any]]:
+        return [dict(bar) for bar in self]
+
+    @property
+    def nbytes(self) -> int:
+        return len(self) * (
+            self._dates.itemsize + sum(col.itemsize for col in self._columns.values())
+        )
+
+
+def as_candle_series(rows: Candles) -> Candles:
+    """Return ``rows`` as a :class:`CandleSeries` when it fits, else unchanged."""
+    if isinstance(rows, CandleSeries) or not rows:
+        return rows
+    return CandleSeries.from_rows(rows) or rows
+
+
+def candle_column(
+    candles: Candles, key: str, *, default: float | None = None
+) -> list[Any]:
+    """One column as a list.
+
+    ``default`` mirrors ``float(bar.get(key) or default)`` for list-of-dict
+    input; without it bars are indexed directly (``bar[key]``).
+    """
+    if isinstance(candles, CandleSeries):
+        return candles.values(key)
+    if default is None:
+        return [c[key] for c in candles]
+    return [float(c.get(key) or default) for c in candles]
+
+
+def candle_dates(candles: Candles) -> list[str]:
+    if isinstance(candles, CandleSeries):
+        return candles.dates()
+    return [str(c.get("date") or "") for c in candles]
+
+
+def candle_rows(candles: Candles) -> list[dict[str, Any]]:
+    """Plain dicts for serializers that need them (JSON caches, checksums)."""
+    if isinstance(candles, CandleSeries):
+        return candles.to_rows()
+    return [c if isinstance(c, dict) else dict(c) for c in candles]
+
+
+__all__ = [
+    "BAR_KEYS",
+    "FLOAT_COLUMNS",
+    "CandleBar",
+    "CandleSeries",
+    "Candles",
+    "as_candle_series",
+    "candle_column",
+    "candle_dates",
+    "candle_rows",
+    "encode_date",
+]
@@ -0,0 +1,404 @@
+"""On-disk daily candle stores.
+
+The default store keeps one binary file per cache key with fixed-width
+columns, so a reader can ``mmap`` the file and copy only the trailing rows it
+needs instead of decoding a JSON list of dicts. Layout (little-endian)::
+
+    header  "SABC" | u16 version | u16 column count | u32 rows
+    dates   int32[rows]          (YYYYMMDD)
+    floats  float64[rows] per column in ``FLOAT_COLUMNS`` order
+
+Series that cannot be represented losslessly (non-numeric dates, other keys)
+are written as JSON instead, and legacy ``<key>.json`` caches are still read
+until the next save replaces them.
+
+The ``sqlite`` backend keeps every series in one WAL-mode database instead of
+thousands of small files; saves are staged and upserted in bulk on ``flush``.
+
+``open_candle_store`` wraps the backend in a :class:`CandleRepository`, which
+also keeps ``candles_manifest.json`` (last date, bars, source, checksum per
+key) in step with every save.
+"""
+
+from __future__ import annotations
+
+import math
+import mmap
+import os
+import sqlite3
+import struct
+import sys
+import threading
+from array import array
+from contextlib import suppress
+from typing import Any, Protocol
+
+from .cache import (
+    ensure_dir,
+    flush_cache_writes,
+    json_path,
+    load_json,
+    queued_cache_write,
+    save_json,
+    write_cache_bytes,
+)
+from .candle_manifest import CandleManifest
+from .candle_series import (
+    FLOAT_COLUMNS,
+    Candles,
+    CandleSeries,
+    as_candle_series,
+    candle_rows,
+)
+
+CANDLE_STORE_BACKENDS = ("columnar", "json", "sqlite")
+
+SQLITE_DB_NAME = "candles.sqlite3"
+
+
+_MAGIC = b"SABC"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHHI")
+_SWAP = sys.byteorder != "little"
+
+
+class CandleStore(Protocol):
+    def load(self, key: str, *, tail: int | None = None) -> Candles | None:
+        """Return cached candles (oldest first), optionally the last ``tail``."""
+        ...
+
+    def save(self, key: str, candles: Candles) -> str:
+        """Persist ``candles`` under ``key`` and return the written path."""
+        ...
+
+    def flush(self) -> None:
+        """Commit staged or queued saves."""
+        ...
+
+
+def _tail_rows(rows: Candles | None, tail: int | None) -> Candles | None:
+    if rows is None or tail is None or tail <= 0 or len(rows) <= tail:
+        return rows
+    return rows[-tail:]
+
+
+class JsonCandleStore:
+    """Original per-key JSON list-of-dicts cache."""
+
+    def __init__(self, base_dir: str) -> None:
+        self.base_dir = base_dir
+
+    def load(self, key: str, *, tail: int | None = None) -> Candles | None:
+        data = load_json(self.base_dir, key)
+        if not isinstance(data, list) or not data:
+            return None
+        return _tail_rows(as_candle_series(data), tail)
+
+    def save(self, key: str, candles: Candles) -> str:
+        return save_json(self.base_dir, key, candle_rows(candles))
+
+    def flush(self) -> None:
+        flush_cache_writes()
+
+
+def columnar_path(base_dir: str, key: str) -> str:
+    safe = key.replace("/", "_")
+    return os.path.join(base_dir, f"{safe}.sabc")
+
+
+def encode_columns(candles: Candles) -> bytes | None:
+    """Pack candles into the columnar layout, or None if it would be lossy."""
+    series = CandleSeries.from_rows(candles)
+    if series is None:
+        return None
+    dates, columns = series.arrays()
+
+    parts = [_HEADER.pack(_MAGIC, _VERSION, len(FLOAT_COLUMNS), len(dates))]
+    arrays: list[array[Any]] = [dates, *(columns[name] for name in FLOAT_COLUMNS)]
+    for arr in arrays:
+        if _SWAP:
+            arr.byteswap()
+        parts.append(arr.tobytes())
+    return b"".join(parts)
+
+
+def decode_columns(buf: Any, *, tail: int | None = None) -> CandleSeries:
+    """Decode the trailing ``tail`` rows (or all rows) from a columnar buffer."""
+    magic, version, ncols, rows = _HEADER.unpack_from(buf, 0)
+    if magic != _MAGIC or version != _VERSION or ncols != len(FLOAT_COLUMNS):
+        raise ValueError("unsupported candle file")
+    start = rows - tail if tail is not None and 0 < tail < rows else 0
+
+    offset = _HEADER.size
+    dates = array("i")
+    dates.frombytes(buf[offset + start * 4 : offset + rows * 4])
+    offset += rows * 4
+    floats: list[array[float]] = []
+    for _ in FLOAT_COLUMNS:
+        column = array("d")
+        column.frombytes(buf[offset + start * 8 : offset + rows * 8])
+        offset += rows * 8
+        floats.append(column)
+    if _SWAP:
+        swapped: list[array[Any]] = [dates, *floats]
+        for arr in swapped:
+            arr.byteswap()
+
+    return CandleSeries(dates, dict(zip(FLOAT_COLUMNS, floats, strict=True)))
+
+
+class ColumnarCandleStore:
+    """Fixed-width columnar files read through ``mmap``."""
+
+    def __init__(self, base_dir: str) -> None:
+        self.base_dir = base_dir
+        self._json = JsonCandleStore(base_dir)
+
+    def load(self, key: str, *, tail: int | None = None) -> Candles | None:
+        path = columnar_path(self.base_dir, key)
+        queued, payload = queued_cache_write(path)
+        if queued:
+            if payload is None:
+                return self._json.load(key, tail=tail)
+            return decode_columns(payload, tail=tail) or None
+        try:
+            with (
+                open(path, "rb") as fp,
+                mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as buf,
+            ):
+                rows = decode_columns(buf, tail=tail)
+        except FileNotFoundError:
+            return self._json.load(key, tail=tail)
+        except (OSError, ValueError, struct.error):
+            return None
+        return rows or None
+
+    def save(self, key: str, candles: Candles) -> str:
+        payload = encode_columns(candles)
+        path = columnar_path(self.base_dir, key)
+        if payload is None:
+            write_cache_bytes(path, None)
+            return self._json.save(key, candles)
+        ensure_dir(self.base_dir)
+        write_cache_bytes(path, payload)
+        write_cache_bytes(json_path(self.base_dir, key), None)
+        return path
+
+    def flush(self) -> None:
+        flush_cache_writes()
+
+
+def split_cache_key(key: str) -> tuple[str, str]:
+    """Map a cache key to ``(market, ticker)``.
+
+    ``candles_<ticker>`` is KR and ``candles_overseas_<EXCD>_<SYMBOL>`` uses the
+    exchange code as the market; other keys keep an empty market.
+    """
+    if key.startswith("candles_overseas_"):
+        exchange, _, symbol = key[len("candles_overseas_") :].partition("_")
+        if symbol:
+            return exchange, symbol
+    if key.startswith("candles_"):
+        return "KR", key[len("candles_") :]
+    return "", key
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS candles (
+    market TEXT NOT NULL,
+    ticker TEXT NOT NULL,
+    date TEXT NOT NULL,
+    open REAL,
+    high REAL,
+    low REAL,
+    close REAL,
+    volume REAL,
+    prev_close_diff REAL,
+    PRIMARY KEY (market, ticker, date)
+) WITHOUT ROWID
+"""
+
+_UPSERT = """
+INSERT INTO candles (market, ticker, date, open, high, low, close, volume,
+                     prev_close_diff)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (market, ticker, date) DO UPDATE SET
+    open = excluded.open,
+    high = excluded.high,
+    low = excluded.low,
+    close = excluded.close,
+    volume = excluded.volume,
+    prev_close_diff = excluded.prev_close_diff
+"""
+
+_SELECT_TAIL = """
+SELECT date, open, high, low, close, volume, prev_close_diff
+FROM candles WHERE market = ? AND ticker = ?
+ORDER BY date DESC LIMIT ?
+"""
+
+
+def _sql_value(value: Any) -> float | None:
+    # SQLite stores NaN as NULL; loads map NULL back to NaN.
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(number) else number
+
+
+class SqliteCandleStore:
+    """All series in one WAL-mode SQLite database keyed by (market, ticker, date).
+
+    Each thread reads through its own connection, so fetch workers never block
+    each other. ``save`` only stages rows; ``flush`` upserts every staged
+    series with ``executemany`` in a single transaction and trims rows older
+    than the saved series (a full refetch replaces revised history).
+    Databases without a series fall back to the per-key files.
+    """
+
+    def __init__(self, base_dir: str, *, db_name: str = SQLITE_DB_NAME) -> None:
+        self.base_dir = base_dir
+        self.path = os.path.join(base_dir, db_name)
+        self._files = ColumnarCandleStore(base_dir)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: list[sqlite3.Connection] = []
+        self._pending: dict[str, Candles] = {}
+        ensure_dir(base_dir)
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(_SCHEMA)
+        conn.commit()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn: sqlite3.Connection | None = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30.0, check_same_thread=False)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def load(self, key: str, *, tail: int | None = None) -> Candles | None:
+        with self._lock:
+            pending = self._pending.get(key)
+        if pending is not None:
+            return _tail_rows(pending, tail)
+
+        market, ticker = split_cache_key(key)
+        limit = tail if tail is not None and tail > 0 else -1
+        try:
+            fetched = (
+                self._connection()
+                .execute(_SELECT_TAIL, (market, ticker, limit))
+                .fetchall()
+            )
+        except sqlite3.Error:
+            return None
+        if not fetched:
+            return self._files.load(key, tail=tail)
+        nan = float("nan")
+        rows: list[dict[str, Any]] = []
+        for record in reversed(fetched):
+            row: dict[str, Any] = {"date": record[0]}
+            for name, value in zip(FLOAT_COLUMNS, record[1:], strict=True):
+                row[name] = nan if value is None else float(value)
+            rows.append(row)
+        return as_candle_series(rows)
+
+    def save(self, key: str, candles: Candles) -> str:
+        with self._lock:
+            # A CandleSeries is immutable; plain lists are copied.
+            self._pending[key] = (
+                candles if isinstance(candles, CandleSeries) else list(candles)
+            )
+        return self.path
+
+    def flush(self) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        conn = self._connection()
+        with conn:
+            for key, candles in pending.items():
+                market, ticker = split_cache_key(key)
+                dated = [row for row in candles if row.get("date")]
+                if not dated:
+                    continue
+                params = [
+                    (
+                        market,
+                        ticker,
+                        str(row["date"]),
+                        *(_sql_value(row.get(name)) for name in FLOAT_COLUMNS),
+                    )
+                    for row in dated
+                ]
+                conn.execute(
+                    "DELETE FROM candles WHERE market = ? AND ticker = ? AND date < ?",
+                    (market, ticker, min(str(row["date"]) for row in dated)),
+                )
+                conn.executemany(_UPSERT, params)
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+
+
+class CandleRepository:
+    """A candle store plus the manifest describing what it holds."""
+
+    def __init__(self, store: CandleStore, manifest: CandleManifest) -> None:
+        self.store = store
+        self.manifest = manifest
+
+    def load(self, key: str, *, tail: int | None = None) -> Candles | None:
+        return self.store.load(key, tail=tail)
+
+    def save(self, key: str, candles: Candles, *, source: str = "kis") -> str:
+        path = self.store.save(key, candles)
+        self.manifest.record(key, candles, source=source)
+        return path
+
+    def flush(self) -> None:
+        # Data first, so the manifest never points past what is on disk.
+        self.store.flush()
+        self.manifest.flush()
+
+    def last_date(self, key: str) -> str | None:
+        return self.manifest.last_date(key)
+
+
+def open_candle_store(base_dir: str, backend: str = "columnar") -> CandleRepository:
+    store: CandleStore
+    if backend == "json":
+        store = JsonCandleStore(base_dir)
+    elif backend == "sqlite":
+        store = SqliteCandleStore(base_dir)
+    else:
+        store = ColumnarCandleStore(base_dir)
+    return CandleRepository(store, CandleManifest(base_dir))
+
+
+__all__ = [
+    "CANDLE_STORE_BACKENDS",
+    "FLOAT_COLUMNS",
+    "CandleRepository",
+    "CandleStore",
+    "ColumnarCandleStore",
+    "JsonCandleStore",
+    "SQLITE_DB_NAME",
+    "SqliteCandleStore",
+    "columnar_path",
+    "decode_columns",
+    "encode_columns",
+    "open_candle_store",
+    "split_cache_key",
+]
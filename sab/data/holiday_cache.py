@@ -18,11 +18,24 @@ class HolidayEntry:
     is_open: bool
 
 
+@dataclass
+class HolidayRefresh:
+    """When a date range was last fetched from the holiday API."""
+
+    start: str
+    end: str
+    fetched_at: dt.datetime
+
+
 def _cache_path(cache_dir: str, country_code: str) -> str:
     os.makedirs(cache_dir, exist_ok=True)
     return os.path.join(cache_dir, f"holidays_{country_code.lower()}.json")
 
 
+def _refresh_path(cache_dir: str, country_code: str) -> str:
+    return os.path.join(cache_dir, f"holidays_{country_code.lower()}.refresh.json")
+
+
 def load_cached_holidays(cache_dir: str, country_code: str) -> Dict[str, HolidayEntry]:
     path = _cache_path(cache_dir, country_code)
     if not os.path.exists(path):
@@ -140,10 +153,64 @@ def merge_holidays(
         if lowered in {"amex", "아멕스"}:
             continue
         cached[date] = HolidayEntry(date=date, note=note, is_open=is_open)
-    save_holidays(cache_dir, country_code, cached)
+    if cached != cached_raw:
+        save_holidays(cache_dir, country_code, cached)
     return cached
 
 
+def load_holiday_refresh(cache_dir: str, country_code: str) -> Optional[HolidayRefresh]:
+    path = _refresh_path(cache_dir, country_code)
+    try:
+        with open(path, "r", encoding="utf-8") as fp:
+            data = json.load(fp)
+        fetched_at = dt.datetime.fromisoformat(data["fetched_at"])
+        start, end = str(data["start"]), str(data["end"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    if fetched_at.tzinfo is None:
+        fetched_at = fetched_at.replace(tzinfo=dt.UTC)
+    return HolidayRefresh(start=start, end=end, fetched_at=fetched_at)
+
+
+def record_holiday_refresh(
+    cache_dir: str,
+    country_code: str,
+    start: str,
+    end: str,
+    fetched_at: Optional[dt.datetime] = None,
+) -> None:
+    os.makedirs(cache_dir, exist_ok=True)
+    stamp = fetched_at or dt.datetime.now(dt.UTC)
+    payload = {"start": start, "end": end, "fetched_at": stamp.isoformat()}
+    atomic_write_json(_refresh_path(cache_dir, country_code), payload)
+
+
+def holiday_refresh_due(
+    cache_dir: str,
+    country_code: str,
+    *,
+    cover_start: str,
+    cover_end: str,
+    ttl_hours: float,
+    now: Optional[dt.datetime] = None,
+) -> bool:
+    """Whether the holiday API should be called again.
+
+    The last fetch is still good while it is younger than ``ttl_hours`` and
+    its range covers ``cover_start``..``cover_end`` (``YYYYMMDD``). A
+    non-positive TTL always refreshes.
+    """
+    if ttl_hours <= 0:
+        return True
+    last = load_holiday_refresh(cache_dir, country_code)
+    if last is None:
+        return True
+    if last.start > cover_start or last.end < cover_end:
+        return True
+    age = (now or dt.datetime.now(dt.UTC)) - last.fetched_at
+    return age >= dt.timedelta(hours=ttl_hours)
+
+
 def lookup_holiday(
     cache_dir: str,
     country_code: str,
@@ -155,8 +222,12 @@ def lookup_holiday(
 
 __all__ = [
     "HolidayEntry",
+    "HolidayRefresh",
     "load_cached_holidays",
     "save_holidays",
     "merge_holidays",
     "lookup_holiday",
+    "load_holiday_refresh",
+    "record_holiday_refresh",
+    "holiday_refresh_due",
 ]
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
 import datetime as dt
+import math
+import threading
 import time
+from collections.abc import Callable, Mapping
 from dataclasses import dataclass
 from typing import Any, Optional
 import logging
@@ -9,9 +12,23 @@ import logging
 import requests  # type: ignore[import-untyped]
 
 from .cache import load_json, save_json
+from .candle_series import Candles, as_candle_series
+from .rate_limiter import Limiter, kis_rate_limiter
+from .request_metrics import RequestMetrics
+from .retry_policy import (
+    AdaptiveThrottle,
+    Classification,
+    RetryPolicy,
+    Verdict,
+    classify_response,
+)
 
 logger = logging.getLogger(__name__)
 
+# Calendar days re-requested before the cached tail during an incremental
+# refresh, so revised (e.g. split-adjusted) history is detected.
+INCREMENTAL_OVERLAP_DAYS = 10
+
 
 class KISClientError(RuntimeError):
     """Base error for KIS client."""
@@ -94,6 +111,9 @@ class KISClient:
         cache_dir: Optional[str] = None,
         max_attempts: int = 3,
         min_interval: Optional[float] = None,
+        rate_limiter: Optional[Limiter] = None,
+        rate_limit_dir: Optional[str] = None,
+        metrics: Optional[RequestMetrics] = None,
     ):
         self.creds = creds
         self.session = session or requests.Session()
@@ -109,7 +129,19 @@ class KISClient:
             if min_interval is not None
             else (0.5 if creds.env == "demo" else 0.1)
         )
-        self._last_request_at: Optional[dt.datetime] = None
+        # Shared by every thread issuing requests through this client; with
+        # ``rate_limit_dir`` also by other processes using the same app key.
+        self.rate_limiter = rate_limiter or kis_rate_limiter(
+            creds.env,
+            self._min_interval,
+            state_dir=rate_limit_dir,
+            app_key=creds.app_key,
+        )
+        self._token_lock = threading.Lock()
+        self.retry_policy = RetryPolicy(max_attempts=self._max_attempts)
+        self.throttle = AdaptiveThrottle(self.rate_limiter)
+        self._sleep = time.sleep
+        self.metrics = metrics or RequestMetrics()
 
         self._try_load_cached_token()
 
@@ -151,7 +183,7 @@ class KISClient:
         self.cache_status = "hit"
 
     # ------------------------------------------------------------------
-    # Auth
+    # Transport
     # ------------------------------------------------------------------
     def _request(
         self,
@@ -163,49 +195,142 @@ class KISClient:
         json: Optional[dict[str, Any]] = None,
         timeout: float = 10.0,
     ) -> requests.Response:
-        backoff = 1.0
-        last_exc: Optional[requests.RequestException] = None
-        resp: Optional[requests.Response] = None
+        """Send a single request once the rate limiter grants a slot."""
+        endpoint = _endpoint_key(url, headers)
+        waited = self.rate_limiter.acquire()
+        started = time.perf_counter()
+        try:
+            resp = self.session.request(
+                method,
+                url,
+                headers=headers,
+                params=params,
+                json=json,
+                timeout=timeout,
+            )
+        except requests.RequestException:
+            self.metrics.record_request(
+                endpoint,
+                latency_s=time.perf_counter() - started,
+                status=None,
+                throttle_wait_s=waited,
+            )
+            raise
+        self.metrics.record_request(
+            endpoint,
+            latency_s=time.perf_counter() - started,
+            status=resp.status_code,
+            throttle_wait_s=waited,
+        )
+        return resp
 
+    def _auth_headers(self, tr_id: str) -> dict[str, Any]:
+        return {
+            "Content-Type": "application/json",
+            "authorization": self._access_token,
+            "appkey": self.creds.app_key,
+            "appsecret": self.creds.app_secret,
+            "tr_id": tr_id,
+            "custtype": "P",
+        }
+
+    def _call(
+        self,
+        url: str,
+        *,
+        tr_id: str,
+        params: dict[str, Any],
+        label: str,
+        error_prefix: str,
+        tr_cont: str = "",
+    ) -> tuple[requests.Response, dict[str, Any]]:
+        """GET a KIS endpoint under the shared retry policy.
+
+        Token expiry refreshes the token and retries at once; throttling
+        (429/EGW00201) slows the shared limiter, once per congestion event
+        across workers, and backs off; server and transport errors back off
+        with jitter. Anything else, or the last failed attempt, raises
+        ``KISClientError`` worded after ``label`` and ``error_prefix``.
+        """
+        error: KISClientError | None = None
         for attempt in range(self._max_attempts):
-            # simple client-side throttle
-            if self._min_interval and self._last_request_at is not None:
-                delta = (dt.datetime.now(dt.timezone.utc) - self._last_request_at).total_seconds()
-                if delta < self._min_interval:
-                    time.sleep(self._min_interval - delta)
+            headers = self._auth_headers(tr_id)
+            if tr_cont:
+                headers["tr_cont"] = tr_cont
+            epoch = self.throttle.epoch
             try:
-                resp = self.session.request(
-                    method,
-                    url,
-                    headers=headers,
-                    params=params,
-                    json=json,
-                    timeout=timeout,
-                )
-                self._last_request_at = dt.datetime.now(dt.timezone.utc)
+                resp = self._request("GET", url, headers=headers, params=params)
             except requests.RequestException as exc:
-                last_exc = exc
+                verdict = Verdict.TRANSPORT_ERROR
+                error = KISClientError(f"{label} request failed: {exc}")
             else:
-                if resp.status_code in {429, 418, 503} and attempt < self._max_attempts - 1:
-                    time.sleep(backoff)
-                    backoff = min(backoff * 2, 8.0)
-                    continue
-                return resp
+                try:
+                    payload = resp.json()
+                except ValueError:
+                    payload = None
+                result = classify_response(resp.status_code, payload)
+                verdict = result.verdict
+                if verdict is Verdict.OK and result.payload is not None:
+                    self.throttle.on_success()
+                    return resp, result.payload
+                error = self._response_error(resp, result, label, error_prefix)
+
+            if not verdict.retryable or attempt >= self._max_attempts - 1:
+                break
+            if verdict is Verdict.TOKEN_EXPIRED:
+                self._refresh_token(stale=headers.get("authorization"))
+            elif verdict is Verdict.RATE_LIMITED:
+                self.throttle.on_throttled(epoch)
+            delay = self.retry_policy.delay(attempt, verdict)
+            self.metrics.record_retry(tr_id, verdict.value, delay)
+            logger.debug(
+                "%s %s (attempt %d); retrying in %.2fs",
+                label,
+                verdict.value,
+                attempt + 1,
+                delay,
+            )
+            if delay > 0:
+                self._sleep(delay)
 
-            if attempt < self._max_attempts - 1:
-                time.sleep(backoff)
-                backoff = min(backoff * 2, 8.0)
+        assert error is not None
+        raise error
 
-        if last_exc is not None:
-            raise last_exc
-        assert resp is not None  # final response present if not exception
-        return resp
+    @staticmethod
+    def _response_error(
+        resp: requests.Response,
+        result: Classification,
+        label: str,
+        error_prefix: str,
+    ) -> KISClientError:
+        if resp.status_code != 200:
+            return KISClientError(f"{label} HTTP {resp.status_code}: {resp.text}")
+        if result.verdict is Verdict.BAD_PAYLOAD:
+            if result.message == "not JSON":
+                return KISClientError(f"{label} response is not JSON")
+            return KISClientError(f"{label} response payload is not an object")
+        return KISClientError(f"{error_prefix}: {result.message}")
 
-    def ensure_token(self) -> None:
-        if self._access_token and self._token_expiry:
-            if dt.datetime.now(dt.timezone.utc) < self._token_expiry:
-                return
+    # ------------------------------------------------------------------
+    # Auth
+    # ------------------------------------------------------------------
+    def _refresh_token(self, *, stale: Optional[str]) -> None:
+        """Replace ``stale`` with a new token unless another worker already did."""
+        with self._token_lock:
+            if self._access_token == stale:
+                self._access_token = None
+                self._token_expiry = None
+        self.ensure_token()
 
+    def ensure_token(self) -> None:
+        # Workers share one token; only the first caller refreshes it.
+        with self._token_lock:
+            if self._access_token and self._token_expiry:
+                if dt.datetime.now(dt.timezone.utc) < self._token_expiry:
+                    return
+            self._issue_token()
+
+    def _issue_token(self) -> None:
         payload = {
             "grant_type": "client_credentials",
             "appkey": self.creds.app_key,
@@ -217,10 +342,29 @@ class KISClient:
             "charset": "UTF-8",
         }
 
-        try:
-            resp = self._request("POST", self.creds.token_url, headers=headers, json=payload)
-        except requests.RequestException as exc:  # pragma: no cover
-            raise KISAuthError(f"Token request failed: {exc}") from exc
+        for attempt in range(self._max_attempts):
+            final = attempt >= self._max_attempts - 1
+            try:
+                resp = self._request(
+                    "POST", self.creds.token_url, headers=headers, json=payload
+                )
+            except requests.RequestException as exc:
+                if final:
+                    raise KISAuthError(f"Token request failed: {exc}") from exc
+                verdict = Verdict.TRANSPORT_ERROR
+            else:
+                if final or resp.status_code == 200:
+                    break
+                verdict = classify_response(resp.status_code, None).verdict
+                # Rejected credentials or the token issue quota (4xx) will not
+                # clear on a quick retry; only throttling and 5xx are retried.
+                if verdict is Verdict.HTTP_ERROR:
+                    break
+            delay = self.retry_policy.delay(attempt, verdict)
+            self.metrics.record_retry(
+                _endpoint_key(self.creds.token_url, None), verdict.value, delay
+            )
+            self._sleep(delay)
 
         if resp.status_code != 200:
             raise KISAuthError(f"Token request HTTP {resp.status_code}: {resp.text}")
@@ -290,8 +434,18 @@ class KISClient:
     # Data fetch
     # ------------------------------------------------------------------
     def daily_candles(
-        self, ticker: str, *, count: int = 120, adjusted: bool = True
-    ) -> list[dict[str, Any]]:
+        self,
+        ticker: str,
+        *,
+        count: int = 120,
+        adjusted: bool = True,
+        cached: Optional[Candles] = None,
+    ) -> Candles:
+        """Return daily candles (oldest first) for a domestic ticker.
+
+        When ``cached`` holds at least ``count`` bars, only the range from the
+        cached tail (minus a small overlap) to today is requested and merged.
+        """
         ticker = ticker.strip()
         if not ticker:
             raise KISClientError("Ticker is required")
@@ -299,6 +453,24 @@ class KISClient:
         self.ensure_token()
 
         target = max(count, 1)
+        if cached:
+            refreshed = self._extend_cached_candles(
+                cached,
+                target=target,
+                fetch=lambda start, end: [
+                    self._parse_candle(item)
+                    for item in self._fetch_candle_chunk(
+                        ticker=ticker,
+                        start_date=start,
+                        end_date=end,
+                        adjusted=adjusted,
+                    )
+                ],
+            )
+            if refreshed is not None:
+                return refreshed
+            logger.debug("Incremental refresh unavailable for %s; full fetch", ticker)
+
         chunk_days = 240  # window size per call (~100 trading days)
         collected: dict[str, dict[str, Any]] = {}
 
@@ -345,7 +517,59 @@ class KISClient:
         if len(rows) > target:
             rows = rows[-target:]
 
-        return rows
+        return as_candle_series(rows)
+
+    def _extend_cached_candles(
+        self,
+        cached: Candles,
+        *,
+        target: int,
+        fetch: Callable[[str, str], list[Optional[dict[str, Any]]]],
+    ) -> Optional[Candles]:
+        """Merge bars newer than the cached tail using a single short request.
+
+        Returns None when the cache cannot be extended safely (too little
+        history, a gap between the cache and the fetched window, or revised
+        prices inside the overlap) so the caller falls back to a full fetch.
+        """
+        existing: dict[str, Mapping[str, Any]] = {}
+        for row in cached:
+            if isinstance(row, Mapping) and row.get("date"):
+                existing[str(row["date"])] = row
+        if len(existing) < target:
+            return None
+
+        last_date = max(existing)
+        try:
+            last_dt = dt.datetime.strptime(last_date, "%Y%m%d")
+        except ValueError:
+            return None
+
+        start_dt = last_dt - dt.timedelta(days=INCREMENTAL_OVERLAP_DAYS)
+        end_str = dt.datetime.now().strftime("%Y%m%d")
+        fetched: dict[str, dict[str, Any]] = {}
+        for parsed_item in fetch(start_dt.strftime("%Y%m%d"), end_str):
+            if parsed_item and parsed_item.get("date"):
+                fetched[str(parsed_item["date"])] = parsed_item
+
+        if not fetched or min(fetched) > last_date:
+            # The window does not reach back to the cached tail.
+            return None
+
+        for date_key, row in fetched.items():
+            # The cached tail itself may be an intraday bar; it is replaced.
+            if date_key >= last_date:
+                continue
+            previous = existing.get(date_key)
+            if previous is None or not _same_price(
+                previous.get("close"), row.get("close")
+            ):
+                return None
+
+        existing.update(fetched)
+        rows = sorted(existing.values(), key=lambda x: x["date"])
+        # Same window as a full fetch: indicators seed at the series start.
+        return as_candle_series(rows[-target:])
 
     def overseas_price_detail(self, *, symbol: str, exchange: str) -> dict[str, Any]:
         symbol = (symbol or "").strip().upper()
@@ -360,80 +584,20 @@ class KISClient:
             "EXCD": exchange,
             "SYMB": symbol,
         }
-        headers = {
-            "Content-Type": "application/json",
-            "authorization": self._access_token,
-            "appkey": self.creds.app_key,
-            "appsecret": self.creds.app_secret,
-            "tr_id": "HHDFS76200200",
-            "custtype": "P",
-        }
-
-        for attempt in range(self._max_attempts):
-            resp = self._request(
-                "GET",
-                self.creds.overseas_price_detail_url,
-                headers=headers,
-                params=params,
-            )
-
-            # Try to parse JSON body even on non-200 to inspect msg_cd
-            data: dict[str, Any] | None = None
-            try:
-                data = resp.json()
-            except ValueError:
-                data = None
-
-            if resp.status_code != 200:
-                msg_cd = str(data.get("msg_cd") or "") if isinstance(data, dict) else ""
-                msg1 = (data.get("msg1") or data.get("msg_cd") or "Unknown error") if isinstance(
-                    data, dict
-                ) else "Unknown error"
-                if msg_cd == "EGW00123" and attempt < self._max_attempts - 1:
-                    # Token expired on server side: clear, refresh, and retry
-                    self._access_token = None
-                    self._token_expiry = None
-                    self.ensure_token()
-                    headers["authorization"] = self._access_token or ""
-                    time.sleep(max(1.0, self._min_interval))
-                    continue
-                if attempt < self._max_attempts - 1:
-                    time.sleep(1.0)
-                    continue
-                raise KISClientError(
-                    f"Overseas price detail HTTP {resp.status_code}: {resp.text}"
-                )
-
-            if data is None:
-                if attempt < self._max_attempts - 1:
-                    time.sleep(1.0)
-                    continue
-                raise KISClientError("Overseas price detail response is not JSON")
-
-            if str(data.get("rt_cd")) != "0":
-                msg_cd = data.get("msg_cd") or ""
-                msg1 = data.get("msg1") or "Unknown error"
-                if msg_cd == "EGW00201" and attempt < self._max_attempts - 1:
-                    time.sleep(max(1.0, self._min_interval))
-                    continue
-                if msg_cd == "EGW00123" and attempt < self._max_attempts - 1:
-                    self._access_token = None
-                    self._token_expiry = None
-                    self.ensure_token()
-                    headers["authorization"] = self._access_token or ""
-                    time.sleep(max(1.0, self._min_interval))
-                    continue
-                raise KISClientError(f"KIS overseas price detail error: {msg1}")
-
-            output = data.get("output")
-            if isinstance(output, list):
-                return output[0] if output else {}
-            if isinstance(output, dict):
-                return output
-            return {}
+        _, data = self._call(
+            self.creds.overseas_price_detail_url,
+            tr_id="HHDFS76200200",
+            params=params,
+            label="Overseas price detail",
+            error_prefix="KIS overseas price detail error",
+        )
 
-        # If loop exits without return, raise generic error
-        raise KISClientError("Overseas price detail request failed after retries")
+        output = data.get("output")
+        if isinstance(output, list):
+            return output[0] if output else {}
+        if isinstance(output, dict):
+            return output
+        return {}
 
     def _fetch_candle_chunk(
         self,
@@ -451,74 +615,13 @@ class KISClient:
             "FID_PERIOD_DIV_CODE": "D",
             "FID_ORG_ADJ_PRC": "0" if adjusted else "1",
         }
-
-        headers = {
-            "Content-Type": "application/json",
-            "authorization": self._access_token,
-            "appkey": self.creds.app_key,
-            "appsecret": self.creds.app_secret,
-            "tr_id": self.creds.tr_id,
-            "custtype": "P",
-        }
-
-        data: dict[str, Any] | None = None
-        for attempt in range(self._max_attempts):
-            try:
-                resp = self._request("GET", self.creds.candle_url, headers=headers, params=params)
-            except requests.RequestException as exc:  # pragma: no cover
-                if attempt < self._max_attempts - 1:
-                    time.sleep(1.0)
-                    continue
-                raise KISClientError(f"Daily candle request failed: {exc}") from exc
-
-            try:
-                parsed = resp.json()
-            except ValueError as exc:
-                if attempt < self._max_attempts - 1:
-                    time.sleep(1.0)
-                    continue
-                raise KISClientError("Daily candle response is not JSON") from exc
-
-            if not isinstance(parsed, dict):
-                raise KISClientError("Daily candle response payload is not an object")
-
-            data = parsed
-
-            if resp.status_code != 200:
-                msg_cd = parsed.get("msg_cd") or ""
-                msg1 = parsed.get("msg1") or "Unknown error"
-                if msg_cd == "EGW00123" and attempt < self._max_attempts - 1:
-                    # Token expired: refresh and retry
-                    self._access_token = None
-                    self._token_expiry = None
-                    self.ensure_token()
-                    headers["authorization"] = self._access_token or ""
-                    time.sleep(max(1.0, self._min_interval))
-                    continue
-                if attempt < self._max_attempts - 1:
-                    time.sleep(1.0)
-                    continue
-                raise KISClientError(f"Daily candle HTTP {resp.status_code}: {resp.text}")
-
-            if str(parsed.get("rt_cd")) != "0":
-                msg_cd = parsed.get("msg_cd") or ""
-                msg1 = parsed.get("msg1") or "Unknown error"
-                if msg_cd == "EGW00201" and attempt < self._max_attempts - 1:
-                    time.sleep(max(1.0, self._min_interval))
-                    continue
-                if msg_cd == "EGW00123" and attempt < self._max_attempts - 1:
-                    self._access_token = None
-                    self._token_expiry = None
-                    self.ensure_token()
-                    headers["authorization"] = self._access_token or ""
-                    time.sleep(max(1.0, self._min_interval))
-                    continue
-                raise KISClientError(f"KIS error: {msg1}")
-            break
-
-        if data is None:
-            return []
-
+        _, data = self._call(
+            self.creds.candle_url,
+            tr_id=self.creds.tr_id,
+            params=params,
+            label="Daily candle",
+            error_prefix="KIS error",
+        )
         return data.get("output2") or []
 
     # ------------------------------------------------------------------
@@ -539,81 +642,18 @@ class KISClient:
         """
         self.ensure_token()
 
-        headers = {
-            "Content-Type": "application/json",
-            "authorization": self._access_token,
-            "appkey": self.creds.app_key,
-            "appsecret": self.creds.app_secret,
-            "tr_id": "CTOS5011R",
-            "custtype": "P",
-        }
-
         params = {
             "TRAD_DT": start_date,
             "CTX_AREA_NK": "",
             "CTX_AREA_FK": "",
         }
-
-        payload: dict[str, Any] | None = None
-        for attempt in range(self._max_attempts):
-            try:
-                resp = self._request(
-                    "GET", self.creds.overseas_holiday_url, headers=headers, params=params
-                )
-            except requests.RequestException as exc:  # pragma: no cover
-                if attempt < self._max_attempts - 1:
-                    time.sleep(1.0)
-                    continue
-                raise KISClientError(f"Overseas holiday request failed: {exc}") from exc
-
-            try:
-                parsed = resp.json()
-            except ValueError as exc:
-                if attempt < self._max_attempts - 1:
-                    time.sleep(1.0)
-                    continue
-                raise KISClientError("Overseas holiday response is not JSON") from exc
-
-            if not isinstance(parsed, dict):
-                if attempt < self._max_attempts - 1:
-                    time.sleep(1.0)
-                    continue
-                raise KISClientError("Overseas holiday response payload is not an object")
-
-            payload = parsed
-
-            if resp.status_code != 200:
-                msg_cd = payload.get("msg_cd") or ""
-                msg1 = payload.get("msg1") or msg_cd or "Unknown error"
-                if msg_cd == "EGW00123" and attempt < self._max_attempts - 1:
-                    # Token expired: refresh and retry
-                    self._access_token = None
-                    self._token_expiry = None
-                    self.ensure_token()
-                    headers["authorization"] = self._access_token or ""
-                    time.sleep(max(1.0, self._min_interval))
-                    continue
-                if attempt < self._max_attempts - 1:
-                    time.sleep(1.0)
-                    continue
-                raise KISClientError(f"Overseas holiday HTTP {resp.status_code}: {resp.text}")
-
-            if str(payload.get("rt_cd")) != "0":
-                msg_cd = payload.get("msg_cd") or ""
-                msg1 = payload.get("msg1") or msg_cd or "Unknown error"
-                if msg_cd == "EGW00123" and attempt < self._max_attempts - 1:
-                    self._access_token = None
-                    self._token_expiry = None
-                    self.ensure_token()
-                    headers["authorization"] = self._access_token or ""
-                    time.sleep(max(1.0, self._min_interval))
-                    continue
-                msg = msg1
-                raise KISClientError(f"KIS overseas holiday error: {msg}")
-            break
-
-        if payload is None:
-            return []
+        _, payload = self._call(
+            self.creds.overseas_holiday_url,
+            tr_id="CTOS5011R",
+            params=params,
+            label="Overseas holiday",
+            error_prefix="KIS overseas holiday error",
+        )
 
         items = payload.get("output") or []
         if not isinstance(items, list):
@@ -637,7 +677,12 @@ class KISClient:
         exchange: str = "NASD",
         count: int = 120,
         adjusted: bool = True,
-    ) -> list[dict[str, Any]]:
+        cached: Optional[Candles] = None,
+    ) -> Candles:
+        """Return daily candles (oldest first) for an overseas symbol.
+
+        ``cached`` enables the same incremental refresh as :meth:`daily_candles`.
+        """
         symbol = symbol.strip().upper()
         exchange = exchange.strip().upper()
         if not symbol or not exchange:
@@ -646,6 +691,29 @@ class KISClient:
         self.ensure_token()
 
         target = max(count, 1)
+        if cached:
+            refreshed = self._extend_cached_candles(
+                cached,
+                target=target,
+                fetch=lambda start, end: [
+                    self._parse_overseas_candle(item)
+                    for item in self._fetch_overseas_candle_chunk(
+                        symbol=symbol,
+                        exchange=exchange,
+                        start_date=start,
+                        end_date=end,
+                        adjusted=adjusted,
+                    )
+                ],
+            )
+            if refreshed is not None:
+                return refreshed
+            logger.debug(
+                "Incremental refresh unavailable for %s.%s; full fetch",
+                symbol,
+                exchange,
+            )
+
         chunk_days = 240
         collected: dict[str, dict[str, Any]] = {}
 
@@ -691,7 +759,7 @@ class KISClient:
         rows = sorted(collected.values(), key=lambda x: x["date"])
         if len(rows) > target:
             rows = rows[-target:]
-        return rows
+        return as_candle_series(rows)
 
     def _fetch_overseas_candle_chunk(
         self,
@@ -710,75 +778,13 @@ class KISClient:
             "BYMD": end_date,
             "MODP": "1" if adjusted else "0",
         }
-
-        headers = {
-            "Content-Type": "application/json",
-            "authorization": self._access_token,
-            "appkey": self.creds.app_key,
-            "appsecret": self.creds.app_secret,
-            "tr_id": self.creds.overseas_tr_id,
-            "custtype": "P",
-        }
-
-        data: dict[str, Any] | None = None
-        for attempt in range(self._max_attempts):
-            try:
-                resp = self._request(
-                    "GET", self.creds.overseas_candle_url, headers=headers, params=params
-                )
-            except requests.RequestException as exc:  # pragma: no cover
-                if attempt < self._max_attempts - 1:
-                    time.sleep(1.0)
-                    continue
-                raise KISClientError(f"Overseas daily request failed: {exc}")
-
-            try:
-                parsed = resp.json()
-            except ValueError as exc:
-                if attempt < self._max_attempts - 1:
-                    time.sleep(1.0)
-                    continue
-                raise KISClientError("Overseas daily response is not JSON") from exc
-
-            if not isinstance(parsed, dict):
-                raise KISClientError("Overseas daily response payload is not an object")
-
-            data = parsed
-
-            if resp.status_code != 200:
-                msg_cd = parsed.get("msg_cd") or ""
-                msg1 = parsed.get("msg1") or "Unknown error"
-                if msg_cd == "EGW00123" and attempt < self._max_attempts - 1:
-                    # Token expired: refresh and retry
-                    self._access_token = None
-                    self._token_expiry = None
-                    self.ensure_token()
-                    headers["authorization"] = self._access_token or ""
-                    time.sleep(max(1.0, self._min_interval))
-                    continue
-                if attempt < self._max_attempts - 1:
-                    time.sleep(1.0)
-                    continue
-                raise KISClientError(f"Overseas daily HTTP {resp.status_code}: {resp.text}")
-
-            if str(parsed.get("rt_cd")) != "0":
-                msg_cd = parsed.get("msg_cd") or ""
-                msg1 = parsed.get("msg1") or "Unknown error"
-                if msg_cd == "EGW00201" and attempt < self._max_attempts - 1:
-                    time.sleep(max(1.0, self._min_interval))
-                    continue
-                if msg_cd == "EGW00123" and attempt < self._max_attempts - 1:
-                    self._access_token = None
-                    self._token_expiry = None
-                    self.ensure_token()
-                    headers["authorization"] = self._access_token or ""
-                    time.sleep(max(1.0, self._min_interval))
-                    continue
-                raise KISClientError(f"KIS overseas error: {msg1}")
-            break
-
-        if data is None:
-            return []
+        _, data = self._call(
+            self.creds.overseas_candle_url,
+            tr_id=self.creds.overseas_tr_id,
+            params=params,
+            label="Overseas daily",
+            error_prefix="KIS overseas error",
+        )
 
         # overseas output variable names differ; prefer 'output2' like domestic. Fallback to 'output'
         return data.get("output2") or data.get("output") or []
@@ -870,80 +876,18 @@ class KISClient:
             "FID_INPUT_DATE_1": "0",
         }
 
-        headers = {
-            "Content-Type": "application/json",
-            "authorization": self._access_token,
-            "appkey": self.creds.app_key,
-            "appsecret": self.creds.app_secret,
-            "tr_id": self.creds.volume_rank_tr_id,
-            "custtype": "P",
-        }
-
         results: list[dict[str, Any]] = []
         tr_cont = ""
 
         while len(results) < limit:
-            hdrs = headers.copy()
-            if tr_cont:
-                hdrs["tr_cont"] = tr_cont
-
-            # Request with body-level rate limit handling
-            data: dict[str, Any] | None = None
-            resp: requests.Response | None = None
-            for attempt in range(self._max_attempts):
-                resp = self._request("GET", self.creds.volume_rank_url, headers=hdrs, params=params)
-
-                # Try to parse JSON body even on non-200 to inspect msg_cd
-                try:
-                    data = resp.json()
-                except ValueError:
-                    data = None
-
-                if resp.status_code != 200:
-                    msg_cd = str(data.get("msg_cd") or "") if isinstance(data, dict) else ""
-                    msg1 = (data.get("msg1") or data.get("msg_cd") or "Unknown error") if isinstance(
-                        data, dict
-                    ) else "Unknown error"
-                    if msg_cd == "EGW00123" and attempt < self._max_attempts - 1:
-                        # Token expired on server side: clear, refresh, and retry
-                        self._access_token = None
-                        self._token_expiry = None
-                        self.ensure_token()
-                        headers["authorization"] = self._access_token or ""
-                        time.sleep(max(1.0, self._min_interval))
-                        continue
-                    if attempt < self._max_attempts - 1:
-                        time.sleep(1.0)
-                        continue
-                    raise KISClientError(
-                        f"Volume rank HTTP {resp.status_code}: {msg1} ({resp.text})"
-                    )
-
-                if data is None:
-                    if attempt < self._max_attempts - 1:
-                        time.sleep(1.0)
-                        continue
-                    raise KISClientError("Volume rank response is not JSON")
-
-                if str(data.get("rt_cd")) != "0":
-                    msg_cd = data.get("msg_cd") or ""
-                    msg1 = data.get("msg1") or "Unknown error"
-                    if msg_cd == "EGW00201" and attempt < self._max_attempts - 1:
-                        time.sleep(max(1.0, self._min_interval))
-                        continue
-                    if msg_cd == "EGW00123" and attempt < self._max_attempts - 1:
-                        # Token expired according to body: refresh and retry
-                        self._access_token = None
-                        self._token_expiry = None
-                        self.ensure_token()
-                        headers["authorization"] = self._access_token or ""
-                        time.sleep(max(1.0, self._min_interval))
-                        continue
-                    raise KISClientError(f"KIS volume rank error: {msg1}")
-                break
-
-            if data is None or resp is None:
-                break
+            resp, data = self._call(
+                self.creds.volume_rank_url,
+                tr_id=self.creds.volume_rank_tr_id,
+                params=params,
+                label="Volume rank",
+                error_prefix="KIS volume rank error",
+                tr_cont=tr_cont,
+            )
 
             items = data.get("output") or []
             if isinstance(items, dict):
@@ -986,36 +930,18 @@ class KISClient:
         request_params.setdefault("AUTH", "")
         request_params.setdefault("KEYB", "")
 
-        headers_base = {
-            "Content-Type": "application/json",
-            "authorization": self._access_token,
-            "appkey": self.creds.app_key,
-            "appsecret": self.creds.app_secret,
-            "tr_id": tr_id,
-            "custtype": "P",
-        }
-
         results: list[dict[str, Any]] = []
         tr_cont = ""
 
         while len(results) < limit:
-            headers = headers_base.copy()
-            if tr_cont:
-                headers["tr_cont"] = tr_cont
-
-            resp = self._request("GET", url, headers=headers, params=request_params)
-
-            if resp.status_code != 200:
-                raise KISClientError(f"Overseas rank HTTP {resp.status_code}: {resp.text}")
-
-            try:
-                data = resp.json()
-            except ValueError as exc:
-                raise KISClientError("Overseas rank response is not JSON") from exc
-
-            if str(data.get("rt_cd")) != "0":
-                msg = data.get("msg1") or data.get("msg_cd") or "Unknown error"
-                raise KISClientError(f"KIS overseas rank error: {msg}")
+            resp, data = self._call(
+                url,
+                tr_id=tr_id,
+                params=request_params,
+                label="Overseas rank",
+                error_prefix="KIS overseas rank error",
+                tr_cont=tr_cont,
+            )
 
             items = data.get("output2") or data.get("output") or []
             if isinstance(items, dict):
@@ -1167,3 +1093,21 @@ class KISClient:
             "volume": volume,
             "amount": amount,
         }
+
+
+def _same_price(left: Any, right: Any) -> bool:
+    try:
+        a = float(left)
+        b = float(right)
+    except (TypeError, ValueError):
+        return False
+    if math.isnan(a) or math.isnan(b):
+        return math.isnan(a) and math.isnan(b)
+    return math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-9)
+
+
+def _endpoint_key(url: str, headers: Optional[dict[str, Any]]) -> str:
+    tr_id = (headers or {}).get("tr_id")
+    if tr_id:
+        return str(tr_id)
+    return url.rstrip("/").rsplit("/", 1)[-1] or url
@@ -0,0 +1,167 @@
+"""Full-market KR end-of-day history, built one session at a time.
+
+Fetching history per ticker costs one request per ticker. A KRX market
+snapshot instead returns every listed stock's OHLCV for one date, so a
+backfill over ``N`` sessions costs ``N`` requests whatever the universe size,
+and a daily append costs one. :func:`ingest_snapshots` transposes a batch of
+snapshots into per-ticker ``candles_krx_<ticker>`` series in the candle store
+(source ``krx_eod``). Snapshot prices are not adjusted for splits or rights
+issues, so they are kept apart from the adjusted KIS ``candles_<ticker>``
+history: scans use them only for tickers without KIS history, and backtests
+only where no KIS series is cached.
+
+Progress is kept in ``kr_eod_state.json`` (first and last ingested session,
+and the tickers listed in the latest snapshot) so a later run only asks for
+the sessions after ``last_date``.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import json
+import os
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+from ..utils.atomic_io import atomic_write_json
+from .candle_series import as_candle_series, candle_rows
+from .candle_store import CandleRepository
+from .trading_calendar import TradingCalendar
+
+INGEST_SOURCE = "krx_eod"
+EOD_KEY_PREFIX = "candles_krx_"
+STATE_NAME = "kr_eod_state.json"
+DEFAULT_BACKFILL_SESSIONS = 250
+
+# One snapshot: ticker -> (open, high, low, close, volume).
+Snapshot = Mapping[str, tuple[float, float, float, float, float]]
+
+
+@dataclass
+class IngestState:
+    first_date: str
+    last_date: str
+    tickers: list[str] = field(default_factory=list)  # listed at last_date
+
+
+def load_ingest_state(data_dir: str) -> IngestState | None:
+    try:
+        with open(os.path.join(data_dir, STATE_NAME), encoding="utf-8") as fp:
+            data = json.load(fp)
+        return IngestState(
+            str(data["first_date"]),
+            str(data["last_date"]),
+            [str(t) for t in data.get("tickers") or []],
+        )
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def save_ingest_state(data_dir: str, state: IngestState) -> None:
+    os.makedirs(data_dir, exist_ok=True)
+    atomic_write_json(
+        os.path.join(data_dir, STATE_NAME),
+        {
+            "first_date": state.first_date,
+            "last_date": state.last_date,
+            "tickers": state.tickers,
+        },
+    )
+
+
+def eod_cache_key(ticker: str) -> str:
+    return f"{EOD_KEY_PREFIX}{ticker.strip()}"
+
+
+def plan_sessions(
+    calendar: TradingCalendar,
+    end: dt.date,
+    *,
+    after: str | None = None,
+    since: dt.date | None = None,
+    backfill: int = DEFAULT_BACKFILL_SESSIONS,
+) -> list[dt.date]:
+    """Sessions to ingest, oldest first, ending at ``end`` (inclusive).
+
+    ``after`` (``YYYYMMDD``, the last ingested session) continues an existing
+    history; otherwise the backfill starts at ``since`` or ``backfill``
+    sessions before ``end``.
+    """
+    sessions: list[dt.date] = []
+    day: dt.date | None
+    if after:
+        day = calendar.next_session(dt.datetime.strptime(after, "%Y%m%d").date())
+        while day is not None and day <= end:
+            sessions.append(day)
+            day = calendar.next_session(day)
+        return sessions
+
+    day = end if calendar.is_session(end) else calendar.previous_session(end)
+    while day is not None:
+        if since is not None and day < since:
+            break
+        if since is None and len(sessions) >= backfill:
+            break
+        sessions.append(day)
+        day = calendar.previous_session(day)
+    sessions.reverse()
+    return sessions
+
+
+def ingest_snapshots(
+    store: CandleRepository,
+    snapshots: Iterable[tuple[str, Snapshot]],
+) -> tuple[int, int]:
+    """Merge a batch of dated snapshots into each ticker's series.
+
+    Snapshot bars replace stored bars of the same date, so re-ingesting a
+    session is harmless, and ``prev_close_diff`` is recomputed over the
+    merged series. Returns ``(tickers, bars)`` written.
+    """
+    by_ticker: dict[str, dict[str, tuple[float, ...]]] = {}
+    for date, snapshot in snapshots:
+        for ticker, bar in snapshot.items():
+            by_ticker.setdefault(ticker, {})[date] = bar
+
+    bars = 0
+    for ticker, new in by_ticker.items():
+        key = eod_cache_key(ticker)
+        merged: dict[str, dict[str, Any]] = {
+            str(row.get("date") or ""): row
+            for row in candle_rows(store.load(key) or [])
+        }
+        for date, (o, h, low, c, v) in new.items():
+            merged[date] = {
+                "date": date,
+                "open": o,
+                "high": h,
+                "low": low,
+                "close": c,
+                "volume": v,
+            }
+        rows: list[dict[str, Any]] = []
+        prev_close: float | None = None
+        for date in sorted(merged):
+            row = dict(merged[date])
+            close = float(row["close"])
+            row["prev_close_diff"] = close - prev_close if prev_close else float("nan")
+            rows.append(row)
+            prev_close = close
+        store.save(key, as_candle_series(rows), source=INGEST_SOURCE)
+        bars += len(new)
+    return len(by_ticker), bars
+
+
+__all__ = [
+    "DEFAULT_BACKFILL_SESSIONS",
+    "EOD_KEY_PREFIX",
+    "INGEST_SOURCE",
+    "IngestState",
+    "Snapshot",
+    "eod_cache_key",
+    "ingest_snapshots",
+    "load_ingest_state",
+    "plan_sessions",
+    "save_ingest_state",
+]
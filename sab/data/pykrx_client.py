@@ -2,9 +2,20 @@ from __future__ import annotations
 
 import datetime as dt
 import importlib
+import math
+from array import array
 from types import ModuleType
 from typing import Any, Optional
 
+from .candle_series import (
+    FLOAT_COLUMNS,
+    Candles,
+    CandleSeries,
+    as_candle_series,
+    candle_rows,
+)
+from .candle_store import ColumnarCandleStore
+
 
 class PykrxClientError(RuntimeError):
     """Base error for PyKRX client."""
@@ -15,10 +26,16 @@ class PykrxNotInstalledError(PykrxClientError):
 
 
 class PykrxClient:
-    """Thin wrapper around pykrx.stock daily OHLC fetch."""
+    """Thin wrapper around pykrx.stock daily OHLC fetch.
+
+    With a ``cache_dir`` the fetched history is kept in a columnar candle file
+    (``candles_pykrx_<ticker>``) and later calls only request the bars from
+    the cached tail onwards.
+    """
 
     def __init__(self, *, cache_dir: Optional[str] = None) -> None:
         self.cache_dir = cache_dir
+        self._store = ColumnarCandleStore(cache_dir) if cache_dir else None
         self._stock_module: ModuleType = _import_pykrx_stock()
 
     # ------------------------------------------------------------------
@@ -28,89 +45,184 @@ class PykrxClient:
         *,
         count: int = 120,
         adjusted: bool = True,
-    ) -> list[dict[str, Any]]:
+    ) -> Candles:
         ticker = ticker.strip()
         if not ticker:
             raise PykrxClientError("Ticker is required")
 
-        stock = self._stock_module
-
         target = max(1, count)
+        key = pykrx_cache_key(ticker, adjusted=adjusted)
+        cached = self._store.load(key) if self._store is not None else None
+
+        candles: Candles | None = None
+        if cached and len(cached) >= target:
+            candles = self._extend_cached(ticker, cached, adjusted=adjusted)
+        if candles is None:
+            candles = self._fetch_history(ticker, target, adjusted=adjusted)
+        # Keep the cache at the requested window so it does not grow per run.
+        if len(candles) > target:
+            candles = candles[-target:]
+        if self._store is not None and candles and candles != cached:
+            self._store.save(key, candles)
+        return candles
+
+    def market_snapshot(
+        self, date: str, *, market: str = "ALL"
+    ) -> dict[str, tuple[float, float, float, float, float]]:
+        """Every listed ticker's ``(open, high, low, close, volume)`` on ``date``.
+
+        One request covers the whole market. Tickers that did not trade
+        (suspended, zero open) are left out; a non-session date yields ``{}``.
+        """
+        df = self._stock_module.get_market_ohlcv_by_ticker(date, market=market)
+        if df is None or df.empty:
+            return {}
+        opens = _column(df, "시가", "Open", "open")
+        highs = _column(df, "고가", "High", "high")
+        lows = _column(df, "저가", "Low", "low")
+        closes = _column(df, "종가", "Close", "close")
+        volumes = _column(df, "거래량", "Volume", "volume")
+        traded = (opens > 0).tolist()
+        rows = zip(
+            [str(t) for t in df.index],
+            opens.tolist(),
+            highs.tolist(),
+            lows.tolist(),
+            closes.tolist(),
+            volumes.tolist(),
+            strict=True,
+        )
+        return {
+            ticker: (o, h, low, c, v)
+            for ok, (ticker, o, h, low, c, v) in zip(traded, rows, strict=True)
+            if ok
+        }
+
+    def _fetch_range(
+        self, ticker: str, start: str, end: str, *, adjusted: bool
+    ) -> Candles:
+        df = self._stock_module.get_market_ohlcv_by_date(
+            start,
+            end,
+            ticker,
+            adjusted=adjusted,
+        )
+        if df is None or df.empty:
+            return []
+        return frame_candles(df)
+
+    def _fetch_history(self, ticker: str, target: int, *, adjusted: bool) -> Candles:
         lookback_days = max(365, int(target * 3))
         end = dt.datetime.now()
-
-        df = None
-        attempts = 0
-        while attempts < 4:
+        end_str = end.strftime("%Y%m%d")
+        for _ in range(4):
             start = end - dt.timedelta(days=lookback_days)
-            start_str = start.strftime("%Y%m%d")
-            end_str = end.strftime("%Y%m%d")
-            data = stock.get_market_ohlcv_by_date(
-                start_str,
-                end_str,
-                ticker,
-                adjusted=adjusted,
+            candles = self._fetch_range(
+                ticker, start.strftime("%Y%m%d"), end_str, adjusted=adjusted
             )
-            if data is not None and not data.empty:
-                df = data
-                break
+            if candles:
+                return candles
             lookback_days *= 2
-            attempts += 1
+        return []
 
-        if df is None or df.empty:
-            return []
+    def _extend_cached(
+        self, ticker: str, cached: Candles, *, adjusted: bool
+    ) -> Candles | None:
+        """Merge the bars from the cached tail onwards into ``cached``.
 
-        df = df.sort_index()
-        records: list[dict[str, Any]] = []
-
-        def _col(*names: str) -> Any:
-            for name in names:
-                if name in df.columns:
-                    return df[name]
-            raise PykrxClientError(f"Missing required column(s): {names}")
-
-        opens = _col("시가", "Open", "open")
-        highs = _col("고가", "High", "high")
-        lows = _col("저가", "Low", "low")
-        closes = _col("종가", "Close", "close")
-        volumes = _col("거래량", "Volume", "volume")
-
-        prev_close: float | None = None
-        for idx, date_idx in enumerate(df.index):
-            row_open = _to_float(opens.iloc[idx])
-            row_high = _to_float(highs.iloc[idx])
-            row_low = _to_float(lows.iloc[idx])
-            row_close = _to_float(closes.iloc[idx])
-            row_volume = _to_float(volumes.iloc[idx])
-
-            date_str = _format_date(date_idx)
-
-            diff = float("nan")
-            if (
-                prev_close is not None
-                and prev_close != 0
-                and not _is_nan(prev_close)
-                and not _is_nan(row_close)
-            ):
-                diff = row_close - prev_close
-
-            records.append(
-                {
-                    "date": date_str,
-                    "open": row_open,
-                    "high": row_high,
-                    "low": row_low,
-                    "close": row_close,
-                    "volume": row_volume,
-                    "prev_close_diff": diff,
-                }
-            )
-            prev_close = row_close
+        The request starts at the bar before the tail: that bar must match
+        the cache (adjusted prices get revised after splits), and the tail
+        itself may have been an intraday bar, so it is replaced. Returns None
+        when the cache cannot be extended safely.
+        """
+        if len(cached) < 2:
+            return None
+        check, tail = cached[-2], cached[-1]
+        start = str(check.get("date") or "")
+        fetched = self._fetch_range(
+            ticker, start, dt.datetime.now().strftime("%Y%m%d"), adjusted=adjusted
+        )
+        if not fetched or str(fetched[0].get("date")) != start:
+            return None
+        if not _same_price(fetched[0].get("close"), check.get("close")):
+            return None
+        tail_date = str(tail.get("date") or "")
+        newer = [row for row in candle_rows(fetched) if str(row["date"]) >= tail_date]
+        return as_candle_series(candle_rows(cached[:-1]) + newer)
+
+
+def pykrx_cache_key(ticker: str, *, adjusted: bool = True) -> str:
+    key = f"candles_pykrx_{ticker.strip()}"
+    return key if adjusted else f"{key}_raw"
+
+
+def frame_candles(df: Any) -> Candles:
+    """Convert a pykrx OHLCV frame (date index) to oldest-first candles.
+
+    Columns are converted in batches; rows whose index is not a date stay in
+    the list-of-dicts layout.
+    """
+    df = df.sort_index()
+    opens = _column(df, "시가", "Open", "open")
+    highs = _column(df, "고가", "High", "high")
+    lows = _column(df, "저가", "Low", "low")
+    closes = _column(df, "종가", "Close", "close")
+    volumes = _column(df, "거래량", "Volume", "volume")
+
+    diffs = closes.copy()
+    if len(diffs):
+        diffs[0] = float("nan")
+        diffs[1:] = closes[1:] - closes[:-1]
+        diffs[1:][closes[:-1] == 0] = float("nan")
 
-        if len(records) > target:
-            records = records[-target:]
+    values = {
+        "open": opens,
+        "high": highs,
+        "low": lows,
+        "close": closes,
+        "volume": volumes,
+        "prev_close_diff": diffs,
+    }
+    dates = _date_keys(df.index)
+    if dates is None:
+        labels = [_format_date(value) for value in df.index]
+        return [
+            {"date": label, **{name: float(col[i]) for name, col in values.items()}}
+            for i, label in enumerate(labels)
+        ]
+    columns: dict[str, array[float]] = {}
+    for name in FLOAT_COLUMNS:
+        column = array("d")
+        column.frombytes(values[name].tobytes())
+        columns[name] = column
+    return CandleSeries(dates, columns)
 
-        return records
+
+def _column(df: Any, *names: str) -> Any:
+    for name in names:
+        if name in df.columns:
+            series = df[name]
+            try:
+                return series.to_numpy(dtype="float64", na_value=float("nan"))
+            except (TypeError, ValueError):
+                # Text cells (e.g. "1,234"): parse one by one.
+                return series.map(_to_float).to_numpy(dtype="float64")
+    raise PykrxClientError(f"Missing required column(s): {names}")
+
+
+def _date_keys(index: Any) -> array[int] | None:
+    """``YYYYMMDD`` integers for a datetime index, else None."""
+    if not all(hasattr(index, attr) for attr in ("year", "month", "day")):
+        return None
+    try:
+        keys = (index.year * 10000 + index.month * 100 + index.day).to_numpy(
+            dtype="int32"
+        )
+    except (TypeError, ValueError):
+        return None
+    dates = array("i")
+    dates.frombytes(keys.tobytes())
+    return dates
 
 
 def _import_pykrx_stock() -> ModuleType:
@@ -134,11 +246,11 @@ def _to_float(value: Any) -> float:
             return float("nan")
 
 
-def _is_nan(value: Any) -> bool:
-    try:
-        return float(value) != float(value)
-    except Exception:
+def _same_price(left: Any, right: Any) -> bool:
+    a, b = _to_float(left), _to_float(right)
+    if math.isnan(a) or math.isnan(b):
         return False
+    return math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-6)
 
 
 def _format_date(value: Any) -> str:
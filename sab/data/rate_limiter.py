@@ -0,0 +1,184 @@
+"""Token-bucket rate limiters shared by KIS request workers and processes."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections.abc import Callable
+from typing import Protocol
+
+from ..utils.atomic_io import advisory_path_lock
+
+# Published KIS Developers REST limits (requests per second per app key).
+KIS_RATE_LIMITS: dict[str, float] = {"real": 20.0, "demo": 2.0}
+
+# Stored schedules further ahead than this are treated as clock jumps.
+_MAX_SCHEDULE_AHEAD = 60.0
+
+
+class Limiter(Protocol):
+    rate: float
+
+    def acquire(self) -> float: ...
+
+    def set_rate(self, rate: float) -> None: ...
+
+
+class RateLimiter:
+    """Token bucket that hands out request slots to any number of threads.
+
+    Callers reserve a slot under the lock and sleep outside of it, so waiting
+    threads do not serialize on each other's sleeps and the aggregate rate
+    never exceeds ``rate`` (plus the initial ``burst``).
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        *,
+        burst: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.burst = max(1.0, float(burst))
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = self.burst
+        self._updated_at = clock()
+
+    @property
+    def interval(self) -> float:
+        """Seconds between requests at the steady-state rate."""
+        return 1.0 / self.rate
+
+    def set_rate(self, rate: float) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        with self._lock:
+            self.rate = float(rate)
+
+    def acquire(self) -> float:
+        """Block until a request slot is available; return the seconds waited."""
+        with self._lock:
+            now = self._clock()
+            elapsed = max(0.0, now - self._updated_at)
+            self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+            self._updated_at = now
+            self._tokens -= 1.0
+            wait = 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+
+class SharedRateLimiter:
+    """Rate limiter coordinated across processes through a state file.
+
+    Uses GCRA (the virtual-scheduling form of a token bucket): the state file
+    holds the theoretical arrival time of the next request on the wall clock.
+    Each caller advances it by one interval under ``advisory_path_lock`` and
+    then sleeps outside the lock, so concurrent ``scan``/``sell`` runs sharing
+    an app key stay at ``rate`` in aggregate.
+    """
+
+    def __init__(
+        self,
+        state_path: str,
+        rate: float,
+        *,
+        burst: float = 1.0,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.burst = max(1.0, float(burst))
+        self.state_path = state_path
+        self.lock_path = f"{state_path}.lock"
+        self._clock = clock
+        self._sleep = sleep
+
+    @property
+    def interval(self) -> float:
+        return 1.0 / self.rate
+
+    def set_rate(self, rate: float) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+
+    def acquire(self) -> float:
+        """Reserve the next shared slot, sleep until it, and return the wait."""
+        interval = self.interval
+        with advisory_path_lock(self.lock_path):
+            now = self._clock()
+            tat = self._read_tat()
+            if tat is None or tat > now + _MAX_SCHEDULE_AHEAD:
+                tat = now
+            tat = max(tat, now)
+            wait = max(0.0, tat - now - (self.burst - 1.0) * interval)
+            self._write_tat(tat + interval)
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+    def _read_tat(self) -> float | None:
+        try:
+            with open(self.state_path, encoding="utf-8") as fp:
+                data = json.load(fp)
+            return float(data["tat"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _write_tat(self, tat: float) -> None:
+        # Writers are serialized by the lock and the state is disposable, so a
+        # plain rewrite (no fsync/rename) keeps the per-request cost low.
+        with open(self.state_path, "w", encoding="utf-8") as fp:
+            json.dump({"tat": tat, "rate": self.rate}, fp)
+
+
+def shared_state_path(state_dir: str, env: str, app_key: str) -> str:
+    """Return the limiter state path for an app key without exposing the key."""
+    digest = hashlib.sha256(app_key.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(state_dir, f"kis_rate_{env}_{digest}.json")
+
+
+def kis_rate_limiter(
+    env: str,
+    min_interval: float | None = None,
+    *,
+    state_dir: str | None = None,
+    app_key: str | None = None,
+) -> Limiter:
+    """Build a limiter for a KIS environment, honouring ``min_interval``.
+
+    The effective rate is the stricter of ``1 / min_interval`` and the
+    environment ceiling from :data:`KIS_RATE_LIMITS`. With ``state_dir`` and
+    ``app_key`` the budget is shared by every process using that key.
+    """
+    ceiling = KIS_RATE_LIMITS.get(env, KIS_RATE_LIMITS["demo"])
+    rate = ceiling
+    if min_interval is not None and min_interval > 0:
+        rate = min(rate, 1.0 / min_interval)
+    if state_dir and app_key:
+        os.makedirs(state_dir, exist_ok=True)
+        return SharedRateLimiter(shared_state_path(state_dir, env, app_key), rate)
+    return RateLimiter(rate)
+
+
+__all__ = [
+    "KIS_RATE_LIMITS",
+    "Limiter",
+    "RateLimiter",
+    "SharedRateLimiter",
+    "kis_rate_limiter",
+    "shared_state_path",
+]
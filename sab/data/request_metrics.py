@@ -0,0 +1,182 @@
+"""Per-endpoint request counters and latency histograms for KIS calls."""
+
+from __future__ import annotations
+
+import datetime as dt
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Any
+
+from ..utils.atomic_io import atomic_write_json
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open.
+LATENCY_BUCKETS_MS: tuple[float, ...] = (50, 100, 250, 500, 1000, 2500, 5000)
+
+
+@dataclass
+class EndpointStats:
+    calls: int = 0
+    transport_errors: int = 0
+    status_counts: dict[str, int] = field(default_factory=dict)
+    retries: dict[str, int] = field(default_factory=dict)
+    latency_total_ms: float = 0.0
+    latency_max_ms: float = 0.0
+    histogram: list[int] = field(
+        default_factory=lambda: [0] * (len(LATENCY_BUCKETS_MS) + 1)
+    )
+    throttle_wait_s: float = 0.0
+    backoff_sleep_s: float = 0.0
+
+    def percentile_ms(self, pct: float) -> float | None:
+        """Upper bucket bound containing ``pct`` of the calls (None if open)."""
+        if not self.calls:
+            return None
+        threshold = self.calls * pct
+        seen = 0
+        for idx, count in enumerate(self.histogram):
+            seen += count
+            if seen >= threshold:
+                if idx < len(LATENCY_BUCKETS_MS):
+                    return LATENCY_BUCKETS_MS[idx]
+                return None
+        return None
+
+    def to_dict(self) -> dict[str, Any]:
+        avg = self.latency_total_ms / self.calls if self.calls else 0.0
+        return {
+            "calls": self.calls,
+            "transport_errors": self.transport_errors,
+            "status_counts": dict(sorted(self.status_counts.items())),
+            "retries": dict(sorted(self.retries.items())),
+            "latency_ms": {
+                "avg": round(avg, 2),
+                "max": round(self.latency_max_ms, 2),
+                "p50_le": self.percentile_ms(0.5),
+                "p95_le": self.percentile_ms(0.95),
+                "buckets_le": [*LATENCY_BUCKETS_MS, None],
+                "histogram": list(self.histogram),
+            },
+            "throttle_wait_s": round(self.throttle_wait_s, 3),
+            "backoff_sleep_s": round(self.backoff_sleep_s, 3),
+        }
+
+
+class RequestMetrics:
+    """Thread-safe collector shared by every request a client issues."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.endpoints: dict[str, EndpointStats] = {}
+        self.started_at = dt.datetime.now(dt.UTC)
+
+    def _stats(self, endpoint: str) -> EndpointStats:
+        stats = self.endpoints.get(endpoint)
+        if stats is None:
+            stats = EndpointStats()
+            self.endpoints[endpoint] = stats
+        return stats
+
+    def record_request(
+        self,
+        endpoint: str,
+        *,
+        latency_s: float,
+        status: int | None,
+        throttle_wait_s: float = 0.0,
+    ) -> None:
+        latency_ms = latency_s * 1000.0
+        bucket = len(LATENCY_BUCKETS_MS)
+        for idx, bound in enumerate(LATENCY_BUCKETS_MS):
+            if latency_ms <= bound:
+                bucket = idx
+                break
+        with self._lock:
+            stats = self._stats(endpoint)
+            stats.calls += 1
+            stats.latency_total_ms += latency_ms
+            stats.latency_max_ms = max(stats.latency_max_ms, latency_ms)
+            stats.histogram[bucket] += 1
+            stats.throttle_wait_s += throttle_wait_s
+            if status is None:
+                stats.transport_errors += 1
+            else:
+                key = str(status)
+                stats.status_counts[key] = stats.status_counts.get(key, 0) + 1
+
+    def record_retry(self, endpoint: str, reason: str, delay_s: float) -> None:
+        with self._lock:
+            stats = self._stats(endpoint)
+            stats.retries[reason] = stats.retries.get(reason, 0) + 1
+            stats.backoff_sleep_s += delay_s
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            endpoints = {
+                name: stats.to_dict() for name, stats in sorted(self.endpoints.items())
+            }
+        return {
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "finished_at": dt.datetime.now(dt.UTC).isoformat(timespec="seconds"),
+            "totals": {
+                "calls": sum(e["calls"] for e in endpoints.values()),
+                "retries": sum(sum(e["retries"].values()) for e in endpoints.values()),
+                "throttle_wait_s": round(
+                    sum(e["throttle_wait_s"] for e in endpoints.values()), 3
+                ),
+                "backoff_sleep_s": round(
+                    sum(e["backoff_sleep_s"] for e in endpoints.values()), 3
+                ),
+            },
+            "endpoints": endpoints,
+        }
+
+    def summary_lines(self) -> list[str]:
+        """Short human-readable lines for the report appendix."""
+        snap = self.snapshot()
+        totals = snap["totals"]
+        if not totals["calls"]:
+            return []
+        lines = [
+            f"Total: {totals['calls']} calls, {totals['retries']} retries, "
+            f"throttle wait {totals['throttle_wait_s']:.1f}s, "
+            f"backoff {totals['backoff_sleep_s']:.1f}s"
+        ]
+        for name, data in snap["endpoints"].items():
+            latency = data["latency_ms"]
+            p95 = latency["p95_le"]
+            p95_txt = f"≤{p95:.0f}ms" if p95 is not None else "slow"
+            line = (
+                f"{name}: {data['calls']} calls, avg {latency['avg']:.0f}ms, "
+                f"p95 {p95_txt}, max {latency['max']:.0f}ms"
+            )
+            if data["retries"]:
+                detail = ", ".join(f"{k}={v}" for k, v in data["retries"].items())
+                line += f", retries {detail}"
+            if data["transport_errors"]:
+                line += f", transport errors {data['transport_errors']}"
+            lines.append(line)
+        return lines
+
+
+def write_run_metrics(
+    data_dir: str,
+    command: str,
+    metrics: RequestMetrics,
+    *,
+    extra: dict[str, Any] | None = None,
+) -> str:
+    """Write ``metrics`` to ``<data_dir>/metrics/<command>-<timestamp>.json``."""
+    stamp = metrics.started_at.strftime("%Y%m%dT%H%M%SZ")
+    path = os.path.join(data_dir, "metrics", f"{command}-{stamp}.json")
+    payload = {"command": command, **(extra or {}), **metrics.snapshot()}
+    atomic_write_json(path, payload, indent=2)
+    return path
+
+
+__all__ = [
+    "LATENCY_BUCKETS_MS",
+    "EndpointStats",
+    "RequestMetrics",
+    "write_run_metrics",
+]
@@ -0,0 +1,160 @@
+"""Response classification, backoff and adaptive throttling for KIS requests."""
+
+from __future__ import annotations
+
+import random
+import threading
+from dataclasses import dataclass, field
+from enum import StrEnum
+from typing import Any
+
+from .rate_limiter import Limiter
+
+RATE_LIMIT_CODES = frozenset({"EGW00201"})
+TOKEN_EXPIRED_CODES = frozenset({"EGW00123"})
+
+
+class Verdict(StrEnum):
+    OK = "ok"
+    RATE_LIMITED = "rate_limited"
+    TOKEN_EXPIRED = "token_expired"
+    SERVER_ERROR = "server_error"
+    TRANSPORT_ERROR = "transport_error"
+    BAD_PAYLOAD = "bad_payload"
+    HTTP_ERROR = "http_error"
+    API_ERROR = "api_error"
+
+    @property
+    def retryable(self) -> bool:
+        # Like the per-endpoint loops this replaced, any non-200 is retried;
+        # only a well-formed KIS error body (rt_cd != "0") is final.
+        return self not in {Verdict.OK, Verdict.API_ERROR}
+
+
+@dataclass(frozen=True)
+class Classification:
+    verdict: Verdict
+    payload: dict[str, Any] | None = None
+    msg_cd: str = ""
+    message: str = ""
+
+
+def classify_response(status_code: int, payload: Any) -> Classification:
+    """Classify a KIS response from its HTTP status and decoded JSON body.
+
+    ``payload`` is None when the body is not JSON. Body codes win over the
+    HTTP status because KIS reports token expiry as ``500`` + ``EGW00123``.
+    A ``200`` body is OK only when it carries ``rt_cd == "0"``.
+    """
+    if payload is not None and not isinstance(payload, dict):
+        return Classification(Verdict.BAD_PAYLOAD, message="not an object")
+
+    body = payload or {}
+    msg_cd = str(body.get("msg_cd") or "")
+    message = str(body.get("msg1") or msg_cd or "Unknown error")
+
+    if msg_cd in TOKEN_EXPIRED_CODES:
+        return Classification(Verdict.TOKEN_EXPIRED, payload, msg_cd, message)
+    if msg_cd in RATE_LIMIT_CODES or status_code == 429:
+        return Classification(Verdict.RATE_LIMITED, payload, msg_cd, message)
+    if status_code in {418, 503} or status_code >= 500:
+        return Classification(Verdict.SERVER_ERROR, payload, msg_cd, message)
+    if status_code != 200:
+        return Classification(Verdict.HTTP_ERROR, payload, msg_cd, message)
+    if payload is None:
+        return Classification(Verdict.BAD_PAYLOAD, message="not JSON")
+    if str(body.get("rt_cd")) != "0":
+        return Classification(Verdict.API_ERROR, payload, msg_cd, message)
+    return Classification(Verdict.OK, payload, msg_cd, message)
+
+
+@dataclass
+class RetryPolicy:
+    """Capped exponential backoff with "equal jitter".
+
+    The delay for attempt ``n`` (0-based) is drawn uniformly from
+    ``[d/2, d]`` where ``d = min(max_delay, base_delay * 2**n)``.
+    """
+
+    max_attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 8.0
+    rng: random.Random = field(default_factory=random.Random)
+
+    def delay(self, attempt: int, verdict: Verdict) -> float:
+        if verdict is Verdict.TOKEN_EXPIRED:
+            # A fresh token is usable immediately; the limiter spaces the call.
+            return 0.0
+        ceiling = min(self.max_delay, self.base_delay * (2**attempt))
+        return self.rng.uniform(ceiling / 2.0, ceiling)
+
+
+class AdaptiveThrottle:
+    """AIMD controller for a limiter's request rate.
+
+    Throttling responses halve the rate (down to ``min_rate``); every
+    ``success_window`` consecutive successes add ``step`` back, never above
+    the configured ``max_rate``.
+
+    Concurrent workers see one congestion event as several throttled
+    responses. Callers pass the :attr:`epoch` read before sending, and a
+    response to a request sent before the latest decrease is ignored, so each
+    event halves the rate once.
+    """
+
+    def __init__(
+        self,
+        limiter: Limiter,
+        *,
+        min_rate: float | None = None,
+        decrease_factor: float = 0.5,
+        success_window: int = 20,
+        step: float | None = None,
+    ) -> None:
+        self.limiter = limiter
+        self.max_rate = limiter.rate
+        self.min_rate = min(self.max_rate, min_rate or self.max_rate / 8.0)
+        self.decrease_factor = decrease_factor
+        self.success_window = max(1, success_window)
+        self.step = step if step is not None else self.max_rate / 10.0
+        self._successes = 0
+        self._epoch = 0
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self) -> float:
+        return self.limiter.rate
+
+    @property
+    def epoch(self) -> int:
+        """Number of decreases so far; read it before sending a request."""
+        return self._epoch
+
+    def on_success(self) -> None:
+        with self._lock:
+            self._successes += 1
+            if self._successes < self.success_window:
+                return
+            self._successes = 0
+            if self.limiter.rate < self.max_rate:
+                self.limiter.set_rate(min(self.max_rate, self.limiter.rate + self.step))
+
+    def on_throttled(self, epoch: int | None = None) -> None:
+        with self._lock:
+            self._successes = 0
+            if epoch is not None and epoch != self._epoch:
+                # Sent before the last decrease: same congestion event.
+                return
+            self._epoch += 1
+            self.limiter.set_rate(
+                max(self.min_rate, self.limiter.rate * self.decrease_factor)
+            )
+
+
+__all__ = [
+    "AdaptiveThrottle",
+    "Classification",
+    "RetryPolicy",
+    "Verdict",
+    "classify_response",
+]
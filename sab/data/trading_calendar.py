@@ -0,0 +1,188 @@
+"""Memoized trading calendars with precomputed session tables.
+
+Session questions ("is this a trading day?", "which session came before?",
+"how many sessions between two dates?") used to rebuild the holiday map from
+the built-in calendar, the override file and the KIS holiday cache on every
+call. :func:`trading_calendar` builds one :class:`TradingCalendar` per market
+and data directory and keeps it until one of its source files changes (by
+``stat`` signature) or the year rolls over.
+
+Each calendar lays out a year lazily as a session bitmap (bit ``n`` set when
+day-of-year ``n`` trades) plus a cumulative session count, so membership,
+previous/next session and session counts are table lookups instead of day by
+day loops.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import os
+import threading
+from array import array
+from collections.abc import Mapping
+from functools import cached_property
+
+from ..utils.atomic_io import file_signature
+from .holiday_cache import HolidayEntry, load_cached_holidays
+from .kr_calendar import load_kr_trading_calendar
+from .us_calendar import load_us_trading_calendar
+
+_BUILTIN_LOADERS = {
+    "US": load_us_trading_calendar,
+    "KR": load_kr_trading_calendar,
+}
+
+# How far previous/next session searches roll over before giving up.
+_MAX_YEAR_HOPS = 10
+
+
+class _Year:
+    """Session layout of one calendar year."""
+
+    __slots__ = ("first", "bits", "cum", "sessions")
+
+    def __init__(self, year: int, closed: frozenset[str]) -> None:
+        self.first = dt.date(year, 1, 1)
+        days = (dt.date(year + 1, 1, 1) - self.first).days
+        bits = 0
+        cum = array("H", [0])
+        sessions = array("H")
+        day = self.first
+        for n in range(days):
+            if day.weekday() < 5 and day.strftime("%Y%m%d") not in closed:
+                bits |= 1 << n
+                sessions.append(n)
+            cum.append(len(sessions))
+            day += dt.timedelta(days=1)
+        self.bits = bits
+        # cum[n] counts the sessions on day-of-year offsets < n.
+        self.cum = cum
+        self.sessions = sessions
+
+    def offset(self, day: dt.date) -> int:
+        return (day - self.first).days
+
+    def date(self, offset: int) -> dt.date:
+        return self.first + dt.timedelta(days=offset)
+
+
+class TradingCalendar:
+    """Sessions of one market: weekdays that are not known closures.
+
+    ``entries`` maps ``YYYYMMDD`` to holiday entries; closures are the
+    entries with ``is_open`` false.
+    """
+
+    def __init__(self, market: str, entries: Mapping[str, HolidayEntry]) -> None:
+        self.market = market
+        self._entries = dict(entries)
+        self._closed = frozenset(k for k, e in self._entries.items() if not e.is_open)
+        self._years: dict[int, _Year] = {}
+
+    def _year(self, year: int) -> _Year:
+        layout = self._years.get(year)
+        if layout is None:
+            layout = self._years.setdefault(year, _Year(year, self._closed))
+        return layout
+
+    def holiday(self, day: dt.date) -> HolidayEntry | None:
+        """The calendar entry for ``day`` (closure or explicit open), if any."""
+        return self._entries.get(day.strftime("%Y%m%d"))
+
+    def is_holiday(self, day: dt.date) -> bool:
+        return day.strftime("%Y%m%d") in self._closed
+
+    def is_session(self, day: dt.date) -> bool:
+        layout = self._year(day.year)
+        return bool(layout.bits >> layout.offset(day) & 1)
+
+    def previous_session(self, day: dt.date) -> dt.date | None:
+        """The last session strictly before ``day``."""
+        layout = self._year(day.year)
+        before = layout.cum[layout.offset(day)]
+        for _ in range(_MAX_YEAR_HOPS):
+            if before:
+                return layout.date(layout.sessions[before - 1])
+            layout = self._year(layout.first.year - 1)
+            before = len(layout.sessions)
+        return None
+
+    def next_session(self, day: dt.date) -> dt.date | None:
+        """The first session strictly after ``day``."""
+        layout = self._year(day.year)
+        upto = layout.cum[layout.offset(day) + 1]
+        for _ in range(_MAX_YEAR_HOPS):
+            if upto < len(layout.sessions):
+                return layout.date(layout.sessions[upto])
+            layout = self._year(layout.first.year + 1)
+            upto = 0
+        return None
+
+    def sessions_between(self, start: dt.date, end: dt.date) -> int:
+        """Number of sessions in ``[start, end]`` (0 when ``end < start``)."""
+        if end < start:
+            return 0
+        first, last = self._year(start.year), self._year(end.year)
+        if start.year == end.year:
+            return first.cum[first.offset(end) + 1] - first.cum[first.offset(start)]
+        total = len(first.sessions) - first.cum[first.offset(start)]
+        for year in range(start.year + 1, end.year):
+            total += len(self._year(year).sessions)
+        return total + last.cum[last.offset(end) + 1]
+
+    @cached_property
+    def holiday_flags(self) -> dict[str, bool]:
+        """``YYYYMMDD`` -> closed, for every known entry."""
+        return {k: not e.is_open for k, e in self._entries.items()}
+
+
+def _resolve_data_dir(data_dir: str | None) -> str:
+    return os.path.abspath(data_dir or os.getenv("SAB_DATA_DIR") or "data")
+
+
+def _build(market: str, data_dir: str) -> TradingCalendar:
+    entries = {
+        key: HolidayEntry(date=key, note=note, is_open=False)
+        for key, note in _BUILTIN_LOADERS[market](data_dir).items()
+    }
+    # load_cached_holidays creates the directory; only read existing ones.
+    if os.path.isdir(data_dir):
+        entries.update(load_cached_holidays(data_dir, market))
+    return TradingCalendar(market, entries)
+
+
+_Signature = tuple[object, ...]
+_CALENDARS: dict[tuple[str, str], tuple[_Signature, TradingCalendar]] = {}
+_LOCK = threading.Lock()
+
+
+def trading_calendar(market: str, data_dir: str | None = None) -> TradingCalendar:
+    """The memoized calendar of ``market`` (``US`` or ``KR``).
+
+    ``data_dir`` defaults to ``SAB_DATA_DIR`` or ``data``. The calendar is
+    rebuilt when the override file or the holiday cache in that directory
+    changes.
+    """
+    market = market.strip().upper()
+    if market not in _BUILTIN_LOADERS:
+        raise ValueError(f"unknown market: {market!r}")
+    resolved = _resolve_data_dir(data_dir)
+    code = market.lower()
+    signature: _Signature = (
+        dt.date.today().year,
+        os.getenv("SAB_USE_PMC_CALENDAR", "1"),
+        file_signature(os.path.join(resolved, f"{code}_trading_calendar.json")),
+        file_signature(os.path.join(resolved, f"holidays_{code}.json")),
+    )
+    key = (market, resolved)
+    with _LOCK:
+        cached = _CALENDARS.get(key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+    calendar = _build(market, resolved)
+    with _LOCK:
+        _CALENDARS[key] = (signature, calendar)
+    return calendar
+
+
+__all__ = ["TradingCalendar", "trading_calendar"]
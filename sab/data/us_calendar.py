@@ -3,8 +3,11 @@ from __future__ import annotations
 import json
 import os
 from datetime import date
+from functools import lru_cache
 from typing import Dict
 
+from ..utils.atomic_io import file_signature
+
 # Built-in US market holiday dates (NYSE/NASDAQ) for 2024–2026.
 # Keys are YYYYMMDD, values are human-readable notes.
 _BUILTIN_US_HOLIDAYS: Dict[str, str] = {
@@ -75,6 +78,13 @@ def _maybe_pandas_holidays(start_year: int, end_year: int) -> Dict[str, str]:
     use_pandas = os.getenv("SAB_USE_PMC_CALENDAR", "1").strip().lower() not in {"0", "false", "no"}
     if not use_pandas:
         return {}
+    return _pandas_holidays(start_year, end_year)
+
+
+@lru_cache(maxsize=None)
+def _pandas_holidays(start_year: int, end_year: int) -> Dict[str, str]:
+    # Importing pandas_market_calendars and building its holiday index is
+    # slow; do it once per process and year range.
     try:
         import pandas_market_calendars as pmc  # type: ignore
     except Exception:
@@ -98,8 +108,7 @@ def _maybe_pandas_holidays(start_year: int, end_year: int) -> Dict[str, str]:
     return out
 
 
-def load_us_trading_calendar(data_dir: str | None = None) -> Dict[str, str]:
-    """Return mapping of YYYYMMDD -> note for known US market holidays."""
+def _build_calendar(data_dir: str | None) -> Dict[str, str]:
     overrides = _load_override_file(data_dir)
     merged = dict(_BUILTIN_US_HOLIDAYS)
 
@@ -117,4 +126,30 @@ def load_us_trading_calendar(data_dir: str | None = None) -> Dict[str, str]:
     return merged
 
 
+# (data_dir, year, pmc flag) -> (override file signature, merged calendar)
+_CALENDAR_CACHE: Dict[
+    tuple[str, int, str], tuple[tuple[int, int, int] | None, Dict[str, str]]
+] = {}
+
+
+def load_us_trading_calendar(data_dir: str | None = None) -> Dict[str, str]:
+    """Return mapping of YYYYMMDD -> note for known US market holidays.
+
+    The merged mapping is memoized per data directory and rebuilt only when
+    the override file changes (or the year rolls over); callers get a copy.
+    """
+    path = (
+        os.path.join(os.path.abspath(data_dir), "us_trading_calendar.json")
+        if data_dir
+        else ""
+    )
+    key = (path, date.today().year, os.getenv("SAB_USE_PMC_CALENDAR", "1"))
+    signature = file_signature(path) if path else None
+    cached = _CALENDAR_CACHE.get(key)
+    if cached is None or cached[0] != signature:
+        cached = (signature, _build_calendar(data_dir))
+        _CALENDAR_CACHE[key] = cached
+    return dict(cached[1])
+
+
 __all__ = ["load_us_trading_calendar"]
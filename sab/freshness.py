@@ -0,0 +1,79 @@
+"""Decide whether a cached candle series can be used without refetching."""
+
+from __future__ import annotations
+
+import datetime as dt
+import threading
+from dataclasses import dataclass, field
+from typing import Any
+
+from .data.candle_series import Candles
+from .signals.eval_index import (
+    STATE_INTRADAY,
+    latest_completed_session,
+    session_close,
+)
+
+
+@dataclass
+class FreshnessPolicy:
+    """Skip a fetch only when it cannot change the evaluated candles.
+
+    A cached series is current when the market is not trading right now, the
+    series ends at the most recent completed session, it holds at least
+    ``min_bars`` bars, and the manifest says it was fetched after that
+    session's close (so the last bar is final rather than an intraday
+    snapshot). While a market trades, every ticker in it is refetched because
+    the evaluators may use today's partial bar.
+    """
+
+    data_dir: str
+    enabled: bool = True
+    now: dt.datetime | None = None
+    _sessions: dict[str, tuple[dt.date, str]] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False
+    )
+
+    def session(self, market: str) -> tuple[dt.date, str]:
+        with self._lock:
+            cached = self._sessions.get(market)
+            if cached is None:
+                cached = latest_completed_session(
+                    market, now=self.now, data_dir=self.data_dir
+                )
+                self._sessions[market] = cached
+            return cached
+
+    def is_fresh(
+        self,
+        market: str,
+        candles: Candles | None,
+        entry: dict[str, Any] | None,
+        *,
+        min_bars: int,
+    ) -> bool:
+        if not self.enabled or not candles or not entry:
+            return False
+        if len(candles) < min_bars:
+            return False
+        session_date, state = self.session(market)
+        if state == STATE_INTRADAY:
+            return False
+        expected = session_date.strftime("%Y%m%d")
+        if str(candles[-1].get("date") or "") != expected:
+            return False
+        if str(entry.get("last_date") or "") != expected:
+            return False
+        try:
+            fetched_at = dt.datetime.fromisoformat(str(entry.get("fetched_at")))
+        except ValueError:
+            return False
+        if fetched_at.tzinfo is None:
+            fetched_at = fetched_at.replace(tzinfo=dt.UTC)
+        return fetched_at >= session_close(market, session_date)
+
+
+__all__ = ["FreshnessPolicy"]
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import datetime as dt
+import logging
+import time
+
+from .config import Config, load_config
+from .config_loader import ConfigLoadError
+from .data.cache import configure_cache_writes
+from .data.candle_store import open_candle_store
+from .data.kr_eod import (
+    DEFAULT_BACKFILL_SESSIONS,
+    IngestState,
+    Snapshot,
+    ingest_snapshots,
+    load_ingest_state,
+    plan_sessions,
+    save_ingest_state,
+)
+from .data.pykrx_client import PykrxClient, PykrxClientError
+from .data.trading_calendar import trading_calendar
+from .holdings_loader import HoldingsLoadError
+from .signals.eval_index import latest_completed_session
+
+# Sessions fetched before their bars are written and progress is saved.
+_BATCH_SESSIONS = 20
+
+
+def run_ingest(
+    *,
+    since: str | None = None,
+    sessions: int = DEFAULT_BACKFILL_SESSIONS,
+    market: str = "ALL",
+) -> int:
+    """Backfill or extend the full-market KR EOD history, one call per session."""
+    logger = logging.getLogger(__name__)
+    try:
+        cfg: Config = load_config()
+    except (ConfigLoadError, HoldingsLoadError) as exc:
+        logger.error("Configuration loading failed: %s", exc)
+        return 1
+    try:
+        since_date = dt.datetime.strptime(since, "%Y%m%d").date() if since else None
+    except ValueError:
+        logger.error("Invalid --since date (expected YYYYMMDD): %s", since)
+        return 1
+    try:
+        client = PykrxClient(cache_dir=cfg.data_dir)
+    except PykrxClientError as exc:
+        logger.error("%s", exc)
+        return 1
+    configure_cache_writes(
+        write_behind=cfg.cache_write_behind, fsync=cfg.cache_durability == "fsync"
+    )
+
+    state = load_ingest_state(cfg.data_dir)
+    end, _ = latest_completed_session("KR", data_dir=cfg.data_dir)
+    plan = plan_sessions(
+        trading_calendar("KR", cfg.data_dir),
+        end,
+        after=state.last_date if state and not since_date else None,
+        since=since_date,
+        backfill=sessions,
+    )
+    if not plan:
+        logger.info("KR EOD history already at %s; nothing to ingest", end)
+        return 0
+    logger.info("Ingesting %d KR sessions (%s -> %s)", len(plan), plan[0], plan[-1])
+
+    first = plan[0].strftime("%Y%m%d")
+    store = open_candle_store(cfg.data_dir, cfg.candle_store)
+    started = time.perf_counter()
+    written = 0
+    # Sessions without data, pending a later session that has some.
+    empty: list[str] = []
+    for i in range(0, len(plan), _BATCH_SESSIONS):
+        batch: list[tuple[str, Snapshot]] = []
+        failed = False
+        for day in plan[i : i + _BATCH_SESSIONS]:
+            date = day.strftime("%Y%m%d")
+            try:
+                snapshot = client.market_snapshot(date, market=market)
+            except Exception as exc:  # pykrx surfaces scraping errors untyped
+                logger.error("KRX snapshot for %s failed: %s", date, exc)
+                failed = True
+                break
+            if not snapshot:
+                empty.append(date)
+                continue
+            if empty:
+                # A later session has data, so these were closures the
+                # calendar does not know about (its KR seeds are partial).
+                logger.warning(
+                    "No KRX data for %s; treated as market closed", ", ".join(empty)
+                )
+                empty = []
+            batch.append((date, snapshot))
+        if batch:
+            tickers, bars = ingest_snapshots(store, batch)
+            store.flush()
+            written += bars
+            last = batch[-1][0]
+            state = IngestState(
+                first_date=min(state.first_date, first) if state else first,
+                last_date=max(state.last_date, last) if state else last,
+                tickers=sorted(batch[-1][1]),
+            )
+            save_ingest_state(cfg.data_dir, state)
+            logger.info("Ingested through %s: %d tickers, %d bars", last, tickers, bars)
+        if failed:
+            return 1
+    if empty:
+        # The newest sessions may not be published yet; last_date stops before
+        # them so the next run asks again.
+        logger.error("No KRX data for %s yet; the next run retries", ", ".join(empty))
+        return 1
+
+    logger.info(
+        "KR EOD ingest finished in %.1fs: %d bars over %d sessions",
+        time.perf_counter() - started,
+        written,
+        len(plan),
+    )
+    return 0
+
+
+__all__ = ["run_ingest"]
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import logging
+import os
+import time
+from collections.abc import Sequence
+from typing import Any
+
+from .backtest import _backtest_universe, _ticker_meta
+from .config import Config, load_config
+from .config_loader import ConfigLoadError
+from .data.candle_series import Candles
+from .data.candle_store import open_candle_store
+from .holdings_loader import HoldingsLoadError
+from .report.optimize_report import write_optimize_report
+from .scan import _build_hybrid_settings
+from .sell import _build_hybrid_sell_settings
+from .signals.backtest import DEFAULT_MAX_HOLD_BARS
+from .signals.hybrid_buy import HybridEvaluationSettings
+from .signals.hybrid_sell import HybridSellSettings
+from .signals.optimize import (
+    DEFAULT_SPACE,
+    Params,
+    grid,
+    parse_param,
+    rank,
+    run_sweep,
+    sample,
+    space_size,
+)
+
+SweepItem = tuple[str, Candles, dict[str, Any] | None]
+
+
+def _sweep_combos(
+    params: Sequence[str] | None,
+    samples: int | None,
+    seed: int,
+    buy: HybridEvaluationSettings,
+    sell: HybridSellSettings,
+) -> tuple[list[Params], str]:
+    """The combinations to evaluate and a label for the search; may raise."""
+    space: dict[str, Sequence[Any]] = dict(DEFAULT_SPACE)
+    if params:
+        space = dict(parse_param(p, buy, sell) for p in params)
+    if samples:
+        combos = sample(space, samples, seed)
+        return combos, f"random {len(combos)} of {space_size(space)} (seed {seed})"
+    return grid(space), "grid"
+
+
+def _load_items(
+    cfg: Config, limit: int | None, watchlist_path: str | None
+) -> tuple[list[SweepItem], list[str]]:
+    store = open_candle_store(cfg.data_dir, cfg.candle_store)
+    universe = _backtest_universe(cfg, store, watchlist_path)
+    if limit:
+        universe = universe[:limit]
+    items: list[SweepItem] = []
+    failures: list[str] = []
+    for ticker, key in universe:
+        candles = store.load(key)
+        if not candles:
+            failures.append(f"{ticker}: no cached candles")
+            continue
+        entry = store.manifest.get(key) or {}
+        meta = _ticker_meta(cfg, ticker, str(entry.get("source") or "kis"))
+        items.append((ticker, candles, meta))
+    return items, failures
+
+
+def run_optimize(
+    *,
+    limit: int | None = None,
+    watchlist_path: str | None = None,
+    params: Sequence[str] | None = None,
+    samples: int | None = None,
+    seed: int = 0,
+    workers: int | None = None,
+    max_hold_bars: int = DEFAULT_MAX_HOLD_BARS,
+    min_trades: int = 5,
+    top: int = 20,
+) -> int:
+    logger = logging.getLogger(__name__)
+    try:
+        cfg: Config = load_config()
+    except (ConfigLoadError, HoldingsLoadError) as exc:
+        logger.error("Configuration loading failed: %s", exc)
+        return 1
+
+    buy_settings = _build_hybrid_settings(cfg)
+    sell_settings = _build_hybrid_sell_settings(cfg)
+    try:
+        combos, search = _sweep_combos(
+            params, samples, seed, buy_settings, sell_settings
+        )
+    except ValueError as exc:
+        logger.error("Invalid --param: %s", exc)
+        return 1
+
+    items, failures = _load_items(cfg, limit, watchlist_path)
+    if not items:
+        logger.error("No cached candles to optimize on (run scan or ingest first)")
+        return 1
+
+    n_workers = workers if workers is not None else (os.cpu_count() or 1)
+    logger.info(
+        "Sweeping %d combinations over %d tickers on %d workers",
+        len(combos),
+        len(items),
+        n_workers,
+    )
+    started = time.perf_counter()
+    results = rank(
+        run_sweep(
+            items,
+            buy_settings,
+            sell_settings,
+            combos,
+            workers=n_workers,
+            max_hold_bars=max_hold_bars,
+        ),
+        min_trades,
+    )
+    logger.info("Sweep finished in %.1fs", time.perf_counter() - started)
+
+    out_path = write_optimize_report(
+        report_dir=cfg.report_dir,
+        universe_count=len(items),
+        results=results,
+        search=search,
+        max_hold_bars=max_hold_bars,
+        min_trades=min_trades,
+        top=top,
+        failures=failures,
+    )
+    logger.info("Optimize report written to: %s", out_path)
+    return 0
+
+
+__all__ = ["run_optimize"]
@@ -1,4 +1,14 @@
+from .backtest_report import write_backtest_report
 from .markdown import write_report
+from .optimize_report import write_optimize_report
 from .sell_report import SellReportRow, write_sell_report
+from .walkforward_report import write_walkforward_report
 
-__all__ = ["write_report", "SellReportRow", "write_sell_report"]
+__all__ = [
+    "write_report",
+    "SellReportRow",
+    "write_sell_report",
+    "write_backtest_report",
+    "write_optimize_report",
+    "write_walkforward_report",
+]
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import csv
+import io
+import os
+from collections.abc import Iterable, Sequence
+from dataclasses import astuple, fields
+
+from ..signals.backtest import SignalOutcome, summarize
+from ..utils.atomic_io import advisory_path_lock, atomic_write_text
+from .time_label import resolve_report_timestamp
+
+
+def _fmt_percent(value: float | None) -> str:
+    if value is None:
+        return "-"
+    return f"{value * 100:+.1f}%"
+
+
+def _fmt_price(value: float | None) -> str:
+    if value is None:
+        return "-"
+    return f"{value:,.2f}"
+
+
+def _summary_row(label: str, outcomes: Sequence[SignalOutcome]) -> str:
+    s = summarize(outcomes)
+    win_rate = f"{s.win_rate * 100:.0f}%" if s.win_rate is not None else "-"
+    return (
+        f"| {label} | {s.signals} | {s.closed} | {s.wins} | {win_rate} "
+        f"| {_fmt_percent(s.avg_return)} | {s.open} | {s.pending} |"
+    )
+
+
+def _outcomes_csv(outcomes: Sequence[SignalOutcome]) -> str:
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    writer.writerow([f.name for f in fields(SignalOutcome)])
+    for outcome in outcomes:
+        writer.writerow(["" if v is None else v for v in astuple(outcome)])
+    return buf.getvalue()
+
+
+def write_backtest_report(
+    *,
+    report_dir: str,
+    strategy_mode: str,
+    universe_count: int,
+    outcomes: Iterable[SignalOutcome],
+    max_hold_bars: int,
+    recent: int = 20,
+    failures: Iterable[str] | None = None,
+) -> str:
+    """Write the snapshot markdown plus a CSV of every outcome next to it."""
+    os.makedirs(report_dir, exist_ok=True)
+    today, now_str, tz_label = resolve_report_timestamp()
+
+    rows = sorted(outcomes, key=lambda o: (o.signal_date, o.ticker))
+    failures_list = list(failures or [])
+    patterns = sorted({o.pattern for o in rows})
+
+    header: list[str] = []
+    header.append(f"# Backtest Snapshot — {today}")
+    header.append(f"- Run at: {now_str} {tz_label}")
+    header.append(f"- Strategy: {strategy_mode}")
+    header.append(f"- Universe: {universe_count} tickers (local candle cache)")
+    hold = f"{max_hold_bars} bars" if max_hold_bars > 0 else "unlimited"
+    header.append(
+        "- Fills: next open after the signal; exit at the close of the first "
+        f"SELL (max hold {hold})"
+    )
+    if rows:
+        header.append(f"- Period: {rows[0].signal_date} – {rows[-1].signal_date}")
+
+    lines: list[str] = [""]
+    lines.append("## Summary")
+    lines.append(
+        "| Pattern | Signals | Closed | Wins | Win rate | Avg return | Open | Pending |"
+    )
+    lines.append("|---|---:|---:|---:|---:|---:|---:|---:|")
+    if len(patterns) > 1:
+        for pattern in patterns:
+            lines.append(
+                _summary_row(pattern, [o for o in rows if o.pattern == pattern])
+            )
+    lines.append(_summary_row("All", rows))
+    lines.append("")
+
+    lines.append(f"## Recent signals (last {min(recent, len(rows))})")
+    if rows and recent > 0:
+        lines.append(
+            "| Signal | Ticker | Pattern | Entry | Exit | Return | Bars | Status "
+            "| Exit reason |"
+        )
+        lines.append("|---|---|---|---:|---:|---:|---:|---|---|")
+        for o in reversed(rows[-recent:]):
+            lines.append(
+                f"| {o.signal_date} | {o.ticker} | {o.pattern} "
+                f"| {_fmt_price(o.entry_price)} | {_fmt_price(o.exit_price)} "
+                f"| {_fmt_percent(o.return_pct)} | {o.bars_held} | {o.status} "
+                f"| {o.exit_reason.replace('|', '/') or '-'} |"
+            )
+    else:
+        lines.append("_No signals in the cached history._")
+    lines.append("")
+
+    if failures_list:
+        lines.append("### Appendix — Failures")
+        for f in failures_list:
+            lines.append(f"- {f}")
+        lines.append("")
+
+    suffix = ".backtest.md"
+    lock_path = os.path.join(report_dir, ".backtest.report.lock")
+    with advisory_path_lock(lock_path):
+        out_path = os.path.join(report_dir, f"{today}{suffix}")
+        i = 1
+        while os.path.exists(out_path):
+            out_path = os.path.join(report_dir, f"{today}-{i}{suffix}")
+            i += 1
+        csv_path = out_path[: -len(".md")] + ".csv"
+        header.append(f"- Outcomes CSV: {os.path.basename(csv_path)}")
+        atomic_write_text(csv_path, _outcomes_csv(rows))
+        atomic_write_text(out_path, "\n".join(header + lines))
+
+    return out_path
+
+
+__all__ = ["write_backtest_report"]
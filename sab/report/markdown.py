@@ -41,6 +41,7 @@ def write_report(
     cache_hint: str | None = None,
     report_type: str = "buy",
     strategy_mode: str | None = None,
+    metrics_summary: Iterable[str] | None = None,
 ) -> str:
     _ensure_dir(report_dir)
     today, now_str, tz_label = resolve_report_timestamp()
@@ -188,6 +189,13 @@ def write_report(
             lines.append(f"- {f}")
         lines.append("")
 
+    metrics_lines = list(metrics_summary or [])
+    if metrics_lines:
+        lines.append("### Appendix — API Metrics")
+        for item in metrics_lines:
+            lines.append(f"- {item}")
+        lines.append("")
+
     lock_name = f".{report_type}.report.lock" if report_type else ".report.lock"
     lock_path = os.path.join(report_dir, lock_name)
     content = "\n".join(lines)
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import csv
+import io
+import math
+import os
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+from ..signals.optimize import SweepResult
+from ..utils.atomic_io import advisory_path_lock, atomic_write_text
+from .time_label import resolve_report_timestamp
+
+
+def _fmt_percent(value: float | None) -> str:
+    if value is None:
+        return "-"
+    return f"{value * 100:+.2f}%"
+
+
+def _fmt_rate(value: float | None) -> str:
+    if value is None:
+        return "-"
+    return f"{value * 100:.0f}%"
+
+
+def _fmt_factor(value: float | None) -> str:
+    if value is None:
+        return "-"
+    if math.isinf(value):
+        return "∞"
+    return f"{value:.2f}"
+
+
+def _fmt_value(value: Any) -> str:
+    if isinstance(value, float):
+        return f"{value:g}"
+    return str(value)
+
+
+def _results_csv(names: Sequence[str], results: Sequence[SweepResult]) -> str:
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    writer.writerow(
+        [
+            "rank",
+            *names,
+            "signals",
+            "closed",
+            "wins",
+            "hit_rate",
+            "expectancy",
+            "profit_factor",
+        ]
+    )
+    for rank, r in enumerate(results, 1):
+        writer.writerow(
+            [
+                rank,
+                *(r.params.get(name, "") for name in names),
+                r.signals,
+                r.closed,
+                r.wins,
+                "" if r.hit_rate is None else f"{r.hit_rate:.4f}",
+                "" if r.expectancy is None else f"{r.expectancy:.6f}",
+                "" if r.profit_factor is None else f"{r.profit_factor:.4f}",
+            ]
+        )
+    return buf.getvalue()
+
+
+def write_optimize_report(
+    *,
+    report_dir: str,
+    universe_count: int,
+    results: Sequence[SweepResult],
+    search: str,
+    max_hold_bars: int,
+    min_trades: int,
+    top: int = 20,
+    failures: Iterable[str] | None = None,
+) -> str:
+    """Write the ranked sweep table plus a CSV of every combination."""
+    os.makedirs(report_dir, exist_ok=True)
+    today, now_str, tz_label = resolve_report_timestamp()
+    names = list(results[0].params) if results else []
+    failures_list = list(failures or [])
+
+    header: list[str] = []
+    header.append(f"# Hybrid Parameter Sweep — {today}")
+    header.append(f"- Run at: {now_str} {tz_label}")
+    header.append(f"- Universe: {universe_count} tickers (local candle cache)")
+    header.append(f"- Search: {search}, {len(results)} combinations")
+    hold = f"{max_hold_bars} bars" if max_hold_bars > 0 else "unlimited"
+    header.append(
+        "- Fills: next open after the signal; exit at the close of the first "
+        f"SELL (max hold {hold})"
+    )
+    header.append(
+        f"- Ranking: expectancy (mean return per closed trade), then hit rate; "
+        f"fewer than {min_trades} closed trades rank last"
+    )
+
+    lines: list[str] = [""]
+    shown = results[: max(top, 0)]
+    lines.append(f"## Top {len(shown)}")
+    if shown:
+        lines.append(
+            "| # | "
+            + " | ".join(names)
+            + " | Signals | Closed | Hit rate | Expectancy | Profit factor |"
+        )
+        lines.append("|---:|" + "---:|" * len(names) + "---:|---:|---:|---:|---:|")
+        for rank, r in enumerate(shown, 1):
+            values = " | ".join(_fmt_value(r.params.get(n, "")) for n in names)
+            lines.append(
+                f"| {rank} | {values} | {r.signals} | {r.closed} "
+                f"| {_fmt_rate(r.hit_rate)} | {_fmt_percent(r.expectancy)} "
+                f"| {_fmt_factor(r.profit_factor)} |"
+            )
+    else:
+        lines.append("_No parameter combinations were evaluated._")
+    lines.append("")
+
+    if failures_list:
+        lines.append("### Appendix — Failures")
+        for f in failures_list:
+            lines.append(f"- {f}")
+        lines.append("")
+
+    suffix = ".optimize.md"
+    lock_path = os.path.join(report_dir, ".optimize.report.lock")
+    with advisory_path_lock(lock_path):
+        out_path = os.path.join(report_dir, f"{today}{suffix}")
+        i = 1
+        while os.path.exists(out_path):
+            out_path = os.path.join(report_dir, f"{today}-{i}{suffix}")
+            i += 1
+        csv_path = out_path[: -len(".md")] + ".csv"
+        header.append(f"- Results CSV: {os.path.basename(csv_path)}")
+        atomic_write_text(csv_path, _results_csv(names, results))
+        atomic_write_text(out_path, "\n".join(header + lines))
+
+    return out_path
+
+
+__all__ = ["write_optimize_report"]
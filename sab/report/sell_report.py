@@ -115,6 +115,7 @@ def write_sell_report(
     sell_mode: str | None = None,
     sell_mode_note: str | None = None,
     quantity_digits: int = 6,
+    metrics_summary: Iterable[str] | None = None,
 ) -> str:
     _ensure_dir(report_dir)
 
@@ -213,6 +214,13 @@ def write_sell_report(
             lines.append(f"- {item}")
         lines.append("")
 
+    metrics_lines = list(metrics_summary or [])
+    if metrics_lines:
+        lines.append("### Appendix — API Metrics")
+        for item in metrics_lines:
+            lines.append(f"- {item}")
+        lines.append("")
+
     suffix = ".sell.md"
     lock_path = os.path.join(report_dir, ".sell.report.lock")
     content = "\n".join(lines)
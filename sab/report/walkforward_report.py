@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import os
+from collections.abc import Iterable, Sequence
+
+from ..signals.optimize import SweepResult
+from ..signals.walkforward import WindowSelection, out_of_sample
+from ..utils.atomic_io import advisory_path_lock, atomic_write_text
+from .optimize_report import _fmt_factor, _fmt_percent, _fmt_rate, _fmt_value
+from .time_label import resolve_report_timestamp
+
+
+def _params_label(result: SweepResult) -> str:
+    return ", ".join(f"{k}={_fmt_value(v)}" for k, v in result.params.items()) or "-"
+
+
+def _record(result: SweepResult) -> str:
+    return (
+        f"{result.closed} | {_fmt_rate(result.hit_rate)} "
+        f"| {_fmt_percent(result.expectancy)}"
+    )
+
+
+def write_walkforward_report(
+    *,
+    report_dir: str,
+    universe_count: int,
+    selections: Sequence[WindowSelection],
+    search: str,
+    combinations: int,
+    train_bars: int,
+    test_bars: int,
+    step_bars: int,
+    max_hold_bars: int,
+    min_trades: int,
+    failures: Iterable[str] | None = None,
+) -> str:
+    """Write the per-window selections and the combined out-of-sample record."""
+    os.makedirs(report_dir, exist_ok=True)
+    today, now_str, tz_label = resolve_report_timestamp()
+    failures_list = list(failures or [])
+    oos = out_of_sample(selections)
+
+    lines: list[str] = []
+    lines.append(f"# Walk-Forward Validation — {today}")
+    lines.append(f"- Run at: {now_str} {tz_label}")
+    lines.append(f"- Universe: {universe_count} tickers (local candle cache)")
+    lines.append(f"- Search: {search}, {combinations} combinations per window")
+    lines.append(
+        f"- Windows: train {train_bars} bars, test {test_bars} bars, "
+        f"step {step_bars} bars"
+    )
+    hold = f"{max_hold_bars} bars" if max_hold_bars > 0 else "unlimited"
+    lines.append(
+        "- Fills: next open after the signal; exit at the close of the first "
+        f"SELL (max hold {hold})"
+    )
+    lines.append(
+        "- Selection: best train expectancy, then hit rate; train trades must "
+        f"exit inside the window; fewer than {min_trades} rank last"
+    )
+    lines.append("")
+
+    lines.append("## Out-of-sample summary")
+    lines.append(
+        "| Windows | Signals | Closed | Hit rate | Expectancy | Profit factor |"
+    )
+    lines.append("|---:|---:|---:|---:|---:|---:|")
+    lines.append(
+        f"| {len(selections)} | {oos.signals} | {oos.closed} "
+        f"| {_fmt_rate(oos.hit_rate)} | {_fmt_percent(oos.expectancy)} "
+        f"| {_fmt_factor(oos.profit_factor)} |"
+    )
+    distinct = len({tuple(s.train.params.items()) for s in selections})
+    lines.append("")
+    lines.append(f"- Distinct selections: {distinct} of {len(selections)} windows")
+    lines.append("")
+
+    lines.append("## Windows")
+    if selections:
+        lines.append(
+            "| # | Train | Test | Selected | Train closed | Train hit "
+            "| Train exp | Test closed | Test hit | Test exp |"
+        )
+        lines.append("|---:|---|---|---|---:|---:|---:|---:|---:|---:|")
+        for i, s in enumerate(selections, 1):
+            w = s.window
+            lines.append(
+                f"| {i} | {w.train_start}–{w.train_end} "
+                f"| {w.test_start}–{w.test_end} | {_params_label(s.train)} "
+                f"| {_record(s.train)} | {_record(s.test)} |"
+            )
+    else:
+        lines.append("_Not enough history for one train/test window._")
+    lines.append("")
+
+    if failures_list:
+        lines.append("### Appendix — Failures")
+        for f in failures_list:
+            lines.append(f"- {f}")
+        lines.append("")
+
+    suffix = ".walkforward.md"
+    lock_path = os.path.join(report_dir, ".walkforward.report.lock")
+    with advisory_path_lock(lock_path):
+        out_path = os.path.join(report_dir, f"{today}{suffix}")
+        i = 1
+        while os.path.exists(out_path):
+            out_path = os.path.join(report_dir, f"{today}-{i}{suffix}")
+            i += 1
+        atomic_write_text(out_path, "\n".join(lines))
+
+    return out_path
+
+
+__all__ = ["write_walkforward_report"]
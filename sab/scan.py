@@ -3,19 +3,33 @@ from __future__ import annotations
 import datetime as dt
 import logging
 import math
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from typing import Any
 
 from .config import Config, load_config, load_watchlist
 from .config_loader import ConfigLoadError
-from .data.cache import load_json, save_json
-from .data.holiday_cache import HolidayEntry, lookup_holiday, merge_holidays
+from .data.cache import configure_cache_writes
+from .data.candle_series import Candles
+from .data.candle_store import CandleRepository, open_candle_store
+from .data.holiday_cache import (
+    HolidayEntry,
+    holiday_refresh_due,
+    load_cached_holidays,
+    merge_holidays,
+    record_holiday_refresh,
+)
 from .data.kis_client import KISAuthError, KISClient, KISClientError, KISCredentials
+from .data.kr_eod import INGEST_SOURCE, eod_cache_key, load_ingest_state
 from .data.pykrx_client import (
     PykrxClient,
     PykrxClientError,
     PykrxNotInstalledError,
 )
+from .data.request_metrics import RequestMetrics, write_run_metrics
+from .data.trading_calendar import trading_calendar
+from .freshness import FreshnessPolicy
 from .fx import resolve_fx_rate
 from .holdings_loader import HoldingsLoadError
 from .report.markdown import write_report
@@ -28,11 +42,19 @@ from .screener.kis_overseas_screener import (
 )
 from .screener.overseas_screener import ScreenRequest as USScreenRequest
 from .screener.overseas_screener import USSimpleScreener as USScreener
-from .signals.evaluator import EvaluationSettings, evaluate_ticker
+from .signals.batch_evaluator import evaluate_universe
+from .signals.evaluator import EvaluationResult, EvaluationSettings, evaluate_ticker
 from .signals.hybrid_buy import (
+    NO_HYBRID_SIGNAL,
+    HybridEvaluationResult,
     HybridEvaluationSettings,
     evaluate_ticker_hybrid,
 )
+from .signals.indicator_cache import IndicatorCache
+from .signals.indicator_state import IndicatorStateStore
+from .signals.indicators import indicator_backend
+from .signals.parallel_eval import evaluate_in_processes
+from .signals.pipeline import count_rejections
 from .utils.market_time import us_market_status, us_session_info
 
 
@@ -145,11 +167,16 @@ class _ScanRuntime:
     logger: logging.Logger
     tickers: list[str]
     failures: list[str] = field(default_factory=list)
-    market_data: dict[str, list[dict[str, Any]]] = field(default_factory=dict)
+    market_data: dict[str, Candles] = field(default_factory=dict)
     ticker_data_source: dict[str, str] = field(default_factory=dict)
     cache_hint: str | None = None
     fatal_failure: bool = False
     kis_client: KISClient | None = None
+    candle_store: CandleRepository | None = None
+    freshness: FreshnessPolicy | None = None
+    fresh_hits: int = 0
+    indicator_states: IndicatorStateStore | None = None
+    indicator_cache: IndicatorCache | None = None
     pykrx_client: PykrxClient | None = None
     pykrx_import_error: str | None = None
     pykrx_warning_added: bool = False
@@ -160,18 +187,28 @@ class _ScanRuntime:
     us_holidays_cache: dict[str, HolidayEntry] = field(default_factory=dict)
     latest_dates: dict[str, str] = field(default_factory=dict)
     candidates: list[dict[str, Any]] = field(default_factory=list)
+    stage_rejections: dict[str, int] = field(default_factory=dict)
 
 
-def _load_scan_tickers(cfg: Config, watchlist_path: str | None) -> list[str]:
-    resolved_watchlist_path = watchlist_path or cfg.watchlist_path or "watchlist.txt"
-    tickers = load_watchlist(resolved_watchlist_path)
+def _load_scan_tickers(
+    cfg: Config, watchlist_path: str | None, universe: str | None = None
+) -> list[str]:
+    if universe == "market":
+        # Every KR stock in the latest `sab ingest` snapshot.
+        state = load_ingest_state(cfg.data_dir)
+        tickers = state.tickers if state else []
+    else:
+        resolved_watchlist_path = (
+            watchlist_path or cfg.watchlist_path or "watchlist.txt"
+        )
+        tickers = load_watchlist(resolved_watchlist_path)
     if cfg.screen_limit and tickers:
         return tickers[: cfg.screen_limit]
     return tickers
 
 
 def _resolve_screener_flags(cfg: Config, universe: str | None) -> tuple[bool, bool]:
-    if universe == "watchlist":
+    if universe in {"watchlist", "market"}:
         return False, False
     if universe == "screener":
         return True, True
@@ -188,7 +225,7 @@ def _ensure_pykrx_client(runtime: _ScanRuntime) -> PykrxClient | None:
     if runtime.pykrx_import_error:
         return None
     try:
-        runtime.pykrx_client = PykrxClient()
+        runtime.pykrx_client = PykrxClient(cache_dir=runtime.cfg.data_dir)
         runtime.logger.info("PyKRX client initialized for fallback/provider usage")
         return runtime.pykrx_client
     except PykrxNotInstalledError as exc:
@@ -220,7 +257,10 @@ def _initialize_provider(runtime: _ScanRuntime, *, screener_enabled: bool) -> No
         if cfg.kis_min_interval_ms is not None:
             min_interval = max(0.0, cfg.kis_min_interval_ms / 1000.0)
         runtime.kis_client = KISClient(
-            creds, cache_dir=cfg.data_dir, min_interval=min_interval
+            creds,
+            cache_dir=cfg.data_dir,
+            min_interval=min_interval,
+            rate_limit_dir=cfg.data_dir if cfg.kis_shared_rate_limit else None,
         )
         runtime.cache_hint = runtime.kis_client.cache_status
         return
@@ -433,15 +473,29 @@ def _resolve_scan_fx(runtime: _ScanRuntime) -> None:
         runtime.failures.extend(fx_messages)
 
 
+# Fetch a month ahead; reuse that fetch while it still covers the next week.
+_HOLIDAY_FETCH_DAYS = 30
+_HOLIDAY_COVER_DAYS = 7
+
+
 def _refresh_us_holidays(runtime: _ScanRuntime) -> dict[str, HolidayEntry]:
     if runtime.kis_client is None:
         return {}
-    try:
-        now = dt.datetime.now()
-        start = now.strftime("%Y%m%d")
-        end = (now + dt.timedelta(days=30)).strftime("%Y%m%d")
-    except Exception:
-        start = end = dt.date.today().strftime("%Y%m%d")
+    data_dir = runtime.cfg.data_dir
+    today = dt.date.today()
+    start = today.strftime("%Y%m%d")
+    end = (today + dt.timedelta(days=_HOLIDAY_FETCH_DAYS)).strftime("%Y%m%d")
+    cover_end = (today + dt.timedelta(days=_HOLIDAY_COVER_DAYS)).strftime("%Y%m%d")
+
+    if not holiday_refresh_due(
+        data_dir,
+        "US",
+        cover_start=start,
+        cover_end=cover_end,
+        ttl_hours=runtime.cfg.holiday_refresh_hours,
+    ):
+        runtime.logger.info("US holidays fresh in cache; skipping KIS refresh")
+        return load_cached_holidays(data_dir, "US")
 
     runtime.logger.info("Refreshing US holidays via KIS: %s -> %s", start, end)
     try:
@@ -456,7 +510,8 @@ def _refresh_us_holidays(runtime: _ScanRuntime) -> dict[str, HolidayEntry]:
             runtime.logger.info(
                 "US holiday API returned 404 (no entries from %s to %s)", start, end
             )
-            return {}
+            record_holiday_refresh(data_dir, "US", start, end)
+            return load_cached_holidays(data_dir, "US")
         runtime.logger.warning("Failed to refresh US holidays: %s", message)
         return {}
 
@@ -465,7 +520,106 @@ def _refresh_us_holidays(runtime: _ScanRuntime) -> dict[str, HolidayEntry]:
     )
     if items:
         runtime.logger.debug("US holiday sample row: %s", items[0])
-    return merge_holidays(runtime.cfg.data_dir, "US", items)
+    merged = merge_holidays(data_dir, "US", items)
+    record_holiday_refresh(data_dir, "US", start, end)
+    return merged
+
+
+def _candle_store(runtime: _ScanRuntime) -> CandleRepository:
+    if runtime.candle_store is None:
+        runtime.candle_store = open_candle_store(
+            runtime.cfg.data_dir, runtime.cfg.candle_store
+        )
+    return runtime.candle_store
+
+
+def _indicator_states(runtime: _ScanRuntime) -> IndicatorStateStore | None:
+    if not runtime.cfg.indicator_state:
+        return None
+    if runtime.indicator_states is None:
+        runtime.indicator_states = IndicatorStateStore(runtime.cfg.data_dir)
+    return runtime.indicator_states
+
+
+def _freshness(runtime: _ScanRuntime) -> FreshnessPolicy:
+    if runtime.freshness is None:
+        runtime.freshness = FreshnessPolicy(
+            runtime.cfg.data_dir, enabled=runtime.cfg.skip_fresh_fetch
+        )
+    return runtime.freshness
+
+
+@dataclass
+class _KISFetchOutcome:
+    ticker: str
+    base_symbol: str
+    exchange: str | None
+    cache_key: str
+    cached: Candles | None = None
+    candles: Candles | None = None
+    error: KISClientError | None = None
+    fresh_source: str | None = None
+
+
+def _kis_cache_key(ticker: str) -> tuple[str, str | None, str]:
+    """Return ``(base_symbol, exchange, cache_key)`` for a scan ticker."""
+    base_symbol, suffix = _split_overseas(ticker)
+    exchange = _excd_from_suffix(suffix)
+    cache_key = (
+        f"candles_overseas_{exchange}_{base_symbol}"
+        if exchange
+        else f"candles_{ticker}"
+    )
+    return base_symbol, exchange, cache_key
+
+
+def _fetch_kis_candles(runtime: _ScanRuntime, ticker: str) -> _KISFetchOutcome:
+    """Load the cache and fetch candles for one ticker (runs on a worker thread)."""
+    cfg = runtime.cfg
+    client = runtime.kis_client
+    assert client is not None
+    base_symbol, exchange, cache_key = _kis_cache_key(ticker)
+    outcome = _KISFetchOutcome(
+        ticker=ticker, base_symbol=base_symbol, exchange=exchange, cache_key=cache_key
+    )
+    store = _candle_store(runtime)
+    outcome.cached = store.load(cache_key)
+    count = max(cfg.min_history_bars, 200)
+    entry = store.manifest.get(cache_key)
+    if _freshness(runtime).is_fresh(
+        "US" if exchange else "KR", outcome.cached, entry, min_bars=count
+    ):
+        assert entry is not None
+        outcome.fresh_source = str(entry.get("source") or "kis")
+        return outcome
+    if not exchange and not outcome.cached:
+        # `sab ingest` history is unadjusted, so it never stands in for (or
+        # merges into) a ticker's KIS history; it only covers tickers without.
+        eod_key = eod_cache_key(base_symbol)
+        eod = store.load(eod_key)
+        eod_entry = store.manifest.get(eod_key)
+        if _freshness(runtime).is_fresh("KR", eod, eod_entry, min_bars=count):
+            outcome.cached = eod
+            outcome.fresh_source = INGEST_SOURCE
+            return outcome
+
+    try:
+        if exchange:
+            outcome.candles = client.overseas_daily_candles(
+                symbol=base_symbol,
+                exchange=exchange,
+                count=count,
+                cached=outcome.cached,
+            )
+        else:
+            outcome.candles = client.daily_candles(
+                base_symbol,
+                count=count,
+                cached=outcome.cached,
+            )
+    except (KISClientError, KISAuthError) as exc:
+        outcome.error = exc
+    return outcome
 
 
 def _collect_market_data_from_kis(runtime: _ScanRuntime) -> None:
@@ -478,99 +632,133 @@ def _collect_market_data_from_kis(runtime: _ScanRuntime) -> None:
     ):
         runtime.us_holidays_cache = _refresh_us_holidays(runtime)
 
+    # Open the store and resolve sessions once before workers share them;
+    # freshness for planning comes from the manifest, not every candle file.
+    store = _candle_store(runtime)
+    freshness = _freshness(runtime)
+    for market in {"US" if _kis_cache_key(t)[1] else "KR" for t in runtime.tickers}:
+        freshness.session(market)
     for ticker in runtime.tickers:
-        base_symbol, suffix = _split_overseas(ticker)
-        exchange = _excd_from_suffix(suffix)
-        cache_key = (
-            f"candles_overseas_{exchange}_{base_symbol}"
-            if exchange
-            else f"candles_{ticker}"
+        last_date = store.last_date(_kis_cache_key(ticker)[2])
+        if last_date:
+            runtime.latest_dates[ticker] = last_date
+    runtime.logger.debug(
+        "Manifest has %d/%d tickers cached",
+        len(runtime.latest_dates),
+        len(runtime.tickers),
+    )
+
+    # Workers only fetch; results are applied here in ticker order so that
+    # failures, cache writes and PyKRX fallbacks stay deterministic.
+    workers = max(1, min(cfg.kis_concurrency, len(runtime.tickers)))
+    try:
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="sab-kis"
+        ) as pool:
+            outcomes = pool.map(
+                lambda ticker: _fetch_kis_candles(runtime, ticker), runtime.tickers
+            )
+            for outcome in outcomes:
+                _apply_kis_outcome(runtime, outcome)
+    finally:
+        # Staged (sqlite) saves land even if applying an outcome fails.
+        _candle_store(runtime).flush()
+    if runtime.fresh_hits:
+        runtime.logger.info(
+            "Used cached candles for %d/%d tickers already at the latest session",
+            runtime.fresh_hits,
+            len(runtime.tickers),
         )
-        cached = load_json(cfg.data_dir, cache_key)
-        if isinstance(cached, list) and cached:
-            runtime.market_data[ticker] = cached
-            runtime.ticker_data_source.setdefault(ticker, cfg.data_provider)
-            last_date = str(cached[-1].get("date") or "")
+
+
+def _apply_kis_outcome(runtime: _ScanRuntime, outcome: _KISFetchOutcome) -> None:
+    cfg = runtime.cfg
+    ticker = outcome.ticker
+    base_symbol = outcome.base_symbol
+    exchange = outcome.exchange
+    cached = outcome.cached
+    if cached:
+        runtime.market_data[ticker] = cached
+        runtime.ticker_data_source.setdefault(ticker, cfg.data_provider)
+        last_date = str(cached[-1].get("date") or "")
+        if last_date:
+            runtime.latest_dates[ticker] = last_date
+
+    if cached and outcome.fresh_source:
+        runtime.ticker_data_source[ticker] = outcome.fresh_source
+        runtime.fresh_hits += 1
+        return
+
+    exc = outcome.error
+    if exc is None:
+        candles = outcome.candles
+        if candles:
+            runtime.market_data[ticker] = candles
+            runtime.ticker_data_source[ticker] = "kis"
+            _candle_store(runtime).save(outcome.cache_key, candles)
+            last_date = str(candles[-1].get("date") or "")
             if last_date:
                 runtime.latest_dates[ticker] = last_date
+            runtime.logger.info("Fetched %s candles for %s", len(candles), ticker)
+        else:
+            msg = f"{ticker}: No candle data returned"
+            runtime.failures.append(msg)
+            runtime.logger.warning(msg)
+        return
+
+    if ticker in runtime.market_data:
+        msg = f"{ticker}: API error, using cached data ({exc})"
+        runtime.failures.append(msg)
+        runtime.logger.warning(msg)
+        return
 
+    fallback_client = _ensure_pykrx_client(runtime)
+    fallback_error: str | None = None
+    if fallback_client is not None and not exchange:
+        # PyKRX only supports KR tickers, skip if overseas
         try:
-            if exchange:
-                candles = runtime.kis_client.overseas_daily_candles(
-                    symbol=base_symbol,
-                    exchange=exchange,
-                    count=max(cfg.min_history_bars, 200),
-                )
-            else:
-                candles = runtime.kis_client.daily_candles(
-                    base_symbol, count=max(cfg.min_history_bars, 200)
-                )
+            candles = fallback_client.daily_candles(
+                base_symbol, count=max(cfg.min_history_bars, 200)
+            )
+        except PykrxClientError as py_exc:
+            fallback_client = None
+            fallback_error = str(py_exc)
+        else:
             if candles:
                 runtime.market_data[ticker] = candles
-                runtime.ticker_data_source[ticker] = "kis"
-                save_json(cfg.data_dir, cache_key, candles)
+                runtime.ticker_data_source[ticker] = "pykrx"
                 last_date = str(candles[-1].get("date") or "")
                 if last_date:
                     runtime.latest_dates[ticker] = last_date
-                runtime.logger.info("Fetched %s candles for %s", len(candles), ticker)
-            else:
-                msg = f"{ticker}: No candle data returned"
-                runtime.failures.append(msg)
-                runtime.logger.warning(msg)
-        except (KISClientError, KISAuthError) as exc:
-            if ticker in runtime.market_data:
-                msg = f"{ticker}: API error, using cached data ({exc})"
-                runtime.failures.append(msg)
-                runtime.logger.warning(msg)
-                continue
-
-            fallback_client = _ensure_pykrx_client(runtime)
-            fallback_error: str | None = None
-            if fallback_client is not None and not exchange:
-                # PyKRX only supports KR tickers, skip if overseas
-                try:
-                    candles = fallback_client.daily_candles(
-                        base_symbol, count=max(cfg.min_history_bars, 200)
-                    )
-                except PykrxClientError as py_exc:
-                    fallback_client = None
-                    fallback_error = str(py_exc)
-                else:
-                    if candles:
-                        runtime.market_data[ticker] = candles
-                        runtime.ticker_data_source[ticker] = "pykrx"
-                        last_date = str(candles[-1].get("date") or "")
-                        if last_date:
-                            runtime.latest_dates[ticker] = last_date
-                        runtime.logger.warning(
-                            "%s: KIS error (%s); used PyKRX fallback (%s candles)",
-                            ticker,
-                            exc,
-                            len(candles),
-                        )
-                        runtime.failures.append(
-                            f"{ticker}: KIS error ({exc}); used PyKRX fallback"
-                        )
-                        if not runtime.pykrx_warning_added:
-                            runtime.failures.append(
-                                "Warning: PyKRX fallback data is end-of-day and may differ from KIS."
-                            )
-                            runtime.pykrx_warning_added = True
-                        continue
-                    fallback_error = "No data from PyKRX"
-                    fallback_client = None
-            else:
-                fallback_error = (
-                    runtime.pykrx_import_error
-                    if not exchange
-                    else "Overseas symbol; no PyKRX fallback"
+                runtime.logger.warning(
+                    "%s: KIS error (%s); used PyKRX fallback (%s candles)",
+                    ticker,
+                    exc,
+                    len(candles),
+                )
+                runtime.failures.append(
+                    f"{ticker}: KIS error ({exc}); used PyKRX fallback"
                 )
+                if not runtime.pykrx_warning_added:
+                    runtime.failures.append(
+                        "Warning: PyKRX fallback data is end-of-day and may differ from KIS."
+                    )
+                    runtime.pykrx_warning_added = True
+                return
+            fallback_error = "No data from PyKRX"
+            fallback_client = None
+    else:
+        fallback_error = (
+            runtime.pykrx_import_error
+            if not exchange
+            else "Overseas symbol; no PyKRX fallback"
+        )
 
-            msg = f"{ticker}: {exc}"
-            if fallback_client is None and fallback_error:
-                msg += f" ({fallback_error})"
-            runtime.failures.append(msg)
-            runtime.logger.error(msg)
+    msg = f"{ticker}: {exc}"
+    if fallback_client is None and fallback_error:
+        msg += f" ({fallback_error})"
+    runtime.failures.append(msg)
+    runtime.logger.error(msg)
 
 
 def _collect_market_data_from_pykrx(runtime: _ScanRuntime) -> None:
@@ -622,9 +810,8 @@ def _collect_market_data(runtime: _ScanRuntime) -> None:
         runtime.fatal_failure = True
 
 
-def _evaluate_candidates(runtime: _ScanRuntime) -> None:
-    cfg = runtime.cfg
-    eval_settings = EvaluationSettings(
+def _build_eval_settings(cfg: Config) -> EvaluationSettings:
+    return EvaluationSettings(
         use_sma200_filter=cfg.use_sma200_filter,
         gap_atr_multiplier=cfg.gap_atr_multiplier,
         min_dollar_volume=cfg.min_dollar_volume,
@@ -637,7 +824,10 @@ def _evaluate_candidates(runtime: _ScanRuntime) -> None:
         min_price=cfg.min_price,
         us_min_price=cfg.us_min_price,
     )
-    hybrid_settings = HybridEvaluationSettings(
+
+
+def _build_hybrid_settings(cfg: Config) -> HybridEvaluationSettings:
+    return HybridEvaluationSettings(
         sma_trend_period=cfg.hybrid.sma_trend_period,
         ema_short_period=cfg.hybrid.ema_short_period,
         ema_mid_period=cfg.hybrid.ema_mid_period,
@@ -663,10 +853,24 @@ def _evaluate_candidates(runtime: _ScanRuntime) -> None:
         exclude_etf_etn=cfg.exclude_etf_etn,
     )
 
+
+def _evaluate_candidates(runtime: _ScanRuntime) -> None:
+    cfg = runtime.cfg
+    eval_settings = _build_eval_settings(cfg)
+    hybrid_settings = _build_hybrid_settings(cfg)
+
+    states = _indicator_states(runtime)
+    pending: list[tuple[str, Candles, dict[str, Any], dict[str, Any]]] = []
     for ticker in runtime.tickers:
         ticker_candles = runtime.market_data.get(ticker)
         if not ticker_candles:
             continue
+        # Only passed when enabled, so the default call keeps its old shape.
+        state_kw: dict[str, Any] = {}
+        if states is not None:
+            state_kw["indicator_state"] = states.get(ticker)
+        if runtime.indicator_cache is not None:
+            state_kw["indicator_cache"] = runtime.indicator_cache
 
         meta = dict(runtime.screener_meta_map.get(ticker, {}))
         meta["currency"] = runtime.ticker_currency.get(ticker, "KRW")
@@ -680,26 +884,51 @@ def _evaluate_candidates(runtime: _ScanRuntime) -> None:
         if runtime.fx_rate is not None:
             meta["usd_krw_rate"] = runtime.fx_rate
 
-        if cfg.strategy_mode == "sma_ema_hybrid":
-            result_hybrid = evaluate_ticker_hybrid(
-                ticker, ticker_candles, hybrid_settings, meta
-            )
-            if result_hybrid.candidate:
-                runtime.candidates.append(result_hybrid.candidate)
-            elif (
-                result_hybrid.reason
-                and result_hybrid.reason != "Did not meet hybrid signal criteria"
-            ):
-                runtime.failures.append(f"{ticker}: {result_hybrid.reason}")
-                runtime.logger.warning("%s: %s", ticker, result_hybrid.reason)
-            continue
+        pending.append((ticker, ticker_candles, meta, state_kw))
+
+    hybrid = cfg.strategy_mode == "sma_ema_hybrid"
+    # Indicator state/cache are per-ticker hooks only the serial path uses.
+    hooks = states is not None or runtime.indicator_cache is not None
+    items = [(ticker, candles, meta) for ticker, candles, meta, _ in pending]
+    results: Sequence[EvaluationResult | HybridEvaluationResult]
+    if (
+        not hybrid
+        and not hooks
+        and cfg.batch_evaluation
+        and indicator_backend() == "numpy"
+    ):
+        results = evaluate_universe(items, eval_settings)
+    elif not hooks and cfg.eval_workers > 1:
+        settings = hybrid_settings if hybrid else eval_settings
+        results = evaluate_in_processes(items, settings, workers=cfg.eval_workers)
+    elif hybrid:
+        results = [
+            evaluate_ticker_hybrid(ticker, candles, hybrid_settings, meta, **state_kw)
+            for ticker, candles, meta, state_kw in pending
+        ]
+    else:
+        results = [
+            evaluate_ticker(ticker, candles, eval_settings, meta, **state_kw)
+            for ticker, candles, meta, state_kw in pending
+        ]
+
+    runtime.stage_rejections = count_rejections(results)
+    if runtime.stage_rejections:
+        runtime.logger.info(
+            "Rejections by stage: %s",
+            ", ".join(f"{k}={v}" for k, v in runtime.stage_rejections.items()),
+        )
 
-        result = evaluate_ticker(ticker, ticker_candles, eval_settings, meta)
+    no_signal = NO_HYBRID_SIGNAL if hybrid else "Did not meet signal criteria"
+    for result in results:
         if result.candidate:
             runtime.candidates.append(result.candidate)
-        elif result.reason and result.reason != "Did not meet signal criteria":
-            runtime.failures.append(f"{ticker}: {result.reason}")
-            runtime.logger.warning("%s: %s", ticker, result.reason)
+        elif result.reason and result.reason != no_signal:
+            runtime.failures.append(f"{result.ticker}: {result.reason}")
+            runtime.logger.warning("%s: %s", result.ticker, result.reason)
+
+    if states is not None:
+        states.flush()
 
 
 def _decorate_candidates(runtime: _ScanRuntime) -> None:
@@ -716,7 +945,8 @@ def _decorate_candidates(runtime: _ScanRuntime) -> None:
             if not holiday_entry:
                 try:
                     date_obj = dt.datetime.strptime(date_key, "%Y%m%d").date()
-                    holiday_entry = lookup_holiday(runtime.cfg.data_dir, "US", date_obj)
+                    calendar = trading_calendar("US", runtime.cfg.data_dir)
+                    holiday_entry = calendar.holiday(date_obj)
                 except ValueError:
                     holiday_entry = None
 
@@ -728,6 +958,47 @@ def _decorate_candidates(runtime: _ScanRuntime) -> None:
             candidate["market_status"] = f"US market {us_market_status()}"
 
 
+def _metrics_extra(runtime: _ScanRuntime, settings: dict[str, Any]) -> dict[str, Any]:
+    extra: dict[str, Any] = {
+        "settings": settings,
+        "fresh_cache_hits": runtime.fresh_hits,
+    }
+    if runtime.indicator_cache is not None:
+        extra["indicator_cache"] = runtime.indicator_cache.stats()
+    if runtime.stage_rejections:
+        extra["stage_rejections"] = runtime.stage_rejections
+    return extra
+
+
+def _record_run_metrics(runtime: _ScanRuntime, command: str) -> list[str]:
+    """Persist this run's KIS request metrics and return appendix lines."""
+    client = runtime.kis_client
+    metrics = getattr(client, "metrics", None)
+    if not isinstance(metrics, RequestMetrics):
+        return []
+    limiter = getattr(client, "rate_limiter", None)
+    settings = {
+        "kis_min_interval_ms": runtime.cfg.kis_min_interval_ms,
+        "kis_concurrency": runtime.cfg.kis_concurrency,
+        "final_rate_per_s": getattr(limiter, "rate", None),
+    }
+    lines = metrics.summary_lines()
+    try:
+        path = write_run_metrics(
+            runtime.cfg.data_dir,
+            command,
+            metrics,
+            extra=_metrics_extra(runtime, settings),
+        )
+    except OSError as exc:
+        runtime.logger.warning("Failed to write request metrics: %s", exc)
+        return lines
+    runtime.logger.info("Request metrics written to: %s", path)
+    if lines:
+        lines.append(f"Details: {path}")
+    return lines
+
+
 def _write_scan_report(runtime: _ScanRuntime) -> str:
     return write_report(
         report_dir=runtime.cfg.report_dir,
@@ -738,6 +1009,7 @@ def _write_scan_report(runtime: _ScanRuntime) -> str:
         cache_hint=runtime.cache_hint,
         report_type="buy",
         strategy_mode=runtime.cfg.strategy_mode,
+        metrics_summary=_record_run_metrics(runtime, "scan"),
     )
 
 
@@ -748,6 +1020,7 @@ def run_scan(
     provider: str | None,
     screener_limit: int | None = None,
     universe: str | None = None,
+    indicator_cache: IndicatorCache | None = None,
 ) -> int:
     logger = logging.getLogger(__name__)
     try:
@@ -755,11 +1028,16 @@ def run_scan(
     except (ConfigLoadError, HoldingsLoadError) as exc:
         logger.error("Configuration loading failed: %s", exc)
         return 1
+    # Queued cache writes are flushed after collection and again at exit.
+    configure_cache_writes(
+        write_behind=cfg.cache_write_behind, fsync=cfg.cache_durability == "fsync"
+    )
 
     runtime = _ScanRuntime(
         cfg=cfg,
         logger=logger,
-        tickers=_load_scan_tickers(cfg, watchlist_path),
+        tickers=_load_scan_tickers(cfg, watchlist_path, universe),
+        indicator_cache=indicator_cache,
     )
     effective_screener_limit: int = (
         cfg.screener_limit if screener_limit is None else screener_limit
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import datetime as dt
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Any
 
@@ -58,11 +59,10 @@ class KISOverseasScreener:
 
         for nd in ndays:
             tried_ndays.append(nd)
-            for exch in exchanges:
-                remaining = request.limit - len(tickers)
-                if remaining <= 0:
+            ranked = self._fetch_exchanges(metric, exchanges, request.limit, nday=nd)
+            for exch, rows in zip(exchanges, ranked, strict=True):
+                if len(tickers) >= request.limit:
                     break
-                rows = self._fetch_rank(metric, exch, remaining, nday=nd)
                 if not rows:
                     continue
                 for row in rows:
@@ -118,6 +118,29 @@ class KISOverseasScreener:
         code = (exchange or "NAS").strip().upper()
         return mapping.get(code, code)
 
+    def _fetch_exchanges(
+        self, metric: str, exchanges: list[str], limit: int, *, nday: int
+    ) -> list[list[dict[str, Any]]]:
+        """Rank rows of each exchange, in ``exchanges`` (priority) order.
+
+        The exchanges are queried concurrently, paced by the client's shared
+        rate limiter. Each is asked for the full ``limit`` since how many rows
+        the higher-priority exchanges contribute is not known up front.
+        """
+        if len(exchanges) <= 1:
+            return [
+                self._fetch_rank(metric, exch, limit, nday=nday) for exch in exchanges
+            ]
+        with ThreadPoolExecutor(
+            max_workers=len(exchanges), thread_name_prefix="sab-rank"
+        ) as pool:
+            return list(
+                pool.map(
+                    lambda exch: self._fetch_rank(metric, exch, limit, nday=nday),
+                    exchanges,
+                )
+            )
+
     def _fetch_rank(
         self, metric: str, exchange: str, limit: int, *, nday: int = 0
     ) -> list[dict[str, Any]]:
@@ -2,18 +2,23 @@ from __future__ import annotations
 
 import logging
 import math
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from typing import Any
 
 from .config import Config, load_config
 from .config_loader import ConfigLoadError
-from .data.cache import load_json, save_json
+from .data.cache import configure_cache_writes
+from .data.candle_series import Candles
+from .data.candle_store import CandleRepository, open_candle_store
 from .data.kis_client import KISAuthError, KISClient, KISClientError, KISCredentials
 from .data.pykrx_client import (
     PykrxClient,
     PykrxClientError,
     PykrxNotInstalledError,
 )
+from .data.request_metrics import RequestMetrics, write_run_metrics
+from .freshness import FreshnessPolicy
 from .fx import SUFFIX_TO_EXCD, resolve_fx_rate
 from .holdings_loader import HoldingsLoadError
 from .report.sell_report import SellReportRow, write_sell_report
@@ -22,6 +27,8 @@ from .signals.hybrid_sell import (
     HybridSellSettings,
     evaluate_sell_signals_hybrid,
 )
+from .signals.indicator_cache import IndicatorCache
+from .signals.indicator_state import IndicatorStateStore
 from .signals.sell_rules import SellEvaluation, SellSettings, evaluate_sell_signals
 
 
@@ -71,11 +78,16 @@ class _SellRuntime:
     unique_tickers: list[str]
     ticker_currency: dict[str, str]
     failures: list[str] = field(default_factory=list)
-    market_data: dict[str, list[dict[str, Any]]] = field(default_factory=dict)
+    market_data: dict[str, Candles] = field(default_factory=dict)
     ticker_data_source: dict[str, str] = field(default_factory=dict)
     cache_hint: str | None = None
     fatal_failure: bool = False
     kis_client: KISClient | None = None
+    candle_store: CandleRepository | None = None
+    freshness: FreshnessPolicy | None = None
+    fresh_hits: int = 0
+    indicator_states: IndicatorStateStore | None = None
+    indicator_cache: IndicatorCache | None = None
     pykrx_client: PykrxClient | None = None
     pykrx_init_error: str | None = None
     pykrx_warning_added: bool = False
@@ -148,7 +160,10 @@ def _initialize_provider(runtime: _SellRuntime) -> None:
         if cfg.kis_min_interval_ms is not None:
             min_interval = max(0.0, cfg.kis_min_interval_ms / 1000.0)
         runtime.kis_client = KISClient(
-            creds, cache_dir=cfg.data_dir, min_interval=min_interval
+            creds,
+            cache_dir=cfg.data_dir,
+            min_interval=min_interval,
+            rate_limit_dir=cfg.data_dir if cfg.kis_shared_rate_limit else None,
         )
         runtime.cache_hint = runtime.kis_client.cache_status
         return
@@ -191,88 +206,190 @@ def _resolve_sell_fx(runtime: _SellRuntime) -> None:
         runtime.failures.extend(fx_messages)
 
 
+def _candle_store(runtime: _SellRuntime) -> CandleRepository:
+    if runtime.candle_store is None:
+        runtime.candle_store = open_candle_store(
+            runtime.cfg.data_dir, runtime.cfg.candle_store
+        )
+    return runtime.candle_store
+
+
+def _indicator_states(runtime: _SellRuntime) -> IndicatorStateStore | None:
+    if not runtime.cfg.indicator_state:
+        return None
+    if runtime.indicator_states is None:
+        runtime.indicator_states = IndicatorStateStore(runtime.cfg.data_dir)
+    return runtime.indicator_states
+
+
+def _freshness(runtime: _SellRuntime) -> FreshnessPolicy:
+    if runtime.freshness is None:
+        runtime.freshness = FreshnessPolicy(
+            runtime.cfg.data_dir, enabled=runtime.cfg.skip_fresh_fetch
+        )
+    return runtime.freshness
+
+
+@dataclass
+class _KISFetchOutcome:
+    ticker: str
+    base_symbol: str
+    exchange: str | None
+    cache_key: str
+    cached: Candles | None = None
+    candles: Candles | None = None
+    error: KISClientError | None = None
+    fresh_source: str | None = None
+
+
+def _fetch_kis_candles(
+    runtime: _SellRuntime, ticker: str, *, target_bars: int
+) -> _KISFetchOutcome:
+    """Load the cache and fetch candles for one holding (runs on a worker thread)."""
+    client = runtime.kis_client
+    assert client is not None
+    base_symbol, suffix = _split_symbol_and_suffix(ticker)
+    exchange = _exchange_from_suffix(suffix)
+    cache_key = (
+        f"candles_overseas_{exchange}_{base_symbol}"
+        if exchange
+        else f"candles_{base_symbol}"
+    )
+    outcome = _KISFetchOutcome(
+        ticker=ticker, base_symbol=base_symbol, exchange=exchange, cache_key=cache_key
+    )
+    store = _candle_store(runtime)
+    outcome.cached = store.load(cache_key)
+    entry = store.manifest.get(cache_key)
+    if _freshness(runtime).is_fresh(
+        "US" if exchange else "KR", outcome.cached, entry, min_bars=target_bars
+    ):
+        assert entry is not None
+        outcome.fresh_source = str(entry.get("source") or "kis")
+        return outcome
+
+    try:
+        if exchange:
+            outcome.candles = client.overseas_daily_candles(
+                symbol=base_symbol,
+                exchange=exchange,
+                count=target_bars,
+                cached=outcome.cached,
+            )
+        else:
+            outcome.candles = client.daily_candles(
+                base_symbol, count=target_bars, cached=outcome.cached
+            )
+    except (KISClientError, KISAuthError) as exc:
+        outcome.error = exc
+    return outcome
+
+
 def _collect_market_data_from_kis(runtime: _SellRuntime, *, target_bars: int) -> None:
     if runtime.kis_client is None:
         return
 
+    # Open the store and resolve sessions once before workers share them.
+    _candle_store(runtime)
+    freshness = _freshness(runtime)
     for ticker in runtime.unique_tickers:
-        base_symbol, suffix = _split_symbol_and_suffix(ticker)
-        exchange = _exchange_from_suffix(suffix)
-        cache_key = (
-            f"candles_overseas_{exchange}_{base_symbol}"
-            if exchange
-            else f"candles_{base_symbol}"
+        suffix = _split_symbol_and_suffix(ticker)[1]
+        freshness.session("US" if _exchange_from_suffix(suffix) else "KR")
+    # Fetch concurrently, apply in holding order (see scan._collect_market_data_from_kis).
+    workers = max(1, min(runtime.cfg.kis_concurrency, len(runtime.unique_tickers)))
+    try:
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="sab-kis"
+        ) as pool:
+            outcomes = pool.map(
+                lambda ticker: _fetch_kis_candles(
+                    runtime, ticker, target_bars=target_bars
+                ),
+                runtime.unique_tickers,
+            )
+            for outcome in outcomes:
+                _apply_kis_outcome(runtime, outcome, target_bars=target_bars)
+    finally:
+        # Staged (sqlite) saves land even if applying an outcome fails.
+        _candle_store(runtime).flush()
+    if runtime.fresh_hits:
+        runtime.logger.info(
+            "Used cached candles for %d/%d holdings already at the latest session",
+            runtime.fresh_hits,
+            len(runtime.unique_tickers),
         )
-        cached = load_json(runtime.cfg.data_dir, cache_key)
-        if isinstance(cached, list) and cached:
-            runtime.market_data[ticker] = cached
-            runtime.ticker_data_source.setdefault(ticker, runtime.cfg.data_provider)
 
+
+def _apply_kis_outcome(
+    runtime: _SellRuntime, outcome: _KISFetchOutcome, *, target_bars: int
+) -> None:
+    ticker = outcome.ticker
+    base_symbol = outcome.base_symbol
+    exchange = outcome.exchange
+    if outcome.cached:
+        runtime.market_data[ticker] = outcome.cached
+        runtime.ticker_data_source.setdefault(ticker, runtime.cfg.data_provider)
+        if outcome.fresh_source:
+            runtime.ticker_data_source[ticker] = outcome.fresh_source
+            runtime.fresh_hits += 1
+            return
+
+    exc = outcome.error
+    if exc is None:
+        candles = outcome.candles
+        if candles:
+            runtime.market_data[ticker] = candles
+            runtime.ticker_data_source[ticker] = "kis"
+            _candle_store(runtime).save(outcome.cache_key, candles)
+            runtime.logger.info("Fetched %s candles for %s", len(candles), ticker)
+        else:
+            msg = f"{ticker}: No candle data returned"
+            runtime.failures.append(msg)
+            runtime.logger.warning(msg)
+        return
+
+    if ticker in runtime.market_data:
+        msg = f"{ticker}: API error, using cached data ({exc})"
+        runtime.failures.append(msg)
+        runtime.logger.warning(msg)
+        return
+
+    fallback_client = _ensure_pykrx_client(runtime)
+    fallback_error = runtime.pykrx_init_error
+    if fallback_client is not None and not exchange:
+        # PyKRX supports KR tickers only.
         try:
-            if exchange:
-                candles = runtime.kis_client.overseas_daily_candles(
-                    symbol=base_symbol,
-                    exchange=exchange,
-                    count=target_bars,
-                )
-            else:
-                candles = runtime.kis_client.daily_candles(
-                    base_symbol, count=target_bars
-                )
+            candles = fallback_client.daily_candles(base_symbol, count=target_bars)
+        except PykrxClientError as py_exc:
+            fallback_client = None
+            fallback_error = str(py_exc)
+        else:
             if candles:
                 runtime.market_data[ticker] = candles
-                runtime.ticker_data_source[ticker] = "kis"
-                save_json(runtime.cfg.data_dir, cache_key, candles)
-                runtime.logger.info("Fetched %s candles for %s", len(candles), ticker)
-            else:
-                msg = f"{ticker}: No candle data returned"
-                runtime.failures.append(msg)
-                runtime.logger.warning(msg)
-        except (KISClientError, KISAuthError) as exc:
-            if ticker in runtime.market_data:
-                msg = f"{ticker}: API error, using cached data ({exc})"
-                runtime.failures.append(msg)
-                runtime.logger.warning(msg)
-                continue
-
-            fallback_client = _ensure_pykrx_client(runtime)
-            fallback_error = runtime.pykrx_init_error
-            if fallback_client is not None and not exchange:
-                # PyKRX supports KR tickers only.
-                try:
-                    candles = fallback_client.daily_candles(
-                        base_symbol, count=target_bars
+                runtime.ticker_data_source[ticker] = "pykrx"
+                runtime.logger.warning(
+                    "%s: KIS error (%s); used PyKRX fallback (%s candles)",
+                    ticker,
+                    exc,
+                    len(candles),
+                )
+                runtime.failures.append(
+                    f"{ticker}: KIS error ({exc}); used PyKRX fallback"
+                )
+                if not runtime.pykrx_warning_added:
+                    runtime.failures.append(
+                        "Warning: PyKRX fallback data is end-of-day and may differ from KIS."
                     )
-                except PykrxClientError as py_exc:
-                    fallback_client = None
-                    fallback_error = str(py_exc)
-                else:
-                    if candles:
-                        runtime.market_data[ticker] = candles
-                        runtime.ticker_data_source[ticker] = "pykrx"
-                        runtime.logger.warning(
-                            "%s: KIS error (%s); used PyKRX fallback (%s candles)",
-                            ticker,
-                            exc,
-                            len(candles),
-                        )
-                        runtime.failures.append(
-                            f"{ticker}: KIS error ({exc}); used PyKRX fallback"
-                        )
-                        if not runtime.pykrx_warning_added:
-                            runtime.failures.append(
-                                "Warning: PyKRX fallback data is end-of-day and may differ from KIS."
-                            )
-                            runtime.pykrx_warning_added = True
-                        continue
-                    fallback_error = "No data from PyKRX"
-                    fallback_client = None
-
-            msg = f"{ticker}: {exc}"
-            if (fallback_client is None or exchange) and fallback_error:
-                msg += f" (PyKRX fallback unavailable: {fallback_error})"
-            runtime.failures.append(msg)
-            runtime.logger.error(msg)
+                    runtime.pykrx_warning_added = True
+                return
+            fallback_error = "No data from PyKRX"
+            fallback_client = None
+
+    msg = f"{ticker}: {exc}"
+    if (fallback_client is None or exchange) and fallback_error:
+        msg += f" (PyKRX fallback unavailable: {fallback_error})"
+    runtime.failures.append(msg)
+    runtime.logger.error(msg)
 
 
 def _collect_market_data_from_pykrx(runtime: _SellRuntime, *, target_bars: int) -> None:
@@ -350,6 +467,7 @@ def _evaluate_holdings(runtime: _SellRuntime) -> list[SellReportRow]:
     results: list[SellReportRow] = []
     settings = _build_sell_settings(runtime.cfg)
     hybrid_settings = _build_hybrid_sell_settings(runtime.cfg)
+    states = _indicator_states(runtime)
 
     for holding in runtime.holdings:
         ticker = holding.ticker
@@ -378,16 +496,22 @@ def _evaluate_holdings(runtime: _SellRuntime) -> list[SellReportRow]:
             ),
             "data_dir": runtime.cfg.data_dir,
         }
+        # Only passed when enabled, so the default call keeps its old shape.
+        state_kw: dict[str, Any] = {}
+        if states is not None:
+            state_kw["indicator_state"] = states.get(ticker)
+        if runtime.indicator_cache is not None:
+            state_kw["indicator_cache"] = runtime.indicator_cache
 
         if runtime.cfg.sell_mode == "sma_ema_hybrid":
             evaluation: HybridSellEvaluation | SellEvaluation = (
                 evaluate_sell_signals_hybrid(
-                    ticker, ticker_candles, holding_dict, hybrid_settings
+                    ticker, ticker_candles, holding_dict, hybrid_settings, **state_kw
                 )
             )
         else:
             evaluation = evaluate_sell_signals(
-                ticker, ticker_candles, holding_dict, settings
+                ticker, ticker_candles, holding_dict, settings, **state_kw
             )
 
         entry_price = holding.entry_price or None
@@ -452,6 +576,9 @@ def _evaluate_holdings(runtime: _SellRuntime) -> list[SellReportRow]:
             )
         )
 
+    if states is not None:
+        states.flush()
+
     order = {"SELL": 0, "REVIEW": 1, "HOLD": 2}
     results.sort(key=lambda row: (order.get(row.action, 99), row.ticker))
     return results
@@ -469,6 +596,45 @@ def _build_sell_mode_note(cfg: Config) -> str | None:
     )
 
 
+def _metrics_extra(runtime: _SellRuntime, settings: dict[str, Any]) -> dict[str, Any]:
+    extra: dict[str, Any] = {
+        "settings": settings,
+        "fresh_cache_hits": runtime.fresh_hits,
+    }
+    if runtime.indicator_cache is not None:
+        extra["indicator_cache"] = runtime.indicator_cache.stats()
+    return extra
+
+
+def _record_run_metrics(runtime: _SellRuntime, command: str) -> list[str]:
+    """Persist this run's KIS request metrics and return appendix lines."""
+    client = runtime.kis_client
+    metrics = getattr(client, "metrics", None)
+    if not isinstance(metrics, RequestMetrics):
+        return []
+    limiter = getattr(client, "rate_limiter", None)
+    settings = {
+        "kis_min_interval_ms": runtime.cfg.kis_min_interval_ms,
+        "kis_concurrency": runtime.cfg.kis_concurrency,
+        "final_rate_per_s": getattr(limiter, "rate", None),
+    }
+    lines = metrics.summary_lines()
+    try:
+        path = write_run_metrics(
+            runtime.cfg.data_dir,
+            command,
+            metrics,
+            extra=_metrics_extra(runtime, settings),
+        )
+    except OSError as exc:
+        runtime.logger.warning("Failed to write request metrics: %s", exc)
+        return lines
+    runtime.logger.info("Request metrics written to: %s", path)
+    if lines:
+        lines.append(f"Details: {path}")
+    return lines
+
+
 def _write_sell_report(runtime: _SellRuntime, results: list[SellReportRow]) -> str:
     return write_sell_report(
         report_dir=runtime.cfg.report_dir,
@@ -482,18 +648,26 @@ def _write_sell_report(runtime: _SellRuntime, results: list[SellReportRow]) -> s
         fx_note=runtime.fx_note,
         sell_mode=runtime.cfg.sell_mode,
         sell_mode_note=_build_sell_mode_note(runtime.cfg),
+        metrics_summary=_record_run_metrics(runtime, "sell"),
     )
 
 
-def run_sell(*, provider: str | None) -> int:
+def run_sell(
+    *, provider: str | None, indicator_cache: IndicatorCache | None = None
+) -> int:
     logger = logging.getLogger(__name__)
     try:
         cfg: Config = load_config(provider_override=provider)
     except (ConfigLoadError, HoldingsLoadError) as exc:
         logger.error("Configuration loading failed: %s", exc)
         return 1
+    # Queued cache writes are flushed after collection and again at exit.
+    configure_cache_writes(
+        write_behind=cfg.cache_write_behind, fsync=cfg.cache_durability == "fsync"
+    )
 
     runtime = _build_sell_runtime(cfg, logger)
+    runtime.indicator_cache = indicator_cache
     _initialize_provider(runtime)
     _resolve_sell_fx(runtime)
     _collect_market_data(runtime, target_bars=max(cfg.min_history_bars, 200))
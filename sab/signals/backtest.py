@@ -0,0 +1,415 @@
+"""Single-pass replay of the buy and sell rules over a ticker's history.
+
+Replaying ``evaluate_ticker``/``evaluate_ticker_hybrid`` on every prefix of a
+history recomputes each indicator over the prefix, which is O(n²) per ticker.
+EMA, Wilder RSI/ATR and SMA are seeded at the start of the series, so their
+value at bar ``i`` over the whole history equals the last value over
+``candles[: i + 1]``. :func:`backtest_ticker` computes every series once and
+walks the bars, handing the live rules :class:`PrefixView` windows that end
+on the current bar:
+
+- ``ema_cross``: :func:`~sab.signals.evaluator.apply_rules`, then
+  :func:`~sab.signals.sell_rules.apply_sell_rules`
+- ``sma_ema_hybrid``: :data:`~sab.signals.hybrid_buy.HYBRID_STAGES`, then
+  :func:`~sab.signals.hybrid_sell.apply_hybrid_sell_rules`
+
+A signal is therefore a candidate the scan would have reported that day.
+Before running the rules on a bar, a necessary condition from the full
+arrays is checked: the EMA cross for ``ema_cross``, and a close above the SMA
+trend or aligned EMAs for the hybrid detectors.
+
+Fill model: a signal on bar ``i`` enters at the open of bar ``i + 1``. The
+sell rules then run on every close from the entry bar on, and the first
+``SELL`` exits at that close. Every signal is its own trade, so signals that
+overlap an open trade are reported too. A trade still open after
+``max_hold_bars`` exits at that close. A trade open at the end of the data is
+marked to the last close.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import math
+from collections.abc import Sequence
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any, overload
+
+from ..data.candle_series import Candles, as_candle_series, candle_column, candle_dates
+from .eval_index import choose_eval_index
+from .evaluator import EvaluationSettings, EvaluationWindow, apply_rules
+from .hybrid_buy import HYBRID_STAGES, HybridContext, HybridEvaluationSettings
+from .hybrid_sell import HybridSellSettings, apply_hybrid_sell_rules
+from .indicator_state import IndicatorFrame
+from .pipeline import run_stages
+from .sell_rules import SellSettings, apply_sell_rules
+
+DEFAULT_MAX_HOLD_BARS = 60
+
+BuySettings = EvaluationSettings | HybridEvaluationSettings
+ExitSettings = SellSettings | HybridSellSettings
+
+
+class PrefixView(Sequence[Any]):
+    """``values[:stop]`` without the copy."""
+
+    __slots__ = ("_stop", "_values")
+
+    def __init__(self, values: Sequence[Any], stop: int) -> None:
+        self._values = values
+        self._stop = stop
+
+    def __len__(self) -> int:
+        return self._stop
+
+    @overload
+    def __getitem__(self, index: int) -> Any: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Any]: ...
+
+    def __getitem__(self, index: int | slice) -> Any:
+        if isinstance(index, slice):
+            return [self._values[i] for i in range(self._stop)[index]]
+        if index < 0:
+            index += self._stop
+        if not 0 <= index < self._stop:
+            raise IndexError("PrefixView index out of range")
+        return self._values[index]
+
+
+@dataclass
+class SignalOutcome:
+    ticker: str
+    signal_date: str
+    pattern: str
+    score: float
+    status: str  # closed, open (marked to the last close), pending (no entry bar)
+    entry_date: str | None = None
+    entry_price: float | None = None
+    exit_date: str | None = None
+    exit_price: float | None = None
+    exit_reason: str = ""
+    bars_held: int = 0
+    return_pct: float | None = None
+
+
+@dataclass
+class BacktestSummary:
+    signals: int
+    closed: int
+    open: int
+    pending: int
+    wins: int
+    avg_return: float | None
+    win_rate: float | None
+
+
+@dataclass
+class _Trade:
+    outcome: SignalOutcome
+    entry_index: int
+    holding: dict[str, Any]
+
+
+def _first_valid(values: Sequence[float]) -> int:
+    for i, value in enumerate(values):
+        if not math.isnan(value):
+            return i
+    return len(values)
+
+
+def _bar_date(text: str) -> dt.date | None:
+    try:
+        return dt.date(int(text[:4]), int(text[4:6]), int(text[6:8]))
+    except ValueError:
+        return None
+
+
+def _close_trade(trade: _Trade, date: str, price: float, reason: str, i: int) -> None:
+    outcome = trade.outcome
+    outcome.status = "closed"
+    outcome.exit_date = date
+    outcome.exit_price = price
+    outcome.exit_reason = reason
+    outcome.bars_held = i - trade.entry_index + 1
+    if outcome.entry_price:
+        outcome.return_pct = (price - outcome.entry_price) / outcome.entry_price
+
+
+class TickerHistory:
+    """One ticker's candles with its indicator memo, prepared once per replay.
+
+    Indicator series are memoized by kind and period, so replays of several
+    settings that share periods compute each series once.
+    """
+
+    def __init__(
+        self, ticker: str, candles: Candles, meta: dict[str, Any] | None = None
+    ) -> None:
+        self.ticker = ticker
+        self.meta = meta or {}
+        # Slices of a CandleSeries are views; row lists fall back to copies.
+        self.candles = as_candle_series(candles)
+        provider = str(
+            self.meta.get("data_source") or self.meta.get("provider") or "kis"
+        ).lower()
+        self.last, _ = choose_eval_index(
+            self.candles, meta=self.meta, provider=provider
+        )
+        self.dates = candle_dates(self.candles)
+        self.opens = candle_column(self.candles, "open")
+        self.closes = candle_column(self.candles, "close")
+        self.highs = candle_column(self.candles, "high")
+        self.lows = candle_column(self.candles, "low")
+        self.frame = IndicatorFrame(self.candles, self.closes, self.highs, self.lows)
+
+    @cached_property
+    def hybrid_columns(self) -> dict[str, list[float]]:
+        # The hybrid evaluator reads missing prices as 0.0.
+        return {
+            name: candle_column(self.candles, name, default=0.0)
+            for name in ("close", "high", "low")
+        }
+
+    @cached_property
+    def hybrid_frame(self) -> IndicatorFrame:
+        cols = self.hybrid_columns
+        return IndicatorFrame(self.candles, cols["close"], cols["high"], cols["low"])
+
+
+def backtest_ticker(
+    ticker: str,
+    candles: Candles,
+    buy_settings: BuySettings,
+    sell_settings: ExitSettings,
+    meta: dict[str, Any] | None = None,
+    *,
+    max_hold_bars: int = DEFAULT_MAX_HOLD_BARS,
+) -> list[SignalOutcome]:
+    """Replay ``ticker``; one outcome per buy signal, in signal order."""
+    return replay_history(
+        TickerHistory(ticker, candles, meta),
+        buy_settings,
+        sell_settings,
+        max_hold_bars=max_hold_bars,
+    )
+
+
+def replay_history(
+    history: TickerHistory,
+    buy_settings: BuySettings,
+    sell_settings: ExitSettings,
+    *,
+    max_hold_bars: int = DEFAULT_MAX_HOLD_BARS,
+) -> list[SignalOutcome]:
+    """:func:`backtest_ticker` over a prepared :class:`TickerHistory`."""
+    ticker, meta, candles, last = (
+        history.ticker,
+        history.meta,
+        history.candles,
+        history.last,
+    )
+    if last < 1:
+        return []
+
+    hybrid = isinstance(buy_settings, HybridEvaluationSettings)
+    dates, opens, closes = history.dates, history.opens, history.closes
+    frame = history.frame
+
+    if hybrid:
+        assert isinstance(buy_settings, HybridEvaluationSettings)
+        h_cols = history.hybrid_columns
+        h_frame = history.hybrid_frame
+        buy_series: dict[str, Sequence[float]] = {
+            **h_cols,
+            f"sma:{buy_settings.sma_trend_period}": h_frame.sma(
+                buy_settings.sma_trend_period
+            ),
+            f"ema:{buy_settings.ema_short_period}": h_frame.ema(
+                buy_settings.ema_short_period
+            ),
+            f"ema:{buy_settings.ema_mid_period}": h_frame.ema(
+                buy_settings.ema_mid_period
+            ),
+            f"rsi:{buy_settings.rsi_period}": h_frame.rsi(buy_settings.rsi_period),
+            "atr:14": h_frame.atr(14),
+        }
+        trend = buy_series[f"sma:{buy_settings.sma_trend_period}"]
+        fast = buy_series[f"ema:{buy_settings.ema_short_period}"]
+        mid = buy_series[f"ema:{buy_settings.ema_mid_period}"]
+        h_closes = h_cols["close"]
+        start = max(buy_settings.min_history_bars - 1, 1)
+
+        def may_signal(i: int) -> bool:
+            # Every detector needs one of these (NaN compares False).
+            return h_closes[i] > trend[i] or fast[i] > mid[i] > trend[i]
+
+    else:
+        assert isinstance(buy_settings, EvaluationSettings)
+        ema20, ema50 = frame.ema(20), frame.ema(50)
+        rsi14, atr14, sma200 = frame.rsi(14), frame.atr(14), frame.sma(200)
+        # prepare_window: enough history and some price data in the window.
+        start = max(
+            buy_settings.min_history_bars - 1,
+            1,
+            _first_valid(closes),
+            _first_valid(history.highs),
+            _first_valid(history.lows),
+        )
+
+        def may_signal(i: int) -> bool:
+            return ema20[i] > ema50[i] and ema20[i - 1] <= ema50[i - 1]
+
+    if isinstance(sell_settings, HybridSellSettings):
+        sell_series = [
+            frame.ema(sell_settings.ema_short_period),
+            frame.ema(sell_settings.ema_mid_period),
+            frame.sma(sell_settings.sma_trend_period),
+            frame.rsi(sell_settings.rsi_period),
+        ]
+    else:
+        short, long = sell_settings.ema_lengths
+        sell_series = [
+            frame.ema(short),
+            frame.ema(long),
+            frame.rsi(sell_settings.rsi_period),
+            frame.atr(14),
+            frame.sma(200),
+        ]
+
+    def signal(i: int) -> tuple[str, float] | None:
+        window = candles[: i + 1]
+        if hybrid:
+            assert isinstance(buy_settings, HybridEvaluationSettings)
+            ctx = HybridContext(
+                ticker,
+                window,
+                buy_settings,
+                meta,
+                i,
+                series={k: PrefixView(v, i + 1) for k, v in buy_series.items()},
+            )
+            if run_stages(HYBRID_STAGES, ctx) is not None or ctx.match is None:
+                return None
+            return ctx.match[0].value, 1.0
+        assert isinstance(buy_settings, EvaluationSettings)
+        stop = i + 1
+        prepared = EvaluationWindow(
+            ticker,
+            meta,
+            window,
+            i,
+            window,
+            PrefixView(closes, stop),
+            PrefixView(history.highs, stop),
+            PrefixView(history.lows, stop),
+        )
+        result = apply_rules(
+            prepared,
+            buy_settings,
+            PrefixView(ema20, stop),
+            PrefixView(ema50, stop),
+            PrefixView(rsi14, stop),
+            PrefixView(atr14, stop),
+            PrefixView(sma200, stop),
+        )
+        if result.candidate is None:
+            return None
+        return "ema_cross", float(result.candidate.get("score_value") or 0.0)
+
+    def sell_action(trade: _Trade, i: int) -> tuple[str, list[str]]:
+        stop = i + 1
+        window = candles[:stop]
+        views = [PrefixView(values, stop) for values in sell_series]
+        today = _bar_date(dates[i])
+        if isinstance(sell_settings, HybridSellSettings):
+            hybrid_eval = apply_hybrid_sell_rules(
+                window, trade.holding, sell_settings, *views, today=today
+            )
+            return hybrid_eval.action, hybrid_eval.reasons
+        evaluation = apply_sell_rules(
+            window,
+            PrefixView(closes, stop),
+            trade.holding,
+            sell_settings,
+            *views,
+            entry_index=trade.entry_index,
+            today=today,
+        )
+        return evaluation.action, evaluation.reasons
+
+    outcomes: list[SignalOutcome] = []
+    trades: list[_Trade] = []
+    for i in range(start, last + 1):
+        if trades:
+            still_open: list[_Trade] = []
+            for trade in trades:
+                if trade.entry_index == i:
+                    price = opens[i] if opens[i] > 0 else closes[i]
+                    entry_day = _bar_date(dates[i])
+                    trade.outcome.entry_date = dates[i]
+                    trade.outcome.entry_price = price
+                    trade.holding["entry_price"] = price
+                    if entry_day is not None:
+                        trade.holding["entry_date"] = entry_day.isoformat()
+                action, reasons = sell_action(trade, i)
+                if action == "SELL":
+                    _close_trade(trade, dates[i], closes[i], "; ".join(reasons), i)
+                elif max_hold_bars > 0 and i - trade.entry_index + 1 >= max_hold_bars:
+                    reason = f"Max hold {max_hold_bars} bars"
+                    _close_trade(trade, dates[i], closes[i], reason, i)
+                else:
+                    still_open.append(trade)
+            trades = still_open
+
+        if not may_signal(i):
+            continue
+        found = signal(i)
+        if found is None:
+            continue
+        pattern, score = found
+        outcome = SignalOutcome(ticker, dates[i], pattern, score, status="pending")
+        outcomes.append(outcome)
+        if i < last:
+            holding: dict[str, Any] = {"strategy": pattern}
+            trades.append(_Trade(outcome, i + 1, holding))
+
+    for trade in trades:
+        outcome = trade.outcome
+        outcome.status = "open"
+        outcome.exit_reason = "Open at end of data"
+        outcome.bars_held = last - trade.entry_index + 1
+        outcome.exit_price = closes[last]
+        if outcome.entry_price:
+            outcome.return_pct = (closes[last] - outcome.entry_price) / (
+                outcome.entry_price
+            )
+    return outcomes
+
+
+def summarize(outcomes: Sequence[SignalOutcome]) -> BacktestSummary:
+    closed = [o for o in outcomes if o.status == "closed"]
+    returns = [o.return_pct for o in closed if o.return_pct is not None]
+    wins = sum(1 for r in returns if r > 0)
+    return BacktestSummary(
+        signals=len(outcomes),
+        closed=len(closed),
+        open=sum(1 for o in outcomes if o.status == "open"),
+        pending=sum(1 for o in outcomes if o.status == "pending"),
+        wins=wins,
+        avg_return=sum(returns) / len(returns) if returns else None,
+        win_rate=wins / len(returns) if returns else None,
+    )
+
+
+__all__ = [
+    "DEFAULT_MAX_HOLD_BARS",
+    "BacktestSummary",
+    "PrefixView",
+    "SignalOutcome",
+    "TickerHistory",
+    "backtest_ticker",
+    "replay_history",
+    "summarize",
+]
@@ -0,0 +1,132 @@
+"""Cross-sectional evaluation of the ``ema_cross`` strategy.
+
+:func:`evaluate_universe` returns exactly what calling
+:func:`~sab.signals.evaluator.evaluate_ticker` once per ticker would, but
+computes the indicators for the whole universe at once. Windows are grouped
+by length into a ``(tickers x bars)`` matrix, right-aligned on each ticker's
+evaluation bar, and run through the NumPy kernels, which are bit-identical
+per row to the reference functions.
+
+As in the per-ticker pipeline, the bar-level stages (price floor, ETF,
+liquidity) run first, so rejected tickers never enter the matrix. The EMA
+cross, RSI rebound, SMA200 and slope stages are then applied as boolean masks
+over the last two columns. Only rows that survive the masks go through
+:func:`~sab.signals.evaluator.apply_rules` for the gap stage and the candidate
+dict, so candidates, reasons and stage names are identical by construction.
+
+Without NumPy (or with ``SAB_INDICATOR_BACKEND=python``) the per-ticker path
+is used.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import Any
+
+from ..data.candle_series import Candles
+from .evaluator import (
+    BELOW_SMA200,
+    NO_EMA_CROSS,
+    NO_RSI_SIGNAL,
+    NO_SLOPE_UP,
+    EvaluationResult,
+    EvaluationSettings,
+    EvaluationWindow,
+    apply_rules,
+    check_bar_stages,
+    evaluate_ticker,
+    prepare_window,
+)
+from .indicators import indicator_backend
+
+UniverseItem = tuple[str, Candles, dict[str, Any] | None]
+
+# Mask rejections in BUY_STAGES order; index 0 means the row passed.
+_MASK_REJECTIONS = (
+    ("", ""),
+    ("ema_cross", NO_EMA_CROSS),
+    ("rsi", NO_RSI_SIGNAL),
+    ("sma200", BELOW_SMA200),
+    ("slope", NO_SLOPE_UP),
+)
+
+
+def evaluate_universe(
+    items: Sequence[UniverseItem], settings: EvaluationSettings
+) -> list[EvaluationResult]:
+    """Evaluate ``(ticker, candles, meta)`` items; results keep their order."""
+    if indicator_backend() != "numpy":
+        return [evaluate_ticker(t, c, settings, m) for t, c, m in items]
+
+    results: list[EvaluationResult | None] = [None] * len(items)
+    groups: dict[int, list[tuple[int, EvaluationWindow]]] = {}
+    for pos, (ticker, candles, meta) in enumerate(items):
+        prepared = prepare_window(ticker, candles, settings, meta)
+        if isinstance(prepared, EvaluationResult):
+            results[pos] = prepared
+            continue
+        rejected = check_bar_stages(prepared, settings)
+        if rejected is not None:
+            results[pos] = rejected
+        else:
+            groups.setdefault(len(prepared.closes), []).append((pos, prepared))
+
+    for members in groups.values():
+        for pos, result in _evaluate_group(members, settings):
+            results[pos] = result
+
+    return [r for r in results if r is not None]
+
+
+def _evaluate_group(
+    members: list[tuple[int, EvaluationWindow]], settings: EvaluationSettings
+) -> list[tuple[int, EvaluationResult]]:
+    import numpy as np
+
+    from . import indicators_np as kernels
+
+    windows = [w for _, w in members]
+    closes = np.array([w.closes for w in windows], dtype=float)
+    highs = np.array([w.highs for w in windows], dtype=float)
+    lows = np.array([w.lows for w in windows], dtype=float)
+
+    ema20 = kernels.ema(closes, 20)
+    ema50 = kernels.ema(closes, 50)
+    rsi14 = kernels.rsi(closes, 14)
+    atr14 = kernels.atr(highs, lows, closes, 14)
+    sma200 = kernels.sma(closes, 200)
+
+    close = closes[:, -1]
+    e20, e50, sma = ema20[:, -1], ema50[:, -1], sma200[:, -1]
+    cross = (e20 > e50) & (ema20[:, -2] <= ema50[:, -2])
+    rsi_ok = (rsi14[:, -1] > 30) & (rsi14[:, -2] <= 30) & (rsi14[:, -1] < 70)
+    trend_ok = np.ones(len(windows), dtype=bool)
+    if settings.use_sma200_filter:
+        trend_ok = ~np.isnan(sma) & (close > sma) & (e20 > sma) & (e50 > sma)
+    slope_ok = np.ones(len(windows), dtype=bool)
+    if settings.require_slope_up:
+        slope_ok = (e20 > ema20[:, -2]) & (e50 > ema50[:, -2])
+
+    # Same order as BUY_STAGES: the first failing stage names the rejection.
+    failed = np.select([~cross, ~rsi_ok, ~trend_ok, ~slope_ok], [1, 2, 3, 4], default=0)
+
+    out: list[tuple[int, EvaluationResult]] = []
+    for row, (pos, window) in enumerate(members):
+        stage, reason = _MASK_REJECTIONS[int(failed[row])]
+        if stage:
+            out.append((pos, EvaluationResult(window.ticker, None, reason, stage)))
+            continue
+        result = apply_rules(
+            window,
+            settings,
+            ema20[row].tolist(),
+            ema50[row].tolist(),
+            rsi14[row].tolist(),
+            atr14[row].tolist(),
+            sma200[row].tolist(),
+        )
+        out.append((pos, result))
+    return out
+
+
+__all__ = ["UniverseItem", "evaluate_universe"]
@@ -1,13 +1,12 @@
 from __future__ import annotations
 
 import datetime as dt
-import json
-import os
 from dataclasses import dataclass
 from typing import Any
 from zoneinfo import ZoneInfo
 
-from sab.data.us_calendar import load_us_trading_calendar
+from sab.data.candle_series import Candles
+from sab.data.trading_calendar import trading_calendar
 
 KR_ZONE = ZoneInfo("Asia/Seoul")
 US_ZONE = ZoneInfo("America/New_York")
@@ -18,10 +17,16 @@ STATE_PRE_OPEN = "PRE_OPEN"
 STATE_AFTER_CLOSE = "AFTER_CLOSE"
 STATE_CLOSED = "CLOSED"
 
+# Regular session hours in each market's local time.
+_SESSION_HOURS = {
+    "KR": (dt.time(9, 0), dt.time(15, 30)),
+    "US": (dt.time(9, 30), dt.time(16, 0)),
+}
+
 
 @dataclass(frozen=True)
 class EvalContext:
-    candles: list[dict[str, Any]]
+    candles: Candles
     meta: dict[str, Any]
     now: dt.datetime
     market: str
@@ -29,51 +34,53 @@ class EvalContext:
     state: str
 
 
-_US_HOLIDAYS_CACHE: dict[str, dict[str, bool]] | None = None
-
-
-def _resolve_data_dir(data_dir: str | None) -> str:
-    if data_dir:
-        return str(data_dir)
-    return os.getenv("SAB_DATA_DIR") or "data"
+def _load_us_holidays(data_dir: str | None = None) -> dict[str, bool]:
+    return trading_calendar("US", data_dir).holiday_flags
 
 
-def _load_us_holidays(data_dir: str | None = None) -> dict[str, bool]:
-    global _US_HOLIDAYS_CACHE
-    if _US_HOLIDAYS_CACHE is None:
-        _US_HOLIDAYS_CACHE = {}
+def _is_us_holiday(date: dt.date, data_dir: str | None = None) -> bool:
+    holidays = _load_us_holidays() if data_dir is None else _load_us_holidays(data_dir)
+    entry = holidays.get(date.strftime("%Y%m%d"))
+    return bool(entry)
 
-    resolved_data_dir = os.path.abspath(_resolve_data_dir(data_dir))
-    cached = _US_HOLIDAYS_CACHE.get(resolved_data_dir)
-    if cached is not None:
-        return cached
 
-    path = os.path.join(resolved_data_dir, "holidays_us.json")
-    holidays: dict[str, bool] = {}
+def session_close(market: str, session_date: dt.date) -> dt.datetime:
+    """Return the (timezone-aware) close of ``session_date`` in ``market``."""
+    zone = US_ZONE if market == "US" else KR_ZONE
+    close = _SESSION_HOURS.get(market, _SESSION_HOURS["KR"])[1]
+    return dt.datetime.combine(session_date, close, tzinfo=zone)
 
-    # Seed with built-in US calendar.
-    for date in load_us_trading_calendar(resolved_data_dir):
-        holidays[date] = True
 
-    try:
-        with open(path, encoding="utf-8") as fp:
-            raw = json.load(fp)
-            if isinstance(raw, dict):
-                for key, value in raw.items():
-                    if not isinstance(key, str) or not isinstance(value, dict):
-                        continue
-                    holidays[key] = not bool(value.get("is_open", True))
-    except (OSError, json.JSONDecodeError):
-        pass
+def latest_completed_session(
+    market: str,
+    *,
+    now: dt.datetime | None = None,
+    data_dir: str | None = None,
+) -> tuple[dt.date, str]:
+    """Return the most recent session that has closed and the current state.
 
-    _US_HOLIDAYS_CACHE[resolved_data_dir] = holidays
-    return holidays
+    Weekends and calendar holidays are skipped. The state is ``INTRADAY``
+    while today's regular session is trading, when no session is complete
+    for today yet.
+    """
+    zone = US_ZONE if market == "US" else KR_ZONE
+    local_now = _to_zone(_ensure_now(now), zone)
+    open_time, close_time = _SESSION_HOURS.get(market, _SESSION_HOURS["KR"])
+    calendar = trading_calendar(market, data_dir)
 
+    today = local_now.date()
+    t = local_now.time()
+    if not calendar.is_session(today):
+        state = STATE_CLOSED
+    elif t < open_time:
+        state = STATE_PRE_OPEN
+    elif t < close_time:
+        state = STATE_INTRADAY
+    else:
+        return today, STATE_AFTER_CLOSE
 
-def _is_us_holiday(date: dt.date, data_dir: str | None = None) -> bool:
-    holidays = _load_us_holidays() if data_dir is None else _load_us_holidays(data_dir)
-    entry = holidays.get(date.strftime("%Y%m%d"))
-    return bool(entry)
+    previous = calendar.previous_session(today)
+    return previous or today - dt.timedelta(days=1), state
 
 
 def _ensure_now(now: dt.datetime | None) -> dt.datetime:
@@ -127,7 +134,7 @@ def _session_state(market: str, local_now: dt.datetime) -> str:
 
 
 def choose_eval_index(
-    candles: list[dict[str, Any]],
+    candles: Candles,
     *,
     meta: dict[str, Any] | None = None,
     provider: str | None = None,
@@ -205,4 +212,4 @@ def choose_eval_index(
     return idx_eval, idx_eval != idx_latest
 
 
-__all__ = ["choose_eval_index"]
+__all__ = ["choose_eval_index", "latest_completed_session", "session_close"]
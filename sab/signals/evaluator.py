@@ -1,12 +1,27 @@
 from __future__ import annotations
 
 import math
+from collections.abc import Sequence
 from dataclasses import dataclass
+from functools import cached_property
 from typing import Any
 
+from ..data.candle_series import Candles, candle_column
 from .etf_filters import is_etf_or_leveraged
 from .eval_index import choose_eval_index
+from .indicator_cache import IndicatorCache
+from .indicator_state import IndicatorFrame, TickerIndicatorState
 from .indicators import atr, ema, rsi, sma
+from .pipeline import (
+    BAR_COST,
+    INDICATOR_COST,
+    WINDOW_COST,
+    LazySeries,
+    Stage,
+    bar_stages,
+    order_stages,
+    run_stages,
+)
 
 
 @dataclass
@@ -14,6 +29,8 @@ class EvaluationResult:
     ticker: str
     candidate: dict[str, Any] | None
     reason: str | None = None
+    # Name of the rejecting stage (see BUY_STAGES).
+    stage: str | None = None
 
 
 @dataclass
@@ -31,139 +48,298 @@ class EvaluationSettings:
     us_min_price: float | None = None
 
 
-def _clean(values: list[float]) -> list[float]:
-    return [v for v in values if not math.isnan(v)]
+# Rejections that do not depend on the bar values (shared with batch_evaluator).
+NO_EMA_CROSS = "EMA(20/50) cross not satisfied"
+NO_RSI_SIGNAL = "RSI signal not satisfied"
+BELOW_SMA200 = "Below SMA200 filter"
+NO_SLOPE_UP = "EMA slope not rising"
 
 
-def evaluate_ticker(
+def _has_values(values: list[float]) -> bool:
+    return any(not math.isnan(v) for v in values)
+
+
+@dataclass
+class EvaluationWindow:
+    """Completed bars of one ticker, ready for indicator computation."""
+
+    ticker: str
+    meta: dict[str, Any]
+    candles: Candles
+    idx_eval: int
+    candles_eval: Candles
+    closes: Sequence[Any]
+    highs: Sequence[Any]
+    lows: Sequence[Any]
+
+
+def prepare_window(
     ticker: str,
-    candles: list[dict[str, float]],
+    candles: Candles,
     settings: EvaluationSettings,
     meta: dict[str, Any] | None = None,
-) -> EvaluationResult:
+) -> EvaluationWindow | EvaluationResult:
+    """Pick the evaluation bar; an :class:`EvaluationResult` means rejected."""
     meta = meta or {}
-    currency = meta.get("currency", "KRW")
-
     if len(candles) < settings.min_history_bars:
         return EvaluationResult(
             ticker,
             None,
             f"Not enough history (<{settings.min_history_bars} bars)",
+            "history",
         )
 
     provider = str(meta.get("data_source") or meta.get("provider") or "kis").lower()
     idx_eval, _ = choose_eval_index(candles, meta=meta, provider=provider)
     if idx_eval < 1:
-        return EvaluationResult(ticker, None, "Not enough completed candles")
+        return EvaluationResult(
+            ticker, None, "Not enough completed candles", "eval_index"
+        )
 
     candles_eval = candles[: idx_eval + 1]
 
-    closes = [c["close"] for c in candles_eval]
-    highs = [c["high"] for c in candles_eval]
-    lows = [c["low"] for c in candles_eval]
+    closes = candle_column(candles_eval, "close")
+    highs = candle_column(candles_eval, "high")
+    lows = candle_column(candles_eval, "low")
 
-    if not (_clean(closes) and _clean(highs) and _clean(lows)):
-        return EvaluationResult(ticker, None, "Insufficient price data")
+    if not (_has_values(closes) and _has_values(highs) and _has_values(lows)):
+        return EvaluationResult(ticker, None, "Insufficient price data", "price_data")
+    return EvaluationWindow(
+        ticker, meta, candles, idx_eval, candles_eval, closes, highs, lows
+    )
 
-    ema20 = ema(closes, 20)
-    ema50 = ema(closes, 50)
-    rsi14 = rsi(closes, 14)
-    atr14 = atr(highs, lows, closes, 14)
-    sma200 = sma(closes, 200)
 
-    latest = candles[idx_eval]
-    previous = candles[idx_eval - 1]
+def evaluate_ticker(
+    ticker: str,
+    candles: Candles,
+    settings: EvaluationSettings,
+    meta: dict[str, Any] | None = None,
+    *,
+    indicator_state: TickerIndicatorState | None = None,
+    indicator_cache: IndicatorCache | None = None,
+) -> EvaluationResult:
+    prepared = prepare_window(ticker, candles, settings, meta)
+    if isinstance(prepared, EvaluationResult):
+        return prepared
+    candles_eval = prepared.candles_eval
+    closes, highs, lows = prepared.closes, prepared.highs, prepared.lows
+
+    # Indicators are computed on first use by a stage (or the candidate).
+    if indicator_state is None and indicator_cache is None:
+        ema20 = LazySeries(lambda: ema(closes, 20))
+        ema50 = LazySeries(lambda: ema(closes, 50))
+        rsi14 = LazySeries(lambda: rsi(closes, 14))
+        atr14 = LazySeries(lambda: atr(highs, lows, closes, 14))
+        sma200 = LazySeries(lambda: sma(closes, 200))
+    else:
+        frame = IndicatorFrame(
+            candles_eval,
+            closes,
+            highs,
+            lows,
+            indicator_state,
+            cache=indicator_cache,
+            ticker=ticker,
+        )
+        ema20 = LazySeries(lambda: frame.ema(20))
+        ema50 = LazySeries(lambda: frame.ema(50))
+        rsi14 = LazySeries(lambda: frame.rsi(14))
+        atr14 = LazySeries(lambda: frame.atr(14))
+        sma200 = LazySeries(lambda: frame.sma(200))
+
+    return apply_rules(prepared, settings, ema20, ema50, rsi14, atr14, sma200)
+
+
+class BuyContext:
+    """What the buy stages read: the window, its bars and the indicators."""
+
+    def __init__(
+        self,
+        prepared: EvaluationWindow,
+        settings: EvaluationSettings,
+        ema20: Sequence[float] = (),
+        ema50: Sequence[float] = (),
+        rsi14: Sequence[float] = (),
+        atr14: Sequence[float] = (),
+        sma200: Sequence[float] = (),
+    ) -> None:
+        self.prepared = prepared
+        self.settings = settings
+        self.meta = prepared.meta
+        self.latest = prepared.candles[prepared.idx_eval]
+        self.previous = prepared.candles[prepared.idx_eval - 1]
+        self.ema20 = ema20
+        self.ema50 = ema50
+        self.rsi14 = rsi14
+        self.atr14 = atr14
+        self.sma200 = sma200
+
+    @property
+    def is_usd(self) -> bool:
+        return str(self.meta.get("currency", "KRW")).upper() == "USD"
+
+    @cached_property
+    def gap_pct(self) -> float:
+        if not self.previous["close"]:
+            return 0.0
+        return (self.latest["open"] - self.previous["close"]) / self.previous["close"]
+
+    @cached_property
+    def gap_threshold(self) -> float:
+        # Gap threshold via ATR multiplier
+        previous_close = self.previous["close"]
+        if self.settings.gap_atr_multiplier > 0:
+            atr_value = self.atr14[-1]
+            if not math.isnan(atr_value) and atr_value > 0 and previous_close > 0:
+                return self.settings.gap_atr_multiplier * atr_value / previous_close
+        return 0.03
+
+    @cached_property
+    def avg_dollar_volume(self) -> float:
+        # Liquidity: average dollar volume last 20 bars
+        candles_eval = self.prepared.candles_eval
+        window = candles_eval[-20:] if len(candles_eval) >= 20 else candles_eval
+        total = 0.0
+        count = 0
+        for c in window:
+            price = c.get("close") or 0.0
+            volume = c.get("volume") or 0.0
+            total += price * volume
+            count += 1
+        return total / count if count else 0.0
 
+
+def _check_price(ctx: BuyContext) -> str | None:
     # Market-aware price floor
+    settings = ctx.settings
     eff_min_price = settings.min_price
-    if meta.get("currency", "KRW").upper() == "USD" and settings.us_min_price:
+    if ctx.is_usd and settings.us_min_price:
         eff_min_price = settings.us_min_price
+    close = ctx.latest["close"]
+    if eff_min_price and close < eff_min_price:
+        return f"Price {close:.0f} < MIN_PRICE {eff_min_price:.0f}"
+    return None
 
-    if eff_min_price and latest["close"] < eff_min_price:
-        return EvaluationResult(
-            ticker,
-            None,
-            f"Price {latest['close']:.0f} < MIN_PRICE {eff_min_price:.0f}",
-        )
 
-    ema_cross_up = ema20[-1] > ema50[-1] and ema20[-2] <= ema50[-2]
-    rsi_rebound = rsi14[-1] > 30 and rsi14[-2] <= 30
-    rsi_not_overbought = rsi14[-1] < 70
-    gap_pct = 0.0
-    if previous["close"]:
-        gap_pct = (latest["open"] - previous["close"]) / previous["close"]
+def _check_ema_cross(ctx: BuyContext) -> str | None:
+    ema20, ema50 = ctx.ema20, ctx.ema50
+    if ema20[-1] > ema50[-1] and ema20[-2] <= ema50[-2]:
+        return None
+    return NO_EMA_CROSS
 
-    atr_value = atr14[-1]
 
-    if not ema_cross_up:
-        return EvaluationResult(ticker, None, "EMA(20/50) cross not satisfied")
-    if not (rsi_rebound and rsi_not_overbought):
-        return EvaluationResult(ticker, None, "RSI signal not satisfied")
+def _check_rsi(ctx: BuyContext) -> str | None:
+    rsi14 = ctx.rsi14
+    if rsi14[-1] > 30 and rsi14[-2] <= 30 and rsi14[-1] < 70:
+        return None
+    return NO_RSI_SIGNAL
 
-    # SMA200 filter
-    trend_pass = True
-    sma200_value = sma200[-1]
-    if settings.use_sma200_filter:
-        trend_pass = (
-            not math.isnan(sma200_value)
-            and latest["close"] > sma200_value
-            and ema20[-1] > sma200_value
-            and ema50[-1] > sma200_value
-        )
-        if not trend_pass:
-            return EvaluationResult(ticker, None, "Below SMA200 filter")
-
-    # EMA slope requirement
-    slope_pass = True
-    if settings.require_slope_up:
-        slope_pass = ema20[-1] > ema20[-2] and ema50[-1] > ema50[-2]
-        if not slope_pass:
-            return EvaluationResult(ticker, None, "EMA slope not rising")
-
-    # Gap threshold via ATR multiplier
-    gap_threshold = 0.03
+
+def _check_sma200(ctx: BuyContext) -> str | None:
+    if not ctx.settings.use_sma200_filter:
+        return None
+    sma200_value = ctx.sma200[-1]
     if (
-        settings.gap_atr_multiplier > 0
-        and not math.isnan(atr_value)
-        and atr_value > 0
-        and previous["close"] > 0
+        not math.isnan(sma200_value)
+        and ctx.latest["close"] > sma200_value
+        and ctx.ema20[-1] > sma200_value
+        and ctx.ema50[-1] > sma200_value
     ):
-        gap_threshold = settings.gap_atr_multiplier * atr_value / previous["close"]
-    gap_ok = abs(gap_pct) <= gap_threshold
-    if not gap_ok:
-        return EvaluationResult(
-            ticker,
-            None,
-            f"Gap {gap_pct * 100:.1f}% exceeds threshold",
-        )
+        return None
+    return BELOW_SMA200
 
-    # Liquidity: average dollar volume last 20 bars
-    avg_dollar_volume = 0.0
-    window = candles_eval[-20:] if len(candles_eval) >= 20 else candles_eval
-    if window:
-        total = 0.0
-        count = 0
-        for c in window:
-            price = c.get("close") or 0.0
-            volume = c.get("volume") or 0.0
-            total += price * volume
-            count += 1
-        if count:
-            avg_dollar_volume = total / count
+
+def _check_slope(ctx: BuyContext) -> str | None:
+    if not ctx.settings.require_slope_up:
+        return None
+    if ctx.ema20[-1] > ctx.ema20[-2] and ctx.ema50[-1] > ctx.ema50[-2]:
+        return None
+    return NO_SLOPE_UP
+
+
+def _check_gap(ctx: BuyContext) -> str | None:
+    if abs(ctx.gap_pct) <= ctx.gap_threshold:
+        return None
+    return f"Gap {ctx.gap_pct * 100:.1f}% exceeds threshold"
+
+
+def _check_liquidity(ctx: BuyContext) -> str | None:
     # Market-aware liquidity floor (USD for US, KRW for KR)
+    settings = ctx.settings
     eff_min_dv = settings.min_dollar_volume
-    if meta.get("currency", "KRW").upper() == "USD" and settings.us_min_dollar_volume:
+    if ctx.is_usd and settings.us_min_dollar_volume:
         eff_min_dv = settings.us_min_dollar_volume
+    avg_dollar_volume = ctx.avg_dollar_volume
     if eff_min_dv > 0 and avg_dollar_volume < eff_min_dv:
-        return EvaluationResult(
-            ticker,
-            None,
-            f"Avg dollar volume {avg_dollar_volume:,.0f} < {eff_min_dv:,.0f}",
-        )
+        return f"Avg dollar volume {avg_dollar_volume:,.0f} < {eff_min_dv:,.0f}"
+    return None
+
 
+def _check_etf(ctx: BuyContext) -> str | None:
     # ETF/ETN exclusion heuristic (including leveraged/inverse products)
-    if settings.exclude_etf_etn and is_etf_or_leveraged(ticker, meta):
-        return EvaluationResult(ticker, None, "ETF/ETN excluded")
+    if ctx.settings.exclude_etf_etn and is_etf_or_leveraged(
+        ctx.prepared.ticker, ctx.meta
+    ):
+        return "ETF/ETN excluded"
+    return None
+
+
+# Declared in rule order; run cheapest first.
+BUY_STAGES: tuple[Stage[BuyContext], ...] = order_stages(
+    [
+        Stage("price", BAR_COST, ("bar", "meta"), _check_price),
+        Stage("ema_cross", INDICATOR_COST, ("ema20", "ema50"), _check_ema_cross),
+        Stage("rsi", INDICATOR_COST, ("rsi14",), _check_rsi),
+        Stage(
+            "sma200",
+            INDICATOR_COST,
+            ("bar", "ema20", "ema50", "sma200"),
+            _check_sma200,
+        ),
+        Stage("slope", INDICATOR_COST, ("ema20", "ema50"), _check_slope),
+        Stage("gap", INDICATOR_COST, ("bar", "previous_bar", "atr14"), _check_gap),
+        Stage("liquidity", WINDOW_COST, ("window", "meta"), _check_liquidity),
+        Stage("etf", BAR_COST, ("meta",), _check_etf),
+    ]
+)
+BUY_BAR_STAGES = bar_stages(BUY_STAGES)
+
+
+def check_bar_stages(
+    prepared: EvaluationWindow, settings: EvaluationSettings
+) -> EvaluationResult | None:
+    """Run only the stages that need no indicators; ``None`` means passed."""
+    rejected = run_stages(BUY_BAR_STAGES, BuyContext(prepared, settings))
+    if rejected is None:
+        return None
+    stage, reason = rejected
+    return EvaluationResult(prepared.ticker, None, reason, stage)
+
+
+def apply_rules(
+    prepared: EvaluationWindow,
+    settings: EvaluationSettings,
+    ema20: Sequence[float],
+    ema50: Sequence[float],
+    rsi14: Sequence[float],
+    atr14: Sequence[float],
+    sma200: Sequence[float],
+) -> EvaluationResult:
+    """Run the buy stages on the indicators and build the candidate."""
+    ctx = BuyContext(prepared, settings, ema20, ema50, rsi14, atr14, sma200)
+    rejected = run_stages(BUY_STAGES, ctx)
+    if rejected is not None:
+        stage, reason = rejected
+        return EvaluationResult(prepared.ticker, None, reason, stage)
+
+    ticker, meta = prepared.ticker, prepared.meta
+    closes = prepared.closes
+    currency = meta.get("currency", "KRW")
+    latest, previous = ctx.latest, ctx.previous
+    atr_value = atr14[-1]
+    sma200_value = sma200[-1]
+    gap_pct, gap_threshold = ctx.gap_pct, ctx.gap_threshold
+    avg_dollar_volume = ctx.avg_dollar_volume
 
     rs_return = None
     rs_diff = None
@@ -190,26 +366,10 @@ def evaluate_ticker(
         target = latest["close"] + atr_value * 2
         risk_guide = f"Stop {fmt(stop, 0)} / Target {fmt(target, 0)} (~1:2)"
 
-    score = 0.0
-    breakdown: list[str] = []
-
-    score += 1
-    breakdown.append("ema_cross")
-
-    score += 1
-    breakdown.append("rsi")
-
-    if trend_pass:
-        score += 1
-        breakdown.append("sma200")
-
-    if slope_pass:
-        score += 1
-        breakdown.append("slope")
-
-    if gap_ok:
-        score += 1
-        breakdown.append("gap")
+    # Every rule stage passed: the cross, RSI, SMA200 (or disabled), slope (or
+    # disabled) and gap each add a point.
+    score = 5.0
+    breakdown: list[str] = ["ema_cross", "rsi", "sma200", "slope", "gap"]
 
     if avg_dollar_volume > 0:
         score += 1
@@ -239,9 +399,7 @@ def evaluate_ticker(
         "high": fmt(latest["high"], 0),
         "low": fmt(latest["low"], 0),
         "risk_guide": risk_guide,
-        "sma200": fmt(
-            sma200_value if not math.isnan(sma200_value) else float("nan"), 0
-        ),
+        "sma200": fmt(sma200_value, 0),
         "avg_dollar_volume": fmt(avg_dollar_volume, 0),
         "rs_return": f"{rs_return * 100:.1f}%" if rs_return is not None else "-",
         "rs_diff": f"{rs_diff * 100:.1f}%" if rs_diff is not None else "-",
@@ -249,8 +407,8 @@ def evaluate_ticker(
         "score": score_display,
         "score_value": score,
         "score_notes": score_notes,
-        "trend_pass": "Yes" if trend_pass else "No",
-        "slope_pass": "Yes" if slope_pass else "No",
+        "trend_pass": "Yes",
+        "slope_pass": "Yes",
         "currency": currency,
         "price_value": latest["close"],
     }
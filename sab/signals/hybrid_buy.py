@@ -1,13 +1,29 @@
 from __future__ import annotations
 
 import math
+from collections.abc import Mapping, Sequence
 from dataclasses import dataclass
 from enum import StrEnum
+from functools import cached_property
 from typing import Any
 
+from ..data.candle_series import Candles, candle_column
 from .etf_filters import is_etf_or_leveraged
 from .eval_index import choose_eval_index
+from .indicator_cache import IndicatorCache
+from .indicator_state import IndicatorFrame, TickerIndicatorState
 from .indicators import atr, ema, rsi, sma
+from .pipeline import (
+    BAR_COST,
+    PATTERN_COST,
+    WINDOW_COST,
+    LazySeries,
+    Stage,
+    order_stages,
+    run_stages,
+)
+
+NO_HYBRID_SIGNAL = "Did not meet hybrid signal criteria"
 
 
 class HybridPattern(StrEnum):
@@ -49,9 +65,11 @@ class HybridEvaluationResult:
     ticker: str
     candidate: dict[str, Any] | None
     reason: str | None = None
+    # Name of the rejecting stage (see HYBRID_STAGES).
+    stage: str | None = None
 
 
-def _avg_dollar_volume(candles: list[dict[str, Any]], window: int) -> float:
+def _avg_dollar_volume(candles: Candles, window: int) -> float:
     if not candles:
         return 0.0
     sub = candles[-window:] if len(candles) >= window else candles
@@ -65,56 +83,13 @@ def _avg_dollar_volume(candles: list[dict[str, Any]], window: int) -> float:
     return total / count if count else 0.0
 
 
-def _basic_filters(
-    ticker: str,
-    candles: list[dict[str, Any]],
-    settings: HybridEvaluationSettings,
-    meta: dict[str, Any],
-    eval_index: int,
-) -> tuple[bool, str | None, float, float]:
-    if len(candles) < settings.min_history_bars:
-        return (
-            False,
-            f"Not enough history (<{settings.min_history_bars} bars)",
-            0.0,
-            0.0,
-        )
-
-    idx = max(0, min(eval_index, len(candles) - 1))
-    latest = candles[idx]
-    currency = str(meta.get("currency", "KRW")).upper()
-
-    close = float(latest.get("close") or 0.0)
-    eff_min_price = settings.min_price
-    if currency == "USD" and settings.us_min_price is not None:
-        eff_min_price = settings.us_min_price
-    if eff_min_price and close < eff_min_price:
-        return False, f"Price {close:.2f} < MIN_PRICE {eff_min_price:.2f}", 0.0, 0.0
-
-    avg_dv = _avg_dollar_volume(candles[: idx + 1], 20)
-    eff_min_dv = settings.min_dollar_volume
-    if currency == "USD" and settings.us_min_dollar_volume is not None:
-        eff_min_dv = settings.us_min_dollar_volume
-    if eff_min_dv > 0 and avg_dv < eff_min_dv:
-        return (
-            False,
-            f"Avg dollar volume {avg_dv:,.0f} < {eff_min_dv:,.0f}",
-            0.0,
-            avg_dv,
-        )
-
-    if settings.exclude_etf_etn and is_etf_or_leveraged(ticker, meta):
-        return False, "ETF/ETN excluded", close, avg_dv
-
-    return True, None, close, avg_dv
-
-
-def _volume_stats(
-    candles: list[dict[str, Any]], lookback_days: int
-) -> tuple[float, float]:
+def _volume_stats(candles: Candles, lookback_days: int) -> tuple[float, float]:
     if not candles:
         return 0.0, 0.0
-    vols = [float(c.get("volume") or 0.0) for c in candles]
+    if lookback_days > 0:
+        # Only the last bars are read; avoid a column over the whole window.
+        candles = candles[-max(lookback_days, 2) :]
+    vols = candle_column(candles, "volume", default=0.0)
     prev_vol = vols[-2] if len(vols) >= 2 else vols[-1]
     window = vols[-lookback_days:] if len(vols) >= lookback_days else vols
     avg_vol = sum(window) / len(window) if window else 0.0
@@ -122,24 +97,24 @@ def _volume_stats(
 
 
 def _detect_trend_pullback_bounce(
-    closes: list[float],
-    sma_trend: list[float],
-    ema_short: list[float],
-    ema_mid: list[float],
-    rsi_vals: list[float],
-    candles: list[dict[str, Any]],
+    closes: Sequence[float],
+    sma_trend: Sequence[float],
+    ema_short: Sequence[float],
+    ema_mid: Sequence[float],
+    rsi_vals: Sequence[float],
+    candles: Candles,
     settings: HybridEvaluationSettings,
 ) -> tuple[bool, list[str], HybridPattern | None, dict[str, Any]]:
     reasons: list[str] = []
     idx = len(closes) - 1
     close = closes[idx]
     sma_val = sma_trend[idx]
-    rsi_val = rsi_vals[idx]
 
     if not (close > sma_val):
         return False, ["Close not above SMA trend"], None, {}
     if not (ema_short[idx] >= ema_mid[idx]):
         return False, ["EMA short < EMA mid (momentum missing)"], None, {}
+    rsi_val = rsi_vals[idx]
     if not (settings.rsi_zone_low <= rsi_val <= settings.rsi_zone_high):
         return False, ["RSI not in swing zone"], None, {}
 
@@ -212,12 +187,12 @@ def _detect_trend_pullback_bounce(
 
 
 def _detect_swing_high_breakout(
-    closes: list[float],
-    sma_trend: list[float],
-    ema_short: list[float],
-    ema_mid: list[float],
-    rsi_vals: list[float],
-    candles: list[dict[str, Any]],
+    closes: Sequence[float],
+    sma_trend: Sequence[float],
+    ema_short: Sequence[float],
+    ema_mid: Sequence[float],
+    rsi_vals: Sequence[float],
+    candles: Candles,
     settings: HybridEvaluationSettings,
     currency: str,
 ) -> tuple[bool, list[str], HybridPattern | None, dict[str, Any]]:
@@ -237,8 +212,8 @@ def _detect_swing_high_breakout(
     if len(window) < min_bars:
         return False, ["Not enough bars for consolidation"], None, {}
 
-    highs = [float(c.get("high") or 0.0) for c in window]
-    lows = [float(c.get("low") or 0.0) for c in window]
+    highs = candle_column(window, "high", default=0.0)
+    lows = candle_column(window, "low", default=0.0)
     swing_high = max(highs[:-1]) if len(highs) > 1 else highs[0]
     range_pct = (max(highs) - min(lows)) / swing_high if swing_high else 0.0
     if range_pct > 0.1:
@@ -268,22 +243,22 @@ def _detect_swing_high_breakout(
 
 
 def _detect_rsi_oversold_reversal(
-    closes: list[float],
-    sma_trend: list[float],
-    ema_short: list[float],
-    ema_mid: list[float],
-    rsi_vals: list[float],
-    candles: list[dict[str, Any]],
+    closes: Sequence[float],
+    sma_trend: Sequence[float],
+    ema_short: Sequence[float],
+    ema_mid: Sequence[float],
+    rsi_vals: Sequence[float],
+    candles: Candles,
     settings: HybridEvaluationSettings,
 ) -> tuple[bool, list[str], HybridPattern | None, dict[str, Any]]:
     idx = len(closes) - 1
     close = closes[idx]
     sma_val = sma_trend[idx]
-    rsi_val = rsi_vals[idx]
     reasons: list[str] = []
 
     if not (close > sma_val):
         return False, ["Price not above SMA trend"], None, {}
+    rsi_val = rsi_vals[idx]
 
     # EMA short dipping below EMA mid temporarily is allowed; we do not enforce it strictly here.
     if not (
@@ -326,81 +301,213 @@ def _detect_rsi_oversold_reversal(
     return False, ["Reversal not near EMA support"], None, {}
 
 
+class HybridContext:
+    """What the hybrid stages read; indicators are computed on first use.
+
+    ``series`` supplies columns (``"close"``/``"high"``/``"low"``) and
+    indicators (``"ema:10"``, ``"sma:20"``, ...) computed elsewhere, e.g. once
+    over the whole history by the backtest replay; they must end on the
+    evaluation bar.
+    """
+
+    def __init__(
+        self,
+        ticker: str,
+        candles: Candles,
+        settings: HybridEvaluationSettings,
+        meta: dict[str, Any],
+        idx_eval: int,
+        indicator_state: TickerIndicatorState | None = None,
+        indicator_cache: IndicatorCache | None = None,
+        *,
+        series: Mapping[str, Sequence[float]] | None = None,
+    ) -> None:
+        self.ticker = ticker
+        self.candles = candles
+        self.settings = settings
+        self.meta = meta
+        self.currency = str(meta.get("currency", "KRW")).upper()
+        self.candles_eval = candles[: idx_eval + 1]
+        self.latest = candles[max(0, min(idx_eval, len(candles) - 1))]
+        self._state = indicator_state
+        self._cache = indicator_cache
+        self._series = series or {}
+        self.sma_trend = self._lazy("sma", settings.sma_trend_period)
+        self.ema_short = self._lazy("ema", settings.ema_short_period)
+        self.ema_mid = self._lazy("ema", settings.ema_mid_period)
+        self.rsi_vals = self._lazy("rsi", settings.rsi_period)
+        self.atr_vals = self._lazy("atr", 14)
+        # Set by the pattern stage: (pattern, reasons, detector context).
+        self.match: tuple[HybridPattern, list[str], dict[str, Any]] | None = None
+
+    @cached_property
+    def closes(self) -> Sequence[float]:
+        if "close" in self._series:
+            return self._series["close"]
+        return candle_column(self.candles_eval, "close", default=0.0)
+
+    @cached_property
+    def highs(self) -> Sequence[float]:
+        if "high" in self._series:
+            return self._series["high"]
+        return candle_column(self.candles_eval, "high", default=0.0)
+
+    @cached_property
+    def lows(self) -> Sequence[float]:
+        if "low" in self._series:
+            return self._series["low"]
+        return candle_column(self.candles_eval, "low", default=0.0)
+
+    @cached_property
+    def last_close(self) -> float:
+        return float(self.latest.get("close") or 0.0)
+
+    @cached_property
+    def avg_dollar_volume(self) -> float:
+        return _avg_dollar_volume(self.candles_eval, 20)
+
+    @cached_property
+    def frame(self) -> IndicatorFrame:
+        return IndicatorFrame(
+            self.candles_eval,
+            self.closes,
+            self.highs,
+            self.lows,
+            self._state,
+            cache=self._cache,
+            ticker=self.ticker,
+        )
+
+    def _lazy(self, kind: str, period: int) -> Sequence[float]:
+        given = self._series.get(f"{kind}:{period}")
+        if given is not None:
+            return given
+        return LazySeries(lambda: self._compute(kind, period))
+
+    def _compute(self, kind: str, period: int) -> list[float]:
+        if self._state is not None or self._cache is not None:
+            frame = self.frame
+            if kind == "atr":
+                return frame.atr(period)
+            return {"sma": frame.sma, "ema": frame.ema, "rsi": frame.rsi}[kind](period)
+        if kind == "atr":
+            return atr(self.highs, self.lows, self.closes, period)
+        if kind == "sma":
+            return sma(self.closes, period)
+        if kind == "rsi":
+            return rsi(self.closes, period)
+        return ema(self.closes, period)
+
+
+def _check_history(ctx: HybridContext) -> str | None:
+    min_bars = ctx.settings.min_history_bars
+    if len(ctx.candles) < min_bars:
+        return f"Not enough history (<{min_bars} bars)"
+    return None
+
+
+def _check_price(ctx: HybridContext) -> str | None:
+    settings = ctx.settings
+    eff_min_price = settings.min_price
+    if ctx.currency == "USD" and settings.us_min_price is not None:
+        eff_min_price = settings.us_min_price
+    close = ctx.last_close
+    if eff_min_price and close < eff_min_price:
+        return f"Price {close:.2f} < MIN_PRICE {eff_min_price:.2f}"
+    return None
+
+
+def _check_liquidity(ctx: HybridContext) -> str | None:
+    settings = ctx.settings
+    eff_min_dv = settings.min_dollar_volume
+    if ctx.currency == "USD" and settings.us_min_dollar_volume is not None:
+        eff_min_dv = settings.us_min_dollar_volume
+    avg_dv = ctx.avg_dollar_volume
+    if eff_min_dv > 0 and avg_dv < eff_min_dv:
+        return f"Avg dollar volume {avg_dv:,.0f} < {eff_min_dv:,.0f}"
+    return None
+
+
+def _check_etf(ctx: HybridContext) -> str | None:
+    if ctx.settings.exclude_etf_etn and is_etf_or_leveraged(ctx.ticker, ctx.meta):
+        return "ETF/ETN excluded"
+    return None
+
+
+def _check_pattern(ctx: HybridContext) -> str | None:
+    args = (
+        ctx.closes,
+        ctx.sma_trend,
+        ctx.ema_short,
+        ctx.ema_mid,
+        ctx.rsi_vals,
+        ctx.candles_eval,
+        ctx.settings,
+    )
+    # 1) Trend continuation + pullback bounce (highest priority)
+    ok, reasons, pattern, context = _detect_trend_pullback_bounce(*args)
+    if not (ok and pattern):
+        # 2) Swing high breakout
+        ok, reasons, pattern, context = _detect_swing_high_breakout(*args, ctx.currency)
+    if not (ok and pattern):
+        # 3) RSI oversold reversal
+        ok, reasons, pattern, context = _detect_rsi_oversold_reversal(*args)
+    if not (ok and pattern):
+        return NO_HYBRID_SIGNAL
+    ctx.match = (pattern, reasons, context)
+    return None
+
+
+# Declared in the original filter order; run cheapest first.
+HYBRID_STAGES: tuple[Stage[HybridContext], ...] = order_stages(
+    [
+        Stage("history", BAR_COST, ("window",), _check_history),
+        Stage("price", BAR_COST, ("bar", "meta"), _check_price),
+        Stage("liquidity", WINDOW_COST, ("window", "meta"), _check_liquidity),
+        Stage("etf", BAR_COST, ("meta",), _check_etf),
+        Stage(
+            "pattern",
+            PATTERN_COST,
+            ("window", "sma_trend", "ema_short", "ema_mid", "rsi"),
+            _check_pattern,
+        ),
+    ]
+)
+
+
 def evaluate_ticker_hybrid(
     ticker: str,
-    candles: list[dict[str, Any]],
+    candles: Candles,
     settings: HybridEvaluationSettings,
     meta: dict[str, Any] | None = None,
+    *,
+    indicator_state: TickerIndicatorState | None = None,
+    indicator_cache: IndicatorCache | None = None,
 ) -> HybridEvaluationResult:
     meta = meta or {}
-    currency = str(meta.get("currency", "KRW")).upper()
 
     provider = str(meta.get("data_source") or meta.get("provider") or "kis").lower()
     idx_eval, _ = choose_eval_index(candles, meta=meta, provider=provider)
     if idx_eval < 0:
-        return HybridEvaluationResult(ticker, None, "No candle data")
-
-    candles_eval = candles[: idx_eval + 1]
+        return HybridEvaluationResult(ticker, None, "No candle data", "eval_index")
 
-    ok, reason, last_close, avg_dv = _basic_filters(
-        ticker, candles, settings, meta, idx_eval
+    ctx = HybridContext(
+        ticker, candles, settings, meta, idx_eval, indicator_state, indicator_cache
     )
-    if not ok:
-        return HybridEvaluationResult(ticker, None, reason)
-
-    closes = [float(c.get("close") or 0.0) for c in candles_eval]
-    highs = [float(c.get("high") or 0.0) for c in candles_eval]
-    lows = [float(c.get("low") or 0.0) for c in candles_eval]
-    sma_trend = sma(closes, settings.sma_trend_period)
-    ema_short = ema(closes, settings.ema_short_period)
-    ema_mid = ema(closes, settings.ema_mid_period)
-    rsi_vals = rsi(closes, settings.rsi_period)
-    atr_vals = atr(highs, lows, closes, 14)
+    rejected = run_stages(HYBRID_STAGES, ctx)
+    if rejected is not None:
+        stage, reason = rejected
+        return HybridEvaluationResult(ticker, None, reason, stage)
+    assert ctx.match is not None
+    pattern, pattern_reasons, pattern_context = ctx.match
+
+    currency = ctx.currency
+    last_close, avg_dv = ctx.last_close, ctx.avg_dollar_volume
+    sma_trend, ema_short, ema_mid = ctx.sma_trend, ctx.ema_short, ctx.ema_mid
+    rsi_vals, atr_vals = ctx.rsi_vals, ctx.atr_vals
+    # ATR only feeds the candidate, so rejected tickers never compute it.
     atr_value = atr_vals[-1] if atr_vals else float("nan")
 
-    pattern: HybridPattern | None = None
-    pattern_reasons: list[str] = []
-    pattern_context: dict[str, Any] = {}
-
-    # 1) Trend continuation + pullback bounce (highest priority)
-    ok_pb, reasons_pb, pat_pb, ctx_pb = _detect_trend_pullback_bounce(
-        closes, sma_trend, ema_short, ema_mid, rsi_vals, candles_eval, settings
-    )
-    if ok_pb and pat_pb:
-        pattern = pat_pb
-        pattern_reasons = reasons_pb
-        pattern_context = ctx_pb
-    else:
-        # 2) Swing high breakout
-        ok_bo, reasons_bo, pat_bo, ctx_bo = _detect_swing_high_breakout(
-            closes,
-            sma_trend,
-            ema_short,
-            ema_mid,
-            rsi_vals,
-            candles_eval,
-            settings,
-            currency,
-        )
-        if ok_bo and pat_bo:
-            pattern = pat_bo
-            pattern_reasons = reasons_bo
-            pattern_context = ctx_bo
-        else:
-            # 3) RSI oversold reversal
-            ok_rsi, reasons_rsi, pat_rsi, ctx_rsi = _detect_rsi_oversold_reversal(
-                closes, sma_trend, ema_short, ema_mid, rsi_vals, candles_eval, settings
-            )
-            if ok_rsi and pat_rsi:
-                pattern = pat_rsi
-                pattern_reasons = reasons_rsi
-                pattern_context = ctx_rsi
-
-    if not pattern:
-        return HybridEvaluationResult(
-            ticker, None, "Did not meet hybrid signal criteria"
-        )
-
     latest = candles[idx_eval]
     prev = candles[idx_eval - 1] if idx_eval >= 1 else latest
 
@@ -525,6 +632,9 @@ def evaluate_ticker_hybrid(
 
 
 __all__ = [
+    "HYBRID_STAGES",
+    "NO_HYBRID_SIGNAL",
+    "HybridContext",
     "HybridPattern",
     "HybridEvaluationSettings",
     "HybridEvaluationResult",
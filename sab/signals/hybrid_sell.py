@@ -1,10 +1,14 @@
 from __future__ import annotations
 
 import datetime as dt
+from collections.abc import Sequence
 from dataclasses import dataclass
 from typing import Any
 
+from ..data.candle_series import Candles, candle_column
 from .eval_index import choose_eval_index
+from .indicator_cache import IndicatorCache
+from .indicator_state import IndicatorFrame, TickerIndicatorState
 from .indicators import ema, rsi, sma
 
 
@@ -61,9 +65,12 @@ def _compute_pnl_pct(
 
 def evaluate_sell_signals_hybrid(
     ticker: str,
-    candles: list[dict[str, float]],
+    candles: Candles,
     holding: dict[str, Any],
     settings: HybridSellSettings,
+    *,
+    indicator_state: TickerIndicatorState | None = None,
+    indicator_cache: IndicatorCache | None = None,
 ) -> HybridSellEvaluation:
     if len(candles) < max(settings.min_bars, 2):
         return HybridSellEvaluation(
@@ -83,16 +90,58 @@ def evaluate_sell_signals_hybrid(
         )
 
     candles_eval = candles[: idx_eval + 1]
-    closes = [float(c["close"]) for c in candles_eval]
-    latest = candles[idx_eval]
+    closes = [float(c) for c in candle_column(candles_eval, "close")]
+
+    if indicator_state is None and indicator_cache is None:
+        ema_short = ema(closes, settings.ema_short_period)
+        ema_mid = ema(closes, settings.ema_mid_period)
+        sma_trend = sma(closes, settings.sma_trend_period)
+        rsi_values = rsi(closes, settings.rsi_period)
+    else:
+        frame = IndicatorFrame(
+            candles_eval,
+            closes,
+            state=indicator_state,
+            cache=indicator_cache,
+            ticker=ticker,
+        )
+        ema_short = frame.ema(settings.ema_short_period)
+        ema_mid = frame.ema(settings.ema_mid_period)
+        sma_trend = frame.sma(settings.sma_trend_period)
+        rsi_values = frame.rsi(settings.rsi_period)
+
+    return apply_hybrid_sell_rules(
+        candles_eval,
+        holding,
+        settings,
+        ema_short,
+        ema_mid,
+        sma_trend,
+        rsi_values,
+    )
+
+
+def apply_hybrid_sell_rules(
+    candles_eval: Candles,
+    holding: dict[str, Any],
+    settings: HybridSellSettings,
+    ema_short: Sequence[float],
+    ema_mid: Sequence[float],
+    sma_trend: Sequence[float],
+    rsi_values: Sequence[float],
+    *,
+    today: dt.date | None = None,
+) -> HybridSellEvaluation:
+    """Run the hybrid sell rules on the last bar of ``candles_eval``.
+
+    The series end on that bar; ``today`` replaces the wall clock for the
+    time stop (the backtest replay passes the bar date).
+    """
+    idx_eval = len(candles_eval) - 1
+    latest = candles_eval[idx_eval]
     last_close = float(latest.get("close") or 0.0)
     eval_date = str(latest.get("date") or "") or None
 
-    ema_short = ema(closes, settings.ema_short_period)
-    ema_mid = ema(closes, settings.ema_mid_period)
-    sma_trend = sma(closes, settings.sma_trend_period)
-    rsi_values = rsi(closes, settings.rsi_period)
-
     reasons: list[str] = []
     action = "HOLD"
 
@@ -210,7 +259,7 @@ def evaluate_sell_signals_hybrid(
     if entry_date_str and time_stop_days > 0:
         try:
             entry_date = dt.date.fromisoformat(str(entry_date_str))
-            days_in_trade = (dt.date.today() - entry_date).days
+            days_in_trade = ((today or dt.date.today()) - entry_date).days
             if days_in_trade >= time_stop_days:
                 reasons.append(
                     f"Time stop: {days_in_trade} days ≥ {time_stop_days} days"
@@ -266,5 +315,6 @@ def evaluate_sell_signals_hybrid(
 __all__ = [
     "HybridSellSettings",
     "HybridSellEvaluation",
+    "apply_hybrid_sell_rules",
     "evaluate_sell_signals_hybrid",
 ]
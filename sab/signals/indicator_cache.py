@@ -0,0 +1,58 @@
+"""Per-run memo of indicator series shared by the evaluators.
+
+Buy and sell evaluation compute the same EMA/RSI/ATR/SMA series for a ticker
+when it is both a candidate and a holding (``sab run``). Entries are keyed by
+``(ticker, last bar date, "<indicator>:<period>")`` and also remember the
+exact input columns, so a caller whose window differs (another bar count, an
+intraday bar that changed in between) recomputes instead of reusing.
+
+Returned lists are shared between callers and must be treated as read-only.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any
+
+CacheKey = tuple[str, str, str]
+
+
+class IndicatorCache:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: dict[CacheKey, tuple[tuple[Any, ...], list[float]]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(
+        self, ticker: str, last_date: str, name: str, inputs: tuple[Any, ...]
+    ) -> list[float] | None:
+        with self._lock:
+            entry = self._entries.get((ticker, last_date, name))
+            if entry is None or entry[0] != inputs:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry[1]
+
+    def put(
+        self,
+        ticker: str,
+        last_date: str,
+        name: str,
+        inputs: tuple[Any, ...],
+        values: list[float],
+    ) -> None:
+        with self._lock:
+            self._entries[(ticker, last_date, name)] = (inputs, values)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+__all__ = ["IndicatorCache"]
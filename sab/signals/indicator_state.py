@@ -0,0 +1,353 @@
+"""Streaming indicator state persisted per ticker.
+
+EMA, Wilder RSI/ATR and SMA only need a small state plus the next bar, so
+instead of recomputing them over the whole candle window on every run the
+state after the last evaluated bar is stored under
+``<data_dir>/indicator_state/<ticker>.json``::
+
+    {"version": 1, "streams": {"ema:20": {
+        "date": "20250103", "n": 200, "state": {"value": 101.5},
+        "anchor": [["20250102", 100.0], ["20250103", 101.0]],
+        "tail": [..., 101.5]}}}
+
+A stream resumes only when its last date is in the new window and the
+``anchor`` bars (the inputs of the last few processed bars) are unchanged, so
+only the bars after it are processed. Anything else (unknown date, revised
+prices, an adjusted history) rebuilds the stream from the window.
+
+A rebuilt stream equals the reference functions in :mod:`indicators`. A
+resumed stream continues the recursion from the bar the state was first
+built on, while the reference re-seeds at the start of the (sliding) window,
+so the seeded indicators can differ in the last digits; SMA is exact. Resumed
+series carry real values only for the last ``tail`` bars and NaN before.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+from collections import deque
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+from ..data.cache import load_json, save_json
+from ..data.candle_series import Candles, candle_dates
+from .indicator_cache import IndicatorCache
+from .indicators import atr, ema, rsi, sma
+
+STATE_DIR_NAME = "indicator_state"
+DEFAULT_TAIL_BARS = 64
+ANCHOR_BARS = 5
+_VERSION = 1
+_NAN = float("nan")
+
+# A step consumes one bar (close, high, low) and returns the indicator value.
+StepFn = Callable[[dict[str, Any], int, Any, Any, Any], float]
+
+
+def _ema_step(
+    st: dict[str, Any], period: int, close: Any, high: Any, low: Any
+) -> float:
+    if period <= 0:
+        return _NAN
+    value = _NAN if close is None else close
+    prev = st.get("value")
+    if prev is not None:
+        k = 2 / (period + 1)
+        value = (value * k) + (prev * (1 - k))
+    st["value"] = value
+    return value
+
+
+def _rsi_value(avg_gain: float, avg_loss: float) -> float:
+    return 100.0 if avg_loss == 0 else 100 - (100 / (1 + (avg_gain / avg_loss)))
+
+
+def _rsi_step(
+    st: dict[str, Any], period: int, close: Any, high: Any, low: Any
+) -> float:
+    if period <= 0:
+        return _NAN
+    n = st.get("n", 0)
+    st["n"] = n + 1
+    prev = st.get("prev")
+    st["prev"] = close
+    if n == 0:
+        return _NAN
+    change = close - prev
+    gain = max(0.0, change)
+    loss = max(0.0, -change)
+    if n <= period:
+        gains = st.setdefault("gains", [])
+        losses = st.setdefault("losses", [])
+        gains.append(gain)
+        losses.append(loss)
+        if n < period:
+            return _NAN
+        avg_gain = sum(gains) / period
+        avg_loss = sum(losses) / period
+        del st["gains"], st["losses"]
+    else:
+        avg_gain = ((st["avg_gain"] * (period - 1)) + gain) / period
+        avg_loss = ((st["avg_loss"] * (period - 1)) + loss) / period
+    st["avg_gain"] = avg_gain
+    st["avg_loss"] = avg_loss
+    return _rsi_value(avg_gain, avg_loss)
+
+
+def _atr_step(
+    st: dict[str, Any], period: int, close: Any, high: Any, low: Any
+) -> float:
+    if period <= 0:
+        return _NAN
+    n = st.get("n", 0)
+    st["n"] = n + 1
+    prev_close = close if n == 0 else st["prev"]
+    st["prev"] = close
+    tr = max(high - low, abs(high - prev_close), abs(low - prev_close))
+    if n == 0:
+        return _NAN
+    if n <= period:
+        seed = st.setdefault("seed", [])
+        seed.append(tr)
+        if n < period:
+            return _NAN
+        value = sum(seed) / period
+        del st["seed"]
+    else:
+        value = ((st["value"] * (period - 1)) + tr) / period
+    st["value"] = value
+    return value
+
+
+def _sma_step(
+    st: dict[str, Any], period: int, close: Any, high: Any, low: Any
+) -> float:
+    if period <= 0:
+        return _NAN
+    value = close
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        value = 0.0
+    window = st.setdefault("window", [])
+    window_sum = st.get("sum", 0.0) + value
+    if len(window) >= period:
+        window_sum -= window.pop(0)
+    window.append(value)
+    st["sum"] = window_sum
+    return window_sum / period if len(window) >= period else _NAN
+
+
+_STEPS: dict[str, StepFn] = {
+    "atr": _atr_step,
+    "ema": _ema_step,
+    "rsi": _rsi_step,
+    "sma": _sma_step,
+}
+
+
+def _same(a: Any, b: Any) -> bool:
+    if a == b:
+        return True
+    return isinstance(a, float) and isinstance(b, float) and a != a and b != b
+
+
+@dataclass
+class TickerIndicatorState:
+    """The persisted streams of one ticker; mutated by :class:`IndicatorFrame`."""
+
+    key: str
+    streams: dict[str, dict[str, Any]] = field(default_factory=dict)
+    dirty: bool = False
+
+
+class IndicatorStateStore:
+    def __init__(self, base_dir: str) -> None:
+        self.dir = os.path.join(base_dir, STATE_DIR_NAME)
+        self._states: dict[str, TickerIndicatorState] = {}
+
+    def get(self, key: str) -> TickerIndicatorState:
+        state = self._states.get(key)
+        if state is None:
+            data = load_json(self.dir, key)
+            streams: dict[str, dict[str, Any]] = {}
+            if isinstance(data, dict) and data.get("version") == _VERSION:
+                raw = data.get("streams")
+                if isinstance(raw, dict):
+                    streams = {k: v for k, v in raw.items() if isinstance(v, dict)}
+            state = TickerIndicatorState(key, streams)
+            self._states[key] = state
+        return state
+
+    def flush(self) -> None:
+        for state in self._states.values():
+            if not state.dirty:
+                continue
+            save_json(
+                self.dir,
+                state.key,
+                {"version": _VERSION, "streams": dict(sorted(state.streams.items()))},
+            )
+            state.dirty = False
+
+
+class IndicatorFrame:
+    """Indicators over one evaluation window.
+
+    Values come from the per-run ``cache`` when another evaluator already
+    computed them for ``ticker``, else from the saved ``state`` or, without
+    state (or when the window has bars without a date), from the reference
+    functions. ``highs`` and ``lows`` are only needed for :meth:`atr`.
+    """
+
+    def __init__(
+        self,
+        candles: Candles,
+        closes: Sequence[Any],
+        highs: Sequence[Any] | None = None,
+        lows: Sequence[Any] | None = None,
+        state: TickerIndicatorState | None = None,
+        *,
+        cache: IndicatorCache | None = None,
+        ticker: str = "",
+        tail: int = DEFAULT_TAIL_BARS,
+    ) -> None:
+        self.closes = closes
+        self.highs = highs
+        self.lows = lows
+        self.state = state
+        self.cache = cache
+        self.ticker = ticker
+        self.tail = max(tail, 2)
+        self._dates = candle_dates(candles)
+        if state is not None and (len(self._dates) != len(closes) or "" in self._dates):
+            self.state = None
+        self._computed: dict[str, list[float]] = {}
+        self._cache_inputs: dict[str, tuple[Any, ...]] = {}
+
+    def ema(self, period: int) -> list[float]:
+        return self._series("ema", period)
+
+    def rsi(self, period: int = 14) -> list[float]:
+        return self._series("rsi", period)
+
+    def sma(self, period: int) -> list[float]:
+        return self._series("sma", period)
+
+    def atr(self, period: int = 14) -> list[float]:
+        if self.highs is None or self.lows is None:
+            raise ValueError("ATR needs highs and lows")
+        return self._series("atr", period)
+
+    def _reference(self, kind: str, period: int) -> list[float]:
+        if kind == "atr":
+            assert self.highs is not None and self.lows is not None
+            return atr(self.highs, self.lows, self.closes, period)
+        if kind == "rsi":
+            return rsi(self.closes, period)
+        if kind == "sma":
+            return sma(self.closes, period)
+        return ema(self.closes, period)
+
+    def _columns(self, kind: str) -> tuple[Any, ...]:
+        # Built once per frame; ema/rsi/sma share the close tuple.
+        group = "hlc" if kind == "atr" else "c"
+        cols = self._cache_inputs.get(group)
+        if cols is None:
+            if group == "hlc":
+                assert self.highs is not None and self.lows is not None
+                cols = (tuple(self.highs), tuple(self.lows), tuple(self.closes))
+            else:
+                cols = tuple(self.closes)
+            self._cache_inputs[group] = cols
+        return cols
+
+    def _series(self, kind: str, period: int) -> list[float]:
+        name = f"{kind}:{period}"
+        values = self._computed.get(name)
+        if values is not None:
+            return values
+        last_date = self._dates[-1] if self._dates else ""
+        if self.cache is not None:
+            values = self.cache.get(self.ticker, last_date, name, self._columns(kind))
+        if values is None:
+            if self.state is None:
+                values = self._reference(kind, period)
+            else:
+                values = self._stream(kind, period)
+            if self.cache is not None:
+                self.cache.put(
+                    self.ticker, last_date, name, self._columns(kind), values
+                )
+        self._computed[name] = values
+        return values
+
+    def _inputs(self, kind: str, i: int) -> list[Any]:
+        if kind == "atr":
+            assert self.highs is not None and self.lows is not None
+            return [self._dates[i], self.highs[i], self.lows[i], self.closes[i]]
+        return [self._dates[i], self.closes[i]]
+
+    def _resume_index(self, kind: str, stream: dict[str, Any] | None) -> int | None:
+        """Index of the first unprocessed bar, or None when a rebuild is needed."""
+        if not stream or not isinstance(stream.get("state"), dict):
+            return None
+        anchor = stream.get("anchor")
+        if not isinstance(anchor, list) or not anchor:
+            return None
+        last_date = stream.get("date")
+        n = len(self._dates)
+        pos = next((i for i in range(n - 1, -1, -1) if self._dates[i] == last_date), -1)
+        if pos < len(anchor) - 1:
+            return None
+        for offset, expected in enumerate(reversed(anchor)):
+            current = self._inputs(kind, pos - offset)
+            if not isinstance(expected, list) or len(expected) != len(current):
+                return None
+            if not all(_same(a, b) for a, b in zip(current, expected, strict=True)):
+                return None
+        return pos + 1
+
+    def _stream(self, kind: str, period: int) -> list[float]:
+        assert self.state is not None
+        name = f"{kind}:{period}"
+        n = len(self.closes)
+        step = _STEPS[kind]
+        stream = self.state.streams.get(name)
+        start = self._resume_index(kind, stream)
+        rebuilt = start is None or stream is None
+        if rebuilt:
+            stream = {"state": {}, "n": 0, "tail": []}
+            start = 0
+        assert stream is not None and start is not None
+        st: dict[str, Any] = stream["state"]
+        highs = self.highs or self.closes
+        lows = self.lows or self.closes
+        produced = [
+            step(st, period, self.closes[i], highs[i], lows[i]) for i in range(start, n)
+        ]
+        tail = deque(stream.get("tail") or [], maxlen=self.tail)
+        tail.extend(produced)
+
+        if produced:
+            first = max(0, n - ANCHOR_BARS)
+            stream.update(
+                date=self._dates[-1],
+                n=int(stream.get("n") or 0) + len(produced),
+                anchor=[self._inputs(kind, i) for i in range(first, n)],
+                tail=list(tail),
+            )
+            self.state.streams[name] = stream
+            self.state.dirty = True
+
+        return produced if rebuilt else [_NAN] * (n - len(tail)) + list(tail)
+
+
+__all__ = [
+    "ANCHOR_BARS",
+    "DEFAULT_TAIL_BARS",
+    "STATE_DIR_NAME",
+    "IndicatorFrame",
+    "IndicatorStateStore",
+    "TickerIndicatorState",
+]
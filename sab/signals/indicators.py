@@ -1,7 +1,19 @@
+"""Technical indicators over plain float lists.
+
+The single-series functions below are the reference implementation. The
+``*_many`` variants evaluate several series at once and use the NumPy
+kernels from :mod:`sab.signals.indicators_np` when NumPy is importable
+(``SAB_INDICATOR_BACKEND=auto``, the default); ``python`` forces the loops
+here and ``numpy`` requires NumPy. Both backends return identical values.
+"""
+
 from __future__ import annotations
 
-from collections.abc import Iterable
+import os
+from collections.abc import Callable, Iterable, Sequence
 from math import isnan
+from types import ModuleType
+from typing import Any
 
 
 def ema(values: Iterable[float], period: int) -> list[float]:
@@ -92,3 +104,121 @@ def sma(values: Iterable[float], period: int) -> list[float]:
         if i >= period - 1:
             out[i] = window_sum / period
     return out
+
+
+# ---------------------------------------------------------------------------
+# Batch API / backend selection
+# ---------------------------------------------------------------------------
+
+INDICATOR_BACKENDS = ("auto", "numpy", "python")
+
+_np_backend: ModuleType | None = None
+_np_backend_resolved = False
+
+
+def _numpy_backend() -> ModuleType | None:
+    global _np_backend, _np_backend_resolved
+    if _np_backend_resolved:
+        return _np_backend
+    choice = (os.getenv("SAB_INDICATOR_BACKEND") or "auto").strip().lower()
+    backend: ModuleType | None = None
+    if choice != "python":
+        try:
+            from . import indicators_np as backend
+        except ImportError:
+            if choice == "numpy":
+                raise
+            backend = None
+    _np_backend = backend
+    _np_backend_resolved = True
+    return backend
+
+
+def reset_indicator_backend() -> None:
+    """Re-read ``SAB_INDICATOR_BACKEND`` on the next batch call."""
+    global _np_backend, _np_backend_resolved
+    _np_backend = None
+    _np_backend_resolved = False
+
+
+def indicator_backend() -> str:
+    return "numpy" if _numpy_backend() is not None else "python"
+
+
+def _run_grouped(
+    columns: Sequence[Sequence[list[Any]]],
+    kernel: Callable[..., Any],
+) -> list[list[float]]:
+    """Run ``kernel`` once per group of equal-length series (NumPy path)."""
+    import numpy as np
+
+    results: list[list[float]] = [[] for _ in columns]
+    groups: dict[int, list[int]] = {}
+    for idx, cols in enumerate(columns):
+        groups.setdefault(len(cols[0]), []).append(idx)
+    for length, members in groups.items():
+        if length == 0:
+            continue
+        arrays = [
+            np.array([columns[m][c] for m in members], dtype=float)
+            for c in range(len(columns[members[0]]))
+        ]
+        out = kernel(*arrays)
+        for row, member in enumerate(members):
+            results[member] = out[row].tolist()
+    return results
+
+
+def ema_many(series: Iterable[Iterable[float]], period: int) -> list[list[float]]:
+    cols = [[list(values)] for values in series]
+    backend = _numpy_backend()
+    if backend is None:
+        return [ema(c[0], period) for c in cols]
+    return _run_grouped(cols, lambda v: backend.ema(v, period))
+
+
+def rsi_many(series: Iterable[Iterable[float]], period: int = 14) -> list[list[float]]:
+    cols = [[list(values)] for values in series]
+    backend = _numpy_backend()
+    if backend is None:
+        return [rsi(c[0], period) for c in cols]
+    return _run_grouped(cols, lambda v: backend.rsi(v, period))
+
+
+def sma_many(series: Iterable[Iterable[float]], period: int) -> list[list[float]]:
+    cols = [[list(values)] for values in series]
+    backend = _numpy_backend()
+    if backend is None:
+        return [sma(c[0], period) for c in cols]
+    return _run_grouped(cols, lambda v: backend.sma(v, period))
+
+
+def atr_many(
+    series: Iterable[tuple[Iterable[float], Iterable[float], Iterable[float]]],
+    period: int = 14,
+) -> list[list[float]]:
+    """ATR for ``(highs, lows, closes)`` triples."""
+    cols: list[list[list[Any]]] = []
+    for highs, lows, closes in series:
+        H, L, C = list(highs), list(lows), list(closes)
+        n = min(len(H), len(L), len(C))
+        cols.append([H[:n], L[:n], C[:n]])
+    backend = _numpy_backend()
+    if backend is None:
+        return [atr(h, lo, c, period) for h, lo, c in cols]
+    return _run_grouped(cols, lambda h, lo, c: backend.atr(h, lo, c, period))
+
+
+__all__ = [
+    "INDICATOR_BACKENDS",
+    "atr",
+    "atr_many",
+    "ema",
+    "ema_many",
+    "indicator_backend",
+    "reset_indicator_backend",
+    "rsi",
+    "rsi_many",
+    "sma",
+    "sma_many",
+]
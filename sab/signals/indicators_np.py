@@ -0,0 +1,120 @@
+"""NumPy kernels for :mod:`sab.signals.indicators` (optional dependency).
+
+Each kernel takes a 2-D ``float64`` array with one series per row and returns
+an array of the same shape. The recursions still step through time, but every
+step updates all rows at once, performing the same floating-point operations
+in the same order as the pure-Python functions. Results are therefore
+bit-for-bit identical per row, including NaN propagation, and the speed-up
+grows with the number of series evaluated together.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+
+FloatArray = np.ndarray[Any, np.dtype[np.float64]]
+
+
+def _nan_like(values: FloatArray) -> FloatArray:
+    return np.full(values.shape, np.nan)
+
+
+def ema(values: FloatArray, period: int) -> FloatArray:
+    rows, n = values.shape
+    if period <= 0 or n == 0:
+        return _nan_like(values)
+    k = 2 / (period + 1)
+    keep = 1 - k
+    out = np.empty_like(values)
+    prev = values[:, 0].copy()
+    out[:, 0] = prev
+    for i in range(1, n):
+        prev = (values[:, i] * k) + (prev * keep)
+        out[:, i] = prev
+    return out
+
+
+def _seed_sum(values: FloatArray, period: int) -> FloatArray:
+    # Python's sum() of floats is compensated (3.12+), so the Wilder seeds are
+    # summed with it per row to stay identical to the reference functions.
+    return np.array([sum(row) for row in values[:, 1 : period + 1].tolist()])
+
+
+def _rsi_from_averages(avg_gain: FloatArray, avg_loss: FloatArray) -> FloatArray:
+    # Callers silence the 0/0 warnings; those rows are replaced by 100.0.
+    value = 100 - (100 / (1 + (avg_gain / avg_loss)))
+    return np.where(avg_loss == 0, 100.0, value)
+
+
+def rsi(closes: FloatArray, period: int = 14) -> FloatArray:
+    rows, n = closes.shape
+    if period <= 0 or n < 2:
+        return _nan_like(closes)
+    change = np.zeros_like(closes)
+    change[:, 1:] = closes[:, 1:] - closes[:, :-1]
+    # ``max(0.0, x)`` keeps 0.0 when x is NaN; np.maximum would propagate it.
+    gains = np.where(change > 0.0, change, 0.0)
+    losses = np.where(-change > 0.0, -change, 0.0)
+
+    out = _nan_like(closes)
+    if n <= period:
+        return out
+    avg_gain = _seed_sum(gains, period) / period
+    avg_loss = _seed_sum(losses, period) / period
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out[:, period] = _rsi_from_averages(avg_gain, avg_loss)
+        for i in range(period + 1, n):
+            avg_gain = ((avg_gain * (period - 1)) + gains[:, i]) / period
+            avg_loss = ((avg_loss * (period - 1)) + losses[:, i]) / period
+            out[:, i] = _rsi_from_averages(avg_gain, avg_loss)
+    return out
+
+
+def true_range(highs: FloatArray, lows: FloatArray, closes: FloatArray) -> FloatArray:
+    prev_close = np.empty_like(closes)
+    prev_close[:, 0] = closes[:, 0]
+    prev_close[:, 1:] = closes[:, :-1]
+    # Mirror max(a, b, c): keep the first value unless a later one is greater.
+    tr = highs - lows
+    up = np.abs(highs - prev_close)
+    tr = np.where(up > tr, up, tr)
+    down = np.abs(lows - prev_close)
+    return np.where(down > tr, down, tr)
+
+
+def atr(
+    highs: FloatArray, lows: FloatArray, closes: FloatArray, period: int = 14
+) -> FloatArray:
+    rows, n = closes.shape
+    if period <= 0 or n == 0:
+        return _nan_like(closes)
+    tr = true_range(highs, lows, closes)
+    out = _nan_like(closes)
+    if n > period:
+        prev = _seed_sum(tr, period) / period
+        out[:, period] = prev
+        for i in range(period + 1, n):
+            prev = ((prev * (period - 1)) + tr[:, i]) / period
+            out[:, i] = prev
+    return out
+
+
+def sma(values: FloatArray, period: int) -> FloatArray:
+    rows, n = values.shape
+    if period <= 0 or n == 0:
+        return _nan_like(values)
+    filled = np.where(np.isnan(values), 0.0, values)
+    out = _nan_like(values)
+    window_sum = np.zeros(rows)
+    for i in range(n):
+        window_sum = window_sum + filled[:, i]
+        if i >= period:
+            window_sum = window_sum - filled[:, i - period]
+        if i >= period - 1:
+            out[:, i] = window_sum / period
+    return out
+
+
+__all__ = ["atr", "ema", "rsi", "sma", "true_range"]
@@ -0,0 +1,313 @@
+"""Parameter sweeps of the hybrid strategy over cached history.
+
+A sweep replays :func:`~sab.signals.backtest.replay_history` for every
+parameter combination on every ticker and tallies the closed trades per
+combination. Parameters name a field of
+:class:`~sab.signals.hybrid_buy.HybridEvaluationSettings` or
+:class:`~sab.signals.hybrid_sell.HybridSellSettings`; a ``buy.`` or ``sell.``
+prefix picks the side when both have the field (the indicator periods), and a
+bare name means the buy side if it has the field.
+
+Work is split into (ticker chunk, combination chunk) tasks on a process pool.
+Candles are packed once into shared memory
+(:func:`~sab.signals.parallel_eval.shared_candles`). A task prepares each
+ticker's :class:`~sab.signals.backtest.TickerHistory` once and replays all of
+its combinations against it, so combinations that share indicator periods
+reuse the same EMA/RSI/SMA/ATR series.
+"""
+
+from __future__ import annotations
+
+import itertools
+import math
+import random
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, fields, replace
+from typing import Any
+
+from ..data.candle_series import Candles
+from .backtest import (
+    DEFAULT_MAX_HOLD_BARS,
+    SignalOutcome,
+    TickerHistory,
+    replay_history,
+)
+from .hybrid_buy import HybridEvaluationSettings
+from .hybrid_sell import HybridSellSettings
+from .parallel_eval import (
+    CHUNKS_PER_WORKER,
+    SharedItem,
+    attached_candles,
+    pool_context,
+    shared_candles,
+)
+
+# 324 combinations around the shipped defaults.
+DEFAULT_SPACE: dict[str, tuple[Any, ...]] = {
+    "rsi_zone_low": (40.0, 45.0, 50.0),
+    "rsi_zone_high": (60.0, 65.0),
+    "pullback_max_bars": (5, 10),
+    "breakout_consolidation_max_bars": (10, 15, 20),
+    "sell.profit_target_high": (0.08, 0.10, 0.15),
+    "sell.stop_loss_pct_max": (0.04, 0.05, 0.07),
+}
+
+_BUY_FIELDS = frozenset(f.name for f in fields(HybridEvaluationSettings))
+_SELL_FIELDS = frozenset(f.name for f in fields(HybridSellSettings))
+
+Params = dict[str, Any]
+
+
+@dataclass
+class SweepResult:
+    params: Params
+    signals: int = 0
+    closed: int = 0
+    wins: int = 0
+    total_return: float = 0.0
+    gross_profit: float = 0.0
+    gross_loss: float = 0.0
+
+    @property
+    def hit_rate(self) -> float | None:
+        return self.wins / self.closed if self.closed else None
+
+    @property
+    def expectancy(self) -> float | None:
+        """Mean return per closed trade."""
+        return self.total_return / self.closed if self.closed else None
+
+    @property
+    def profit_factor(self) -> float | None:
+        if self.gross_loss > 0:
+            return self.gross_profit / self.gross_loss
+        return math.inf if self.gross_profit > 0 else None
+
+    def add(self, outcomes: Iterable[SignalOutcome]) -> None:
+        for outcome in outcomes:
+            self.signals += 1
+            if outcome.status != "closed" or outcome.return_pct is None:
+                continue
+            r = outcome.return_pct
+            self.closed += 1
+            self.total_return += r
+            if r > 0:
+                self.wins += 1
+                self.gross_profit += r
+            else:
+                self.gross_loss -= r
+
+    def merge(self, other: SweepResult) -> None:
+        self.signals += other.signals
+        self.closed += other.closed
+        self.wins += other.wins
+        self.total_return += other.total_return
+        self.gross_profit += other.gross_profit
+        self.gross_loss += other.gross_loss
+
+
+def resolve_param(name: str) -> tuple[str, str]:
+    """``(side, field)`` for a parameter name; ``side`` is ``buy`` or ``sell``."""
+    side, _, attr = name.rpartition(".")
+    if side:
+        known = _BUY_FIELDS if side == "buy" else _SELL_FIELDS
+        if side not in {"buy", "sell"} or attr not in known:
+            raise ValueError(f"Unknown parameter: {name}")
+        return side, attr
+    if attr in _BUY_FIELDS:
+        return "buy", attr
+    if attr in _SELL_FIELDS:
+        return "sell", attr
+    raise ValueError(f"Unknown parameter: {name}")
+
+
+def _coerce(text: str, like: Any) -> Any:
+    text = text.strip()
+    if isinstance(like, bool):
+        lowered = text.lower()
+        if lowered not in {"true", "false", "1", "0", "yes", "no"}:
+            raise ValueError(f"Not a boolean: {text}")
+        return lowered in {"true", "1", "yes"}
+    if isinstance(like, int):
+        return int(text)
+    return float(text)
+
+
+def parse_param(
+    text: str, buy: HybridEvaluationSettings, sell: HybridSellSettings
+) -> tuple[str, tuple[Any, ...]]:
+    """Parse ``NAME=V1,V2,...``, typing values like the base setting."""
+    name, sep, raw = text.partition("=")
+    name = name.strip()
+    if not sep or not raw.strip():
+        raise ValueError(f"Expected NAME=V1,V2,...: {text}")
+    side, attr = resolve_param(name)
+    like = getattr(buy if side == "buy" else sell, attr)
+    values = tuple(dict.fromkeys(_coerce(v, like) for v in raw.split(",") if v))
+    return name, values
+
+
+def space_size(space: dict[str, Sequence[Any]]) -> int:
+    return math.prod(len(values) for values in space.values())
+
+
+def grid(space: dict[str, Sequence[Any]]) -> list[Params]:
+    """Every combination, the last parameter varying fastest."""
+    names = list(space)
+    return [
+        dict(zip(names, combo, strict=True))
+        for combo in itertools.product(*space.values())
+    ]
+
+
+def sample(space: dict[str, Sequence[Any]], n: int, seed: int = 0) -> list[Params]:
+    """``n`` distinct combinations drawn uniformly, in grid order."""
+    total = space_size(space)
+    if n >= total:
+        return grid(space)
+    picks = sorted(random.Random(seed).sample(range(total), n))
+    out: list[Params] = []
+    for index in picks:
+        combo: Params = {}
+        # Decode the mixed-radix grid index, last parameter fastest.
+        for name in reversed(list(space)):
+            index, pos = divmod(index, len(space[name]))
+            combo[name] = space[name][pos]
+        out.append({name: combo[name] for name in space})
+    return out
+
+
+def apply_params(
+    buy: HybridEvaluationSettings, sell: HybridSellSettings, params: Params
+) -> tuple[HybridEvaluationSettings, HybridSellSettings]:
+    buy_changes: Params = {}
+    sell_changes: Params = {}
+    for name, value in params.items():
+        side, attr = resolve_param(name)
+        (buy_changes if side == "buy" else sell_changes)[attr] = value
+    return replace(buy, **buy_changes), replace(sell, **sell_changes)
+
+
+def replay_combos(
+    items: Iterable[tuple[str, Candles, dict[str, Any] | None]],
+    buy: HybridEvaluationSettings,
+    sell: HybridSellSettings,
+    combos: Sequence[Params],
+    max_hold_bars: int,
+) -> Iterator[tuple[int, list[SignalOutcome]]]:
+    """Yield ``(combination index, outcomes)`` per ticker and combination."""
+    settings = [apply_params(buy, sell, params) for params in combos]
+    for ticker, candles, meta in items:
+        history = TickerHistory(ticker, candles, meta)
+        for j, (b, s) in enumerate(settings):
+            yield j, replay_history(history, b, s, max_hold_bars=max_hold_bars)
+
+
+def _sweep(
+    items: Iterable[tuple[str, Candles, dict[str, Any] | None]],
+    buy: HybridEvaluationSettings,
+    sell: HybridSellSettings,
+    combos: Sequence[Params],
+    max_hold_bars: int,
+) -> list[SweepResult]:
+    results = [SweepResult(dict(params)) for params in combos]
+    for j, outcomes in replay_combos(items, buy, sell, combos, max_hold_bars):
+        results[j].add(outcomes)
+    return results
+
+
+def _sweep_task(
+    shm_name: str | None,
+    items: list[SharedItem],
+    buy: HybridEvaluationSettings,
+    sell: HybridSellSettings,
+    combos: list[Params],
+    max_hold_bars: int,
+) -> list[SweepResult]:
+    return _sweep(attached_candles(shm_name, items), buy, sell, combos, max_hold_bars)
+
+
+def _chunks[T](values: Sequence[T], count: int) -> list[tuple[int, list[T]]]:
+    """``(start, chunk)`` pairs splitting ``values`` into about ``count`` parts."""
+    size = -(-len(values) // max(count, 1))
+    return [(i, list(values[i : i + size])) for i in range(0, len(values), size)]
+
+
+def plan_tasks(
+    packed: Sequence[SharedItem], combos: Sequence[Params], workers: int
+) -> list[tuple[list[SharedItem], int, list[Params]]]:
+    """``(tickers, first combination index, combinations)`` per pool task."""
+    target = workers * CHUNKS_PER_WORKER
+    # Few tickers: split the combinations too, so every worker has work.
+    ticker_chunks = _chunks(packed, target)
+    combo_chunks = _chunks(combos, -(-target // len(ticker_chunks)))
+    return [
+        (tickers, start, chunk)
+        for _, tickers in ticker_chunks
+        for start, chunk in combo_chunks
+    ]
+
+
+def run_sweep(
+    items: Sequence[tuple[str, Candles, dict[str, Any] | None]],
+    buy: HybridEvaluationSettings,
+    sell: HybridSellSettings,
+    combos: Sequence[Params],
+    *,
+    workers: int,
+    max_hold_bars: int = DEFAULT_MAX_HOLD_BARS,
+) -> list[SweepResult]:
+    """Tally every combination over ``items``; results follow ``combos``."""
+    if workers <= 1 or not items or not combos:
+        return _sweep(items, buy, sell, combos, max_hold_bars)
+
+    with shared_candles(items) as (name, packed):
+        tasks = plan_tasks(packed, combos, workers)
+        results = [SweepResult(dict(params)) for params in combos]
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(tasks)), mp_context=pool_context()
+        ) as pool:
+            parts = pool.map(
+                _sweep_task,
+                [name] * len(tasks),
+                [tickers for tickers, _, _ in tasks],
+                [buy] * len(tasks),
+                [sell] * len(tasks),
+                [chunk for _, _, chunk in tasks],
+                [max_hold_bars] * len(tasks),
+            )
+            for (_, start, _), part in zip(tasks, parts, strict=True):
+                for j, result in enumerate(part):
+                    results[start + j].merge(result)
+    return results
+
+
+def rank(results: Iterable[SweepResult], min_trades: int = 1) -> list[SweepResult]:
+    """Best first: expectancy, then hit rate; thin samples sort last."""
+
+    def key(result: SweepResult) -> tuple[bool, float, float, int]:
+        return (
+            result.closed >= max(min_trades, 1),
+            result.expectancy if result.expectancy is not None else -math.inf,
+            result.hit_rate if result.hit_rate is not None else -math.inf,
+            result.closed,
+        )
+
+    return sorted(results, key=key, reverse=True)
+
+
+__all__ = [
+    "DEFAULT_SPACE",
+    "SweepResult",
+    "apply_params",
+    "grid",
+    "parse_param",
+    "plan_tasks",
+    "rank",
+    "replay_combos",
+    "resolve_param",
+    "run_sweep",
+    "sample",
+    "space_size",
+]
@@ -0,0 +1,148 @@
+"""Buy evaluation fanned out over worker processes.
+
+:func:`evaluate_in_processes` runs :func:`~sab.signals.evaluator.evaluate_ticker`
+or :func:`~sab.signals.hybrid_buy.evaluate_ticker_hybrid` (picked by the
+settings type) for every item on a :class:`ProcessPoolExecutor`.
+
+Candles are not pickled per ticker: every series is packed once with the
+columnar cache codec (:func:`~sab.data.candle_store.encode_columns`) into a
+single :class:`~multiprocessing.shared_memory.SharedMemory` block and workers
+decode their slice from it (:func:`shared_candles` / :func:`attached_candles`).
+Only series the codec cannot represent travel as pickled rows. Items are split
+into contiguous chunks and results come back in input order, so candidates and
+failure messages are the same as a serial run.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+from collections.abc import Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any
+
+from ..data.candle_series import Candles, candle_rows
+from ..data.candle_store import decode_columns, encode_columns
+from .evaluator import EvaluationResult, EvaluationSettings, evaluate_ticker
+from .hybrid_buy import (
+    HybridEvaluationResult,
+    HybridEvaluationSettings,
+    evaluate_ticker_hybrid,
+)
+
+CHUNKS_PER_WORKER = 4
+
+Settings = EvaluationSettings | HybridEvaluationSettings
+Result = EvaluationResult | HybridEvaluationResult
+# (ticker, offset, size, rows, meta): rows is None when the candles are in
+# shared memory at [offset, offset + size).
+SharedItem = tuple[str, int, int, list[dict[str, Any]] | None, dict[str, Any] | None]
+
+
+def _evaluate(
+    ticker: str, candles: Candles, settings: Settings, meta: dict[str, Any] | None
+) -> Result:
+    if isinstance(settings, HybridEvaluationSettings):
+        return evaluate_ticker_hybrid(ticker, candles, settings, meta)
+    return evaluate_ticker(ticker, candles, settings, meta)
+
+
+@contextmanager
+def shared_candles(
+    items: Sequence[tuple[str, Candles, dict[str, Any] | None]],
+) -> Iterator[tuple[str | None, list[SharedItem]]]:
+    """Pack every series into one shared block; yield its name and the items.
+
+    The block is unlinked on exit, so workers must be done with it by then.
+    """
+    payloads: list[bytes | None] = [encode_columns(c) for _, c, _ in items]
+    total = sum(len(p) for p in payloads if p is not None)
+    shm = SharedMemory(create=True, size=total) if total else None
+    try:
+        packed: list[SharedItem] = []
+        offset = 0
+        for (ticker, candles, meta), payload in zip(items, payloads, strict=True):
+            if payload is None:
+                packed.append((ticker, 0, 0, candle_rows(candles), meta))
+                continue
+            assert shm is not None and shm.buf is not None
+            shm.buf[offset : offset + len(payload)] = payload
+            packed.append((ticker, offset, len(payload), None, meta))
+            offset += len(payload)
+        yield (shm.name if shm is not None else None), packed
+    finally:
+        if shm is not None:
+            shm.close()
+            shm.unlink()
+
+
+def attached_candles(
+    shm_name: str | None, items: Sequence[SharedItem]
+) -> Iterator[tuple[str, Candles, dict[str, Any] | None]]:
+    """Worker side of :func:`shared_candles`: decode the items in order."""
+    shm = SharedMemory(name=shm_name, track=False) if shm_name else None
+    try:
+        for ticker, offset, size, rows, meta in items:
+            candles: Candles
+            if rows is not None:
+                candles = rows
+            else:
+                assert shm is not None and shm.buf is not None
+                with shm.buf[offset : offset + size] as view:
+                    candles = decode_columns(view)
+            yield ticker, candles, meta
+    finally:
+        if shm is not None:
+            shm.close()
+
+
+def _evaluate_chunk(
+    shm_name: str | None, settings: Settings, items: list[SharedItem]
+) -> list[Result]:
+    return [
+        _evaluate(ticker, candles, settings, meta)
+        for ticker, candles, meta in attached_candles(shm_name, items)
+    ]
+
+
+def pool_context() -> Any:
+    # The parent runs I/O threads (KIS workers, write-behind), so avoid fork.
+    methods = multiprocessing.get_all_start_methods()
+    method = "forkserver" if "forkserver" in methods else "spawn"
+    return multiprocessing.get_context(method)
+
+
+def evaluate_in_processes(
+    items: Sequence[tuple[str, Candles, dict[str, Any] | None]],
+    settings: Settings,
+    *,
+    workers: int,
+) -> list[Result]:
+    """Evaluate ``(ticker, candles, meta)`` items; results keep their order."""
+    if workers <= 1 or len(items) <= 1:
+        return [_evaluate(t, c, settings, m) for t, c, m in items]
+
+    with shared_candles(items) as (name, packed):
+        size = -(-len(packed) // (workers * CHUNKS_PER_WORKER))
+        chunks = [packed[i : i + size] for i in range(0, len(packed), size)]
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(chunks)), mp_context=pool_context()
+        ) as pool:
+            parts = pool.map(
+                _evaluate_chunk,
+                [name] * len(chunks),
+                [settings] * len(chunks),
+                chunks,
+            )
+            return [result for part in parts for result in part]
+
+
+__all__ = [
+    "CHUNKS_PER_WORKER",
+    "SharedItem",
+    "attached_candles",
+    "evaluate_in_processes",
+    "pool_context",
+    "shared_candles",
+]
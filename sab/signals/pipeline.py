@@ -0,0 +1,120 @@
+"""Cost-ordered filter stages for the buy evaluators.
+
+A :class:`Stage` declares the data it reads (``needs``) and a relative
+``cost``. :func:`order_stages` sorts stages cheapest first (stably, so stages
+of equal cost keep their declared order) and :func:`run_stages` stops at the
+first rejection. Indicator series are handed to the stages as
+:class:`LazySeries`, which compute on first access, so a ticker rejected by a
+bar-level stage (price floor, liquidity, ETF) never pays for an EMA or RSI.
+
+Results carry the name of the rejecting stage; :func:`count_rejections`
+turns a run's results into per-stage counts for the scan log and metrics.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from dataclasses import dataclass
+from typing import Any, overload
+
+# Relative costs: a look at the evaluation bar, a scan of the last N bars,
+# an indicator pass over the whole window, several indicators plus patterns.
+BAR_COST = 1
+WINDOW_COST = 2
+INDICATOR_COST = 10
+PATTERN_COST = 20
+
+# Data every stage can read without computing an indicator.
+BAR_DATA = frozenset({"bar", "previous_bar", "window", "meta"})
+
+
+@dataclass(frozen=True)
+class Stage[C]:
+    """One filter: ``check(ctx)`` returns a rejection reason or ``None``."""
+
+    name: str
+    cost: int
+    needs: tuple[str, ...]
+    check: Callable[[C], str | None]
+
+
+def order_stages[C](stages: Iterable[Stage[C]]) -> tuple[Stage[C], ...]:
+    return tuple(sorted(stages, key=lambda stage: stage.cost))
+
+
+def bar_stages[C](stages: Iterable[Stage[C]]) -> tuple[Stage[C], ...]:
+    """The stages that need no indicator series."""
+    return tuple(stage for stage in stages if BAR_DATA.issuperset(stage.needs))
+
+
+def run_stages[C](stages: Iterable[Stage[C]], ctx: C) -> tuple[str, str] | None:
+    """Return ``(stage name, reason)`` of the first rejection, else ``None``."""
+    for stage in stages:
+        reason = stage.check(ctx)
+        if reason is not None:
+            return stage.name, reason
+    return None
+
+
+class LazySeries(Sequence[float]):
+    """An indicator series computed on first access."""
+
+    __slots__ = ("_compute", "_values")
+
+    def __init__(self, compute: Callable[[], list[float]]) -> None:
+        self._compute = compute
+        self._values: list[float] | None = None
+
+    @property
+    def computed(self) -> bool:
+        return self._values is not None
+
+    def values(self) -> list[float]:
+        if self._values is None:
+            self._values = self._compute()
+        return self._values
+
+    @overload
+    def __getitem__(self, index: int) -> float: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[float]: ...
+
+    def __getitem__(self, index: int | slice) -> float | list[float]:
+        return self.values()[index]
+
+    def __len__(self) -> int:
+        return len(self.values())
+
+    def __iter__(self) -> Iterator[float]:
+        return iter(self.values())
+
+    def __repr__(self) -> str:
+        state = "computed" if self.computed else "pending"
+        return f"LazySeries({state})"
+
+
+def count_rejections(results: Iterable[Any]) -> dict[str, int]:
+    """Per-stage rejection counts of evaluation results (with ``.stage``)."""
+    counts = Counter(
+        result.stage
+        for result in results
+        if not result.candidate and getattr(result, "stage", None)
+    )
+    return dict(counts.most_common())
+
+
+__all__ = [
+    "BAR_COST",
+    "BAR_DATA",
+    "INDICATOR_COST",
+    "LazySeries",
+    "PATTERN_COST",
+    "Stage",
+    "WINDOW_COST",
+    "bar_stages",
+    "count_rejections",
+    "order_stages",
+    "run_stages",
+]
@@ -1,11 +1,16 @@
 from __future__ import annotations
 
 import datetime as dt
+from collections.abc import Sequence
 from dataclasses import dataclass
 from typing import Any
 
+from ..data.candle_series import Candles, candle_column
 from .eval_index import choose_eval_index
+from .indicator_cache import IndicatorCache
+from .indicator_state import IndicatorFrame, TickerIndicatorState
 from .indicators import atr, ema, rsi, sma
+from .pipeline import LazySeries
 
 
 def _normalize_candle_date(value: Any) -> str:
@@ -38,9 +43,12 @@ class SellEvaluation:
 
 def evaluate_sell_signals(
     ticker: str,
-    candles: list[dict[str, float]],
+    candles: Candles,
     holding: dict[str, Any],
     settings: SellSettings,
+    *,
+    indicator_state: TickerIndicatorState | None = None,
+    indicator_cache: IndicatorCache | None = None,
 ) -> SellEvaluation:
     if len(candles) < settings.min_bars:
         return SellEvaluation(
@@ -58,20 +66,73 @@ def evaluate_sell_signals(
         return SellEvaluation(action="REVIEW", reasons=["Not enough completed candles"])
 
     candles_eval = candles[: idx_eval + 1]
-    closes = [c["close"] for c in candles_eval]
-    highs = [c["high"] for c in candles_eval]
-    lows = [c["low"] for c in candles_eval]
+    closes = candle_column(candles_eval, "close")
+    highs = candle_column(candles_eval, "high")
+    lows = candle_column(candles_eval, "low")
+
+    frame = None
+    if indicator_state is not None or indicator_cache is not None:
+        frame = IndicatorFrame(
+            candles_eval,
+            closes,
+            highs,
+            lows,
+            indicator_state,
+            cache=indicator_cache,
+            ticker=ticker,
+        )
+    atr_values = frame.atr(14) if frame else atr(highs, lows, closes, 14)
+
+    ema_len_short, ema_len_long = settings.ema_lengths
+    if frame is None:
+        ema_short = ema(closes, ema_len_short)
+        ema_long = ema(closes, ema_len_long)
+        rsi_values = rsi(closes, settings.rsi_period)
+        sma200 = LazySeries(lambda: sma(closes, 200))
+    else:
+        ema_short = frame.ema(ema_len_short)
+        ema_long = frame.ema(ema_len_long)
+        rsi_values = frame.rsi(settings.rsi_period)
+        sma200 = LazySeries(lambda: frame.sma(200))
+
+    return apply_sell_rules(
+        candles_eval,
+        closes,
+        holding,
+        settings,
+        ema_short,
+        ema_long,
+        rsi_values,
+        atr_values,
+        sma200,
+    )
+
 
-    atr_values = atr(highs, lows, closes, 14)
+def apply_sell_rules(
+    candles_eval: Candles,
+    closes: Sequence[float],
+    holding: dict[str, Any],
+    settings: SellSettings,
+    ema_short: Sequence[float],
+    ema_long: Sequence[float],
+    rsi_values: Sequence[float],
+    atr_values: Sequence[float],
+    sma200: Sequence[float],
+    *,
+    entry_index: int | None = None,
+    today: dt.date | None = None,
+) -> SellEvaluation:
+    """Run the sell rules on the last bar of ``candles_eval``.
+
+    The series end on that bar. ``entry_index`` (the entry bar in
+    ``candles_eval``) skips the entry date lookup and ``today`` replaces the
+    wall clock for the time stop; the backtest replay passes both.
+    """
     stop_override = holding.get("stop_override")
     target_override = holding.get("target_override")
 
-    ema_len_short, ema_len_long = settings.ema_lengths
-    ema_short = ema(closes, ema_len_short)
-    ema_long = ema(closes, ema_len_long)
-    rsi_values = rsi(closes, settings.rsi_period)
-
-    latest = candles[idx_eval]
+    idx_eval = len(candles_eval) - 1
+    latest = candles_eval[idx_eval]
     close_today = float(latest.get("close") or 0.0)
     eval_date = str(latest.get("date") or "") or None
     atr_today = atr_values[-1]
@@ -81,7 +142,6 @@ def evaluate_sell_signals(
 
     # SMA200 context (optional)
     if settings.require_sma200:
-        sma200 = sma(closes, 200)
         sma_val = sma200[-1]
         if not (
             close_today > sma_val and ema_short[-1] > sma_val and ema_long[-1] > sma_val
@@ -114,7 +174,9 @@ def evaluate_sell_signals(
         reasons.append("Custom stop override in effect")
     elif atr_today > 0:
         start_idx = max(0, len(closes) - settings.min_bars)
-        if entry_date_str:
+        if entry_index is not None:
+            start_idx = entry_index
+        elif entry_date_str:
             try:
                 entry_date = dt.date.fromisoformat(str(entry_date_str))
                 entry_yyyymmdd = entry_date.strftime("%Y%m%d")
@@ -153,7 +215,7 @@ def evaluate_sell_signals(
     if entry_date_str and time_stop_days > 0:
         try:
             entry_date = dt.date.fromisoformat(str(entry_date_str))
-            days_in_trade = (dt.date.today() - entry_date).days
+            days_in_trade = ((today or dt.date.today()) - entry_date).days
             if days_in_trade >= time_stop_days:
                 reasons.append(
                     f"Time stop: {days_in_trade} days >= {time_stop_days} days"
@@ -0,0 +1,203 @@
+"""Walk-forward validation of the hybrid settings.
+
+Rolling windows over the trading calendar each pair a train span with the
+test span that follows it. In every window the parameter combination with the
+best train record (:func:`~sab.signals.optimize.rank`) is selected and scored
+on the test span only, so the combined test record is out of sample.
+
+The replay is causal: indicators are seeded at the start of the series and a
+signal on day ``d`` only reads bars up to ``d`` (see
+:mod:`sab.signals.backtest`). Each (ticker, combination) is therefore replayed
+once over the whole history, with one indicator memo per ticker, and every
+window is scored by filtering those outcomes on the signal date. A train span
+only counts trades that exited inside it; a test span counts the trades
+signalled in it through to their exit. The per-window tallies are built in
+the same process-pool tasks as :func:`~sab.signals.optimize.run_sweep`.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Any
+
+from ..data.candle_series import Candles
+from .backtest import DEFAULT_MAX_HOLD_BARS, SignalOutcome
+from .hybrid_buy import HybridEvaluationSettings
+from .hybrid_sell import HybridSellSettings
+from .optimize import Params, SweepResult, plan_tasks, rank, replay_combos
+from .parallel_eval import SharedItem, attached_candles, pool_context, shared_candles
+
+DEFAULT_TRAIN_BARS = 504  # about two years of sessions
+DEFAULT_TEST_BARS = 126  # about six months
+
+
+@dataclass(frozen=True)
+class Window:
+    train_start: str
+    train_end: str
+    test_start: str
+    test_end: str
+
+
+@dataclass
+class WindowTally:
+    window: Window
+    train: list[SweepResult]  # one per combination
+    test: list[SweepResult]
+
+    @classmethod
+    def empty(cls, window: Window, combos: Sequence[Params]) -> WindowTally:
+        return cls(
+            window,
+            [SweepResult(dict(p)) for p in combos],
+            [SweepResult(dict(p)) for p in combos],
+        )
+
+
+@dataclass
+class WindowSelection:
+    window: Window
+    train: SweepResult  # the selected combination's train record
+    test: SweepResult  # and its out-of-sample record
+
+
+def make_windows(
+    dates: Iterable[str],
+    train_bars: int = DEFAULT_TRAIN_BARS,
+    test_bars: int = DEFAULT_TEST_BARS,
+    step_bars: int | None = None,
+) -> list[Window]:
+    """Rolling windows over the sorted distinct ``dates`` (``YYYYMMDD``).
+
+    Windows advance by ``step_bars`` (default ``test_bars``); the last test
+    span may be shorter.
+    """
+    if train_bars < 1 or test_bars < 1:
+        raise ValueError("train_bars and test_bars must be positive")
+    calendar = sorted({d for d in dates if d})
+    step = step_bars or test_bars
+    windows: list[Window] = []
+    start = 0
+    while start + train_bars < len(calendar):
+        split = start + train_bars
+        test = calendar[split : split + test_bars]
+        windows.append(Window(calendar[start], calendar[split - 1], test[0], test[-1]))
+        start += step
+    return windows
+
+
+def _tally(
+    windows: Sequence[Window],
+    combos: Sequence[Params],
+    replays: Iterable[tuple[int, list[SignalOutcome]]],
+) -> list[WindowTally]:
+    tallies = [WindowTally.empty(w, combos) for w in windows]
+    for j, outcomes in replays:
+        for outcome in outcomes:
+            day = outcome.signal_date
+            for tally in tallies:
+                w = tally.window
+                if w.train_start <= day <= w.train_end:
+                    seen = outcome
+                    if outcome.status == "closed" and (
+                        (outcome.exit_date or "") > w.train_end
+                    ):
+                        # Unknown at selection time: count the signal only.
+                        seen = replace(outcome, status="open")
+                    tally.train[j].add([seen])
+                elif w.test_start <= day <= w.test_end:
+                    tally.test[j].add([outcome])
+    return tallies
+
+
+def _walk_task(
+    shm_name: str | None,
+    items: list[SharedItem],
+    buy: HybridEvaluationSettings,
+    sell: HybridSellSettings,
+    combos: list[Params],
+    windows: list[Window],
+    max_hold_bars: int,
+) -> list[WindowTally]:
+    replays = replay_combos(
+        attached_candles(shm_name, items), buy, sell, combos, max_hold_bars
+    )
+    return _tally(windows, combos, replays)
+
+
+def run_walkforward(
+    items: Sequence[tuple[str, Candles, dict[str, Any] | None]],
+    buy: HybridEvaluationSettings,
+    sell: HybridSellSettings,
+    combos: Sequence[Params],
+    windows: Sequence[Window],
+    *,
+    workers: int,
+    max_hold_bars: int = DEFAULT_MAX_HOLD_BARS,
+) -> list[WindowTally]:
+    """Train and test tallies of every combination, one entry per window."""
+    if workers <= 1 or not items or not combos or not windows:
+        replays = replay_combos(items, buy, sell, combos, max_hold_bars)
+        return _tally(windows, combos, replays)
+
+    tallies = [WindowTally.empty(w, combos) for w in windows]
+    with shared_candles(items) as (name, packed):
+        tasks = plan_tasks(packed, combos, workers)
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(tasks)), mp_context=pool_context()
+        ) as pool:
+            parts = pool.map(
+                _walk_task,
+                [name] * len(tasks),
+                [tickers for tickers, _, _ in tasks],
+                [buy] * len(tasks),
+                [sell] * len(tasks),
+                [chunk for _, _, chunk in tasks],
+                [list(windows)] * len(tasks),
+                [max_hold_bars] * len(tasks),
+            )
+            for (_, start, _), part in zip(tasks, parts, strict=True):
+                for tally, got in zip(tallies, part, strict=True):
+                    for j, (train, test) in enumerate(
+                        zip(got.train, got.test, strict=True)
+                    ):
+                        tally.train[start + j].merge(train)
+                        tally.test[start + j].merge(test)
+    return tallies
+
+
+def select(
+    tallies: Iterable[WindowTally], min_trades: int = 1
+) -> list[WindowSelection]:
+    """The best train combination of each window with its test record."""
+    selections: list[WindowSelection] = []
+    for tally in tallies:
+        if not tally.train:
+            continue
+        best = rank(tally.train, min_trades)[0]
+        index = next(i for i, r in enumerate(tally.train) if r is best)
+        selections.append(WindowSelection(tally.window, best, tally.test[index]))
+    return selections
+
+
+def out_of_sample(selections: Iterable[WindowSelection]) -> SweepResult:
+    """The selected combinations' test records, combined."""
+    total = SweepResult({})
+    for selection in selections:
+        total.merge(selection.test)
+    return total
+
+
+__all__ = [
+    "DEFAULT_TEST_BARS",
+    "DEFAULT_TRAIN_BARS",
+    "Window",
+    "WindowSelection",
+    "WindowTally",
+    "make_windows",
+    "out_of_sample",
+    "run_walkforward",
+    "select",
+]
@@ -6,7 +6,7 @@ import tempfile
 import threading
 from collections.abc import Callable, Iterator
 from contextlib import contextmanager, suppress
-from typing import Any, TextIO
+from typing import IO, Any, TextIO
 
 _fcntl: Any
 try:
@@ -30,7 +30,12 @@ def _get_path_lock(path: str) -> threading.Lock:
 
 
 def _atomic_write(
-    path: str, writer: Callable[[TextIO], None], *, encoding: str
+    path: str,
+    writer: Callable[[Any], None],
+    *,
+    encoding: str | None,
+    binary: bool = False,
+    fsync: bool = True,
 ) -> None:
     directory = os.path.dirname(path) or "."
     os.makedirs(directory, exist_ok=True)
@@ -43,16 +48,20 @@ def _atomic_write(
     )
 
     try:
-        file_obj: TextIO
+        file_obj: IO[Any]
         try:
-            file_obj = os.fdopen(fd, "w", encoding=encoding)
+            if binary:
+                file_obj = os.fdopen(fd, "wb")
+            else:
+                file_obj = os.fdopen(fd, "w", encoding=encoding)
         except Exception:
             os.close(fd)
             raise
         with file_obj as fp:
             writer(fp)
             fp.flush()
-            os.fsync(fp.fileno())
+            if fsync:
+                os.fsync(fp.fileno())
         os.replace(tmp_path, path)
         tmp_path = ""
     finally:
@@ -68,6 +77,27 @@ def atomic_write_text(path: str, content: str, *, encoding: str = "utf-8") -> No
     _atomic_write(path, _write, encoding=encoding)
 
 
+def atomic_write_bytes(path: str, content: bytes, *, fsync: bool = True) -> None:
+    def _write(fp: IO[bytes]) -> None:
+        fp.write(content)
+
+    _atomic_write(path, _write, encoding=None, binary=True, fsync=fsync)
+
+
+def fsync_directory(directory: str) -> None:
+    """Persist renames in ``directory`` (best effort on platforms without it)."""
+    try:
+        fd = os.open(directory or ".", os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
 def atomic_write_json(
     path: str,
     obj: Any,
@@ -75,11 +105,25 @@ def atomic_write_json(
     ensure_ascii: bool = False,
     indent: int | None = None,
     encoding: str = "utf-8",
+    fsync: bool = True,
 ) -> None:
     def _write(fp: TextIO) -> None:
         json.dump(obj, fp, ensure_ascii=ensure_ascii, indent=indent)
 
-    _atomic_write(path, _write, encoding=encoding)
+    _atomic_write(path, _write, encoding=encoding, fsync=fsync)
+
+
+def file_signature(path: str) -> tuple[int, int, int] | None:
+    """``(mtime_ns, size, inode)`` of ``path``, or ``None`` when it is missing.
+
+    Atomic writes replace the file, so the inode changes even when the mtime
+    resolution hides a quick rewrite.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size, st.st_ino
 
 
 @contextmanager
@@ -100,6 +144,9 @@ def advisory_path_lock(lock_path: str) -> Iterator[None]:
 
 __all__ = [
     "advisory_path_lock",
+    "atomic_write_bytes",
     "atomic_write_json",
     "atomic_write_text",
+    "file_signature",
+    "fsync_directory",
 ]
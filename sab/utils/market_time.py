@@ -1,11 +1,9 @@
 from __future__ import annotations
 
 import datetime as dt
-import os
 from zoneinfo import ZoneInfo
 
-from sab.data.holiday_cache import load_cached_holidays
-from sab.data.us_calendar import load_us_trading_calendar
+from sab.data.trading_calendar import trading_calendar
 
 STATE_PRE_OPEN = "pre_open"
 STATE_INTRADAY = "intraday"
@@ -49,16 +47,8 @@ def us_session_info(
     session_date = ny_now.date()
     weekday = ny_now.weekday()  # 0=Mon
 
-    data_dir = data_dir or os.getenv("SAB_DATA_DIR") or "data"
-    # Load holiday map (built-ins + overrides + cached KIS fetches).
-    holidays = load_us_trading_calendar(data_dir)
-    cached = load_cached_holidays(data_dir, "US")
-    # cached values have is_open flag; treat is_open False as holiday/closure
-    for key, entry in cached.items():
-        if not entry.is_open:
-            holidays[key] = entry.note or holidays.get(key, "")
-
-    is_holiday = session_date.strftime("%Y%m%d") in holidays
+    # Built-ins + overrides + cached KIS fetches, memoized per data dir.
+    is_holiday = trading_calendar("US", data_dir).is_holiday(session_date)
 
     if weekday >= 5 or is_holiday:
         state = STATE_CLOSED
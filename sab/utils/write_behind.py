@@ -0,0 +1,115 @@
+"""Background writer that batches cache file commits.
+
+Callers hand over the final bytes for a path and continue; a single daemon
+thread commits everything queued so far as one batch: each file is written
+to a temp file and renamed into place, then every touched directory is
+fsynced once. Repeated writes to the same path before a commit coalesce into
+the last one, and readers can ask for a queued payload so they never observe
+an older file than what they just saved.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from contextlib import suppress
+
+from .atomic_io import atomic_write_bytes, fsync_directory
+
+logger = logging.getLogger(__name__)
+
+# A queued ``None`` payload removes the file instead of writing it.
+Payload = bytes | None
+
+
+class WriteBehindWriter:
+    def __init__(self, *, fsync: bool = True, linger: float = 0.05) -> None:
+        self.fsync = fsync
+        self.linger = linger
+        self._cond = threading.Condition()
+        self._pending: dict[str, Payload] = {}
+        self._committing: dict[str, Payload] = {}
+        self._flush_requested = False
+        self._closed = False
+        self.errors: list[str] = []
+        self._thread = threading.Thread(
+            target=self._run, name="sab-write-behind", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, path: str, payload: Payload) -> None:
+        key = os.path.abspath(path)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("write-behind writer is closed")
+            self._pending[key] = payload
+            self._cond.notify_all()
+
+    def lookup(self, path: str) -> tuple[bool, Payload]:
+        """Return ``(queued, payload)`` for the newest uncommitted write."""
+        key = os.path.abspath(path)
+        with self._cond:
+            if key in self._pending:
+                return True, self._pending[key]
+            if key in self._committing:
+                return True, self._committing[key]
+        return False, None
+
+    def flush(self) -> None:
+        """Block until everything submitted so far is on disk."""
+        with self._cond:
+            self._flush_requested = True
+            self._cond.notify_all()
+            while (self._pending or self._committing) and self._thread.is_alive():
+                self._cond.wait(0.1)
+            self._flush_requested = False
+
+    def close(self) -> None:
+        self.flush()
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout=5.0)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending and self._closed:
+                    return
+                # Let a burst of saves accumulate into one batch.
+                deadline = time.monotonic() + self.linger
+                while not self._flush_requested and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch, self._pending = self._pending, {}
+                self._committing = batch
+            self._commit(batch)
+            with self._cond:
+                self._committing = {}
+                self._cond.notify_all()
+
+    def _commit(self, batch: dict[str, Payload]) -> None:
+        directories: set[str] = set()
+        for path, payload in batch.items():
+            try:
+                if payload is None:
+                    with suppress(FileNotFoundError):
+                        os.remove(path)
+                else:
+                    atomic_write_bytes(path, payload, fsync=self.fsync)
+                directories.add(os.path.dirname(path))
+            except OSError as exc:
+                self.errors.append(f"{path}: {exc}")
+                logger.warning("Cache write failed for %s: %s", path, exc)
+        if self.fsync:
+            for directory in sorted(directories):
+                fsync_directory(directory)
+
+
+__all__ = ["WriteBehindWriter"]
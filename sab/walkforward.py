@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import logging
+import os
+import time
+from collections.abc import Sequence
+
+from .config import Config, load_config
+from .config_loader import ConfigLoadError
+from .data.candle_series import candle_dates
+from .holdings_loader import HoldingsLoadError
+from .optimize import _load_items, _sweep_combos
+from .report.walkforward_report import write_walkforward_report
+from .scan import _build_hybrid_settings
+from .sell import _build_hybrid_sell_settings
+from .signals.backtest import DEFAULT_MAX_HOLD_BARS
+from .signals.walkforward import (
+    DEFAULT_TEST_BARS,
+    DEFAULT_TRAIN_BARS,
+    make_windows,
+    out_of_sample,
+    run_walkforward,
+    select,
+)
+
+
+def run_walkforward_validation(
+    *,
+    limit: int | None = None,
+    watchlist_path: str | None = None,
+    params: Sequence[str] | None = None,
+    samples: int | None = None,
+    seed: int = 0,
+    workers: int | None = None,
+    train_bars: int = DEFAULT_TRAIN_BARS,
+    test_bars: int = DEFAULT_TEST_BARS,
+    step_bars: int | None = None,
+    max_hold_bars: int = DEFAULT_MAX_HOLD_BARS,
+    min_trades: int = 5,
+) -> int:
+    logger = logging.getLogger(__name__)
+    try:
+        cfg: Config = load_config()
+    except (ConfigLoadError, HoldingsLoadError) as exc:
+        logger.error("Configuration loading failed: %s", exc)
+        return 1
+
+    buy_settings = _build_hybrid_settings(cfg)
+    sell_settings = _build_hybrid_sell_settings(cfg)
+    try:
+        combos, search = _sweep_combos(
+            params, samples, seed, buy_settings, sell_settings
+        )
+        step = step_bars or test_bars
+        items, failures = _load_items(cfg, limit, watchlist_path)
+        windows = make_windows(
+            (d for _, candles, _ in items for d in candle_dates(candles)),
+            train_bars,
+            test_bars,
+            step,
+        )
+    except ValueError as exc:
+        logger.error("Invalid walk-forward options: %s", exc)
+        return 1
+    if not items:
+        logger.error("No cached candles to validate on (run scan or ingest first)")
+        return 1
+    if not windows:
+        logger.warning(
+            "History shorter than %d train bars: no walk-forward window", train_bars
+        )
+
+    n_workers = workers if workers is not None else (os.cpu_count() or 1)
+    logger.info(
+        "Walk-forward: %d windows x %d combinations over %d tickers on %d workers",
+        len(windows),
+        len(combos),
+        len(items),
+        n_workers,
+    )
+    started = time.perf_counter()
+    selections = select(
+        run_walkforward(
+            items,
+            buy_settings,
+            sell_settings,
+            combos,
+            windows,
+            workers=n_workers,
+            max_hold_bars=max_hold_bars,
+        ),
+        min_trades,
+    )
+    oos = out_of_sample(selections)
+    logger.info(
+        "Walk-forward finished in %.1fs: %d out-of-sample trades",
+        time.perf_counter() - started,
+        oos.closed,
+    )
+
+    out_path = write_walkforward_report(
+        report_dir=cfg.report_dir,
+        universe_count=len(items),
+        selections=selections,
+        search=search,
+        combinations=len(combos),
+        train_bars=train_bars,
+        test_bars=test_bars,
+        step_bars=step,
+        max_hold_bars=max_hold_bars,
+        min_trades=min_trades,
+        failures=failures,
+    )
+    logger.info("Walk-forward report written to: %s", out_path)
+    return 0
+
+
+__all__ = ["run_walkforward_validation"]
@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import datetime as dt
+import random
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import pytest
+import sab.signals.backtest as bt
+import sab.signals.evaluator as ev
+import sab.signals.hybrid_buy as hb
+import sab.signals.hybrid_sell as hs
+import sab.signals.sell_rules as sr
+from sab.report.backtest_report import write_backtest_report
+from sab.signals.backtest import PrefixView, backtest_ticker, summarize
+from sab.signals.evaluator import EvaluationSettings, evaluate_ticker
+from sab.signals.hybrid_buy import HybridEvaluationSettings, evaluate_ticker_hybrid
+from sab.signals.hybrid_sell import HybridSellSettings, evaluate_sell_signals_hybrid
+from sab.signals.sell_rules import SellSettings, evaluate_sell_signals
+
+
+@pytest.fixture(autouse=True)
+def _last_bar(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    def last_index(data: Any, meta: Any = None, provider: Any = None) -> tuple:
+        return len(data) - 1, False
+
+    for module in (ev, hb, hs, sr, bt):
+        monkeypatch.setattr(module, "choose_eval_index", last_index)
+    yield
+
+
+def _row(i: int, open_: float, close: float, volume: float) -> dict[str, Any]:
+    start = dt.date(2022, 1, 3)
+    return {
+        "date": (start + dt.timedelta(days=i)).strftime("%Y%m%d"),
+        "open": open_,
+        "high": round(close * 1.01, 2),
+        "low": round(close * 0.99, 2),
+        "close": close,
+        "volume": volume,
+        "prev_close_diff": 0.0,
+    }
+
+
+def _rebounds(cycles: int, seed: int) -> list[dict[str, Any]]:
+    """Slow uptrends, a short slide and a gap up: an EMA cross with RSI rebound."""
+    rng = random.Random(seed)
+    price, closes, opens = 100.0, [], []
+    for _ in range(cycles):
+        for _ in range(102):
+            price *= 1.002 + rng.gauss(0, 0.001)
+            closes.append(round(price, 2))
+            opens.append(closes[-1])
+        for _ in range(17):
+            price *= 0.995
+            closes.append(round(price, 2))
+            opens.append(closes[-1])
+        opens.append(closes[-1])
+        price *= 1.08
+        closes.append(round(price, 2))
+    pairs = enumerate(zip(opens, closes, strict=True))
+    return [_row(i, o, c, 1000.0 + i) for i, (o, c) in pairs]
+
+
+def _random_walk(seed: int, n: int) -> list[dict[str, Any]]:
+    rng = random.Random(seed)
+    price, rows = 100.0, []
+    for i in range(n):
+        price = max(1.0, price * (1 + rng.gauss(0.001, 0.03)))
+        close = round(price, 2)
+        open_ = round(close * (1 + rng.gauss(0, 0.01)), 2)
+        rows.append(_row(i, open_, close, float(rng.randint(10_000, 500_000))))
+    return rows
+
+
+def _hybrid_settings() -> HybridEvaluationSettings:
+    return HybridEvaluationSettings(
+        sma_trend_period=20,
+        ema_short_period=10,
+        ema_mid_period=21,
+        rsi_period=14,
+        rsi_zone_low=0.0,
+        rsi_zone_high=100.0,
+        rsi_oversold_low=0.0,
+        rsi_oversold_high=100.0,
+        pullback_max_bars=10,
+        breakout_consolidation_min_bars=5,
+        breakout_consolidation_max_bars=20,
+        volume_lookback_days=20,
+        max_gap_pct=0.5,
+        use_sma60_filter=False,
+        sma60_period=60,
+        kr_breakout_requires_confirmation=False,
+        gap_atr_multiplier=0.0,
+        min_history_bars=60,
+        min_price=0.0,
+        us_min_price=0.0,
+        min_dollar_volume=0.0,
+        us_min_dollar_volume=0.0,
+        exclude_etf_etn=False,
+    )
+
+
+def _first_sell(rows: list[dict[str, Any]], outcome: Any, settings: Any) -> int:
+    """Bar of the first SELL from the live sell rules on growing prefixes."""
+    entry = next(i for i, r in enumerate(rows) if r["date"] == outcome.entry_date)
+    day = dt.datetime.strptime(outcome.entry_date, "%Y%m%d").date()
+    holding = {
+        "strategy": outcome.pattern,
+        "entry_price": outcome.entry_price,
+        "entry_date": day.isoformat(),
+    }
+    for j in range(entry, len(rows)):
+        if isinstance(settings, HybridSellSettings):
+            action = evaluate_sell_signals_hybrid(
+                "T", rows[: j + 1], holding, settings
+            ).action
+        else:
+            action = evaluate_sell_signals("T", rows[: j + 1], holding, settings).action
+        if action == "SELL":
+            return j
+    raise AssertionError("no SELL before the end of data")
+
+
+def _exit_index(rows: list[dict[str, Any]], outcome: Any) -> int:
+    return next(i for i, r in enumerate(rows) if r["date"] == outcome.exit_date)
+
+
+def test_ema_cross_replay_matches_live_rules() -> None:
+    rows = _rebounds(4, seed=2)
+    buy = EvaluationSettings(min_history_bars=60, gap_atr_multiplier=0)
+    sell = SellSettings(time_stop_days=0)
+
+    outcomes = backtest_ticker("T", rows, buy, sell, {}, max_hold_bars=0)
+
+    expected = [
+        rows[i]["date"]
+        for i in range(len(rows))
+        if evaluate_ticker("T", rows[: i + 1], buy, {}).candidate
+    ]
+    assert [o.signal_date for o in outcomes] == expected
+    assert len(expected) >= 3
+    assert {o.pattern for o in outcomes} == {"ema_cross"}
+    # The gap-up bar is the signal; the fill is the next bar's open.
+    first = outcomes[0]
+    signal_at = next(i for i, r in enumerate(rows) if r["date"] == first.signal_date)
+    assert first.entry_date == rows[signal_at + 1]["date"]
+    assert first.entry_price == rows[signal_at + 1]["open"]
+    for outcome in outcomes:
+        if outcome.status == "closed":
+            assert _exit_index(rows, outcome) == _first_sell(rows, outcome, sell)
+
+
+def test_hybrid_replay_matches_live_rules() -> None:
+    rows = _random_walk(5, 260)
+    buy = _hybrid_settings()
+    sell = HybridSellSettings()
+
+    outcomes = backtest_ticker("T", rows, buy, sell, {}, max_hold_bars=0)
+
+    expected = []
+    for i in range(len(rows)):
+        result = evaluate_ticker_hybrid("T", rows[: i + 1], buy, {})
+        if result.candidate:
+            expected.append((rows[i]["date"], result.candidate["pattern"]))
+    assert [(o.signal_date, o.pattern) for o in outcomes] == expected
+    closed = [o for o in outcomes if o.status == "closed"]
+    assert closed
+    for outcome in closed:
+        assert _exit_index(rows, outcome) == _first_sell(rows, outcome, sell)
+
+
+def test_max_hold_closes_and_summary() -> None:
+    rows = _rebounds(3, seed=0)
+    buy = EvaluationSettings(min_history_bars=60, gap_atr_multiplier=0)
+
+    outcomes = backtest_ticker(
+        "T", rows, buy, SellSettings(time_stop_days=0), {}, max_hold_bars=5
+    )
+
+    closed = [o for o in outcomes if o.status == "closed"]
+    assert closed
+    assert all(o.bars_held <= 5 for o in closed)
+    # The last gap-up sits on the final bar: signalled but never filled.
+    assert outcomes[-1].status == "pending"
+    summary = summarize(outcomes)
+    assert summary.signals == len(outcomes)
+    assert summary.closed + summary.open + summary.pending == summary.signals
+
+
+def test_prefix_view_is_a_bounded_window() -> None:
+    view = PrefixView([1.0, 2.0, 3.0, 4.0], 3)
+    assert (len(view), view[-1], view[0], view[-2:]) == (3, 3.0, 1.0, [2.0, 3.0])
+    assert list(view) == [1.0, 2.0, 3.0]
+    with pytest.raises(IndexError):
+        view[3]
+
+
+def test_report_writes_markdown_and_csv(tmp_path: Path) -> None:
+    rows = _rebounds(3, seed=0)
+    buy = EvaluationSettings(min_history_bars=60, gap_atr_multiplier=0)
+    outcomes = backtest_ticker("T", rows, buy, SellSettings(), {})
+
+    path = write_backtest_report(
+        report_dir=str(tmp_path),
+        strategy_mode="ema_cross",
+        universe_count=1,
+        outcomes=outcomes,
+        max_hold_bars=60,
+        failures=["X: no data"],
+    )
+
+    text = Path(path).read_text(encoding="utf-8")
+    assert path.endswith(".backtest.md")
+    assert "## Summary" in text and "| All |" in text
+    assert "- X: no data" in text
+    csv_lines = Path(path[: -len(".md")] + ".csv").read_text().splitlines()
+    assert csv_lines[0].startswith("ticker,signal_date,pattern")
+    assert len(csv_lines) == len(outcomes) + 1
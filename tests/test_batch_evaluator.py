@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import datetime as dt
+import random
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+import sab.signals.batch_evaluator as be
+import sab.signals.evaluator as ev
+from sab.data.candle_series import as_candle_series
+from sab.signals import indicators
+from sab.signals.batch_evaluator import evaluate_universe
+from sab.signals.evaluator import EvaluationSettings, evaluate_ticker
+
+pytest.importorskip("numpy")
+
+
+@pytest.fixture(autouse=True)
+def _last_bar_and_numpy(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    def last_index(data: Any, meta: Any = None, provider: Any = None) -> tuple:
+        return len(data) - 1, False
+
+    monkeypatch.setattr(ev, "choose_eval_index", last_index)
+    monkeypatch.setenv("SAB_INDICATOR_BACKEND", "numpy")
+    indicators.reset_indicator_backend()
+    yield
+    indicators.reset_indicator_backend()
+
+
+def _rows(closes: list[float], opens: list[float] | None = None) -> list[dict]:
+    start = dt.date(2024, 1, 1)
+    return [
+        {
+            "date": (start + dt.timedelta(days=i)).strftime("%Y%m%d"),
+            "open": opens[i] if opens else close,
+            "high": round(close * 1.01, 2),
+            "low": round(close * 0.99, 2),
+            "close": close,
+            "volume": 1000.0 + i,
+            "prev_close_diff": 0.0,
+        }
+        for i, close in enumerate(closes)
+    ]
+
+
+def _walk(seed: int, n: int) -> list[dict]:
+    rng = random.Random(seed)
+    price, closes = 100.0, []
+    for _ in range(n):
+        price = max(1.0, price * (1 + rng.gauss(0, 0.03)))
+        closes.append(round(price, 2))
+    return _rows(closes)
+
+
+def _rebound(up: float, down_len: int, down: float, jump: float) -> list[dict]:
+    # Slow uptrend, short decline (RSI <= 30, EMA20 just under EMA50), then a
+    # jump that crosses both: a candidate on the last bar.
+    price, closes = 100.0, []
+    for _ in range(120 - down_len - 1):
+        price *= 1 + up
+        closes.append(round(price, 2))
+    for _ in range(down_len):
+        price *= 1 - down
+        closes.append(round(price, 2))
+    closes.append(round(price * (1 + jump), 2))
+    opens = list(closes)
+    opens[-1] = closes[-2]
+    return _rows(closes, opens)
+
+
+def _universe() -> list[tuple[str, Any, dict[str, Any]]]:
+    items: list[tuple[str, Any, dict[str, Any]]] = []
+    for seed in range(120):
+        n = (100, 120, 150)[seed % 3]
+        rows = _walk(seed, n)
+        candles = as_candle_series(rows) if seed % 2 else rows
+        items.append((f"{seed:06d}", candles, {"currency": "KRW"}))
+    items.append(("SHORT", _walk(999, 30), {"currency": "KRW"}))
+    for i, params in enumerate(
+        [(0.002, 17, 0.005, 0.08), (0.002, 12, 0.01, 0.15), (0.005, 27, 0.005, 0.1)]
+    ):
+        items.append((f"REB{i}", _rebound(*params), {"currency": "KRW"}))
+    items.append(("CHEAP.US", _rebound(0.002, 17, 0.005, 0.06), {"currency": "USD"}))
+    return items
+
+
+@pytest.mark.parametrize(
+    "settings",
+    [
+        EvaluationSettings(min_history_bars=60, gap_atr_multiplier=0),
+        EvaluationSettings(
+            min_history_bars=60,
+            use_sma200_filter=True,
+            require_slope_up=True,
+            us_min_price=500.0,
+            min_dollar_volume=50_000.0,
+        ),
+    ],
+)
+def test_batch_matches_per_ticker_path(settings: EvaluationSettings) -> None:
+    items = _universe()
+
+    expected = [evaluate_ticker(t, c, settings, m) for t, c, m in items]
+    got = evaluate_universe(items, settings)
+
+    assert got == expected
+    reasons = {r.reason for r in expected}
+    assert "EMA(20/50) cross not satisfied" in reasons
+    assert "Not enough history (<60 bars)" in reasons
+
+
+def test_batch_builds_the_same_candidates() -> None:
+    items = _universe()
+    settings = EvaluationSettings(min_history_bars=60, gap_atr_multiplier=0)
+
+    candidates = [r.candidate for r in evaluate_universe(items, settings)]
+
+    assert [c["ticker"] for c in candidates if c] == [
+        "REB0",
+        "REB1",
+        "REB2",
+        "CHEAP.US",
+    ]
+
+
+def test_python_backend_uses_the_per_ticker_path(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("SAB_INDICATOR_BACKEND", "python")
+    indicators.reset_indicator_backend()
+
+    def no_matrix(*args: Any, **kwargs: Any) -> Any:
+        raise AssertionError("matrix path used")
+
+    monkeypatch.setattr(be, "_evaluate_group", no_matrix)
+    items = _universe()[:10]
+    settings = EvaluationSettings(min_history_bars=60)
+
+    assert evaluate_universe(items, settings) == [
+        evaluate_ticker(t, c, settings, m) for t, c, m in items
+    ]
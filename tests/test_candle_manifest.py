@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+
+from sab.data.candle_manifest import CandleManifest, candle_checksum
+from sab.data.candle_store import open_candle_store
+
+
+def _rows(last_day: int) -> list[dict[str, Any]]:
+    return [
+        {
+            "date": f"202501{day:02d}",
+            "open": 1.0,
+            "high": 2.0,
+            "low": 0.5,
+            "close": float(day),
+            "volume": 10.0,
+            "prev_close_diff": 1.0,
+        }
+        for day in range(1, last_day + 1)
+    ]
+
+
+def test_save_updates_manifest_on_flush(tmp_path: Path) -> None:
+    repo = open_candle_store(str(tmp_path))
+    rows = _rows(5)
+
+    repo.save("candles_005930", rows)
+    assert repo.last_date("candles_005930") == "20250105"
+    assert not (tmp_path / "candles_manifest.json").exists()
+    repo.flush()
+
+    data = json.loads((tmp_path / "candles_manifest.json").read_text("utf-8"))
+    entry = data["entries"]["candles_005930"]
+    assert entry["last_date"] == "20250105"
+    assert entry["bars"] == 5
+    assert entry["source"] == "kis"
+    assert entry["checksum"] == candle_checksum(rows)
+    assert entry["fetched_at"]
+
+    reopened = open_candle_store(str(tmp_path), "sqlite")
+    assert reopened.last_date("candles_005930") == "20250105"
+    assert reopened.last_date("candles_000660") is None
+
+
+def test_concurrent_writers_merge_entries(tmp_path: Path) -> None:
+    first = CandleManifest(str(tmp_path))
+    second = CandleManifest(str(tmp_path))
+    first.get("candles_A")  # both load the (empty) file before either flushes
+    second.get("candles_B")
+
+    first.record("candles_A", _rows(2), source="kis")
+    second.record("candles_B", _rows(3), source="kis")
+    first.flush()
+    second.flush()
+
+    merged = CandleManifest(str(tmp_path))
+    assert merged.last_date("candles_A") == "20250102"
+    assert merged.last_date("candles_B") == "20250103"
+
+
+def test_checksum_tracks_content() -> None:
+    rows = _rows(3)
+    changed = [dict(row) for row in rows]
+    changed[-1]["close"] = 99.0
+
+    assert candle_checksum(rows) == candle_checksum([dict(r) for r in rows])
+    assert candle_checksum(rows) != candle_checksum(changed)
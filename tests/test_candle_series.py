@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import math
+import sys
+from pathlib import Path
+from typing import Any
+
+from sab.data.candle_series import (
+    CandleSeries,
+    as_candle_series,
+    candle_column,
+    candle_dates,
+    candle_rows,
+)
+from sab.data.candle_store import ColumnarCandleStore, SqliteCandleStore
+
+
+def _rows(count: int) -> list[dict[str, Any]]:
+    return [
+        {
+            "date": f"2025{1 + i // 28:02d}{1 + i % 28:02d}",
+            "open": 100.0 + i,
+            "high": 101.5 + i,
+            "low": 99.25 + i,
+            "close": 100.5 + i,
+            "volume": 1_000_000.0 + i,
+            "prev_close_diff": 1.0,
+        }
+        for i in range(count)
+    ]
+
+
+def test_series_behaves_like_the_row_list() -> None:
+    rows = _rows(30)
+    series = as_candle_series(rows)
+
+    assert isinstance(series, CandleSeries)
+    assert len(series) == 30
+    assert series == rows
+    assert series[-1]["close"] == rows[-1]["close"]
+    assert series[-1].get("date") == rows[-1]["date"]
+    assert series[0].get("missing") is None
+    assert dict(series[3]) == rows[3]
+    assert candle_rows(series) == rows
+    assert candle_dates(series) == [r["date"] for r in rows]
+
+
+def test_slices_share_the_parent_arrays() -> None:
+    series = CandleSeries.from_rows(_rows(250))
+    assert series is not None
+
+    window = series[-200:]
+    assert isinstance(window, CandleSeries)
+    assert window._dates is series._dates
+    assert len(window) == 200
+    assert window[0] == series[50]
+    assert window[:10].values("close") == [r["close"] for r in _rows(250)[50:60]]
+    assert series[::50] == [series[i] for i in range(0, 250, 50)]
+    assert len(series[300:]) == 0
+
+
+def test_rows_outside_the_layout_stay_dicts() -> None:
+    extra = _rows(3)
+    extra[1]["note"] = "halt"
+    assert CandleSeries.from_rows(extra) is None
+    assert as_candle_series(extra) is extra
+
+    undated = _rows(3)
+    undated[0]["date"] = "2025-01-01"
+    assert as_candle_series(undated) is undated
+
+
+def test_missing_values_become_nan_and_compare_bitwise() -> None:
+    rows = _rows(5)
+    rows[0]["prev_close_diff"] = None
+    series = CandleSeries.from_rows(rows)
+    assert series is not None
+
+    assert math.isnan(series[0]["prev_close_diff"])
+    assert series == CandleSeries.from_rows(rows)
+
+
+def test_candle_column_matches_both_shapes() -> None:
+    rows = _rows(10)
+    rows[4]["volume"] = 0.0
+    series = as_candle_series(rows)
+
+    assert candle_column(series, "close") == candle_column(rows, "close")
+    assert candle_column(series, "volume", default=0.0) == candle_column(
+        rows, "volume", default=0.0
+    )
+
+
+def test_stores_load_series(tmp_path: Path) -> None:
+    rows = _rows(40)
+    columnar = ColumnarCandleStore(str(tmp_path / "files"))
+    columnar.save("candles_005930", as_candle_series(rows))
+    columnar.flush()
+    sqlite = SqliteCandleStore(str(tmp_path / "db"))
+    sqlite.save("candles_005930", rows)
+    sqlite.flush()
+
+    for store in (columnar, sqlite):
+        loaded = store.load("candles_005930", tail=20)
+        assert isinstance(loaded, CandleSeries)
+        assert loaded == rows[-20:]
+    sqlite.close()
+
+
+def test_series_is_much_smaller_than_dict_rows() -> None:
+    rows = _rows(200)
+    series = CandleSeries.from_rows(rows)
+    assert series is not None
+
+    dict_bytes = sum(
+        sys.getsizeof(r) + sum(sys.getsizeof(v) for v in r.values()) for r in rows
+    )
+    assert series.nbytes == 200 * (4 + 6 * 8)
+    assert series.nbytes * 5 < dict_bytes
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import math
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any
+
+from sab.data.cache import save_json
+from sab.data.candle_store import (
+    ColumnarCandleStore,
+    SqliteCandleStore,
+    open_candle_store,
+    split_cache_key,
+)
+
+
+def _rows(count: int) -> list[dict[str, Any]]:
+    return [
+        {
+            "date": f"202501{i + 1:02d}",
+            "open": 100.0 + i,
+            "high": 101.5 + i,
+            "low": 99.25 + i,
+            "close": 100.5 + i,
+            "volume": 1_000_000.0 + i,
+            "prev_close_diff": float("nan") if i == 0 else 1.0,
+        }
+        for i in range(count)
+    ]
+
+
+def _same(a: list[dict[str, Any]], b: list[dict[str, Any]]) -> bool:
+    def norm(rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        return [
+            {
+                k: ("nan" if isinstance(v, float) and math.isnan(v) else v)
+                for k, v in row.items()
+            }
+            for row in rows
+        ]
+
+    return norm(a) == norm(b)
+
+
+def test_round_trip_and_tail_window(tmp_path: Path) -> None:
+    store = ColumnarCandleStore(str(tmp_path))
+    rows = _rows(20)
+
+    path = store.save("candles_005930", rows)
+
+    assert path.endswith("candles_005930.sabc")
+    loaded = store.load("candles_005930")
+    assert loaded is not None and _same(loaded, rows)
+    tail = store.load("candles_005930", tail=5)
+    assert tail is not None and _same(tail, rows[-5:])
+    assert store.load("candles_missing") is None
+
+
+def test_reads_legacy_json_until_next_save(tmp_path: Path) -> None:
+    rows = _rows(3)
+    save_json(str(tmp_path), "candles_000660", rows)
+    store = open_candle_store(str(tmp_path))
+
+    loaded = store.load("candles_000660", tail=2)
+    assert loaded is not None and _same(loaded, rows[-2:])
+
+    store.save("candles_000660", rows)
+    assert not (tmp_path / "candles_000660.json").exists()
+    assert (tmp_path / "candles_000660.sabc").exists()
+
+
+def test_non_columnar_rows_fall_back_to_json(tmp_path: Path) -> None:
+    store = ColumnarCandleStore(str(tmp_path))
+    rows = [{"date": "2025-01-02", "close": 1.0}]
+
+    path = store.save("candles_odd", rows)
+
+    assert path.endswith("candles_odd.json")
+    assert store.load("candles_odd") == rows
+
+
+def test_corrupt_file_reads_as_missing(tmp_path: Path) -> None:
+    (tmp_path / "candles_bad.sabc").write_bytes(b"garbage")
+
+    assert ColumnarCandleStore(str(tmp_path)).load("candles_bad") is None
+
+
+def test_split_cache_key_maps_market() -> None:
+    assert split_cache_key("candles_005930") == ("KR", "005930")
+    assert split_cache_key("candles_overseas_NAS_AAPL") == ("NAS", "AAPL")
+    assert split_cache_key("other") == ("", "other")
+
+
+def test_sqlite_store_bulk_upsert_and_tail(tmp_path: Path) -> None:
+    store = SqliteCandleStore(str(tmp_path))
+    rows = _rows(10)
+
+    store.save("candles_005930", rows)
+    staged = store.load("candles_005930", tail=3)
+    assert staged is not None and _same(staged, rows[-3:])
+    store.flush()
+
+    assert _same(store.load("candles_005930") or [], rows)
+    assert _same(store.load("candles_005930", tail=4) or [], rows[-4:])
+    conn = sqlite3.connect(tmp_path / "candles.sqlite3")
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conn.execute(
+        "SELECT COUNT(*) FROM candles WHERE market = 'KR' AND ticker = '005930'"
+    ).fetchone() == (10,)
+    conn.close()
+
+    # A shorter refetch replaces older history and overwrites overlapping days.
+    revised = [dict(row, close=row["close"] * 2) for row in rows[5:]]
+    store.save("candles_005930", revised)
+    store.flush()
+    assert _same(store.load("candles_005930") or [], revised)
+    store.close()
+
+
+def test_sqlite_store_reads_files_until_first_save(tmp_path: Path) -> None:
+    rows = _rows(4)
+    ColumnarCandleStore(str(tmp_path)).save("candles_overseas_NAS_AAPL", rows)
+    store = open_candle_store(str(tmp_path), "sqlite")
+
+    assert _same(store.load("candles_overseas_NAS_AAPL") or [], rows)
+    store.flush()
+
+
+def test_sqlite_store_serves_concurrent_readers(tmp_path: Path) -> None:
+    store = SqliteCandleStore(str(tmp_path))
+    for i in range(8):
+        store.save(f"candles_{i:06d}", _rows(5))
+    store.flush()
+    results: list[int] = []
+
+    def _read(i: int) -> None:
+        results.append(len(store.load(f"candles_{i:06d}") or []))
+
+    threads = [threading.Thread(target=_read, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results == [5] * 8
+    store.close()
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import datetime as dt
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+import sab.signals.evaluator as ev
+import sab.signals.hybrid_buy as hb
+from sab.signals.evaluator import BUY_STAGES, EvaluationSettings, evaluate_ticker
+from sab.signals.hybrid_buy import (
+    HYBRID_STAGES,
+    HybridEvaluationSettings,
+    evaluate_ticker_hybrid,
+)
+from sab.signals.pipeline import LazySeries, count_rejections
+
+
+@pytest.fixture(autouse=True)
+def _last_bar(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    def last_index(data: Any, meta: Any = None, provider: Any = None) -> tuple:
+        return len(data) - 1, False
+
+    monkeypatch.setattr(ev, "choose_eval_index", last_index)
+    monkeypatch.setattr(hb, "choose_eval_index", last_index)
+    yield
+
+
+def _rows(n: int, close: float = 10.0, volume: float = 100.0) -> list[dict]:
+    start = dt.date(2024, 1, 1)
+    return [
+        {
+            "date": (start + dt.timedelta(days=i)).strftime("%Y%m%d"),
+            "open": close,
+            "high": close * 1.01,
+            "low": close * 0.99,
+            "close": close + i * 0.01,
+            "volume": volume,
+        }
+        for i in range(n)
+    ]
+
+
+def _no_indicators(monkeypatch: pytest.MonkeyPatch, module: Any) -> None:
+    def fail(*args: Any, **kwargs: Any) -> Any:
+        raise AssertionError("indicator computed")
+
+    for name in ("ema", "rsi", "atr", "sma"):
+        monkeypatch.setattr(module, name, fail)
+
+
+def _hybrid_settings(**overrides: Any) -> HybridEvaluationSettings:
+    values: dict[str, Any] = {
+        "sma_trend_period": 20,
+        "ema_short_period": 10,
+        "ema_mid_period": 21,
+        "rsi_period": 14,
+        "rsi_zone_low": 0.0,
+        "rsi_zone_high": 100.0,
+        "rsi_oversold_low": 0.0,
+        "rsi_oversold_high": 100.0,
+        "pullback_max_bars": 10,
+        "breakout_consolidation_min_bars": 5,
+        "breakout_consolidation_max_bars": 20,
+        "volume_lookback_days": 20,
+        "max_gap_pct": 0.5,
+        "use_sma60_filter": False,
+        "sma60_period": 60,
+        "kr_breakout_requires_confirmation": False,
+        "gap_atr_multiplier": 0.0,
+        "min_history_bars": 60,
+        "min_price": 0.0,
+        "us_min_price": None,
+        "min_dollar_volume": 0.0,
+        "us_min_dollar_volume": None,
+        "exclude_etf_etn": False,
+    }
+    values.update(overrides)
+    return HybridEvaluationSettings(**values)
+
+
+def test_stages_run_cheapest_first() -> None:
+    assert [s.name for s in BUY_STAGES] == [
+        "price",
+        "etf",
+        "liquidity",
+        "ema_cross",
+        "rsi",
+        "sma200",
+        "slope",
+        "gap",
+    ]
+    assert [s.name for s in HYBRID_STAGES] == [
+        "history",
+        "price",
+        "etf",
+        "liquidity",
+        "pattern",
+    ]
+
+
+@pytest.mark.parametrize(
+    ("settings", "meta", "stage", "reason"),
+    [
+        (
+            EvaluationSettings(min_history_bars=60, min_price=50.0),
+            {},
+            "price",
+            "Price 11 < MIN_PRICE 50",
+        ),
+        (
+            EvaluationSettings(min_history_bars=60, min_dollar_volume=5_000.0),
+            {},
+            "liquidity",
+            "Avg dollar volume 1,070 < 5,000",
+        ),
+        (
+            EvaluationSettings(min_history_bars=60, exclude_etf_etn=True),
+            {"name": "KODEX 200 ETF"},
+            "etf",
+            "ETF/ETN excluded",
+        ),
+    ],
+)
+def test_cheap_rejections_skip_indicators(
+    monkeypatch: pytest.MonkeyPatch,
+    settings: EvaluationSettings,
+    meta: dict[str, Any],
+    stage: str,
+    reason: str,
+) -> None:
+    _no_indicators(monkeypatch, ev)
+
+    result = evaluate_ticker("069500", _rows(80), settings, meta)
+
+    assert (result.candidate, result.stage, result.reason) == (None, stage, reason)
+
+
+def test_indicators_are_computed_on_first_use(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    calls: list[str] = []
+    monkeypatch.setattr(ev, "ema", lambda v, n: calls.append(f"ema{n}") or [1.0] * 80)
+    monkeypatch.setattr(ev, "rsi", lambda v, n: calls.append("rsi") or [50.0] * 80)
+    monkeypatch.setattr(ev, "atr", lambda *a: calls.append("atr") or [1.0] * 80)
+    monkeypatch.setattr(ev, "sma", lambda v, n: calls.append("sma") or [1.0] * 80)
+
+    result = evaluate_ticker(
+        "005930", _rows(80), EvaluationSettings(min_history_bars=60), {}
+    )
+
+    assert result.stage == "ema_cross"
+    assert calls == ["ema20", "ema50"]
+
+
+def test_hybrid_atr_only_for_candidates(monkeypatch: pytest.MonkeyPatch) -> None:
+    def fail(*args: Any) -> Any:
+        raise AssertionError("ATR computed")
+
+    monkeypatch.setattr(hb, "atr", fail)
+    # Flat closes: never above the SMA trend, so no detector matches.
+    rows = [dict(r, close=10.0) for r in _rows(80)]
+
+    result = evaluate_ticker_hybrid("005930", rows, _hybrid_settings(), {})
+
+    assert result.stage == "pattern"
+    assert result.reason == "Did not meet hybrid signal criteria"
+
+
+def test_hybrid_cheap_rejection_skips_indicators(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    _no_indicators(monkeypatch, hb)
+
+    short = evaluate_ticker_hybrid("005930", _rows(30), _hybrid_settings(), {})
+    cheap = evaluate_ticker_hybrid(
+        "AAPL.US",
+        _rows(80),
+        _hybrid_settings(us_min_price=20.0),
+        {"currency": "USD"},
+    )
+
+    assert (short.stage, short.reason) == ("history", "Not enough history (<60 bars)")
+    assert (cheap.stage, cheap.reason) == ("price", "Price 10.79 < MIN_PRICE 20.00")
+
+
+def test_lazy_series_and_counts() -> None:
+    calls: list[int] = []
+    series = LazySeries(lambda: calls.append(1) or [1.0, 2.0])
+    assert not series.computed
+    assert (series[-1], len(series), list(series)) == (2.0, 2, [1.0, 2.0])
+    assert calls == [1]
+
+    settings = EvaluationSettings(min_history_bars=60, min_price=50.0)
+    results = [
+        evaluate_ticker("A", _rows(80), settings, {}),
+        evaluate_ticker("B", _rows(30), settings, {}),
+        evaluate_ticker("C", _rows(80), settings, {}),
+    ]
+    assert count_rejections(results) == {"price": 2, "history": 1}
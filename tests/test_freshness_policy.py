@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import datetime as dt
+import logging
+from dataclasses import replace
+from pathlib import Path
+from typing import Any
+from zoneinfo import ZoneInfo
+
+from sab.config import Config
+from sab.data.candle_store import open_candle_store
+from sab.freshness import FreshnessPolicy
+from sab.scan import _collect_market_data_from_kis, _ScanRuntime
+from sab.signals.eval_index import latest_completed_session
+
+KST = ZoneInfo("Asia/Seoul")
+NY = ZoneInfo("America/New_York")
+
+
+def _rows(last: dt.date, count: int) -> list[dict[str, Any]]:
+    return [
+        {
+            "date": (last - dt.timedelta(days=count - 1 - i)).strftime("%Y%m%d"),
+            "open": 1.0,
+            "high": 1.0,
+            "low": 1.0,
+            "close": 1.0,
+            "volume": 1.0,
+            "prev_close_diff": 0.0,
+        }
+        for i in range(count)
+    ]
+
+
+def test_latest_completed_session_skips_weekends_and_holidays(tmp_path: Path) -> None:
+    data_dir = str(tmp_path)
+    # Monday 2025-01-27 is a KRX holiday (Seollal); the prior session is Friday.
+    assert latest_completed_session(
+        "KR", now=dt.datetime(2025, 1, 27, 10, tzinfo=KST), data_dir=data_dir
+    ) == (dt.date(2025, 1, 24), "CLOSED")
+    assert latest_completed_session(
+        "KR", now=dt.datetime(2025, 2, 3, 16, tzinfo=KST), data_dir=data_dir
+    ) == (dt.date(2025, 2, 3), "AFTER_CLOSE")
+    assert latest_completed_session(
+        "US", now=dt.datetime(2025, 2, 4, 11, tzinfo=NY), data_dir=data_dir
+    ) == (dt.date(2025, 2, 3), "INTRADAY")
+
+
+def test_is_fresh_requires_final_bar_fetched_after_close(tmp_path: Path) -> None:
+    policy = FreshnessPolicy(str(tmp_path), now=dt.datetime(2025, 2, 3, 18, tzinfo=KST))
+    rows = _rows(dt.date(2025, 2, 3), 5)
+    entry = {
+        "last_date": "20250203",
+        "fetched_at": dt.datetime(2025, 2, 3, 16, tzinfo=KST).isoformat(),
+    }
+
+    assert policy.is_fresh("KR", rows, entry, min_bars=5)
+    assert not policy.is_fresh("KR", rows, entry, min_bars=6)
+    intraday_snapshot = dict(
+        entry, fetched_at=dt.datetime(2025, 2, 3, 14, tzinfo=KST).isoformat()
+    )
+    assert not policy.is_fresh("KR", rows, intraday_snapshot, min_bars=5)
+    assert not policy.is_fresh("KR", rows[:-1], entry, min_bars=4)
+    assert not replace(policy, enabled=False).is_fresh("KR", rows, entry, min_bars=5)
+
+    trading = FreshnessPolicy(
+        str(tmp_path), now=dt.datetime(2025, 2, 4, 10, tzinfo=KST)
+    )
+    assert not trading.is_fresh("KR", rows, entry, min_bars=5)
+
+
+class _NoCallClient:
+    def daily_candles(self, symbol: str, **_: Any) -> list[dict[str, Any]]:
+        raise AssertionError(f"unexpected fetch for {symbol}")
+
+
+def test_scan_uses_current_cache_without_calling_kis(tmp_path: Path) -> None:
+    session = dt.date(2025, 2, 3)
+    repo = open_candle_store(str(tmp_path))
+    repo.save("candles_005930", _rows(session, 200))
+    repo.manifest.record(
+        "candles_005930",
+        _rows(session, 200),
+        source="kis",
+        fetched_at=dt.datetime(2025, 2, 3, 16, tzinfo=KST),
+    )
+    repo.flush()
+
+    cfg = replace(Config(), data_dir=str(tmp_path), universe_markets=["KR"])
+    runtime = _ScanRuntime(
+        cfg=cfg, logger=logging.getLogger("test"), tickers=["005930"]
+    )
+    runtime.kis_client = _NoCallClient()  # type: ignore[assignment]
+    runtime.freshness = FreshnessPolicy(
+        str(tmp_path), now=dt.datetime(2025, 2, 3, 20, tzinfo=KST)
+    )
+
+    _collect_market_data_from_kis(runtime)
+
+    assert runtime.failures == []
+    assert runtime.fresh_hits == 1
+    assert runtime.ticker_data_source == {"005930": "kis"}
+    assert len(runtime.market_data["005930"]) == 200
+    assert runtime.latest_dates == {"005930": "20250203"}
@@ -1,12 +1,16 @@
 import datetime as dt
 import json
+import os
 import tempfile
 import unittest
+from unittest.mock import patch
 
 from sab.data.holiday_cache import (
     HolidayEntry,
+    holiday_refresh_due,
     lookup_holiday,
     merge_holidays,
+    record_holiday_refresh,
 )
 
 
@@ -106,6 +110,44 @@ class HolidayCacheTests(unittest.TestCase):
             merged = merge_holidays(tmpdir, "US", items)
             self.assertNotIn("20251218", merged)
 
+    def test_merge_skips_the_write_when_nothing_changed(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            items = [{"TRD_DT": "20250107", "evnt_nm": "Closure", "open_yn": "N"}]
+            merge_holidays(tmpdir, "US", items)
+            self.assertTrue(os.path.exists(f"{tmpdir}/holidays_us.json"))
+
+            with patch("sab.data.holiday_cache.save_holidays") as save:
+                merge_holidays(tmpdir, "US", items)
+                save.assert_not_called()
+                merge_holidays(tmpdir, "US", [{"TRD_DT": "20250108", "open_yn": "N"}])
+                save.assert_called_once()
+
+    def test_refresh_is_due_after_ttl_or_outside_the_fetched_range(self) -> None:
+        fetched = dt.datetime(2025, 1, 6, 12, 0, tzinfo=dt.UTC)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cover = {"cover_start": "20250106", "cover_end": "20250113"}
+            self.assertTrue(holiday_refresh_due(tmpdir, "US", ttl_hours=24, **cover))
+
+            record_holiday_refresh(tmpdir, "US", "20250106", "20250205", fetched)
+
+            soon = fetched + dt.timedelta(hours=5)
+            late = fetched + dt.timedelta(hours=25)
+            due = holiday_refresh_due
+            self.assertFalse(due(tmpdir, "US", ttl_hours=24, now=soon, **cover))
+            self.assertTrue(due(tmpdir, "US", ttl_hours=24, now=late, **cover))
+            self.assertTrue(due(tmpdir, "US", ttl_hours=0, now=soon, **cover))
+            self.assertTrue(
+                due(
+                    tmpdir,
+                    "US",
+                    cover_start="20250106",
+                    cover_end="20250210",
+                    ttl_hours=24,
+                    now=soon,
+                )
+            )
+            self.assertTrue(due(tmpdir, "KR", ttl_hours=24, now=soon, **cover))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,6 +1,7 @@
 from sab.signals.hybrid_buy import (
     HybridEvaluationSettings,
     HybridPattern,
+    _detect_trend_pullback_bounce,
     evaluate_ticker_hybrid,
 )
 
@@ -55,6 +56,41 @@ def _settings(min_history: int = 5) -> HybridEvaluationSettings:
     )
 
 
+def _heavy_selling_reasons(ema_short: list[float], heavy_at: int) -> list[str]:
+    """Reasons for flat closes at 10 with one high-volume red bar."""
+    candles = [
+        {"date": f"202501{10 + i:02d}", "open": 10.0, "close": 10.0, "volume": 100}
+        for i in range(6)
+    ]
+    candles[heavy_at] = dict(candles[heavy_at], open=11.0, volume=1_000)
+    _, reasons, _, _ = _detect_trend_pullback_bounce(
+        [10.0] * 6,
+        [5.0] * 6,
+        ema_short,
+        [5.0] * 6,
+        [50.0] * 6,
+        candles,
+        _settings(),
+    )
+    return reasons
+
+
+def test_heavy_selling_checks_pullback_bars():
+    # The last two closes sit at or below the short EMA.
+    ema_short = [9.0] * 4 + [11.0] * 2
+    heavy = "Heavy selling volume during pullback"
+
+    assert heavy in _heavy_selling_reasons(ema_short, heavy_at=5)
+    assert heavy not in _heavy_selling_reasons(ema_short, heavy_at=3)
+
+
+def test_heavy_selling_without_pullback_checks_whole_history():
+    # With no pullback bar, candles[-0:] spans every bar (long-standing behaviour).
+    reasons = _heavy_selling_reasons([9.0] * 6, heavy_at=0)
+
+    assert reasons == ["Heavy selling volume during pullback"]
+
+
 def test_pullback_bounce_watch(monkeypatch):
     candles = _simple_candles(10)
 
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import datetime as dt
+from typing import Any
+
+import pytest
+import sab.__main__ as cli
+import sab.signals.evaluator as ev
+import sab.signals.sell_rules as sr
+from sab.signals.evaluator import EvaluationSettings, evaluate_ticker
+from sab.signals.indicator_cache import IndicatorCache
+from sab.signals.indicator_state import IndicatorFrame
+from sab.signals.indicators import ema, rsi
+from sab.signals.sell_rules import SellSettings, evaluate_sell_signals
+
+
+def _candles(count: int) -> list[dict[str, Any]]:
+    start = dt.date(2024, 1, 1)
+    rows = []
+    for i in range(count):
+        close = 100.0 + (i % 7) - (i % 3) * 0.5 + i * 0.1
+        rows.append(
+            {
+                "date": (start + dt.timedelta(days=i)).strftime("%Y%m%d"),
+                "open": close,
+                "high": close + 1.0,
+                "low": close - 1.0,
+                "close": close,
+                "volume": 1000.0,
+            }
+        )
+    return rows
+
+
+def _frame(rows: list[dict[str, Any]], cache: IndicatorCache) -> IndicatorFrame:
+    return IndicatorFrame(
+        rows,
+        [r["close"] for r in rows],
+        [r["high"] for r in rows],
+        [r["low"] for r in rows],
+        cache=cache,
+        ticker="005930",
+    )
+
+
+def test_frames_share_series_for_identical_inputs() -> None:
+    rows = _candles(80)
+    cache = IndicatorCache()
+
+    first = _frame(rows, cache).ema(20)
+    second = _frame(rows, cache).ema(20)
+
+    assert first == ema([r["close"] for r in rows], 20)
+    assert second is first
+    assert cache.stats() == {"entries": 1, "hits": 1, "misses": 1}
+
+
+def test_changed_inputs_with_same_last_date_recompute() -> None:
+    rows = _candles(80)
+    cache = IndicatorCache()
+    before = _frame(rows, cache).rsi(14)
+
+    revised = [dict(r) for r in rows]
+    revised[-1]["close"] += 5.0
+    values = _frame(revised, cache).rsi(14)
+
+    assert values[-1] == rsi([r["close"] for r in revised], 14)[-1]
+    assert values[-1] != before[-1]
+    assert cache.hits == 0
+
+
+def test_buy_and_sell_evaluation_reuse_indicators(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    def last_index(data: Any, meta: Any = None, provider: Any = None) -> tuple:
+        return len(data) - 1, False
+
+    monkeypatch.setattr(ev, "choose_eval_index", last_index)
+    monkeypatch.setattr(sr, "choose_eval_index", last_index)
+    rows = _candles(220)
+    holding = {"entry_price": 100.0, "entry_date": "2024-03-01"}
+    cache = IndicatorCache()
+
+    buy = evaluate_ticker("005930", rows, EvaluationSettings(), {})
+    sell = evaluate_sell_signals("005930", rows, holding, SellSettings())
+    buy_cached = evaluate_ticker(
+        "005930", rows, EvaluationSettings(), {}, indicator_cache=cache
+    )
+    sell_cached = evaluate_sell_signals(
+        "005930", rows, holding, SellSettings(), indicator_cache=cache
+    )
+
+    assert buy_cached == buy
+    assert sell_cached == sell
+    # Buy stops at the EMA cross stage, so only EMA(20/50) are computed there;
+    # sell reuses those two and computes RSI(14), ATR(14) and SMA(200) itself.
+    assert buy.stage == "ema_cross"
+    assert cache.hits == 2
+
+
+def test_run_command_shares_one_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    seen: list[Any] = []
+
+    def fake_scan(**kwargs: Any) -> int:
+        seen.append(kwargs["indicator_cache"])
+        return 0
+
+    def fake_sell(**kwargs: Any) -> int:
+        seen.append(kwargs["indicator_cache"])
+        return 1
+
+    monkeypatch.setattr(cli, "run_scan", fake_scan)
+    monkeypatch.setattr(cli, "run_sell", fake_sell)
+    monkeypatch.setattr(cli, "load_dotenv_if_available", lambda override: None)
+
+    assert cli.main(["run", "--universe", "watchlist"]) == 1
+    assert isinstance(seen[0], IndicatorCache)
+    assert seen[0] is seen[1]
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import datetime as dt
+import math
+import random
+from pathlib import Path
+from typing import Any
+
+from sab.signals.indicator_state import (
+    DEFAULT_TAIL_BARS,
+    IndicatorFrame,
+    IndicatorStateStore,
+)
+from sab.signals.indicators import atr, ema, rsi, sma
+
+
+def _bars(count: int, seed: int = 7) -> list[dict[str, Any]]:
+    rng = random.Random(seed)
+    start = dt.date(2024, 1, 1)
+    price = 100.0
+    rows = []
+    for i in range(count):
+        price = max(1.0, price * (1 + rng.gauss(0, 0.02)))
+        close = round(price, 2)
+        rows.append(
+            {
+                "date": (start + dt.timedelta(days=i)).strftime("%Y%m%d"),
+                "high": round(close * 1.01, 2),
+                "low": round(close * 0.99, 2),
+                "close": close,
+            }
+        )
+    return rows
+
+
+def _frame(rows: list[dict[str, Any]], state: Any) -> IndicatorFrame:
+    return IndicatorFrame(
+        rows,
+        [r["close"] for r in rows],
+        [r["high"] for r in rows],
+        [r["low"] for r in rows],
+        state,
+    )
+
+
+def _reference(rows: list[dict[str, Any]]) -> dict[str, list[float]]:
+    closes = [r["close"] for r in rows]
+    highs = [r["high"] for r in rows]
+    lows = [r["low"] for r in rows]
+    return {
+        "ema": ema(closes, 20),
+        "rsi": rsi(closes, 14),
+        "atr": atr(highs, lows, closes, 14),
+        "sma": sma(closes, 50),
+    }
+
+
+def _compute(frame: IndicatorFrame) -> dict[str, list[float]]:
+    return {
+        "ema": frame.ema(20),
+        "rsi": frame.rsi(14),
+        "atr": frame.atr(14),
+        "sma": frame.sma(50),
+    }
+
+
+def _same(a: list[float], b: list[float]) -> bool:
+    return len(a) == len(b) and all(
+        x == y or (math.isnan(x) and math.isnan(y)) for x, y in zip(a, b, strict=True)
+    )
+
+
+def test_extending_the_window_processes_only_new_bars(tmp_path: Path) -> None:
+    rows = _bars(160)
+    store = IndicatorStateStore(str(tmp_path))
+    state = store.get("005930")
+
+    first = _compute(_frame(rows[:150], state))
+    for name, values in _reference(rows[:150]).items():
+        assert _same(first[name], values), name
+
+    resumed = _compute(_frame(rows, state))
+    expected = _reference(rows)
+    for name, values in resumed.items():
+        assert len(values) == len(rows)
+        # A growing window has the same seed, so the tail is exact.
+        assert _same(values[-DEFAULT_TAIL_BARS:], expected[name][-DEFAULT_TAIL_BARS:])
+    assert state.streams["ema:20"]["n"] == 160
+    assert state.streams["atr:14"]["date"] == rows[-1]["date"]
+
+
+def test_sliding_window_steps_one_bar(tmp_path: Path) -> None:
+    rows = _bars(201)
+    state = IndicatorStateStore(str(tmp_path)).get("AAPL.US")
+    _compute(_frame(rows[:200], state))
+
+    values = _compute(_frame(rows[1:], state))
+
+    assert state.streams["rsi:14"]["n"] == 201
+    assert math.isnan(values["ema"][0])
+    # SMA only depends on the window, so it still matches the reference.
+    assert _same(values["sma"][-10:], _reference(rows[1:])["sma"][-10:])
+
+
+def test_revised_history_rebuilds_the_stream(tmp_path: Path) -> None:
+    rows = _bars(120)
+    state = IndicatorStateStore(str(tmp_path)).get("005930")
+    _compute(_frame(rows[:119], state))
+
+    revised = [dict(r) for r in rows]
+    revised[117]["close"] = revised[117]["close"] * 0.5
+
+    values = _compute(_frame(revised, state))
+    for name, expected in _reference(revised).items():
+        assert _same(values[name], expected), name
+    assert state.streams["ema:20"]["n"] == 120
+
+
+def test_state_round_trips_through_the_store(tmp_path: Path) -> None:
+    rows = _bars(100)
+    store = IndicatorStateStore(str(tmp_path))
+    _compute(_frame(rows[:99], store.get("005930")))
+    store.flush()
+    assert (tmp_path / "indicator_state" / "005930.json").exists()
+
+    reloaded = IndicatorStateStore(str(tmp_path)).get("005930")
+    values = _compute(_frame(rows, reloaded))
+    expected = _reference(rows)
+    for name in values:
+        assert _same(values[name][-5:], expected[name][-5:]), name
+    assert reloaded.streams["sma:50"]["n"] == 100
+    assert reloaded.dirty
+
+
+def test_frame_without_dates_uses_reference(tmp_path: Path) -> None:
+    rows = _bars(30)
+    for row in rows:
+        row["date"] = None
+    state = IndicatorStateStore(str(tmp_path)).get("X")
+    values = _compute(_frame(rows, state))
+    assert _same(values["rsi"], _reference(rows)["rsi"])
+    assert not state.streams and not state.dirty
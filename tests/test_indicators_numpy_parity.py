@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import math
+import random
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+from sab.signals import indicators
+from sab.signals.indicators import (
+    atr,
+    atr_many,
+    ema,
+    ema_many,
+    rsi,
+    rsi_many,
+    sma,
+    sma_many,
+)
+
+pytest.importorskip("numpy")
+
+PERIODS = [0, 1, 2, 5, 14, 20, 60]
+
+
+@pytest.fixture(autouse=True)
+def _numpy_backend(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    monkeypatch.setenv("SAB_INDICATOR_BACKEND", "numpy")
+    indicators.reset_indicator_backend()
+    yield
+    indicators.reset_indicator_backend()
+
+
+def _series(rng: random.Random, n: int, *, gaps: bool) -> list[Any]:
+    price = rng.uniform(5, 500)
+    out: list[Any] = []
+    for _ in range(n):
+        price = max(0.01, price * (1 + rng.gauss(0, 0.02)))
+        out.append(round(price, 2))
+    if gaps and n > 3:
+        out[rng.randrange(n)] = float("nan")
+        out[rng.randrange(n)] = None
+    return out
+
+
+def _same(a: list[float], b: list[float]) -> bool:
+    return len(a) == len(b) and all(
+        (math.isnan(x) and math.isnan(y)) or x == y for x, y in zip(a, b, strict=True)
+    )
+
+
+def _universe(gaps: bool) -> list[list[Any]]:
+    rng = random.Random(7)
+    lengths = [0, 1, 2, 3, 15, 30, 30, 30, 200, 200]
+    return [_series(rng, n, gaps=gaps) for n in lengths]
+
+
+@pytest.mark.parametrize("period", PERIODS)
+def test_ema_and_sma_match_reference_bit_for_bit(period: int) -> None:
+    universe = _universe(gaps=True)
+    assert indicators.indicator_backend() == "numpy"
+
+    for got, values in zip(ema_many(universe, period), universe, strict=True):
+        assert _same(got, ema(values, period))
+    for got, values in zip(sma_many(universe, period), universe, strict=True):
+        assert _same(got, sma(values, period))
+
+
+@pytest.mark.parametrize("period", PERIODS)
+def test_rsi_matches_reference_bit_for_bit(period: int) -> None:
+    universe = _universe(gaps=False)
+    universe.append([100.0] * 40)  # no losses -> RSI pinned at 100
+    universe.append([100.0, float("nan"), 101.0, 99.0] * 8)
+
+    for got, values in zip(rsi_many(universe, period), universe, strict=True):
+        assert _same(got, rsi(values, period))
+
+
+@pytest.mark.parametrize("period", PERIODS)
+def test_atr_matches_reference_bit_for_bit(period: int) -> None:
+    rng = random.Random(11)
+    triples = []
+    for closes in _universe(gaps=False):
+        highs = [c + rng.uniform(0, 2) for c in closes]
+        lows = [c - rng.uniform(0, 2) for c in closes]
+        triples.append((highs, lows, closes))
+    # Ragged inputs are truncated to the shortest list, as in atr().
+    triples.append(([10.0, 11.0, 12.0], [9.0, float("nan")], [9.5, 10.5, 11.5]))
+
+    for got, (h, lo, c) in zip(atr_many(triples, period), triples, strict=True):
+        assert _same(got, atr(h, lo, c, period))
+
+
+def test_python_backend_is_selectable(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("SAB_INDICATOR_BACKEND", "python")
+    indicators.reset_indicator_backend()
+
+    assert indicators.indicator_backend() == "python"
+    universe = _universe(gaps=True)
+    assert all(
+        _same(got, ema(values, 10))
+        for got, values in zip(ema_many(universe, 10), universe, strict=True)
+    )
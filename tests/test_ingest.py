@@ -0,0 +1,266 @@
+from __future__ import annotations
+
+import datetime as dt
+import logging
+import math
+from dataclasses import replace
+from pathlib import Path
+from typing import Any
+from zoneinfo import ZoneInfo
+
+import pytest
+import sab.data.pykrx_client as pykrx_client
+import sab.ingest as ingest
+from sab.config import Config
+from sab.data.candle_store import open_candle_store
+from sab.data.holiday_cache import HolidayEntry
+from sab.data.kr_eod import (
+    INGEST_SOURCE,
+    eod_cache_key,
+    ingest_snapshots,
+    load_ingest_state,
+    plan_sessions,
+)
+from sab.data.trading_calendar import TradingCalendar
+from sab.freshness import FreshnessPolicy
+from sab.scan import _collect_market_data_from_kis, _load_scan_tickers, _ScanRuntime
+
+KST = ZoneInfo("Asia/Seoul")
+
+CALENDAR = TradingCalendar(
+    "KR", {"20250303": HolidayEntry(date="20250303", note="삼일절", is_open=False)}
+)
+
+
+def _bar(close: float) -> tuple[float, float, float, float, float]:
+    return (close - 1, close + 1, close - 2, close, 1000.0)
+
+
+def test_plan_sessions_backfills_then_continues() -> None:
+    end = dt.date(2025, 3, 5)
+
+    assert plan_sessions(CALENDAR, end, backfill=4) == [
+        dt.date(2025, 2, 27),
+        dt.date(2025, 2, 28),
+        dt.date(2025, 3, 4),
+        dt.date(2025, 3, 5),
+    ]
+    assert plan_sessions(CALENDAR, end, since=dt.date(2025, 3, 1)) == [
+        dt.date(2025, 3, 4),
+        dt.date(2025, 3, 5),
+    ]
+    assert plan_sessions(CALENDAR, end, after="20250228") == [
+        dt.date(2025, 3, 4),
+        dt.date(2025, 3, 5),
+    ]
+    assert plan_sessions(CALENDAR, end, after="20250305") == []
+
+
+def test_snapshots_are_transposed_into_ticker_series(tmp_path: Path) -> None:
+    store = open_candle_store(str(tmp_path))
+
+    assert ingest_snapshots(
+        store,
+        [
+            ("20250228", {"005930": _bar(100.0), "000660": _bar(50.0)}),
+            ("20250227", {"005930": _bar(98.0)}),
+        ],
+    ) == (2, 3)
+    # A re-ingested session replaces its bar; a new one is appended.
+    ingest_snapshots(
+        store,
+        [("20250228", {"005930": _bar(101.0)}), ("20250304", {"005930": _bar(99.0)})],
+    )
+    store.flush()
+
+    assert store.load("candles_005930") is None  # KIS history stays untouched
+    candles = store.load(eod_cache_key("005930"))
+    assert candles is not None
+    assert [c["date"] for c in candles] == ["20250227", "20250228", "20250304"]
+    assert [c["close"] for c in candles] == [98.0, 101.0, 99.0]
+    diffs = [c["prev_close_diff"] for c in candles]
+    assert math.isnan(diffs[0]) and diffs[1:] == [3.0, -2.0]
+    entry = store.manifest.get(eod_cache_key("005930"))
+    assert entry is not None and entry["source"] == INGEST_SOURCE
+    assert entry["last_date"] == "20250304"
+
+
+class _Client:
+    calls: list[str] = []
+    unpublished: set[str] = set()
+
+    def __init__(self, **_: Any) -> None:
+        pass
+
+    def market_snapshot(self, date: str, *, market: str = "ALL") -> dict[str, Any]:
+        self.calls.append(date)
+        if date in self.unpublished:
+            return {}
+        base = float(date[-2:])
+        return {"005930": _bar(100.0 + base), "035720": _bar(40.0 + base)}
+
+
+def test_run_ingest_backfills_once_then_appends(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    cfg = replace(Config(), data_dir=str(tmp_path))
+    end = [dt.date(2025, 2, 28)]
+    monkeypatch.setattr(ingest, "load_config", lambda: cfg)
+    monkeypatch.setattr(ingest, "PykrxClient", _Client)
+    monkeypatch.setattr(ingest, "trading_calendar", lambda *_: CALENDAR)
+    monkeypatch.setattr(
+        ingest, "latest_completed_session", lambda *_, **__: (end[0], "CLOSED")
+    )
+    _Client.calls = []
+    _Client.unpublished = set()
+
+    assert ingest.run_ingest(sessions=3) == 0
+    assert _Client.calls == ["20250226", "20250227", "20250228"]
+
+    end[0] = dt.date(2025, 3, 4)
+    assert ingest.run_ingest(sessions=3) == 0
+    assert _Client.calls[3:] == ["20250304"]
+
+    state = load_ingest_state(str(tmp_path))
+    assert state is not None
+    assert (state.first_date, state.last_date) == ("20250226", "20250304")
+    assert _load_scan_tickers(cfg, None, "market") == ["005930", "035720"]
+    candles = open_candle_store(str(tmp_path)).load(eod_cache_key("035720"))
+    assert candles is not None and len(candles) == 4
+
+
+def _patch_run(monkeypatch: pytest.MonkeyPatch, tmp_path: Path, end: dt.date) -> None:
+    cfg = replace(Config(), data_dir=str(tmp_path))
+    monkeypatch.setattr(ingest, "load_config", lambda: cfg)
+    monkeypatch.setattr(ingest, "PykrxClient", _Client)
+    monkeypatch.setattr(ingest, "trading_calendar", lambda *_: CALENDAR)
+    monkeypatch.setattr(
+        ingest, "latest_completed_session", lambda *_, **__: (end, "CLOSED")
+    )
+    _Client.calls = []
+
+
+def test_run_ingest_skips_closures_missing_from_the_calendar(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    _patch_run(monkeypatch, tmp_path, dt.date(2025, 3, 5))
+    _Client.unpublished = {"20250228"}  # closed, but not in CALENDAR
+
+    assert ingest.run_ingest(sessions=4) == 0
+    assert _Client.calls == ["20250227", "20250228", "20250304", "20250305"]
+    state = load_ingest_state(str(tmp_path))
+    assert state is not None and state.last_date == "20250305"
+    candles = open_candle_store(str(tmp_path)).load(eod_cache_key("005930"))
+    assert candles is not None
+    assert candles.dates() == ["20250227", "20250304", "20250305"]
+
+
+def test_run_ingest_retries_the_newest_session_without_data(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    _patch_run(monkeypatch, tmp_path, dt.date(2025, 3, 4))
+    _Client.unpublished = {"20250304"}
+
+    assert ingest.run_ingest(sessions=3) == 1
+    assert _Client.calls == ["20250227", "20250228", "20250304"]
+    state = load_ingest_state(str(tmp_path))
+    assert state is not None and state.last_date == "20250228"
+
+    _Client.unpublished = set()
+    assert ingest.run_ingest(sessions=3) == 0
+    assert _Client.calls[3:] == ["20250304"]
+    candles = open_candle_store(str(tmp_path)).load(eod_cache_key("005930"))
+    assert candles is not None
+    assert candles.dates() == ["20250227", "20250228", "20250304"]
+
+
+class _KIS:
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, int]] = []
+
+    def daily_candles(
+        self, symbol: str, *, count: int, cached: Any = None
+    ) -> list[dict[str, Any]]:
+        self.calls.append((symbol, len(cached or [])))
+        return _rows(dt.date(2025, 2, 3), count, close=10.0)
+
+
+def _rows(last: dt.date, count: int, *, close: float) -> list[dict[str, Any]]:
+    return [
+        {
+            "date": (last - dt.timedelta(days=count - 1 - i)).strftime("%Y%m%d"),
+            "open": close,
+            "high": close,
+            "low": close,
+            "close": close,
+            "volume": 1.0,
+            "prev_close_diff": 0.0,
+        }
+        for i in range(count)
+    ]
+
+
+def test_scan_uses_ingested_history_only_without_kis_history(
+    tmp_path: Path,
+) -> None:
+    session = dt.date(2025, 2, 3)
+    fetched_at = dt.datetime(2025, 2, 3, 16, tzinfo=KST)
+    store = open_candle_store(str(tmp_path))
+    for ticker in ("005930", "035720"):
+        rows = _rows(session, 200, close=1.0)
+        store.save(eod_cache_key(ticker), rows)
+        store.manifest.record(
+            eod_cache_key(ticker), rows, source=INGEST_SOURCE, fetched_at=fetched_at
+        )
+    # 005930 also has (stale) adjusted KIS history.
+    kis_rows = _rows(session - dt.timedelta(days=1), 200, close=10.0)
+    store.save("candles_005930", kis_rows)
+    store.manifest.record("candles_005930", kis_rows, source="kis")
+    store.flush()
+
+    cfg = replace(Config(), data_dir=str(tmp_path), universe_markets=["KR"])
+    runtime = _ScanRuntime(
+        cfg=cfg, logger=logging.getLogger("test"), tickers=["005930", "035720"]
+    )
+    kis = _KIS()
+    runtime.kis_client = kis  # type: ignore[assignment]
+    runtime.freshness = FreshnessPolicy(
+        str(tmp_path), now=dt.datetime(2025, 2, 3, 20, tzinfo=KST)
+    )
+
+    _collect_market_data_from_kis(runtime)
+
+    assert kis.calls == [("005930", 200)]
+    assert runtime.ticker_data_source == {"005930": "kis", "035720": INGEST_SOURCE}
+    assert runtime.market_data["005930"][-1]["close"] == 10.0
+    assert runtime.market_data["035720"][-1]["close"] == 1.0
+    assert runtime.fresh_hits == 1
+
+
+def test_market_snapshot_skips_untraded_tickers(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    pd = pytest.importorskip("pandas")
+    frame = pd.DataFrame(
+        {
+            "시가": [100, 0, 50],
+            "고가": [110, 0, 55],
+            "저가": [95, 0, 49],
+            "종가": [105, 30, 52],
+            "거래량": [1000, 0, 500],
+        },
+        index=pd.Index(["005930", "000020", "035720"], name="티커"),
+    )
+
+    class _Stock:
+        def get_market_ohlcv_by_ticker(self, date: str, market: str = "ALL") -> Any:
+            return frame
+
+    monkeypatch.setattr(pykrx_client, "_import_pykrx_stock", lambda: _Stock())
+
+    snapshot = pykrx_client.PykrxClient().market_snapshot("20250228")
+
+    assert snapshot == {
+        "005930": (100.0, 110.0, 95.0, 105.0, 1000.0),
+        "035720": (50.0, 55.0, 49.0, 52.0, 500.0),
+    }
@@ -0,0 +1,129 @@
+import datetime as dt
+from typing import Any
+from unittest.mock import MagicMock
+
+from sab.data.kis_client import KISClient, KISCredentials
+
+
+def _client() -> KISClient:
+    creds = KISCredentials(
+        app_key="test-key",
+        app_secret="test-secret",
+        base_url="https://example.com",
+        env="demo",
+    )
+    client = KISClient(creds, session=MagicMock(), cache_dir=None)
+    client._access_token = "Bearer test"
+    client._token_expiry = dt.datetime.now(dt.UTC) + dt.timedelta(hours=1)
+    return client
+
+
+def _dates(count: int, end: dt.date) -> list[str]:
+    return [
+        (end - dt.timedelta(days=count - 1 - i)).strftime("%Y%m%d")
+        for i in range(count)
+    ]
+
+
+def _cached(count: int, end: dt.date) -> list[dict[str, Any]]:
+    return [
+        {
+            "date": d,
+            "open": 100.0 + i,
+            "high": 101.0 + i,
+            "low": 99.0 + i,
+            "close": 100.0 + i,
+            "volume": 1000.0,
+            "prev_close_diff": 1.0,
+        }
+        for i, d in enumerate(_dates(count, end))
+    ]
+
+
+def _raw(row: dict[str, Any]) -> dict[str, str]:
+    return {
+        "stck_bsop_date": row["date"],
+        "stck_oprc": str(row["open"]),
+        "stck_hgpr": str(row["high"]),
+        "stck_lwpr": str(row["low"]),
+        "stck_clpr": str(row["close"]),
+        "acml_vol": str(row["volume"]),
+        "prdy_vrss": "1",
+    }
+
+
+def test_incremental_refresh_uses_single_short_request() -> None:
+    client = _client()
+    tail = dt.date.today() - dt.timedelta(days=3)
+    cached = _cached(30, tail)
+    new_row = dict(cached[-1], date=dt.date.today().strftime("%Y%m%d"), close=200.0)
+    overlap = [_raw(row) for row in cached[-5:]] + [_raw(new_row)]
+    client._fetch_candle_chunk = MagicMock(return_value=list(reversed(overlap)))  # type: ignore[method-assign]
+
+    rows = client.daily_candles("005930", count=30, cached=cached)
+
+    client._fetch_candle_chunk.assert_called_once()
+    kwargs = client._fetch_candle_chunk.call_args.kwargs
+    expected_start = (tail - dt.timedelta(days=10)).strftime("%Y%m%d")
+    assert kwargs["start_date"] == expected_start
+    assert len(rows) == 30
+    assert rows[0]["date"] == cached[1]["date"]
+    assert rows[-1]["date"] == new_row["date"]
+    assert rows[-1]["close"] == 200.0
+    assert [r["date"] for r in rows] == sorted(r["date"] for r in rows)
+
+
+def test_revised_history_triggers_full_refetch() -> None:
+    client = _client()
+    tail = dt.date.today() - dt.timedelta(days=1)
+    cached = _cached(30, tail)
+    revised = [dict(row, close=row["close"] / 2) for row in cached]
+    client._fetch_candle_chunk = MagicMock(  # type: ignore[method-assign]
+        side_effect=[[_raw(r) for r in revised[-5:]], [_raw(r) for r in revised], []]
+    )
+
+    rows = client.daily_candles("005930", count=30, cached=cached)
+
+    assert client._fetch_candle_chunk.call_count >= 2
+    assert rows[0]["close"] == revised[0]["close"]
+    assert len(rows) == 30
+
+
+def test_short_cache_falls_back_to_full_fetch() -> None:
+    client = _client()
+    cached = _cached(5, dt.date.today())
+    full = _cached(30, dt.date.today())
+    client._fetch_candle_chunk = MagicMock(return_value=[_raw(r) for r in full])  # type: ignore[method-assign]
+
+    rows = client.daily_candles("005930", count=30, cached=cached)
+
+    start = client._fetch_candle_chunk.call_args_list[0].kwargs["start_date"]
+    assert start != (dt.date.today() - dt.timedelta(days=10)).strftime("%Y%m%d")
+    assert len(rows) == 30
+
+
+def test_overseas_incremental_refresh_merges_tail() -> None:
+    client = _client()
+    tail = dt.date.today() - dt.timedelta(days=2)
+    cached = _cached(30, tail)
+    new_row = dict(cached[-1], date=dt.date.today().strftime("%Y%m%d"), close=150.0)
+    items = [
+        {
+            "xymd": r["date"],
+            "open": r["open"],
+            "high": r["high"],
+            "low": r["low"],
+            "clos": r["close"],
+            "tvol": r["volume"],
+        }
+        for r in cached[-3:] + [new_row]
+    ]
+    client._fetch_overseas_candle_chunk = MagicMock(return_value=items)  # type: ignore[method-assign]
+
+    rows = client.overseas_daily_candles(
+        symbol="AAPL", exchange="NAS", count=30, cached=cached
+    )
+
+    client._fetch_overseas_candle_chunk.assert_called_once()
+    assert len(rows) == 30
+    assert rows[-1]["close"] == 150.0
@@ -1,3 +1,5 @@
+import threading
+import time
 from unittest.mock import MagicMock
 
 from sab.screener.kis_overseas_screener import KISOverseasScreener, ScreenRequest
@@ -101,12 +103,28 @@ def test_kis_overseas_screener_fills_across_exchanges_until_limit() -> None:
     assert result.tickers[0] == "NAS001.NAS"
     assert result.tickers[-1] == "NYS010.NYS"
 
-    assert client.overseas_trade_value_rank.call_count == 2
-    first_call = client.overseas_trade_value_rank.call_args_list[0].kwargs
-    second_call = client.overseas_trade_value_rank.call_args_list[1].kwargs
-    assert first_call["exchange"] == "NAS"
-    assert first_call["limit"] == 110
-    assert first_call["nday"] == "1"
-    assert second_call["exchange"] == "NYS"
-    assert second_call["limit"] == 10
-    assert second_call["nday"] == "1"
+    # All exchanges are queried at once, each for the full limit.
+    calls = [c.kwargs for c in client.overseas_trade_value_rank.call_args_list]
+    assert sorted(c["exchange"] for c in calls) == ["AMS", "NAS", "NYS"]
+    assert all(c["limit"] == 110 and c["nday"] == "1" for c in calls)
+
+
+def test_kis_overseas_screener_queries_exchanges_concurrently() -> None:
+    client = MagicMock()
+    # Every exchange must be in flight together for the barrier to open.
+    barrier = threading.Barrier(3, timeout=5)
+
+    def volume_rank(**kwargs):
+        barrier.wait()
+        exchange = kwargs["exchange"]
+        if exchange == "NAS":
+            time.sleep(0.05)  # slowest, yet still ranked first
+        return [{"SYMB": "SHARED"}, {"SYMB": f"{exchange}1"}]
+
+    client.overseas_trade_volume_rank.side_effect = volume_rank
+    screener = KISOverseasScreener(client)
+
+    result = screener.screen(ScreenRequest(limit=4, metric="volume", nday=0))
+
+    assert result.tickers == ["SHARED.NAS", "NAS1.NAS", "SHARED.NYS", "NYS1.NYS"]
+    assert result.metadata["by_ticker"]["NAS1.NAS"]["exchange"] == "NAS"
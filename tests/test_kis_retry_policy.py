@@ -0,0 +1,194 @@
+import datetime as dt
+import random
+import threading
+import unittest
+from typing import Any
+from unittest.mock import MagicMock
+
+from sab.data.kis_client import KISClient, KISClientError, KISCredentials
+from sab.data.rate_limiter import RateLimiter
+from sab.data.retry_policy import (
+    AdaptiveThrottle,
+    RetryPolicy,
+    Verdict,
+    classify_response,
+)
+
+
+def _resp(status: int, payload: Any) -> MagicMock:
+    resp = MagicMock()
+    resp.status_code = status
+    resp.headers = {}
+    resp.text = str(payload)
+    if payload is None:
+        resp.json.side_effect = ValueError("no json")
+    else:
+        resp.json.return_value = payload
+    return resp
+
+
+class ClassifyResponseTests(unittest.TestCase):
+    def test_classifies_kis_body_codes_before_http_status(self) -> None:
+        self.assertIs(
+            classify_response(500, {"msg_cd": "EGW00123"}).verdict,
+            Verdict.TOKEN_EXPIRED,
+        )
+        self.assertIs(
+            classify_response(200, {"rt_cd": "1", "msg_cd": "EGW00201"}).verdict,
+            Verdict.RATE_LIMITED,
+        )
+        self.assertIs(classify_response(429, None).verdict, Verdict.RATE_LIMITED)
+        self.assertIs(classify_response(502, None).verdict, Verdict.SERVER_ERROR)
+        self.assertIs(classify_response(404, {}).verdict, Verdict.HTTP_ERROR)
+        self.assertTrue(Verdict.HTTP_ERROR.retryable)
+        self.assertIs(classify_response(200, None).verdict, Verdict.BAD_PAYLOAD)
+        self.assertIs(classify_response(200, []).verdict, Verdict.BAD_PAYLOAD)
+        self.assertIs(
+            classify_response(200, {"rt_cd": "1", "msg1": "bad"}).verdict,
+            Verdict.API_ERROR,
+        )
+        self.assertIs(classify_response(200, {"rt_cd": "0"}).verdict, Verdict.OK)
+        self.assertIs(classify_response(200, {"output": []}).verdict, Verdict.API_ERROR)
+        self.assertFalse(Verdict.API_ERROR.retryable)
+
+    def test_backoff_is_jittered_and_capped(self) -> None:
+        policy = RetryPolicy(base_delay=0.5, max_delay=2.0, rng=random.Random(7))
+        for attempt, ceiling in [(0, 0.5), (1, 1.0), (2, 2.0), (5, 2.0)]:
+            delay = policy.delay(attempt, Verdict.SERVER_ERROR)
+            self.assertGreaterEqual(delay, ceiling / 2)
+            self.assertLessEqual(delay, ceiling)
+        self.assertEqual(policy.delay(3, Verdict.TOKEN_EXPIRED), 0.0)
+
+    def test_aimd_halves_on_throttle_and_recovers_additively(self) -> None:
+        limiter = RateLimiter(10.0)
+        throttle = AdaptiveThrottle(limiter, success_window=2, step=1.0)
+
+        throttle.on_throttled()
+        throttle.on_throttled()
+        self.assertEqual(limiter.rate, 2.5)
+
+        for _ in range(4):
+            throttle.on_success()
+        self.assertEqual(limiter.rate, 4.5)
+
+        for _ in range(40):
+            throttle.on_success()
+        self.assertEqual(limiter.rate, 10.0)
+
+    def test_concurrent_throttles_from_one_burst_halve_once(self) -> None:
+        limiter = RateLimiter(16.0)
+        throttle = AdaptiveThrottle(limiter)
+        workers = 8
+        barrier = threading.Barrier(workers)
+
+        def _worker() -> None:
+            epoch = throttle.epoch  # read before "sending"
+            barrier.wait()
+            throttle.on_throttled(epoch)
+
+        threads = [threading.Thread(target=_worker) for _ in range(workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(limiter.rate, 8.0)
+
+        # A request sent after the decrease still signals a new event.
+        throttle.on_throttled(throttle.epoch)
+        self.assertEqual(limiter.rate, 4.0)
+
+
+class KISClientRetryEngineTests(unittest.TestCase):
+    def setUp(self) -> None:
+        creds = KISCredentials(
+            app_key="test-key",
+            app_secret="test-secret",
+            base_url="https://example.com",
+            env="real",
+        )
+        self.client = KISClient(creds, session=MagicMock(), cache_dir=None)
+        self.client._access_token = "Bearer old"
+        self.client._token_expiry = dt.datetime.now(dt.UTC) + dt.timedelta(hours=1)
+        self.sleeps: list[float] = []
+        self.client._sleep = self.sleeps.append  # type: ignore[method-assign]
+
+    def test_token_expiry_refreshes_and_retries_without_sleeping(self) -> None:
+        ok = _resp(200, {"rt_cd": "0", "output2": [{"stck_bsop_date": "20250102"}]})
+        self.client._request = MagicMock(  # type: ignore[method-assign]
+            side_effect=[_resp(500, {"msg_cd": "EGW00123"}), ok]
+        )
+
+        def _issue() -> None:
+            self.client._access_token = "Bearer new"
+            self.client._token_expiry = dt.datetime.now(dt.UTC) + dt.timedelta(hours=1)
+
+        self.client._issue_token = MagicMock(side_effect=_issue)  # type: ignore[method-assign]
+
+        items = self.client._fetch_candle_chunk(
+            ticker="005930", start_date="20250101", end_date="20250110", adjusted=True
+        )
+
+        self.assertEqual(len(items), 1)
+        self.client._issue_token.assert_called_once()
+        second_headers = self.client._request.call_args_list[1].kwargs["headers"]
+        self.assertEqual(second_headers["authorization"], "Bearer new")
+        self.assertEqual(self.sleeps, [])
+
+    def test_rate_limit_slows_limiter_and_backs_off_once(self) -> None:
+        start_rate = self.client.rate_limiter.rate
+        self.client._request = MagicMock(  # type: ignore[method-assign]
+            side_effect=[
+                _resp(200, {"rt_cd": "1", "msg_cd": "EGW00201", "msg1": "too many"}),
+                _resp(200, {"rt_cd": "0", "output": []}),
+            ]
+        )
+
+        self.client.overseas_holidays(start_date="20250101", end_date="20250131")
+
+        self.assertEqual(self.client._request.call_count, 2)
+        self.assertEqual(len(self.sleeps), 1)
+        self.assertLessEqual(self.sleeps[0], 0.5)
+        self.assertEqual(self.client.rate_limiter.rate, start_rate / 2)
+
+    def test_client_errors_are_retried_and_keep_endpoint_wording(self) -> None:
+        self.client._request = MagicMock(return_value=_resp(404, {}))  # type: ignore[method-assign]
+
+        with self.assertRaises(KISClientError) as ctx:
+            self.client.overseas_holidays(start_date="20250101", end_date="20250131")
+
+        self.assertIn("Overseas holiday HTTP 404", str(ctx.exception))
+        self.assertEqual(self.client._request.call_count, 3)
+        self.assertEqual(len(self.sleeps), 2)
+
+    def test_body_without_rt_cd_is_an_api_error(self) -> None:
+        self.client._request = MagicMock(  # type: ignore[method-assign]
+            return_value=_resp(200, {"output": []})
+        )
+
+        with self.assertRaises(KISClientError) as ctx:
+            self.client.overseas_holidays(start_date="20250101", end_date="20250131")
+
+        self.assertIn("Unknown error", str(ctx.exception))
+        self.client._request.assert_called_once()
+        self.assertEqual(self.sleeps, [])
+
+    def test_api_error_after_exhausting_retries_uses_endpoint_prefix(self) -> None:
+        busy = _resp(200, {"rt_cd": "1", "msg_cd": "EGW00201", "msg1": "busy"})
+        self.client._request = MagicMock(return_value=busy)  # type: ignore[method-assign]
+
+        with self.assertRaises(KISClientError) as ctx:
+            self.client._fetch_overseas_candle_chunk(
+                symbol="AAPL",
+                exchange="NAS",
+                start_date="20250101",
+                end_date="20250110",
+                adjusted=True,
+            )
+
+        self.assertEqual(str(ctx.exception), "KIS overseas error: busy")
+        self.assertEqual(self.client._request.call_count, 3)
+        self.assertEqual(len(self.sleeps), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
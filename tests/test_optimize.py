@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import datetime as dt
+import random
+from pathlib import Path
+from typing import Any
+
+import pytest
+import sab.signals.indicator_state as indicator_state
+from sab.data.candle_series import as_candle_series
+from sab.report.optimize_report import write_optimize_report
+from sab.signals.backtest import backtest_ticker
+from sab.signals.hybrid_buy import HybridEvaluationSettings
+from sab.signals.hybrid_sell import HybridSellSettings
+from sab.signals.optimize import (
+    SweepResult,
+    apply_params,
+    grid,
+    parse_param,
+    rank,
+    resolve_param,
+    run_sweep,
+    sample,
+)
+
+
+def _rows(seed: int, n: int) -> list[dict[str, Any]]:
+    rng = random.Random(seed)
+    start = dt.date(2022, 1, 3)
+    price, rows = 100.0, []
+    for i in range(n):
+        price = max(1.0, price * (1 + rng.gauss(0.001, 0.03)))
+        close = round(price, 2)
+        rows.append(
+            {
+                "date": (start + dt.timedelta(days=i)).strftime("%Y%m%d"),
+                "open": round(close * (1 + rng.gauss(0, 0.01)), 2),
+                "high": round(close * 1.02, 2),
+                "low": round(close * 0.98, 2),
+                "close": close,
+                "volume": float(rng.randint(10_000, 500_000)),
+                "prev_close_diff": 0.0,
+            }
+        )
+    return rows
+
+
+def _buy() -> HybridEvaluationSettings:
+    return HybridEvaluationSettings(
+        sma_trend_period=20,
+        ema_short_period=10,
+        ema_mid_period=21,
+        rsi_period=14,
+        rsi_zone_low=45.0,
+        rsi_zone_high=60.0,
+        rsi_oversold_low=30.0,
+        rsi_oversold_high=40.0,
+        pullback_max_bars=10,
+        breakout_consolidation_min_bars=5,
+        breakout_consolidation_max_bars=20,
+        volume_lookback_days=20,
+        max_gap_pct=0.5,
+        use_sma60_filter=False,
+        sma60_period=60,
+        kr_breakout_requires_confirmation=False,
+        gap_atr_multiplier=0.0,
+        min_history_bars=60,
+        min_price=0.0,
+        us_min_price=None,
+        min_dollar_volume=0.0,
+        us_min_dollar_volume=None,
+        exclude_etf_etn=False,
+    )
+
+
+SPACE = {
+    "rsi_zone_low": (40.0, 50.0),
+    "sell.profit_target_high": (0.08, 0.15),
+    "sell.ema_mid_period": (21, 30),
+}
+
+
+def _items() -> list[tuple[str, Any, dict[str, Any]]]:
+    meta = {"currency": "KRW", "data_source": "pykrx"}
+    return [(f"{s:06d}", as_candle_series(_rows(s, 220)), meta) for s in range(6)]
+
+
+def test_param_names_and_parsing() -> None:
+    buy, sell = _buy(), HybridSellSettings()
+    assert resolve_param("rsi_zone_low") == ("buy", "rsi_zone_low")
+    assert resolve_param("ema_mid_period") == ("buy", "ema_mid_period")
+    assert resolve_param("sell.ema_mid_period") == ("sell", "ema_mid_period")
+    assert resolve_param("stop_loss_pct_max") == ("sell", "stop_loss_pct_max")
+    with pytest.raises(ValueError):
+        resolve_param("buy.stop_loss_pct_max")
+    assert parse_param("pullback_max_bars=5,10,5", buy, sell) == (
+        "pullback_max_bars",
+        (5, 10),
+    )
+    assert parse_param("us_min_price=5", buy, sell) == ("us_min_price", (5.0,))
+    assert parse_param("use_sma60_filter=true,false", buy, sell)[1] == (True, False)
+    with pytest.raises(ValueError):
+        parse_param("rsi_zone_low", buy, sell)
+
+
+def test_grid_and_sample() -> None:
+    combos = grid(SPACE)
+    assert len(combos) == 8
+    assert combos[1] == {
+        "rsi_zone_low": 40.0,
+        "sell.profit_target_high": 0.08,
+        "sell.ema_mid_period": 30,
+    }
+    picked = sample(SPACE, 3, seed=7)
+    assert picked == sample(SPACE, 3, seed=7)
+    assert len(picked) == 3 and all(p in combos for p in picked)
+    assert picked == [c for c in combos if c in picked]
+    assert sample(SPACE, 50) == combos
+
+
+def test_sweep_tallies_backtest_outcomes() -> None:
+    items = _items()
+    buy, sell = _buy(), HybridSellSettings()
+    combos = grid(SPACE)
+
+    results = run_sweep(items, buy, sell, combos, workers=1)
+
+    params = combos[5]
+    b, s = apply_params(buy, sell, params)
+    expected = SweepResult(params)
+    for ticker, candles, meta in items:
+        expected.add(backtest_ticker(ticker, candles, b, s, meta))
+    assert results[5] == expected
+    assert expected.closed > 0
+
+
+def test_parallel_sweep_matches_serial() -> None:
+    items = _items()
+    buy, sell = _buy(), HybridSellSettings()
+    combos = grid(SPACE)
+
+    serial = run_sweep(items, buy, sell, combos, workers=1)
+    parallel = run_sweep(items, buy, sell, combos, workers=2)
+
+    assert [(r.params, r.signals, r.closed, r.wins) for r in parallel] == [
+        (r.params, r.signals, r.closed, r.wins) for r in serial
+    ]
+    for a, b in zip(parallel, serial, strict=True):
+        assert a.total_return == pytest.approx(b.total_return)
+
+
+def test_combinations_share_indicator_series(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[int] = []
+    real_ema = indicator_state.ema
+
+    def counting_ema(values: Any, period: int) -> list[float]:
+        calls.append(period)
+        return real_ema(values, period)
+
+    monkeypatch.setattr(indicator_state, "ema", counting_ema)
+    items = _items()[:1]
+
+    run_sweep(items, _buy(), HybridSellSettings(), grid(SPACE), workers=1)
+
+    # Buy EMAs on the hybrid columns; sell EMAs once per distinct period.
+    assert sorted(calls) == [10, 10, 21, 21, 30]
+
+
+def test_rank_and_report(tmp_path: Path) -> None:
+    good = SweepResult({"x": 1}, signals=6, closed=6, wins=4, total_return=0.3)
+    thin = SweepResult({"x": 2}, signals=1, closed=1, wins=1, total_return=0.2)
+    bad = SweepResult(
+        {"x": 3}, signals=8, closed=8, wins=2, total_return=-0.1, gross_loss=0.3
+    )
+    ranked = rank([bad, thin, good], min_trades=5)
+    assert [r.params["x"] for r in ranked] == [1, 3, 2]
+
+    path = write_optimize_report(
+        report_dir=str(tmp_path),
+        universe_count=3,
+        results=ranked,
+        search="grid",
+        max_hold_bars=60,
+        min_trades=5,
+        top=2,
+    )
+
+    text = Path(path).read_text(encoding="utf-8")
+    assert path.endswith(".optimize.md")
+    assert "## Top 2" in text and "| 1 | 1 | 6 | 6 | 67% | +5.00% |" in text
+    csv_lines = Path(path[: -len(".md")] + ".csv").read_text().splitlines()
+    assert csv_lines[0] == (
+        "rank,x,signals,closed,wins,hit_rate,expectancy,profit_factor"
+    )
+    assert len(csv_lines) == 4
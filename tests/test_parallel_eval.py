@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import datetime as dt
+import random
+from typing import Any
+
+import pytest
+from sab.data.candle_series import as_candle_series
+from sab.signals.evaluator import EvaluationSettings, evaluate_ticker
+from sab.signals.hybrid_buy import HybridEvaluationSettings, evaluate_ticker_hybrid
+from sab.signals.parallel_eval import evaluate_in_processes
+
+
+def _rows(seed: int, n: int) -> list[dict[str, Any]]:
+    rng = random.Random(seed)
+    start = dt.date(2023, 1, 2)
+    price = 100.0
+    rows = []
+    for i in range(n):
+        price = max(1.0, price * (1 + rng.gauss(0.001, 0.03)))
+        close = round(price, 2)
+        rows.append(
+            {
+                "date": (start + dt.timedelta(days=i)).strftime("%Y%m%d"),
+                "open": round(close * (1 + rng.gauss(0, 0.01)), 2),
+                "high": round(close * 1.02, 2),
+                "low": round(close * 0.98, 2),
+                "close": close,
+                "volume": float(rng.randint(10_000, 500_000)),
+                "prev_close_diff": 0.0,
+            }
+        )
+    return rows
+
+
+def _items(tmp_path: Any) -> list[tuple[str, Any, dict[str, Any]]]:
+    meta = {"currency": "KRW", "data_source": "pykrx", "data_dir": str(tmp_path)}
+    items: list[tuple[str, Any, dict[str, Any]]] = []
+    for seed in range(24):
+        rows = _rows(seed, 140 + seed)
+        items.append((f"{seed:06d}", as_candle_series(rows), dict(meta)))
+    odd = _rows(99, 150)
+    odd[0]["note"] = "kept as dicts"
+    items.append(("999999", odd, dict(meta)))
+    return items
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_results_match_serial_evaluation(tmp_path: Any, workers: int) -> None:
+    items = _items(tmp_path)
+    settings = EvaluationSettings(min_history_bars=150, gap_atr_multiplier=0)
+
+    expected = [evaluate_ticker(t, c, settings, m) for t, c, m in items]
+    got = evaluate_in_processes(items, settings, workers=workers)
+
+    assert got == expected
+    assert [r.ticker for r in got] == [t for t, _, _ in items]
+
+
+def test_hybrid_settings_select_the_hybrid_evaluator(tmp_path: Any) -> None:
+    items = _items(tmp_path)
+    settings = HybridEvaluationSettings(
+        sma_trend_period=20,
+        ema_short_period=10,
+        ema_mid_period=21,
+        rsi_period=14,
+        rsi_zone_low=0.0,
+        rsi_zone_high=100.0,
+        rsi_oversold_low=0.0,
+        rsi_oversold_high=100.0,
+        pullback_max_bars=10,
+        breakout_consolidation_min_bars=5,
+        breakout_consolidation_max_bars=20,
+        volume_lookback_days=20,
+        max_gap_pct=0.5,
+        use_sma60_filter=False,
+        sma60_period=60,
+        kr_breakout_requires_confirmation=False,
+        gap_atr_multiplier=0.0,
+        min_history_bars=120,
+        min_price=0.0,
+        us_min_price=0.0,
+        min_dollar_volume=0.0,
+        us_min_dollar_volume=0.0,
+        exclude_etf_etn=False,
+    )
+
+    expected = [evaluate_ticker_hybrid(t, c, settings, m) for t, c, m in items]
+    got = evaluate_in_processes(items, settings, workers=2)
+
+    assert got == expected
+    assert any(r.candidate for r in got)
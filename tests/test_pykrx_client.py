@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import datetime as dt
+import math
+from pathlib import Path
+from typing import Any
+
+import pytest
+import sab.data.pykrx_client as pykrx_client
+from sab.data.candle_series import CandleSeries
+from sab.data.pykrx_client import PykrxClient, frame_candles
+
+pd = pytest.importorskip("pandas")
+
+
+def _frame(start: dt.date, closes: list[float], *, bump: float = 0.0) -> Any:
+    index = pd.DatetimeIndex([start + dt.timedelta(days=i) for i in range(len(closes))])
+    return pd.DataFrame(
+        {
+            "시가": [c - 1 for c in closes],
+            "고가": [c + 2 for c in closes],
+            "저가": [c - 2 for c in closes],
+            "종가": [c + bump for c in closes],
+            "거래량": [1000 + i for i in range(len(closes))],
+        },
+        index=index,
+    )
+
+
+class _Stock:
+    """Serves one ticker's history, sliced to the requested dates."""
+
+    def __init__(self, frame: Any) -> None:
+        self.frame = frame
+        self.calls: list[tuple[str, str]] = []
+
+    def get_market_ohlcv_by_date(
+        self, start: str, end: str, ticker: str, adjusted: bool = True
+    ) -> Any:
+        self.calls.append((start, end))
+        dates = self.frame.index.strftime("%Y%m%d")
+        return self.frame[(dates >= start) & (dates <= end)]
+
+
+def _client(monkeypatch: pytest.MonkeyPatch, stock: _Stock, cache_dir: str) -> Any:
+    monkeypatch.setattr(pykrx_client, "_import_pykrx_stock", lambda: stock)
+    return PykrxClient(cache_dir=cache_dir)
+
+
+def test_frame_conversion_matches_row_values() -> None:
+    frame = _frame(dt.date(2025, 1, 2), [100.0, 0.0, 103.0, 101.5])
+    frame["거래량"] = frame["거래량"].astype(object)
+    frame.loc[frame.index[2], "거래량"] = "1,234"
+
+    candles = frame_candles(frame.iloc[::-1])
+
+    assert isinstance(candles, CandleSeries)
+    assert candles.dates() == ["20250102", "20250103", "20250104", "20250105"]
+    assert candles[0]["open"] == 99.0 and candles[3]["high"] == 103.5
+    assert candles[2]["volume"] == 1234.0
+    diffs = candles.values("prev_close_diff")
+    assert math.isnan(diffs[0]) and diffs[1] == -100.0
+    assert math.isnan(diffs[2])  # previous close of zero
+    assert diffs[3] == -1.5
+
+
+def test_cache_fetches_only_from_the_cached_tail(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    today = dt.date.today()
+    start = today - dt.timedelta(days=9)
+    closes = [100.0 + i for i in range(10)]
+    stock = _Stock(_frame(start, closes[:8]))
+    client = _client(monkeypatch, stock, str(tmp_path))
+
+    first = client.daily_candles("005930", count=5)
+    assert [c["close"] for c in first] == closes[3:8]
+    assert len(stock.calls) == 1
+
+    stock.frame = _frame(start, closes)
+    second = client.daily_candles("005930", count=5)
+
+    assert [c["close"] for c in second] == closes[5:]
+    tail_start = (start + dt.timedelta(days=6)).strftime("%Y%m%d")
+    assert stock.calls[1][0] == tail_start
+    assert len(stock.calls) == 2
+    assert second[-1]["prev_close_diff"] == 1.0
+    cached = client._store.load(pykrx_client.pykrx_cache_key("005930"))
+    assert cached is not None and [c["close"] for c in cached] == closes[5:]
+
+
+def test_revised_prices_trigger_a_full_fetch(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    start = dt.date.today() - dt.timedelta(days=5)
+    stock = _Stock(_frame(start, [10.0, 11.0, 12.0, 13.0]))
+    client = _client(monkeypatch, stock, str(tmp_path))
+    client.daily_candles("000660", count=3)
+
+    stock.frame = _frame(start, [10.0, 11.0, 12.0, 13.0, 14.0], bump=0.5)
+    candles = client.daily_candles("000660", count=3)
+
+    assert [c["close"] for c in candles] == [12.5, 13.5, 14.5]
+    assert len(stock.calls) == 3
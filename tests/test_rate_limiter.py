@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from pathlib import Path
+
+import pytest
+from sab.data.rate_limiter import (
+    KIS_RATE_LIMITS,
+    RateLimiter,
+    SharedRateLimiter,
+    kis_rate_limiter,
+    shared_state_path,
+)
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.lock = threading.Lock()
+
+    def __call__(self) -> float:
+        with self.lock:
+            return self.now
+
+    def sleep(self, seconds: float) -> None:
+        # Sleeping does not advance the shared clock; waits are only recorded.
+        pass
+
+
+def test_acquire_spaces_requests_at_configured_rate() -> None:
+    clock = _FakeClock()
+    limiter = RateLimiter(10.0, clock=clock, sleep=clock.sleep)
+
+    waits = [limiter.acquire() for _ in range(4)]
+
+    assert waits == pytest.approx([0.0, 0.1, 0.2, 0.3])
+
+
+def test_idle_time_refills_up_to_burst() -> None:
+    clock = _FakeClock()
+    limiter = RateLimiter(2.0, burst=2.0, clock=clock, sleep=clock.sleep)
+    limiter.acquire()
+    limiter.acquire()
+
+    clock.now = 10.0
+
+    assert limiter.acquire() == 0.0
+    assert limiter.acquire() == 0.0
+    assert limiter.acquire() == 0.5
+
+
+def test_concurrent_reservations_do_not_overlap() -> None:
+    clock = _FakeClock()
+    limiter = RateLimiter(5.0, clock=clock, sleep=clock.sleep)
+    waits: list[float] = []
+    waits_lock = threading.Lock()
+
+    def worker() -> None:
+        wait = limiter.acquire()
+        with waits_lock:
+            waits.append(wait)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    slots = sorted(round(w, 6) for w in waits)
+    assert slots == [round(i * 0.2, 6) for i in range(8)]
+
+
+def test_kis_rate_limiter_uses_stricter_of_interval_and_ceiling() -> None:
+    assert kis_rate_limiter("real", 0.5).rate == 2.0
+    assert kis_rate_limiter("real", 0.01).rate == KIS_RATE_LIMITS["real"]
+    assert kis_rate_limiter("demo", None).rate == KIS_RATE_LIMITS["demo"]
+
+
+def test_shared_limiter_schedules_across_instances(tmp_path: Path) -> None:
+    clock = _FakeClock()
+    clock.now = 1_000.0
+    state = shared_state_path(str(tmp_path), "real", "secret-app-key")
+    # Two instances stand in for two processes sharing one app key.
+    first = SharedRateLimiter(state, 4.0, clock=clock, sleep=clock.sleep)
+    second = SharedRateLimiter(state, 4.0, clock=clock, sleep=clock.sleep)
+
+    waits = [first.acquire(), second.acquire(), first.acquire(), second.acquire()]
+
+    assert waits == pytest.approx([0.0, 0.25, 0.5, 0.75])
+    assert "secret-app-key" not in state
+    assert os.path.exists(state)
+
+
+def test_shared_limiter_recovers_from_corrupt_or_future_state(tmp_path: Path) -> None:
+    clock = _FakeClock()
+    clock.now = 50.0
+    state = str(tmp_path / "kis_rate.json")
+    limiter = SharedRateLimiter(state, 2.0, clock=clock, sleep=clock.sleep)
+
+    Path(state).write_text("{not json", encoding="utf-8")
+    assert limiter.acquire() == 0.0
+
+    Path(state).write_text(json.dumps({"tat": 10_000.0}), encoding="utf-8")
+    assert limiter.acquire() == 0.0
+
+
+def test_kis_rate_limiter_returns_shared_limiter_with_state_dir(
+    tmp_path: Path,
+) -> None:
+    limiter = kis_rate_limiter("demo", 0.5, state_dir=str(tmp_path), app_key="app-key")
+
+    assert isinstance(limiter, SharedRateLimiter)
+    assert limiter.state_path == shared_state_path(str(tmp_path), "demo", "app-key")
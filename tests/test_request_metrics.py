@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import datetime as dt
+import json
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+import requests  # type: ignore[import-untyped]
+from sab.data.kis_client import KISClient, KISCredentials
+from sab.data.request_metrics import RequestMetrics, write_run_metrics
+from sab.report.markdown import write_report
+
+
+def test_records_latency_histogram_status_and_retries() -> None:
+    metrics = RequestMetrics()
+    metrics.record_request("TR1", latency_s=0.04, status=200, throttle_wait_s=0.1)
+    metrics.record_request("TR1", latency_s=0.3, status=200)
+    metrics.record_request("TR1", latency_s=7.0, status=None)
+    metrics.record_retry("TR1", "rate_limited", 0.75)
+
+    data = metrics.snapshot()["endpoints"]["TR1"]
+
+    assert data["calls"] == 3
+    assert data["transport_errors"] == 1
+    assert data["status_counts"] == {"200": 2}
+    assert data["retries"] == {"rate_limited": 1}
+    assert data["latency_ms"]["histogram"] == [1, 0, 0, 1, 0, 0, 0, 1]
+    assert data["latency_ms"]["p50_le"] == 500
+    assert data["latency_ms"]["p95_le"] is None
+    assert data["throttle_wait_s"] == pytest.approx(0.1)
+    assert data["backoff_sleep_s"] == pytest.approx(0.75)
+
+
+def test_summary_and_run_file(tmp_path: Path) -> None:
+    metrics = RequestMetrics()
+    assert metrics.summary_lines() == []
+    metrics.record_request("FHKST03010100", latency_s=0.08, status=200)
+    metrics.record_retry("FHKST03010100", "server_error", 0.5)
+
+    lines = metrics.summary_lines()
+    path = write_run_metrics(
+        str(tmp_path), "scan", metrics, extra={"settings": {"kis_concurrency": 4}}
+    )
+
+    assert lines[0].startswith("Total: 1 calls, 1 retries")
+    assert "FHKST03010100: 1 calls" in lines[1]
+    assert "retries server_error=1" in lines[1]
+    assert Path(path).parent == tmp_path / "metrics"
+    payload = json.loads(Path(path).read_text(encoding="utf-8"))
+    assert payload["command"] == "scan"
+    assert payload["settings"] == {"kis_concurrency": 4}
+    assert payload["totals"]["calls"] == 1
+
+
+def test_client_request_records_per_tr_id() -> None:
+    session = MagicMock()
+    resp = MagicMock()
+    resp.status_code = 200
+    session.request.side_effect = [resp, requests.ConnectionError("down")]
+    creds = KISCredentials(
+        app_key="k", app_secret="s", base_url="https://example.com", env="real"
+    )
+    client = KISClient(creds, session=session, cache_dir=None)
+    client._access_token = "Bearer t"
+    client._token_expiry = dt.datetime.now(dt.UTC) + dt.timedelta(hours=1)
+
+    client._request("GET", "https://example.com/x", headers={"tr_id": "TRX"})
+    with pytest.raises(requests.ConnectionError):
+        client._request("POST", "https://example.com/oauth2/tokenP")
+
+    endpoints = client.metrics.snapshot()["endpoints"]
+    assert endpoints["TRX"]["status_counts"] == {"200": 1}
+    assert endpoints["tokenP"]["transport_errors"] == 1
+
+
+def test_report_appendix_lists_metrics(tmp_path: Path) -> None:
+    out = write_report(
+        report_dir=str(tmp_path),
+        provider="kis",
+        universe_count=0,
+        candidates=[],
+        metrics_summary=["Total: 3 calls, 0 retries"],
+    )
+
+    content = Path(out).read_text(encoding="utf-8")
+    assert "### Appendix — API Metrics" in content
+    assert "- Total: 3 calls, 0 retries" in content
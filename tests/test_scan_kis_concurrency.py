@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import replace
+from pathlib import Path
+from typing import Any
+
+from sab.config import Config
+from sab.data.candle_store import open_candle_store
+from sab.data.kis_client import KISClientError
+from sab.scan import _collect_market_data_from_kis, _ScanRuntime
+
+
+def _candles(last_close: float) -> list[dict[str, Any]]:
+    return [
+        {"date": "20250102", "close": last_close - 1.0},
+        {"date": "20250103", "close": last_close},
+    ]
+
+
+class _SlowKISClient:
+    """Finishes later tickers first to expose any ordering dependence."""
+
+    def __init__(self, delays: dict[str, float], failing: set[str]) -> None:
+        self.delays = delays
+        self.failing = failing
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def daily_candles(
+        self, symbol: str, *, count: int, cached: Any = None
+    ) -> list[dict[str, Any]]:
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(self.delays.get(symbol, 0.0))
+            if symbol in self.failing:
+                raise KISClientError(f"boom {symbol}")
+            return _candles(float(len(symbol)))
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def test_concurrent_collection_records_results_in_ticker_order(
+    tmp_path: Path,
+) -> None:
+    tickers = ["000001", "000002", "000003", "000004"]
+    cfg = replace(Config(), data_dir=str(tmp_path), kis_concurrency=4)
+    client = _SlowKISClient(
+        delays={"000001": 0.15, "000002": 0.1, "000003": 0.05},
+        failing={"000001", "000003"},
+    )
+    runtime = _ScanRuntime(
+        cfg=cfg, logger=logging.getLogger("test"), tickers=list(tickers)
+    )
+    runtime.kis_client = client  # type: ignore[assignment]
+    runtime.pykrx_import_error = "pykrx missing"
+
+    _collect_market_data_from_kis(runtime)
+
+    assert client.peak > 1
+    assert runtime.failures == [
+        "000001: boom 000001 (pykrx missing)",
+        "000003: boom 000003 (pykrx missing)",
+    ]
+    assert list(runtime.market_data) == ["000002", "000004"]
+    assert open_candle_store(str(tmp_path)).load("candles_000002") == _candles(6.0)
+    assert runtime.latest_dates == {"000002": "20250103", "000004": "20250103"}
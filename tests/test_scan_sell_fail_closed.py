@@ -74,11 +74,13 @@ class _FakeKISClient:
         pass
 
     def overseas_daily_candles(
-        self, *, symbol: str, exchange: str, count: int
+        self, *, symbol: str, exchange: str, count: int, cached: object = None
     ) -> list[dict[str, float | str]]:
         return _build_candles()
 
-    def daily_candles(self, symbol: str, *, count: int) -> list[dict[str, float | str]]:
+    def daily_candles(
+        self, symbol: str, *, count: int, cached: object = None
+    ) -> list[dict[str, float | str]]:
         return _build_candles()
 
 
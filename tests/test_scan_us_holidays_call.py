@@ -37,14 +37,16 @@ class RunScanUSHolidayCallTests(unittest.TestCase):
                     return_value=[{"TRD_DT": "20250101", "open_yn": "N"}],
                 ) as mock_holidays,
             ):
-                run_scan(
-                    limit=None,
-                    watchlist_path=None,
-                    provider=None,
-                    screener_limit=None,
-                    universe="watchlist",
-                )
+                for _ in range(2):
+                    run_scan(
+                        limit=None,
+                        watchlist_path=None,
+                        provider=None,
+                        screener_limit=None,
+                        universe="watchlist",
+                    )
 
+            # The second scan reuses the fresh holiday cache.
             mock_holidays.assert_called_once()
             kwargs = mock_holidays.call_args.kwargs
             self.assertEqual(kwargs.get("country_code"), "US")
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import datetime as dt
+import json
+import os
+from pathlib import Path
+
+from sab.data.holiday_cache import HolidayEntry
+from sab.data.trading_calendar import TradingCalendar, trading_calendar
+
+
+def _calendar(*closed: str) -> TradingCalendar:
+    return TradingCalendar(
+        "US", {d: HolidayEntry(date=d, note="x", is_open=False) for d in closed}
+    )
+
+
+def _naive_sessions(calendar: TradingCalendar, start: dt.date, end: dt.date) -> int:
+    days = (end - start).days + 1
+    return sum(
+        1
+        for n in range(days)
+        if (day := start + dt.timedelta(days=n)).weekday() < 5
+        and not calendar.is_holiday(day)
+    )
+
+
+def test_session_queries_skip_weekends_and_closures() -> None:
+    calendar = _calendar("20250101", "20250120", "20241225")
+
+    assert calendar.is_session(dt.date(2025, 1, 2))
+    assert not calendar.is_session(dt.date(2025, 1, 1))
+    assert not calendar.is_session(dt.date(2025, 1, 18))  # Saturday
+    assert calendar.previous_session(dt.date(2025, 1, 21)) == dt.date(2025, 1, 17)
+    assert calendar.next_session(dt.date(2025, 1, 17)) == dt.date(2025, 1, 21)
+    # Across the year boundary in both directions.
+    assert calendar.previous_session(dt.date(2025, 1, 2)) == dt.date(2024, 12, 31)
+    assert calendar.next_session(dt.date(2024, 12, 31)) == dt.date(2025, 1, 2)
+    assert calendar.sessions_between(dt.date(2025, 1, 20), dt.date(2025, 1, 17)) == 0
+
+    start = dt.date(2023, 11, 15)
+    for end in (dt.date(2023, 11, 15), dt.date(2024, 12, 24), dt.date(2025, 2, 3)):
+        expected = _naive_sessions(calendar, start, end)
+        assert calendar.sessions_between(start, end) == expected
+
+
+def test_cache_entries_override_builtin_closures(tmp_path: Path) -> None:
+    (tmp_path / "holidays_us.json").write_text(
+        json.dumps(
+            {
+                "20250127": {"note": "Custom Closure", "is_open": False},
+                "20250120": {"note": "Open anyway", "is_open": True},
+            }
+        ),
+        encoding="utf-8",
+    )
+
+    calendar = trading_calendar("US", str(tmp_path))
+
+    assert not calendar.is_session(dt.date(2025, 1, 27))
+    assert calendar.is_session(dt.date(2025, 1, 20))  # MLK Day in the built-ins
+    assert not calendar.is_session(dt.date(2025, 12, 25))
+    entry = calendar.holiday(dt.date(2025, 12, 25))
+    assert entry is not None and entry.note == "Christmas"
+
+
+def test_calendar_is_memoized_until_the_cache_changes(tmp_path: Path) -> None:
+    path = tmp_path / "holidays_us.json"
+    path.write_text("{}", encoding="utf-8")
+
+    first = trading_calendar("US", str(tmp_path))
+    assert trading_calendar("us", str(tmp_path)) is first
+    assert first.is_session(dt.date(2025, 3, 3))
+
+    path.write_text(
+        json.dumps({"20250303": {"note": "Closure", "is_open": False}}),
+        encoding="utf-8",
+    )
+    os.utime(path, ns=(1, 1))
+
+    second = trading_calendar("US", str(tmp_path))
+    assert second is not first
+    assert not second.is_session(dt.date(2025, 3, 3))
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import datetime as dt
+import random
+from pathlib import Path
+from typing import Any
+
+import pytest
+from sab.data.candle_series import as_candle_series, candle_dates
+from sab.report.walkforward_report import write_walkforward_report
+from sab.signals.backtest import backtest_ticker
+from sab.signals.hybrid_buy import HybridEvaluationSettings
+from sab.signals.hybrid_sell import HybridSellSettings
+from sab.signals.optimize import SweepResult, apply_params, grid
+from sab.signals.walkforward import (
+    Window,
+    WindowTally,
+    make_windows,
+    out_of_sample,
+    run_walkforward,
+    select,
+)
+
+
+def _rows(seed: int, n: int) -> list[dict[str, Any]]:
+    rng = random.Random(seed)
+    start = dt.date(2021, 1, 4)
+    price, rows = 100.0, []
+    for i in range(n):
+        price = max(1.0, price * (1 + rng.gauss(0.001, 0.03)))
+        close = round(price, 2)
+        rows.append(
+            {
+                "date": (start + dt.timedelta(days=i)).strftime("%Y%m%d"),
+                "open": round(close * (1 + rng.gauss(0, 0.01)), 2),
+                "high": round(close * 1.02, 2),
+                "low": round(close * 0.98, 2),
+                "close": close,
+                "volume": float(rng.randint(10_000, 500_000)),
+                "prev_close_diff": 0.0,
+            }
+        )
+    return rows
+
+
+def _buy() -> HybridEvaluationSettings:
+    return HybridEvaluationSettings(
+        sma_trend_period=20,
+        ema_short_period=10,
+        ema_mid_period=21,
+        rsi_period=14,
+        rsi_zone_low=45.0,
+        rsi_zone_high=60.0,
+        rsi_oversold_low=30.0,
+        rsi_oversold_high=40.0,
+        pullback_max_bars=10,
+        breakout_consolidation_min_bars=5,
+        breakout_consolidation_max_bars=20,
+        volume_lookback_days=20,
+        max_gap_pct=0.5,
+        use_sma60_filter=False,
+        sma60_period=60,
+        kr_breakout_requires_confirmation=False,
+        gap_atr_multiplier=0.0,
+        min_history_bars=60,
+        min_price=0.0,
+        us_min_price=None,
+        min_dollar_volume=0.0,
+        us_min_dollar_volume=None,
+        exclude_etf_etn=False,
+    )
+
+
+SPACE = {"rsi_zone_low": (40.0, 50.0), "sell.profit_target_high": (0.08, 0.15)}
+
+
+def _items() -> list[tuple[str, Any, dict[str, Any]]]:
+    meta = {"currency": "KRW", "data_source": "pykrx"}
+    return [(f"{s:06d}", as_candle_series(_rows(s, 300)), meta) for s in range(4)]
+
+
+def _windows(items: list[tuple[str, Any, dict[str, Any]]]) -> list[Window]:
+    dates = [d for _, candles, _ in items for d in candle_dates(candles)]
+    return make_windows(dates, train_bars=120, test_bars=60)
+
+
+def test_make_windows_rolls_over_the_calendar() -> None:
+    dates = [f"202401{d:02d}" for d in range(1, 11)]
+
+    windows = make_windows(dates + dates[:3], train_bars=4, test_bars=3)
+
+    assert windows == [
+        Window("20240101", "20240104", "20240105", "20240107"),
+        Window("20240104", "20240107", "20240108", "20240110"),
+    ]
+    assert make_windows(dates, 4, 3, step_bars=5)[-1] == Window(
+        "20240106", "20240109", "20240110", "20240110"
+    )
+    with pytest.raises(ValueError):
+        make_windows(dates, 0, 3)
+
+
+def test_window_tallies_filter_the_full_replay() -> None:
+    items = _items()
+    windows = _windows(items)
+    buy, sell = _buy(), HybridSellSettings()
+    combos = grid(SPACE)
+
+    tallies = run_walkforward(items, buy, sell, combos, windows, workers=1)
+
+    b, s = apply_params(buy, sell, combos[2])
+    outcomes = [o for t, c, m in items for o in backtest_ticker(t, c, b, s, m)]
+    for tally in tallies:
+        w = tally.window
+        test = SweepResult(combos[2])
+        test.add(o for o in outcomes if w.test_start <= o.signal_date <= w.test_end)
+        assert tally.test[2] == test
+        train = [o for o in outcomes if w.train_start <= o.signal_date <= w.train_end]
+        seen = [o for o in train if o.status == "closed" and o.exit_date <= w.train_end]
+        assert tally.train[2].signals == len(train)
+        assert tally.train[2].closed == len(seen)
+    assert sum(t.test[2].closed for t in tallies) > 0
+
+
+def test_parallel_windows_match_serial() -> None:
+    items = _items()
+    windows = _windows(items)
+    buy, sell = _buy(), HybridSellSettings()
+    combos = grid(SPACE)
+
+    serial = run_walkforward(items, buy, sell, combos, windows, workers=1)
+    parallel = run_walkforward(items, buy, sell, combos, windows, workers=2)
+
+    def counts(tallies: list[WindowTally]) -> list[Any]:
+        return [
+            [(r.signals, r.closed, r.wins) for r in t.train + t.test] for t in tallies
+        ]
+
+    assert counts(parallel) == counts(serial)
+
+
+def test_select_scores_the_best_train_combination(tmp_path: Path) -> None:
+    window = Window("20240101", "20240630", "20240701", "20241231")
+    good = SweepResult({"x": 1}, signals=5, closed=5, wins=4, total_return=0.2)
+    poor = SweepResult({"x": 2}, signals=5, closed=5, wins=1, total_return=-0.1)
+    tally = WindowTally(
+        window,
+        [poor, good],
+        [
+            SweepResult({"x": 2}, signals=3, closed=3, wins=3, total_return=0.3),
+            SweepResult({"x": 1}, signals=2, closed=2, wins=1, total_return=0.01),
+        ],
+    )
+
+    selections = select([tally, tally], min_trades=3)
+
+    assert [s.train.params for s in selections] == [{"x": 1}, {"x": 1}]
+    oos = out_of_sample(selections)
+    assert (oos.closed, oos.wins) == (4, 2)
+
+    path = write_walkforward_report(
+        report_dir=str(tmp_path),
+        universe_count=2,
+        selections=selections,
+        search="grid",
+        combinations=2,
+        train_bars=120,
+        test_bars=60,
+        step_bars=60,
+        max_hold_bars=60,
+        min_trades=3,
+    )
+    text = Path(path).read_text(encoding="utf-8")
+    assert path.endswith(".walkforward.md")
+    assert "| 2 | 4 | 4 | 50% | +0.50% | - |" in text
+    assert "- Distinct selections: 1 of 2 windows" in text
+    assert "| 1 | 20240101–20240630 | 20240701–20241231 | x=1 |" in text
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from sab.data import cache
+from sab.data.cache import configure_cache_writes, load_json, save_json
+from sab.utils import write_behind
+from sab.utils.write_behind import WriteBehindWriter
+
+
+@pytest.fixture(autouse=True)
+def _reset_cache_writes() -> Iterator[None]:
+    yield
+    configure_cache_writes(write_behind=False, fsync=True)
+
+
+def test_coalesces_and_commits_batch_with_one_directory_fsync(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    writes: list[str] = []
+    dir_syncs: list[str] = []
+    real_write = write_behind.atomic_write_bytes
+
+    def _write(path: str, payload: bytes, *, fsync: bool = True) -> None:
+        writes.append(path)
+        real_write(path, payload, fsync=fsync)
+
+    monkeypatch.setattr(write_behind, "atomic_write_bytes", _write)
+    monkeypatch.setattr(write_behind, "fsync_directory", dir_syncs.append)
+    writer = WriteBehindWriter(fsync=True, linger=30.0)
+    target = tmp_path / "a.json"
+
+    writer.submit(str(target), b"1")
+    writer.submit(str(target), b"2")
+    writer.submit(str(tmp_path / "b.json"), b"3")
+    assert writer.lookup(str(target)) == (True, b"2")
+    writer.flush()
+
+    assert target.read_bytes() == b"2"
+    assert (tmp_path / "b.json").read_bytes() == b"3"
+    assert sorted(Path(p).name for p in writes) == ["a.json", "b.json"]
+    assert dir_syncs == [str(tmp_path)]
+    assert writer.lookup(str(target)) == (False, None)
+    writer.close()
+
+
+def test_queued_delete_removes_file(tmp_path: Path) -> None:
+    target = tmp_path / "old.json"
+    target.write_text("{}", encoding="utf-8")
+    writer = WriteBehindWriter(fsync=False)
+
+    writer.submit(str(target), None)
+    writer.close()
+
+    assert not target.exists()
+
+
+def test_load_json_sees_queued_save(tmp_path: Path) -> None:
+    configure_cache_writes(write_behind=True, fsync=False)
+    assert cache._WRITER is not None
+    cache._WRITER.linger = 30.0
+
+    save_json(str(tmp_path), "fx", {"rate": 1300.0})
+
+    assert load_json(str(tmp_path), "fx") == {"rate": 1300.0}
+    cache.flush_cache_writes()
+    assert json.loads((tmp_path / "fx.json").read_text("utf-8")) == {"rate": 1300.0}
+
+
+def test_pending_writes_flush_at_exit(tmp_path: Path) -> None:
+    script = (
+        "from sab.data import cache\n"
+        "cache.configure_cache_writes(write_behind=True, fsync=False)\n"
+        "cache._WRITER.linger = 30.0\n"
+        f"cache.save_json({str(tmp_path)!r}, 'k', [1, 2])\n"
+        "raise SystemExit(3)\n"
+    )
+    result = subprocess.run([sys.executable, "-c", script], check=False)
+
+    assert result.returncode == 3
+    assert json.loads((tmp_path / "k.json").read_text("utf-8")) == [1, 2]